@@ -0,0 +1,130 @@
+"""
+Import-time regression benchmark for the pipeline entry points.
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and reports the cumulative import time, the slowest modules, and any heavy ML
+library (torch, transformers, ultralytics, paddleocr, ...) that got imported.
+Heavy libraries must only load when a component that needs them is built.
+
+Example:
+    python scripts/benchmark_import_time.py --runs 5
+    python scripts/benchmark_import_time.py --check --max-ms 1500 --output import_times.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = {
+    "pipeline": "src.main",
+    "batch": "src.batch_runner",
+    "perception": "src.perception.main",
+    "reasoning": "src.reasoning.main",
+    "realization": "src.realization.main",
+}
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "ultralytics",
+    "paddleocr",
+    "paddle",
+    "diffusers",
+    "sentence_transformers",
+    "segment_anything",
+    "onnxruntime",
+)
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us) for each ``import time:`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def measure_import(module: str, top: int = 10) -> dict:
+    """Import ``module`` in a fresh interpreter and summarize ``-X importtime``."""
+    probe = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps(sorted(m for m in {list(HEAVY_MODULES)!r} if m in sys.modules)))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(PROJECT_ROOT), str(PROJECT_ROOT / "src"), env.get("PYTHONPATH", "")])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or [""]
+        return {"module": module, "error": tail[0]}
+    rows = parse_importtime(proc.stderr)
+    total_us = next((cumulative for name, _, cumulative in rows if name == module), 0)
+    slowest = sorted(rows, key=lambda row: -row[1])[:top]
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000.0, 1),
+        "modules_imported": len(rows),
+        "heavy_imported": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "slowest_self_ms": [{"module": name, "ms": round(self_us / 1000.0, 1)} for name, self_us, _ in slowest],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure entry-point import time with python -X importtime")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS), help="Entry point(s) to measure")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per entry point (median reported)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest modules to list")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="Fail --check when an import exceeds this")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on heavy imports or a budget overrun")
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    report = {}
+    failures = []
+    for name in args.entry or list(ENTRY_POINTS):
+        runs = [measure_import(ENTRY_POINTS[name], top=args.top) for _ in range(max(1, args.runs))]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            report[name] = {"module": ENTRY_POINTS[name], "error": errors[0]}
+            failures.append(f"{name}: import failed ({errors[0]})")
+            print(f"{name:<12} {ENTRY_POINTS[name]:<24} FAILED  {errors[0]}")
+            continue
+        result = dict(runs[-1])
+        result["runs_ms"] = [run["total_ms"] for run in runs]
+        result["total_ms"] = round(statistics.median(result["runs_ms"]), 1)
+        report[name] = result
+        heavy = ", ".join(result["heavy_imported"]) or "-"
+        print(f"{name:<12} {result['module']:<24} {result['total_ms']:>8.1f} ms  heavy: {heavy}")
+        for entry in result["slowest_self_ms"]:
+            print(f"    {entry['ms']:>8.1f} ms  {entry['module']}")
+        if result["heavy_imported"]:
+            failures.append(f"{name}: imports {heavy} at import time")
+        if args.max_ms and result["total_ms"] > args.max_ms:
+            failures.append(f"{name}: {result['total_ms']:.0f} ms exceeds {args.max_ms:.0f} ms")
+
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved report: {out_path}")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
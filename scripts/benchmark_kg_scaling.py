@@ -0,0 +1,162 @@
+"""
+Scaling benchmark for KnowledgeLoader lookups on synthetic knowledge graphs.
+
+Builds graphs 1x..1000x the size of countries_graph.json by replicating every
+node, edge and country under a numbered suffix (plus synthetic
+preferred_substitutions), then times loading and the per-object lookups the
+reasoning engine makes. With hash indexes the per-call latencies should stay
+flat as the graph grows; only load time scales. ``snapshot_load_s`` is the
+second load, served from the binary KG snapshot the first one wrote.
+``get_policy_set`` times the reasoning-policy reads the engine makes per
+object; ``policy_yaml_reads`` counts reasoning.yaml parses during the timed
+calls and must be 0.
+
+Example:
+    python scripts/benchmark_kg_scaling.py --scales 1,10,100 --queries 2000
+    python scripts/benchmark_kg_scaling.py --scales 1,10,100,1000 --output kg_scaling.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_KG = PROJECT_ROOT / "data" / "knowledge_base" / "countries_graph.json"
+
+
+def synthesize_graph(base: dict, scale: int) -> dict:
+    """Replicate ``base`` ``scale`` times; copy k>0 suffixes ids, labels and country labels."""
+    nodes, edges, preferred = [], [], []
+    base_nodes = base.get("nodes") or []
+    base_edges = base.get("edges") or base.get("links") or []
+    for k in range(scale):
+        suffix = "" if k == 0 else f" {k}"
+        id_suffix = "" if k == 0 else f"__{k}"
+        for node in base_nodes:
+            copy = dict(node, id=f"{node['id']}{id_suffix}", label=f"{node.get('label', '')}{suffix}")
+            if copy.get("country_label"):
+                copy["country_label"] = f"{node['country_label']}{suffix}"
+            nodes.append(copy)
+        for edge in base_edges:
+            edges.append(dict(edge, source=f"{edge['source']}{id_suffix}", target=f"{edge['target']}{id_suffix}"))
+        countries = [n["label"] + suffix for n in base_nodes if n.get("type") == "COUNTRY"]
+        items = [n["label"] + suffix for n in base_nodes if n.get("type") not in ("COUNTRY", "CULTURE")]
+        for i, item in enumerate(items):
+            preferred.append(
+                {
+                    "object_label": item,
+                    "target_culture": countries[i % len(countries)] if countries else "",
+                    "target_object": items[(i + 1) % len(items)],
+                }
+            )
+    label_to_type = {
+        str(n.get("label", "")).lower(): n.get("type")
+        for n in nodes
+        if n.get("type") not in ("COUNTRY", "CULTURE", None)
+    }
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "label_to_type": label_to_type,
+        "preferred_substitutions": preferred,
+    }
+
+
+def _time_calls(fn, args_list) -> dict:
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "mean_us": round(statistics.fmean(timings), 2),
+        "p95_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+    }
+
+
+def bench_scale(base: dict, scale: int, queries: int, seed: int) -> dict:
+    from src.reasoning.knowledge_loader import KnowledgeLoader
+    from src.reasoning.policy_config import get_policy_set, policy_stats
+
+    graph = synthesize_graph(base, scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"kg_x{scale}.json"
+        path.write_text(json.dumps(graph), encoding="utf-8")
+        snapshot_dir = Path(tmp) / "snapshots"
+        start = time.perf_counter()
+        loader = KnowledgeLoader(str(path), snapshot=True, snapshot_dir=str(snapshot_dir))
+        load_s = time.perf_counter() - start
+        start = time.perf_counter()
+        KnowledgeLoader(str(path), snapshot=True, snapshot_dir=str(snapshot_dir))
+        snapshot_load_s = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    labels = [n["label"] for n in graph["nodes"]]
+    countries = [n["label"] for n in graph["nodes"] if n.get("type") == "COUNTRY"] or [""]
+    types = sorted(loader.get_cultural_types()) or ["FOOD"]
+    label_culture = [(rng.choice(labels).upper(), rng.choice(countries)) for _ in range(queries)]
+    pairs = [(p["object_label"], p["target_culture"]) for p in rng.sample(graph["preferred_substitutions"], min(queries, len(graph["preferred_substitutions"])))]
+
+    get_policy_set("scope_excluded_types")
+    policy_reads = policy_stats()["yaml_reads"]
+    policy_timing = _time_calls(get_policy_set, [("scope_excluded_types",)] * queries)
+
+    return {
+        "scale": scale,
+        "nodes": len(graph["nodes"]),
+        "edges": len(graph["edges"]),
+        "preferred_substitutions": len(graph["preferred_substitutions"]),
+        "load_s": round(load_s, 3),
+        "snapshot_load_s": round(snapshot_load_s, 3),
+        "find_node": _time_calls(loader.find_node, [(label,) for label, _ in label_culture]),
+        "get_item_by_label": _time_calls(loader.get_item_by_label, label_culture),
+        "get_nodes_by_type_and_culture": _time_calls(
+            loader.get_nodes_by_type_and_culture, [(rng.choice(types), culture.lower()) for _, culture in label_culture]
+        ),
+        "get_preferred_substitution": _time_calls(loader.get_preferred_substitution, pairs or [("", "")]),
+        "get_policy_set": policy_timing,
+        "policy_yaml_reads": policy_stats()["yaml_reads"] - policy_reads,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KnowledgeLoader lookups on synthetic KGs")
+    parser.add_argument("--kg", default=str(DEFAULT_KG), help="Base knowledge graph JSON")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated size multipliers (up to 1000)")
+    parser.add_argument("--queries", type=int, default=1000, help="Timed lookups per method and scale")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    with open(args.kg, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    results = []
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        result = bench_scale(base, scale, args.queries, args.seed)
+        results.append(result)
+        print(
+            f"x{scale:<5} nodes={result['nodes']:<8} load={result['load_s']:>7.2f}s "
+            f"snapshot={result['snapshot_load_s']:>6.2f}s  "
+            + "  ".join(
+                f"{name}={result[name]['mean_us']:.1f}us"
+                for name in ("find_node", "get_item_by_label", "get_nodes_by_type_and_culture", "get_preferred_substitution", "get_policy_set")
+            )
+        )
+        assert result["policy_yaml_reads"] == 0, "reasoning.yaml was re-read in the hot path"
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Saved report: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
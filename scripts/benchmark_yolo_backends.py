@@ -0,0 +1,99 @@
+"""
+Benchmark the YOLO object detector on CPU: ultralytics/torch vs ONNX Runtime.
+
+Runs the same single-pass inference used by ObjectDetector on both backends and
+reports latency plus detection parity (count and matched-box IoU).
+
+Example:
+    python scripts/benchmark_yolo_backends.py --img data/input/samples/food.jpg --runs 20 --threads 4
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _time_backend(detector, image, runs: int) -> dict:
+    detector._run_inference(image, threshold=detector.threshold)
+    timings = []
+    detections = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        detections = detector._run_inference(image, threshold=detector.threshold)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "p50_ms": round(timings[len(timings) // 2], 2),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        "detections": detections,
+    }
+
+
+def _parity(reference: list, candidate: list) -> dict:
+    from perception.detectors.object_detector import ObjectDetector
+
+    ious = []
+    for ref in reference:
+        same_class = [c for c in candidate if c["class_id"] == ref["class_id"]]
+        best = max((ObjectDetector._bbox_iou(ref["bbox"], c["bbox"]) for c in same_class), default=0.0)
+        ious.append(best)
+    return {
+        "torch_count": len(reference),
+        "onnx_count": len(candidate),
+        "mean_matched_iou": round(statistics.fmean(ious), 4) if ious else None,
+        "min_matched_iou": round(min(ious), 4) if ious else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark YOLO torch vs ONNX Runtime on CPU")
+    parser.add_argument("--img", required=True, help="Path to input image")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per backend")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX intra-op threads (0 = runtime default)")
+    parser.add_argument("--torch-threads", type=int, default=0, help="torch.set_num_threads (0 = default)")
+    args = parser.parse_args()
+
+    # Settings are read at import time; pin the ONNX thread count before importing perception.
+    os.environ["YOLO_ONNX_INTRA_OP_THREADS"] = str(args.threads)
+    os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+    import torch
+
+    from perception.detectors.object_detector import ObjectDetector
+    from perception.utils.image_loader import load_image
+
+    if args.torch_threads > 0:
+        torch.set_num_threads(args.torch_threads)
+
+    image = load_image(args.img)
+    report = {"image": args.img, "runs": args.runs, "image_shape": list(image.shape)}
+
+    torch_detector = ObjectDetector(backend="torch")
+    torch_result = _time_backend(torch_detector, image, args.runs)
+
+    onnx_detector = ObjectDetector(backend="onnx")
+    if onnx_detector.onnx_session is None:
+        print("ONNX backend unavailable (is onnxruntime installed?)", file=sys.stderr)
+        return 1
+    onnx_result = _time_backend(onnx_detector, image, args.runs)
+
+    report["torch"] = {k: v for k, v in torch_result.items() if k != "detections"}
+    report["torch"]["threads"] = torch.get_num_threads()
+    report["onnx"] = {k: v for k, v in onnx_result.items() if k != "detections"}
+    report["onnx"]["intra_op_threads"] = args.threads
+    report["speedup"] = round(torch_result["mean_ms"] / max(onnx_result["mean_ms"], 1e-6), 3)
+    report["parity"] = _parity(torch_result["detections"], onnx_result["detections"])
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
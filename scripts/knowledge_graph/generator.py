@@ -2,8 +2,13 @@ import json
 import logging
 import os
 import pickle
+import sys
 from typing import Any, Dict, List, Tuple
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
 logger = logging.getLogger(__name__)
 
 REL_ASSOCIATED_WITH = "ASSOCIATED_WITH"
@@ -264,10 +269,16 @@ def generate_knowledge_graph():
         for edge in edges:
             f.write(json.dumps(edge) + "\n")
 
+    # Per-culture shards + global label/type index (KnowledgeLoader on shards/index.json).
+    from src.reasoning.kg_shards import write_shards
+
+    shard_index = write_shards(output_file_json, os.path.join(output_dir, "shards"))
+
     logger.info("Successfully generated knowledge graph data:")
     logger.info("  - JSON: %s", output_file_json)
     logger.info("  - Pickle: %s", output_file_pkl)
     logger.info("  - JSONL: %s", output_file_jsonl)
+    logger.info("  - Shards: %s", shard_index)
     logger.info("Total Nodes: %s", len(nodes))
     logger.info("Total Edges: %s", len(edges))
 
@@ -0,0 +1,171 @@
+"""
+Accuracy-delta report for BLIP/CLIP precision modes.
+
+Runs BLIP captioning and CLIP image-type classification over a fixture image set
+with fp32 as the reference and the requested mode as the candidate, then reports
+caption agreement (exact match, token F1), CLIP top-1 agreement, mean absolute
+probability delta and the latency/throughput ratio.
+
+Example:
+    python scripts/precision_accuracy_report.py --images data/input/samples --mode dynamic-int8
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def _token_f1(reference: str, candidate: str) -> float:
+    ref = reference.lower().split()
+    cand = candidate.lower().split()
+    if not ref and not cand:
+        return 1.0
+    if not ref or not cand:
+        return 0.0
+    common = 0
+    pool = list(ref)
+    for token in cand:
+        if token in pool:
+            pool.remove(token)
+            common += 1
+    if common == 0:
+        return 0.0
+    precision = common / len(cand)
+    recall = common / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _run_mode(mode: str, images: list, settings, max_new_tokens: int) -> dict:
+    import torch
+    from transformers import (
+        BlipForConditionalGeneration,
+        BlipProcessor,
+        CLIPModel,
+        CLIPProcessor,
+    )
+
+    from src.utilities.model_precision import inference_autocast, load_model_with_precision
+
+    device = "cpu"
+    cache_dir = settings.MODEL_PRECISION_CACHE_DIR
+    blip, blip_mode = load_model_with_precision(
+        lambda: BlipForConditionalGeneration.from_pretrained(settings.BLIP2_MODEL_NAME),
+        model_name=settings.BLIP2_MODEL_NAME,
+        mode=mode,
+        device=device,
+        cache_dir=cache_dir,
+    )
+    blip_processor = BlipProcessor.from_pretrained(settings.BLIP2_MODEL_NAME)
+    clip, clip_mode = load_model_with_precision(
+        lambda: CLIPModel.from_pretrained(settings.CLIP_MODEL_NAME),
+        model_name=settings.CLIP_MODEL_NAME,
+        mode=mode,
+        device=device,
+        cache_dir=cache_dir,
+    )
+    clip_processor = CLIPProcessor.from_pretrained(settings.CLIP_MODEL_NAME)
+    prompts_cfg = settings.PERCEPTION_PROMPTS.get("image_type_classifier", {})
+    classes = [str(c).strip() for c in prompts_cfg.get("classes", []) if str(c).strip()]
+    labels = [str(c).strip() for c in prompts_cfg.get("labels", []) if str(c).strip()]
+    text_prompts = [str(prompts_cfg.get("template", "{class_name}")).format(class_name=c) for c in classes]
+
+    captions, probs, blip_ms, clip_ms = [], [], [], []
+    for image in images:
+        inputs = blip_processor(images=image, return_tensors="pt")
+        start = time.perf_counter()
+        with torch.no_grad(), inference_autocast(blip_mode, device):
+            ids = blip.generate(**inputs, max_new_tokens=max_new_tokens)
+        blip_ms.append((time.perf_counter() - start) * 1000.0)
+        captions.append(blip_processor.batch_decode(ids, skip_special_tokens=True)[0].strip())
+
+        inputs = clip_processor(text=text_prompts, images=image, return_tensors="pt", padding=True)
+        start = time.perf_counter()
+        with torch.no_grad(), inference_autocast(clip_mode, device):
+            logits = clip(**inputs).logits_per_image
+        clip_ms.append((time.perf_counter() - start) * 1000.0)
+        probs.append(logits.float().softmax(dim=1)[0].tolist())
+    return {
+        "blip_mode": blip_mode,
+        "clip_mode": clip_mode,
+        "captions": captions,
+        "probs": probs,
+        "labels": labels,
+        "blip_mean_ms": statistics.fmean(blip_ms) if blip_ms else 0.0,
+        "clip_mean_ms": statistics.fmean(clip_ms) if clip_ms else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BLIP/CLIP precision accuracy-delta report")
+    parser.add_argument("--images", default=str(PROJECT_ROOT / "data" / "input" / "samples"))
+    parser.add_argument("--mode", default="dynamic-int8", help="dynamic-int8 | bf16-autocast")
+    parser.add_argument("--limit", type=int, default=20, help="Max fixture images")
+    parser.add_argument("--max-new-tokens", type=int, default=30)
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    from PIL import Image
+
+    from perception.config import settings
+    from src.utilities.model_precision import normalize_precision_mode
+
+    paths = sorted(p for p in Path(args.images).glob("*") if p.suffix.lower() in _IMAGE_SUFFIXES)
+    paths = paths[: max(1, args.limit)]
+    if not paths:
+        print(f"No fixture images found in {args.images}", file=sys.stderr)
+        return 1
+    images = [Image.open(p).convert("RGB") for p in paths]
+
+    reference = _run_mode("fp32", images, settings, args.max_new_tokens)
+    candidate = _run_mode(normalize_precision_mode(args.mode), images, settings, args.max_new_tokens)
+
+    per_image = []
+    for i, path in enumerate(paths):
+        ref_probs, cand_probs = reference["probs"][i], candidate["probs"][i]
+        ref_top = max(range(len(ref_probs)), key=ref_probs.__getitem__) if ref_probs else -1
+        cand_top = max(range(len(cand_probs)), key=cand_probs.__getitem__) if cand_probs else -1
+        per_image.append(
+            {
+                "image": path.name,
+                "caption_fp32": reference["captions"][i],
+                "caption_candidate": candidate["captions"][i],
+                "caption_token_f1": round(_token_f1(reference["captions"][i], candidate["captions"][i]), 4),
+                "clip_top1_match": ref_top == cand_top,
+                "clip_prob_l1": round(sum(abs(a - b) for a, b in zip(ref_probs, cand_probs)), 4),
+            }
+        )
+
+    report = {
+        "images": len(paths),
+        "candidate_mode": {"blip": candidate["blip_mode"], "clip": candidate["clip_mode"]},
+        "caption_exact_match_rate": round(
+            sum(r["caption_fp32"] == r["caption_candidate"] for r in per_image) / len(per_image), 4
+        ),
+        "caption_mean_token_f1": round(statistics.fmean(r["caption_token_f1"] for r in per_image), 4),
+        "clip_top1_agreement": round(sum(r["clip_top1_match"] for r in per_image) / len(per_image), 4),
+        "clip_mean_prob_l1": round(statistics.fmean(r["clip_prob_l1"] for r in per_image), 4),
+        "blip_speedup": round(reference["blip_mean_ms"] / max(candidate["blip_mean_ms"], 1e-6), 3),
+        "clip_speedup": round(reference["clip_mean_ms"] / max(candidate["clip_mean_ms"], 1e-6), 3),
+        "latency_ms": {
+            "fp32": {"blip": round(reference["blip_mean_ms"], 2), "clip": round(reference["clip_mean_ms"], 2)},
+            "candidate": {"blip": round(candidate["blip_mean_ms"], 2), "clip": round(candidate["clip_mean_ms"], 2)},
+        },
+        "per_image": per_image,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
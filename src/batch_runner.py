@@ -0,0 +1,437 @@
+"""
+Batch runner for the full pipeline with a pre-fork worker pool.
+
+The parent loads the Stage-1 models, the reasoning engine (KG indexes) and the
+realization engine once, freezes the GC so refcount/collector passes do not
+dirty those pages, and forks N workers that share them copy-on-write. Images
+are handed out through a work queue. Fork-unsafe state is rebuilt in each
+worker: PaddleOCR handles reload lazily and torch/OpenCV thread pools are
+re-created with the per-worker thread count.
+
+Example:
+    python src/batch_runner.py --img-dir data/input/samples --target India --workers 4
+    python src/batch_runner.py --img-dir data/input/samples --target India --workers 8 --scaling-report
+"""
+
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.append(str(SRC_ROOT))
+
+from src.main import (
+    DEFAULT_REALIZATION_CONFIG_PATH,
+    _default_output_paths,
+    _get_realization_engine,
+    _get_reasoning_engine,
+    _resolve_run_output_dir,
+    _save_json,
+    configure_model_memory,
+    run_full_pipeline,
+)
+from src.utilities.terminal_logger import configure_terminal_logger
+
+logger = logging.getLogger("batch_runner")
+
+DEFAULT_IMAGE_FORMATS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+# How long the parent waits for a result before checking for dead workers.
+RESULT_POLL_S = 5.0
+
+
+def collect_images(img_dir: Path, formats=DEFAULT_IMAGE_FORMATS) -> List[Path]:
+    suffixes = {str(s).lower() for s in formats}
+    return sorted(p for p in Path(img_dir).iterdir() if p.is_file() and p.suffix.lower() in suffixes)
+
+
+def _memory_snapshot() -> Dict[str, float]:
+    """RSS/PSS and shared/private pages of this process (Linux smaps_rollup)."""
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup", "r", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024.0
+    except OSError:
+        return {}
+    return {
+        "rss_mb": round(fields.get("Rss", 0.0), 1),
+        "pss_mb": round(fields.get("Pss", 0.0), 1),
+        "shared_mb": round(fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0), 1),
+        "private_mb": round(fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0), 1),
+    }
+
+
+def _realization_config(realization_config_path: Optional[Path], target_culture: str) -> Dict[str, Any]:
+    # Same shape run_full_pipeline builds, so the preloaded engine is a cache hit.
+    config: Dict[str, Any] = {}
+    if realization_config_path:
+        with open(realization_config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    config["target_culture"] = config.get("target_culture") or target_culture
+    config["debug_prompt"] = False
+    return config
+
+
+def preload_shared_state(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Load everything the workers should share before forking."""
+    from src.perception.main import preload_models
+
+    started = time.perf_counter()
+    loaded = {"perception": preload_models(warm=True)}
+    _get_reasoning_engine(
+        Path(job["knowledge_graph_path"]),
+        use_model_cache=True,
+        strict_mode=True,
+        use_cache=bool(job.get("use_cache", True)),
+    )
+    loaded["reasoning"] = True
+    try:
+        _get_realization_engine(
+            _realization_config(job.get("realization_config_path"), job["target_culture"]),
+            use_model_cache=True,
+        )
+        loaded["realization"] = True
+    except Exception as e:
+        logger.warning("Realization engine preload failed; workers will initialize it: %s", e)
+        loaded["realization"] = False
+    loaded["preload_s"] = round(time.perf_counter() - started, 2)
+    return loaded
+
+
+def _reinit_worker(threads: int) -> None:
+    from src.perception.main import reinit_after_fork
+
+    reinit_after_fork(threads=threads)
+
+
+def _prefork_blockers() -> List[str]:
+    reasons = []
+    if not hasattr(os, "fork"):
+        reasons.append("fork is not available on this platform")
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available() and torch.cuda.is_initialized():
+        reasons.append("CUDA is initialized in the parent")
+    perception_settings = sys.modules.get("perception.config.loader")
+    workers_cfg = getattr(getattr(perception_settings, "settings", None), "MODEL_WORKERS", {}) or {}
+    if workers_cfg.get("enabled"):
+        reasons.append("pipeline.model_workers is enabled")
+    return reasons
+
+
+def _run_one(index: int, image_path: Path, job: Dict[str, Any]) -> Dict[str, Any]:
+    outputs = _default_output_paths(image_path, Path(job["run_output_dir"]))
+    started = time.perf_counter()
+    record = {"index": index, "image": str(image_path), "pid": os.getpid()}
+    try:
+        result = run_full_pipeline(
+            image_path=image_path,
+            target_culture=job["target_culture"],
+            knowledge_graph_path=Path(job["knowledge_graph_path"]),
+            avoid_list=list(job.get("avoid_list") or []),
+            perception_output=outputs["perception_json"],
+            reasoning_output=outputs["reasoning_json"],
+            final_image_output=outputs["final_image"],
+            realization_config_path=job.get("realization_config_path"),
+            use_cache=bool(job.get("use_cache", True)),
+            use_model_cache=True,
+        )
+        record.update(status="ok", final_image=result.get("final_image"))
+    except Exception as e:
+        logger.error("Batch item failed: %s: %s", image_path, e)
+        logger.debug("Batch item traceback:\n%s", traceback.format_exc())
+        record.update(status="failed", error=str(e))
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def _worker_loop(task_queue, result_queue, job: Dict[str, Any], threads: int) -> None:
+    configure_model_memory()
+    _reinit_worker(threads)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        index, image_path = task
+        result_queue.put(("start", {"pid": os.getpid(), "index": index}))
+        result_queue.put(("item", _run_one(index, Path(image_path), job)))
+    result_queue.put(("done", {"pid": os.getpid(), **_memory_snapshot()}))
+
+
+def _failed_record(index: int, image_path: Path, error: str) -> Dict[str, Any]:
+    return {"index": index, "image": str(image_path), "status": "failed", "error": error, "seconds": 0.0}
+
+
+def _collect_results(result_queue, processes: list, images: List[Path], worker_memory: list) -> List[Dict[str, Any]]:
+    """
+    Gather worker results until every worker has finished or died.
+
+    Every RESULT_POLL_S without a result, workers that exited without reporting
+    "done" are treated as dead: the image each was working on is recorded as
+    failed. Images with no result once all workers are gone (left in the queue,
+    or whose result a crashed worker never flushed) are failed too.
+    """
+    records: Dict[int, Dict[str, Any]] = {}
+    in_flight: Dict[int, int] = {}
+    finished = set()
+    while len(finished) < len(processes):
+        try:
+            kind, payload = result_queue.get(timeout=RESULT_POLL_S)
+        except queue.Empty:
+            for process in processes:
+                if process.pid in finished or process.is_alive():
+                    continue
+                finished.add(process.pid)
+                index = in_flight.pop(process.pid, None)
+                logger.error("Batch worker %s died (exit code %s)", process.pid, process.exitcode)
+                if index is not None and index not in records:
+                    records[index] = _failed_record(
+                        index, images[index], f"worker {process.pid} died (exit code {process.exitcode})"
+                    )
+            continue
+        if kind == "start":
+            in_flight[payload["pid"]] = payload["index"]
+        elif kind == "item":
+            records[payload["index"]] = payload
+            in_flight.pop(payload.get("pid"), None)
+        else:
+            worker_memory.append(payload)
+            finished.add(payload["pid"])
+    for index, image_path in enumerate(images):
+        if index not in records:
+            records[index] = _failed_record(index, image_path, "no result: batch workers exited before reporting it")
+    return list(records.values())
+
+
+def run_batch(
+    images: List[Path],
+    job: Dict[str, Any],
+    workers: int = 1,
+    threads_per_worker: int = 0,
+    prefork: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the full pipeline over ``images``.
+
+    With ``prefork`` and more than one worker, shared state is preloaded and N
+    forked workers pull images from a queue; otherwise images run in this
+    process.
+
+    Returns:
+        Summary with per-image records, wall time, throughput and worker memory
+    """
+    workers = max(1, int(workers))
+    if threads_per_worker <= 0:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    mode = "prefork" if prefork and workers > 1 else "inline"
+    blockers = _prefork_blockers() if mode == "prefork" else []
+    if blockers:
+        logger.warning("Pre-fork disabled (%s); running inline", "; ".join(blockers))
+        mode, workers = "inline", 1
+
+    preload = {}
+    if mode == "prefork":
+        preload = preload_shared_state(job)
+
+    started = time.perf_counter()
+    records: List[Dict[str, Any]] = []
+    worker_memory: List[Dict[str, Any]] = []
+    if mode == "inline":
+        for index, image_path in enumerate(images):
+            records.append(_run_one(index, image_path, job))
+    else:
+        context = multiprocessing.get_context("fork")
+        task_queue, result_queue = context.Queue(), context.Queue()
+        for index, image_path in enumerate(images):
+            task_queue.put((index, str(image_path)))
+        for _ in range(workers):
+            task_queue.put(None)
+        # Keep the preloaded objects out of the collector so workers do not
+        # touch (and copy) their pages.
+        gc.collect()
+        gc.freeze()
+        processes = [
+            context.Process(
+                target=_worker_loop,
+                args=(task_queue, result_queue, job, threads_per_worker),
+                name=f"batch-worker-{i}",
+            )
+            for i in range(workers)
+        ]
+        try:
+            for process in processes:
+                process.start()
+            records = _collect_results(result_queue, processes, images, worker_memory)
+            for process in processes:
+                process.join()
+        finally:
+            gc.unfreeze()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+        records.sort(key=lambda r: r["index"])
+
+    wall_s = time.perf_counter() - started
+    succeeded = sum(1 for r in records if r.get("status") == "ok")
+    summary = {
+        "mode": mode,
+        "workers": workers,
+        "threads_per_worker": threads_per_worker,
+        "images": len(images),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "wall_s": round(wall_s, 3),
+        "images_per_s": round(len(images) / wall_s, 4) if wall_s > 0 else 0.0,
+        "preload": preload,
+        "parent_memory": _memory_snapshot(),
+        "worker_memory": worker_memory,
+        "records": records,
+    }
+    logger.info(
+        "Batch %s: %d image(s) with %d worker(s) in %.1fs (%.3f img/s, %d failed)",
+        mode,
+        len(images),
+        workers,
+        wall_s,
+        summary["images_per_s"],
+        summary["failed"],
+    )
+    return summary
+
+
+def _scaling_steps(max_workers: int) -> List[int]:
+    steps, n = [], 1
+    while n < max_workers:
+        steps.append(n)
+        n *= 2
+    steps.append(max(1, max_workers))
+    return steps
+
+
+_SCALING_ENV = ("CACHE_DIR", "ENABLE_LLM_CACHE")
+
+
+def scaling_report(
+    images: List[Path],
+    job: Dict[str, Any],
+    max_workers: int,
+    threads_per_worker: int = 0,
+) -> Dict[str, Any]:
+    """
+    Throughput for 1, 2, 4, ... ``max_workers`` workers over the same images.
+
+    Every run does the full work: stage output caching and near-duplicate
+    reuse are off (``use_cache=False``), the LLM response cache is disabled,
+    and each run gets its own ``CACHE_DIR`` under
+    ``<run_output_dir>/scaling/w<N>/cache``, next to its outputs.
+    """
+    runs = []
+    baseline = None
+    for workers in _scaling_steps(max_workers):
+        run_dir = Path(job["run_output_dir"]) / "scaling" / f"w{workers}"
+        run_job = dict(job, use_cache=False, run_output_dir=str(run_dir))
+        saved_env = {name: os.environ.get(name) for name in _SCALING_ENV}
+        os.environ.update({"CACHE_DIR": str(run_dir / "cache"), "ENABLE_LLM_CACHE": "false"})
+        try:
+            summary = run_batch(images, run_job, workers=workers, threads_per_worker=threads_per_worker)
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        baseline = baseline or summary["images_per_s"]
+        speedup = summary["images_per_s"] / baseline if baseline else 0.0
+        runs.append(
+            {
+                "workers": summary["workers"],
+                "mode": summary["mode"],
+                "threads_per_worker": summary["threads_per_worker"],
+                "wall_s": summary["wall_s"],
+                "images_per_s": summary["images_per_s"],
+                "speedup": round(speedup, 3),
+                "efficiency": round(speedup / summary["workers"], 3),
+                "failed": summary["failed"],
+                "worker_memory": summary["worker_memory"],
+            }
+        )
+    return {"images": len(images), "runs": runs}
+
+
+def main() -> None:
+    configure_terminal_logger(level=os.getenv("LOG_LEVEL", "INFO"))
+    configure_model_memory()
+    parser = argparse.ArgumentParser(description="Run the full pipeline over a directory of images")
+    parser.add_argument("--img-dir", required=True, help="Directory of input images")
+    parser.add_argument("--target", required=True, help="Target culture (e.g., India, Japan)")
+    parser.add_argument("--kg", default="data/knowledge_base/countries_graph.json", help="Knowledge graph JSON")
+    parser.add_argument("--output-dir", default="data/output", help="Base output directory")
+    parser.add_argument("--run-name", default="batch_run", help="Run folder name under --output-dir")
+    parser.add_argument("--config", default=None, help="Optional realization config JSON path")
+    parser.add_argument("--avoid", nargs="*", default=[], help="Items to avoid in reasoning substitutions")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=0,
+        help="torch/OpenCV threads per worker (0 = cores divided by workers)",
+    )
+    parser.add_argument("--no-prefork", action="store_true", help="Run all images in this process")
+    parser.add_argument("--no-cache", action="store_true", help="Disable stage output cache")
+    parser.add_argument(
+        "--scaling-report",
+        action="store_true",
+        help="Measure throughput for 1, 2, 4, ... --workers workers",
+    )
+    parser.add_argument("--report-output", default=None, help="Path for the batch report JSON")
+    args = parser.parse_args()
+
+    images = collect_images(Path(args.img_dir))
+    if not images:
+        logger.error("No images found in %s", args.img_dir)
+        sys.exit(1)
+    if args.config:
+        realization_config_path = Path(args.config)
+    else:
+        realization_config_path = DEFAULT_REALIZATION_CONFIG_PATH if DEFAULT_REALIZATION_CONFIG_PATH.exists() else None
+    run_output_dir = _resolve_run_output_dir(args.output_dir, args.run_name)
+    job = {
+        "target_culture": args.target,
+        "knowledge_graph_path": str(args.kg),
+        "avoid_list": args.avoid,
+        "realization_config_path": realization_config_path,
+        "run_output_dir": str(run_output_dir),
+        "use_cache": not args.no_cache,
+    }
+
+    if args.scaling_report:
+        report = scaling_report(images, job, args.workers, args.threads_per_worker)
+    else:
+        report = run_batch(
+            images,
+            job,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            prefork=not args.no_prefork,
+        )
+    report_path = Path(args.report_output) if args.report_output else run_output_dir / "batch_report.json"
+    _save_json(report, report_path)
+    logger.info("Batch report: %s", report_path)
+
+
+if __name__ == "__main__":
+    main()
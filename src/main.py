@@ -3,10 +3,11 @@ import json
 import logging
 import os
 import sys
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 # Ensure project root is on sys.path for "src.*" imports.
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -17,11 +18,18 @@ if str(SRC_ROOT) not in sys.path:
     # Perception package imports use "perception.*", which lives under src/.
     sys.path.append(str(SRC_ROOT))
 
-from src.reasoning.engine import CulturalReasoningEngine, apply_plan_to_input
-from src.reasoning.schemas import ReasoningInput
-from src.realization.engine import RealizationEngine
 from src.realization.schema import adapt_plan_to_edit_format, validate_edit_plan
+from src.reasoning.llm_cache import llm_cache_stats
+from src.utilities.model_manager import configure_model_manager, get_model_manager
+from src.utilities.scene_sidecar import load_scene_json
 from src.utilities.terminal_logger import configure_terminal_logger, print_startup_logo
+from src.utilities.weight_cache import load_timings
+
+if TYPE_CHECKING:
+    # Engines are imported where they are built, so realization-only runs
+    # never load the reasoning stack (and vice versa).
+    from src.reasoning.engine import CulturalReasoningEngine
+    from src.realization.engine import RealizationEngine
 
 logger = logging.getLogger("pipeline_main")
 _STAGE_LOGGER_NAMES = {
@@ -29,8 +37,8 @@ _STAGE_LOGGER_NAMES = {
     "2": "stage2_reasoning",
     "3": "stage3_realization",
 }
-_REASONING_ENGINE_CACHE: Dict[str, CulturalReasoningEngine] = {}
-_REALIZATION_ENGINE_CACHE: Dict[str, RealizationEngine] = {}
+_REASONING_ENGINE_CACHE: Dict[str, "CulturalReasoningEngine"] = {}
+_REALIZATION_ENGINE_CACHE: Dict[str, "RealizationEngine"] = {}
 DEFAULT_REALIZATION_CONFIG_PATH = PROJECT_ROOT / "data" / "config" / "realization_config.json"
 
 
@@ -75,12 +83,14 @@ def _load_json(path: Path) -> Dict[str, Any]:
 
 def _load_cached_scene_graph(path: Path) -> Dict[str, Any]:
     _stage_logger("1").info("Using cached stage-1 perception JSON: %s", path)
-    return _load_json(path)
+    # Compact outputs keep geometry in a sidecar; it is only read when Stage 3
+    # resolves a polygon.
+    return load_scene_json(path)
 
 
 def _load_cached_reasoning_graph(path: Path) -> Dict[str, Any]:
     _stage_logger("2").info("Using cached stage-2 reasoning JSON: %s", path)
-    return _load_json(path)
+    return load_scene_json(path)
 
 
 def _normalize_stage2_objects(scene_graph: Dict[str, Any]) -> None:
@@ -155,23 +165,38 @@ def _log_stage2_actionability(scene_graph: Dict[str, Any], edit_plan: Dict[str,
         )
 
 
+def configure_model_memory() -> None:
+    """Apply pipeline.model_memory to the shared model manager before any stage loads a model."""
+    from perception.config import settings as perception_settings
+
+    configure_model_manager(
+        budget_mb=getattr(perception_settings, "MODEL_MEMORY_BUDGET_MB", 0),
+        size_hints_mb=getattr(perception_settings, "MODEL_SIZE_HINTS_MB", {}),
+    )
+
+
 def _get_reasoning_engine(
     knowledge_graph_path: Path,
     use_model_cache: bool,
     strict_mode: bool = True,
-) -> CulturalReasoningEngine:
-    key = f"{knowledge_graph_path.resolve()}::{int(bool(strict_mode))}"
+    use_cache: bool = True,
+) -> "CulturalReasoningEngine":
+    from src.reasoning.engine import CulturalReasoningEngine
+
+    key = f"{knowledge_graph_path.resolve()}::{int(bool(strict_mode))}::{int(bool(use_cache))}"
     if use_model_cache and key in _REASONING_ENGINE_CACHE:
         _stage_logger("2").info("Using cached reasoning engine for KG: %s", key)
         return _REASONING_ENGINE_CACHE[key]
     _stage_logger("2").info("Initializing reasoning engine for KG: %s", key)
-    engine = CulturalReasoningEngine(str(knowledge_graph_path), strict_mode=strict_mode)
+    engine = CulturalReasoningEngine(str(knowledge_graph_path), strict_mode=strict_mode, llm_use_cache=use_cache)
     if use_model_cache:
         _REASONING_ENGINE_CACHE[key] = engine
     return engine
 
 
-def _get_realization_engine(config: Dict[str, Any], use_model_cache: bool) -> RealizationEngine:
+def _get_realization_engine(config: Dict[str, Any], use_model_cache: bool) -> "RealizationEngine":
+    from src.realization.engine import RealizationEngine
+
     # Stable cache key so equivalent configs share one initialized engine/model.
     key = json.dumps(config, sort_keys=True, default=str)
     if use_model_cache and key in _REALIZATION_ENGINE_CACHE:
@@ -193,9 +218,17 @@ def _build_run_metrics_payload(
         "run_context": run_context,
         "stage2": stage2_trace,
         "stage3": stage3_metrics,
+        "model_memory": get_model_manager().metrics(),
+        "llm_cache": llm_cache_stats(),
     }
 
 
+def _stage1_warm_state(scene_graph: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(scene_graph, dict):
+        return {}
+    return dict((scene_graph.get("quality_summary") or {}).get("model_warm_state") or {})
+
+
 def _score_below_threshold(metrics: Dict[str, Any], validation_cfg: Dict[str, Any]) -> List[str]:
     failures: List[str] = []
     min_cultural = float(validation_cfg.get("min_cultural_score", 0.7))
@@ -210,7 +243,7 @@ def _score_below_threshold(metrics: Dict[str, Any], validation_cfg: Dict[str, An
 
 
 def _validate_stage3_quality(
-    realization_engine: RealizationEngine,
+    realization_engine: "RealizationEngine",
     generated_path: str,
     target_culture: str,
     target_objects: List[str],
@@ -254,7 +287,7 @@ def _stage3_skip_reason(edit_plan: Any) -> str:
 
 
 def _generate_with_strict_quality(
-    realization_engine: RealizationEngine,
+    realization_engine: "RealizationEngine",
     edit_plan: Any,
     image_path: Path,
     target_culture: str,
@@ -461,7 +494,7 @@ def run_full_pipeline(
     else:
         _stage_log("1", "START", f"perception on image: {image_path}")
         try:
-            scene_graph = run_perception(str(image_path), str(perception_output))
+            scene_graph = run_perception(str(image_path), str(perception_output), use_cache=use_cache)
             _stage_log("1", "DONE", f"{perception_output}")
             _stage_logger("1").info(
                 "Perception summary: objects=%d text_regions=%d image_type=%s",
@@ -499,10 +532,14 @@ def run_full_pipeline(
     else:
         _stage_log("2", "START", f"reasoning for target culture: {target_culture}")
         try:
+            from src.reasoning.engine import apply_plan_to_input
+            from src.reasoning.schemas import ReasoningInput
+
             engine = _get_reasoning_engine(
                 knowledge_graph_path=knowledge_graph_path,
                 use_model_cache=use_model_cache,
                 strict_mode=True,
+                use_cache=use_cache,
             )
             engine.debug_plan = debug_plan
             engine.debug_kg_selection = debug_kg_selection
@@ -596,6 +633,7 @@ def run_full_pipeline(
                 "target_culture": target_culture,
                 "reasoning_output": str(reasoning_output),
                 "final_image_output": str(final_image_output),
+                "stage1_model_warm_state": _stage1_warm_state(scene_graph),
             },
         )
         _save_json(run_metrics_payload, run_metrics_path)
@@ -652,6 +690,7 @@ def run_full_pipeline(
             "target_culture": target_culture,
             "reasoning_output": str(reasoning_output),
             "final_image_output": str(final_image_output),
+            "stage1_model_warm_state": _stage1_warm_state(scene_graph),
         },
     )
     _save_json(run_metrics_payload, run_metrics_path)
@@ -675,9 +714,74 @@ def run_full_pipeline(
     }
 
 
+def profile_startup(
+    knowledge_graph_path: Path,
+    target_culture: str,
+    realization_config_path: Path = None,
+) -> Dict[str, Any]:
+    """
+    Load every model and engine up front and time each step.
+
+    Returns the breakdown (also printed): Stage-1 component loads, individual
+    weight loads with their source (mmap, convert, checkpoint, direct) and the
+    Stage-2/3 engine initializations.
+    """
+    steps: List[Dict[str, Any]] = []
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        try:
+            fn()
+            status = "ok"
+        except Exception as e:
+            logger.warning("Startup step %s failed: %s", name, e)
+            status = "failed"
+        steps.append({"step": name, "seconds": round(time.perf_counter() - started, 3), "status": status})
+
+    started = time.perf_counter()
+
+    def perception():
+        from src.perception.main import preload_models
+
+        preload_models(warm=True)
+
+    timed("stage1_models", perception)
+    timed("stage2_reasoning_engine", lambda: _get_reasoning_engine(knowledge_graph_path, use_model_cache=True))
+
+    def realization():
+        config: Dict[str, Any] = {}
+        if realization_config_path:
+            config = _load_json(realization_config_path)
+        config["target_culture"] = config.get("target_culture") or target_culture
+        config["debug_prompt"] = False
+        _get_realization_engine(config, use_model_cache=True)
+
+    timed("stage3_realization_engine", realization)
+    components = get_model_manager().metrics()["resident"]
+    profile = {
+        "total_s": round(time.perf_counter() - started, 3),
+        "steps": steps,
+        "components": {key: entry["load_ms"] for key, entry in components.items()},
+        "weights": load_timings(),
+    }
+
+    lines = ["Startup profile (%.2fs total)" % profile["total_s"]]
+    for step in steps:
+        lines.append("  %-34s %8.2fs  %s" % (step["step"], step["seconds"], step["status"]))
+    lines.append("  Stage-1 components:")
+    for key, load_ms in sorted(profile["components"].items(), key=lambda item: -item[1]):
+        lines.append("    %-32s %8.2fs" % (key, load_ms / 1000.0))
+    lines.append("  Model weights:")
+    for entry in sorted(profile["weights"], key=lambda item: -item["seconds"]):
+        lines.append("    %-32s %8.2fs  %s" % (entry["model"], entry["seconds"], entry["source"]))
+    print("\n".join(lines))
+    return profile
+
+
 def main() -> None:
     configure_terminal_logger(level=os.getenv("LOG_LEVEL", "INFO"))
     print_startup_logo()
+    configure_model_memory()
 
     parser = argparse.ArgumentParser(
         description="Run full transcreation pipeline: Perception -> Reasoning -> Realization"
@@ -763,6 +867,11 @@ def main() -> None:
         default=None,
         help="Optional output path for per-run metrics JSON.",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Load all models/engines first and print a per-model cold-start breakdown.",
+    )
 
     args = parser.parse_args()
 
@@ -773,6 +882,11 @@ def main() -> None:
     if realization_config_path:
         logger.info("Using realization config: %s", realization_config_path)
 
+    if args.profile_startup:
+        profile_startup(Path(args.kg), args.target or "", realization_config_path)
+        if not args.img and not args.stage2_json:
+            return
+
     if args.stage2_json:
         stage2_json_path = Path(args.stage2_json)
         if not stage2_json_path.exists():
@@ -826,6 +940,11 @@ def main() -> None:
     final_image_output = Path(args.final_image_output) if args.final_image_output else defaults["final_image"]
     metrics_output = Path(args.metrics_output) if args.metrics_output else None
 
+    if (args.no_cache or not perception_output.exists()) and not args.profile_startup:
+        from src.perception.main import start_background_warmup
+
+        start_background_warmup()
+
     try:
         outputs = run_full_pipeline(
             image_path=image_path,
@@ -9,6 +9,7 @@ from pathlib import Path
 from datetime import datetime
 
 from perception.config import settings
+from src.utilities.scene_sidecar import save_compact_scene
 
 
 class SceneJSONBuilder:
@@ -34,6 +35,7 @@ class SceneJSONBuilder:
         quality_summary: dict = None,
         infographic_analysis: dict = None,
         image_shape: tuple | None = None,
+        execution_plan: dict = None,
     ) -> dict:
         """
         Build final scene JSON
@@ -47,6 +49,7 @@ class SceneJSONBuilder:
             object_attributes: Object attributes
             scene_description: Scene summary
             extracted_text: OCR results
+            execution_plan: Per-image plan from the execution planner
             
         Returns:
             Complete scene JSON structure
@@ -84,6 +87,7 @@ class SceneJSONBuilder:
             },
             'quality_summary': self._augment_quality_summary(quality_summary or {}, visual_regions),
             'infographic_analysis': infographic_analysis or {'enabled': False},
+            'execution_plan': execution_plan or {'enabled': False},
         }
         
         return scene_json
@@ -127,6 +131,7 @@ class SceneJSONBuilder:
                 'semantic_type': bbox_info.get('semantic_type'),
                 'semantic_score': bbox_info.get('semantic_score'),
                 'icon_cluster_id': bbox_info.get('icon_cluster_id', -1),
+                'crop_group_id': bbox_info.get('crop_group_id', -1),
                 'segmentation': bbox_info.get('segmentation', {'enabled': False, 'source': 'sam'}),
                 'caption': caption,
                 'caption_candidates': captions[i].get('caption_candidates', []) if i < len(captions) else [],
@@ -152,6 +157,7 @@ class SceneJSONBuilder:
                     "bbox": obj.get("bbox", []),
                     "confidence": obj.get("fused_confidence", obj.get("confidence", 0.0)),
                     "quality_flags": obj.get("quality_flags", []),
+                    "crop_group_id": obj.get("crop_group_id", -1),
                     "source": {
                         "detector_backend": obj.get("detector_backend", "unknown"),
                         "detector_label": obj.get("detector_label", ""),
@@ -362,16 +368,53 @@ class SceneJSONBuilder:
         denom = area_a + area_b - inter_area
         return float(inter_area / denom) if denom > 0 else 0.0
     
-    def save(self, scene_json: dict, output_path: str):
+    def rebuild_text(
+        self,
+        scene_json: dict,
+        extracted_text: list,
+        text_boxes: list,
+        object_text_links: list = None,
+    ) -> dict:
+        """
+        Refresh the text-derived sections of an existing scene JSON
+        (used when OCR is re-run on part of a reused near-duplicate).
+        """
+        text_regions = self._build_text_regions(extracted_text, text_boxes)
+        scene_json['text_regions'] = text_regions
+        text = scene_json.setdefault('text', {})
+        text['regions'] = text_boxes
+        text['extracted'] = extracted_text
+        text['full_text'] = ' '.join([t.get('text', '') for t in (extracted_text or [])])
+        text['object_links'] = object_text_links or []
+        layout = scene_json.get('layout') or {}
+        scene_json['layout'] = self._build_layout(
+            scene_json.get('image_type') or {},
+            scene_json.get('visual_regions') or [],
+            text_regions,
+            tuple(layout.get('image_shape') or ()) or None,
+        )
+        return scene_json
+
+    def save(self, scene_json: dict, output_path: str, compact: bool = None):
         """
         Save scene JSON to file
         
         Args:
             scene_json: Scene data
             output_path: Output file path
+            compact: Write minified JSON with a geometry sidecar
+                (defaults to settings.COMPACT_OUTPUT)
+            
+        Returns:
+            The scene as written; compact scenes carry sidecar references
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        if compact is None:
+            compact = bool(getattr(settings, "COMPACT_OUTPUT", False))
+        if compact:
+            return save_compact_scene(scene_json, output_path)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(scene_json, f, indent=2, ensure_ascii=False)
+        return scene_json
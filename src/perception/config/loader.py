@@ -89,6 +89,10 @@ def load_settings(config_path: Path | None = None) -> "Settings":
     BLIP2_MODEL_NAME = os.getenv("BLIP_MODEL", models_cfg.get("blip", "Salesforce/blip-image-captioning-base"))
     BLIP_MODEL_API_KEY = os.getenv("BLIP_MODEL_API_KEY", "")
     CLIP_MODEL_NAME = os.getenv("CLIP_MODEL", models_cfg.get("clip", "openai/clip-vit-large-patch14"))
+    MODEL_PRECISION = os.getenv("MODEL_PRECISION", models_cfg.get("precision", "fp32"))
+    MODEL_PRECISION_CACHE_DIR = CACHE_DIR / "quantized"
+    MMAP_WEIGHTS = _env_bool("ENABLE_MMAP_WEIGHTS", models_cfg.get("mmap_weights", True))
+    WEIGHT_CACHE_DIR = CACHE_DIR / "safetensors"
     sam_cfg = models_cfg.get("sam", {})
     SAM_MODEL_TYPE = os.getenv("SAM_MODEL_TYPE", sam_cfg.get("model_type", "vit_b"))
     sam_checkpoint_rel = sam_cfg.get("checkpoint", "sam/sam_vit_b_01ec64.pth")
@@ -96,6 +100,17 @@ def load_settings(config_path: Path | None = None) -> "Settings":
         SAM_CHECKPOINT_PATH = Path(os.getenv("SAM_CHECKPOINT_PATH"))
     else:
         SAM_CHECKPOINT_PATH = MODELS_DIR / sam_checkpoint_rel
+    SAM_BOX_BATCH_SIZE = _env_int("SAM_BOX_BATCH_SIZE", sam_cfg.get("box_batch_size", 32))
+    SAM_EMBEDDING_CACHE_ENTRIES = _env_int(
+        "SAM_EMBEDDING_CACHE_ENTRIES", sam_cfg.get("embedding_cache_entries", 4)
+    )
+    SAM_BOX_BATCH_MASK_BUDGET_MB = _env_int(
+        "SAM_BOX_BATCH_MASK_BUDGET_MB", sam_cfg.get("box_batch_mask_budget_mb", 512)
+    )
+    SAM_EMBEDDING_CACHE_DISK = _env_bool("SAM_EMBEDDING_CACHE_DISK", sam_cfg.get("embedding_cache_disk", True))
+    SAM_EMBEDDING_CACHE_DISK_MAX_MB = _env_int(
+        "SAM_EMBEDDING_CACHE_DISK_MAX_MB", sam_cfg.get("embedding_cache_disk_max_mb", 1024)
+    )
 
     OBJECT_DETECTION_THRESHOLD = _env_float("OBJECT_THRESHOLD", thresholds_cfg.get("object_detection", 0.5))
     TEXT_DETECTION_THRESHOLD = _env_float("TEXT_THRESHOLD", thresholds_cfg.get("text_detection", 0.6))
@@ -108,9 +123,22 @@ def load_settings(config_path: Path | None = None) -> "Settings":
     OCR_LANGUAGES: List[str] = ocr_cfg.get("languages", ["en"])
     OCR_GPU = _env_bool("OCR_GPU", ocr_cfg.get("gpu", False))
     OCR_USE_ANGLE_CLS = _env_bool("OCR_USE_ANGLE_CLS", ocr_cfg.get("use_angle_cls", True))
+    OCR_CPU_THREADS = _env_int("OCR_CPU_THREADS", ocr_cfg.get("cpu_threads", 0))
+    ocr_tiling_cfg = ocr_cfg.get("tiling", {})
+    OCR_TILING_ENABLED = _env_bool("OCR_TILING_ENABLED", ocr_tiling_cfg.get("enabled", False))
+    OCR_TILING_MIN_IMAGE_SIDE = _env_int(
+        "OCR_TILING_MIN_IMAGE_SIDE", ocr_tiling_cfg.get("min_image_side", 3000)
+    )
+    OCR_TILE_SIZE = _env_int("OCR_TILE_SIZE", ocr_tiling_cfg.get("tile_size", 1600))
+    OCR_TILE_OVERLAP = _env_int("OCR_TILE_OVERLAP", ocr_tiling_cfg.get("overlap", 200))
+    OCR_TILE_BATCH_SIZE = _env_int("OCR_TILE_BATCH_SIZE", ocr_tiling_cfg.get("batch_size", 4))
+    OCR_TILE_MERGE_IOU = _env_float("OCR_TILE_MERGE_IOU", ocr_tiling_cfg.get("merge_iou", 0.3))
 
     SAVE_DEBUG_IMAGES = _env_bool("SAVE_DEBUG", output_cfg.get("save_debug_images", True))
     DEBUG_IMAGES_DIR = OUTPUT_DIR / "debug"
+    compact_output_cfg = output_cfg.get("compact", {}) or {}
+    COMPACT_OUTPUT = _env_bool("COMPACT_OUTPUT", compact_output_cfg.get("enabled", False))
+    KEEP_SAM_MASKS = _env_bool("KEEP_SAM_MASKS", compact_output_cfg.get("keep_sam_masks", True))
 
     ENABLE_SCENE_GRAPH = pipeline_cfg.get("enable_scene_graph", False)
     ENABLE_SAM_SEGMENTATION = _env_bool(
@@ -129,13 +157,52 @@ def load_settings(config_path: Path | None = None) -> "Settings":
         "ENABLE_MODEL_WARMUP",
         pipeline_cfg.get("enable_model_warmup", True),
     )
+    ENABLE_BACKGROUND_WARMUP = _env_bool(
+        "ENABLE_BACKGROUND_WARMUP",
+        pipeline_cfg.get("background_warmup", False),
+    )
+    REUSE_PERCEPTION_MODELS = _env_bool(
+        "REUSE_PERCEPTION_MODELS",
+        pipeline_cfg.get("reuse_models", True),
+    )
+    model_memory_cfg = pipeline_cfg.get("model_memory", {}) or {}
+    MODEL_MEMORY_BUDGET_MB = _env_int("MODEL_MEMORY_BUDGET_MB", model_memory_cfg.get("budget_mb", 0))
+    MODEL_SIZE_HINTS_MB = dict(model_memory_cfg.get("size_hints_mb", {}) or {})
+    MODEL_WORKERS = dict(pipeline_cfg.get("model_workers", {}) or {})
+    MODEL_WORKERS["enabled"] = _env_bool("ENABLE_MODEL_WORKERS", MODEL_WORKERS.get("enabled", False))
+    CROP_DEDUP = dict(pipeline_cfg.get("crop_dedup", {}) or {})
+    CROP_DEDUP["enabled"] = _env_bool("ENABLE_CROP_DEDUP", CROP_DEDUP.get("enabled", False))
+    NEAR_DUPLICATE = dict(pipeline_cfg.get("near_duplicate", {}) or {})
+    NEAR_DUPLICATE["enabled"] = _env_bool(
+        "ENABLE_NEAR_DUPLICATE_REUSE",
+        NEAR_DUPLICATE.get("enabled", False),
+    )
+    NEAR_DUPLICATE_INDEX_DIR = Path(
+        os.getenv("NEAR_DUPLICATE_INDEX_DIR", str(CACHE_DIR / "perception_index"))
+    )
     BATCH_SIZE = _env_int("BATCH_SIZE", pipeline_cfg.get("batch_size", 1))
     FALLBACK_ACTIONABLE_CLASSES: List[str] = pipeline_cfg.get(
         "fallback_actionable_classes",
         [],
     )
+    EXECUTION_PLANNER = dict(pipeline_cfg.get("execution_planner", {}) or {})
+    EXECUTION_PLANNER["enabled"] = _env_bool(
+        "ENABLE_EXECUTION_PLANNER",
+        EXECUTION_PLANNER.get("enabled", False),
+    )
+    stage_executor_cfg = pipeline_cfg.get("stage_executor", {}) or {}
+    STAGE_EXECUTOR_MODE = os.getenv("STAGE_EXECUTOR_MODE", stage_executor_cfg.get("mode", "thread"))
+    STAGE_EXECUTOR_MAX_WORKERS = _env_int(
+        "STAGE_EXECUTOR_MAX_WORKERS",
+        stage_executor_cfg.get("max_workers", 4),
+    )
+    STAGE_TASK_THREADS = {
+        str(name): int(value or 0)
+        for name, value in (stage_executor_cfg.get("task_threads", {}) or {}).items()
+    }
     yolo_cfg = detectors_cfg.get("yolo", {})
     yolo_sup_cfg = yolo_cfg.get("supplemental", {})
+    yolo_tiling_cfg = yolo_cfg.get("tiling", {})
     hybrid_cfg = detectors_cfg.get("hybrid", {})
     detr_cfg = detectors_cfg.get("detr", {})
     vit_cfg = detectors_cfg.get("vit", {})
@@ -144,6 +211,19 @@ def load_settings(config_path: Path | None = None) -> "Settings":
     YOLO_IOU_THRESHOLD = _env_float("YOLO_IOU_THRESHOLD", yolo_cfg.get("iou_threshold", 0.45))
     YOLO_IMAGE_SIZE = _env_int("YOLO_IMAGE_SIZE", yolo_cfg.get("imgsz", 1280))
     YOLO_MAX_DET = _env_int("YOLO_MAX_DET", yolo_cfg.get("max_det", 300))
+    YOLO_BACKEND = os.getenv("YOLO_BACKEND", yolo_cfg.get("backend", "torch")).strip().lower()
+    YOLO_ONNX_INTRA_OP_THREADS = _env_int(
+        "YOLO_ONNX_INTRA_OP_THREADS", (yolo_cfg.get("onnx") or {}).get("intra_op_threads", 0)
+    )
+    YOLO_TILING_ENABLED = _env_bool("YOLO_TILING_ENABLED", yolo_tiling_cfg.get("enabled", False))
+    YOLO_TILING_MIN_IMAGE_SIDE = _env_int(
+        "YOLO_TILING_MIN_IMAGE_SIDE", yolo_tiling_cfg.get("min_image_side", 3000)
+    )
+    YOLO_TILE_SIZE = _env_int("YOLO_TILE_SIZE", yolo_tiling_cfg.get("tile_size", YOLO_IMAGE_SIZE))
+    YOLO_TILE_OVERLAP = _env_int("YOLO_TILE_OVERLAP", yolo_tiling_cfg.get("overlap", 256))
+    YOLO_TILE_BATCH_SIZE = _env_int("YOLO_TILE_BATCH_SIZE", yolo_tiling_cfg.get("batch_size", 4))
+    YOLO_TILE_MERGE_IOU = _env_float("YOLO_TILE_MERGE_IOU", yolo_tiling_cfg.get("merge_iou", 0.5))
+    YOLO_TILE_GLOBAL_PASS = _env_bool("YOLO_TILE_GLOBAL_PASS", yolo_tiling_cfg.get("global_pass", True))
     YOLO_SUPPLEMENTAL_ENABLED = _env_bool(
         "YOLO_SUPPLEMENTAL_ENABLED", yolo_sup_cfg.get("enabled", True)
     )
@@ -217,8 +297,17 @@ def load_settings(config_path: Path | None = None) -> "Settings":
         BLIP2_MODEL_NAME=BLIP2_MODEL_NAME,
         BLIP_MODEL_API_KEY=BLIP_MODEL_API_KEY,
         CLIP_MODEL_NAME=CLIP_MODEL_NAME,
+        MODEL_PRECISION=MODEL_PRECISION,
+        MODEL_PRECISION_CACHE_DIR=MODEL_PRECISION_CACHE_DIR,
+        MMAP_WEIGHTS=MMAP_WEIGHTS,
+        WEIGHT_CACHE_DIR=WEIGHT_CACHE_DIR,
         SAM_MODEL_TYPE=SAM_MODEL_TYPE,
         SAM_CHECKPOINT_PATH=SAM_CHECKPOINT_PATH,
+        SAM_BOX_BATCH_SIZE=SAM_BOX_BATCH_SIZE,
+        SAM_BOX_BATCH_MASK_BUDGET_MB=SAM_BOX_BATCH_MASK_BUDGET_MB,
+        SAM_EMBEDDING_CACHE_ENTRIES=SAM_EMBEDDING_CACHE_ENTRIES,
+        SAM_EMBEDDING_CACHE_DISK=SAM_EMBEDDING_CACHE_DISK,
+        SAM_EMBEDDING_CACHE_DISK_MAX_MB=SAM_EMBEDDING_CACHE_DISK_MAX_MB,
         OBJECT_DETECTION_THRESHOLD=OBJECT_DETECTION_THRESHOLD,
         TEXT_DETECTION_THRESHOLD=TEXT_DETECTION_THRESHOLD,
         CLASSIFICATION_THRESHOLD=CLASSIFICATION_THRESHOLD,
@@ -227,18 +316,48 @@ def load_settings(config_path: Path | None = None) -> "Settings":
         OCR_LANGUAGES=OCR_LANGUAGES,
         OCR_GPU=OCR_GPU,
         OCR_USE_ANGLE_CLS=OCR_USE_ANGLE_CLS,
+        OCR_CPU_THREADS=OCR_CPU_THREADS,
+        OCR_TILING_ENABLED=OCR_TILING_ENABLED,
+        OCR_TILING_MIN_IMAGE_SIDE=OCR_TILING_MIN_IMAGE_SIDE,
+        OCR_TILE_SIZE=OCR_TILE_SIZE,
+        OCR_TILE_OVERLAP=OCR_TILE_OVERLAP,
+        OCR_TILE_BATCH_SIZE=OCR_TILE_BATCH_SIZE,
+        OCR_TILE_MERGE_IOU=OCR_TILE_MERGE_IOU,
         SAVE_DEBUG_IMAGES=SAVE_DEBUG_IMAGES,
+        COMPACT_OUTPUT=COMPACT_OUTPUT,
+        KEEP_SAM_MASKS=KEEP_SAM_MASKS,
         DEBUG_IMAGES_DIR=DEBUG_IMAGES_DIR,
         ENABLE_SCENE_GRAPH=ENABLE_SCENE_GRAPH,
         ENABLE_SAM_SEGMENTATION=ENABLE_SAM_SEGMENTATION,
         ENABLE_FACE_DETECTION=ENABLE_FACE_DETECTION,
         ENABLE_TYPOGRAPHY_SUMMARY=ENABLE_TYPOGRAPHY_SUMMARY,
         ENABLE_MODEL_WARMUP=ENABLE_MODEL_WARMUP,
+        ENABLE_BACKGROUND_WARMUP=ENABLE_BACKGROUND_WARMUP,
+        REUSE_PERCEPTION_MODELS=REUSE_PERCEPTION_MODELS,
+        MODEL_MEMORY_BUDGET_MB=MODEL_MEMORY_BUDGET_MB,
+        MODEL_SIZE_HINTS_MB=MODEL_SIZE_HINTS_MB,
+        MODEL_WORKERS=MODEL_WORKERS,
+        CROP_DEDUP=CROP_DEDUP,
+        NEAR_DUPLICATE=NEAR_DUPLICATE,
+        NEAR_DUPLICATE_INDEX_DIR=NEAR_DUPLICATE_INDEX_DIR,
         BATCH_SIZE=BATCH_SIZE,
         FALLBACK_ACTIONABLE_CLASSES=FALLBACK_ACTIONABLE_CLASSES,
+        EXECUTION_PLANNER=EXECUTION_PLANNER,
+        STAGE_EXECUTOR_MODE=STAGE_EXECUTOR_MODE,
+        STAGE_EXECUTOR_MAX_WORKERS=STAGE_EXECUTOR_MAX_WORKERS,
+        STAGE_TASK_THREADS=STAGE_TASK_THREADS,
         YOLO_IOU_THRESHOLD=YOLO_IOU_THRESHOLD,
         YOLO_IMAGE_SIZE=YOLO_IMAGE_SIZE,
         YOLO_MAX_DET=YOLO_MAX_DET,
+        YOLO_BACKEND=YOLO_BACKEND,
+        YOLO_ONNX_INTRA_OP_THREADS=YOLO_ONNX_INTRA_OP_THREADS,
+        YOLO_TILING_ENABLED=YOLO_TILING_ENABLED,
+        YOLO_TILING_MIN_IMAGE_SIDE=YOLO_TILING_MIN_IMAGE_SIDE,
+        YOLO_TILE_SIZE=YOLO_TILE_SIZE,
+        YOLO_TILE_OVERLAP=YOLO_TILE_OVERLAP,
+        YOLO_TILE_BATCH_SIZE=YOLO_TILE_BATCH_SIZE,
+        YOLO_TILE_MERGE_IOU=YOLO_TILE_MERGE_IOU,
+        YOLO_TILE_GLOBAL_PASS=YOLO_TILE_GLOBAL_PASS,
         YOLO_SUPPLEMENTAL_ENABLED=YOLO_SUPPLEMENTAL_ENABLED,
         YOLO_SUPPLEMENTAL_MIN_THRESHOLD=YOLO_SUPPLEMENTAL_MIN_THRESHOLD,
         YOLO_SUPPLEMENTAL_THRESHOLD_RATIO=YOLO_SUPPLEMENTAL_THRESHOLD_RATIO,
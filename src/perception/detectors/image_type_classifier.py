@@ -6,15 +6,21 @@ Zero-shot classification for ad, poster, UI, etc.
 import logging
 
 import numpy as np
-import torch
 from PIL import Image
-from transformers import CLIPProcessor, CLIPModel
 
 from perception.config import settings
+from src.utilities.model_precision import inference_autocast, load_model_with_precision
+from src.utilities.weight_cache import hf_skeleton
 
 logger = logging.getLogger(__name__)
 
 
+def _default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
 class ImageTypeClassifier:
     """Classifies image type using CLIP zero-shot classification"""
     
@@ -24,7 +30,8 @@ class ImageTypeClassifier:
         self.threshold = settings.CLASSIFICATION_THRESHOLD
         self.model = None
         self.processor = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = _default_device()
+        self.precision = str(getattr(settings, "MODEL_PRECISION", "fp32"))
         prompts_cfg = getattr(settings, "PERCEPTION_PROMPTS", {}).get("image_type_classifier", {})
         self.classes = [str(item).strip() for item in prompts_cfg.get("classes", []) if str(item).strip()]
         self.class_labels = [str(item).strip() for item in prompts_cfg.get("labels", []) if str(item).strip()]
@@ -45,9 +52,23 @@ class ImageTypeClassifier:
     def _load_model(self):
         """Load CLIP model for classification"""
         try:
-            self.model = CLIPModel.from_pretrained(self.model_name).to(self.device)
+            from transformers import CLIPModel, CLIPProcessor
+
+            model, self.precision = load_model_with_precision(
+                lambda: CLIPModel.from_pretrained(self.model_name),
+                model_name=self.model_name,
+                mode=self.precision,
+                device=self.device,
+                cache_dir=getattr(settings, "MODEL_PRECISION_CACHE_DIR", None),
+                skeleton_fn=hf_skeleton(CLIPModel, self.model_name),
+                weight_cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                mmap_weights=getattr(settings, "MMAP_WEIGHTS", None),
+            )
+            self.model = model.to(self.device)
             self.processor = CLIPProcessor.from_pretrained(self.model_name)
-            logger.info("CLIP model loaded: %s on %s", self.model_name, self.device)
+            logger.info(
+                "CLIP model loaded: %s on %s (precision=%s)", self.model_name, self.device, self.precision
+            )
         except Exception as e:
             logger.error("Failed to load CLIP model: %s", e)
             raise
@@ -85,10 +106,12 @@ class ImageTypeClassifier:
         ).to(self.device)
         
         # Get predictions
-        with torch.no_grad():
+        import torch
+
+        with torch.no_grad(), inference_autocast(self.precision, self.device):
             outputs = self.model(**inputs)
             logits_per_image = outputs.logits_per_image
-            probs = logits_per_image.softmax(dim=1).cpu().numpy()[0]
+            probs = logits_per_image.float().softmax(dim=1).cpu().numpy()[0]
         
         # Find best match
         best_idx = np.argmax(probs)
@@ -4,37 +4,73 @@ Object detector with optional YOLO + DETR + ViT hybrid inference.
 
 import logging
 import re
+import shutil
+import time
 from collections import Counter
+from pathlib import Path
 
 import numpy as np
-import torch
-from transformers import AutoImageProcessor, AutoProcessor, DetrForObjectDetection
-from ultralytics import YOLO
 
 from perception.config import settings
+from perception.utils.tiling import (
+    iter_tile_batches,
+    merge_tiled_detections,
+    plan_tiles,
+    should_tile,
+    tile_detections_to_image,
+)
+from perception.utils.yolo_onnx import YoloOnnxSession, onnx_export_path
+from src.utilities.weight_cache import hf_fingerprint, hf_skeleton, load_module_mmap, record_load
 
 logger = logging.getLogger(__name__)
-try:
-    from transformers import Owlv2ForObjectDetection as ViTDetectorModel
-except Exception:  # pragma: no cover - fallback for older transformers builds
-    from transformers import OwlViTForObjectDetection as ViTDetectorModel
+
+
+def _vit_detector_model_class():
+    # torch/transformers/ultralytics are imported when a model loads, not with this module.
+    try:
+        from transformers import Owlv2ForObjectDetection as ViTDetectorModel
+    except Exception:  # pragma: no cover - fallback for older transformers builds
+        from transformers import OwlViTForObjectDetection as ViTDetectorModel
+    return ViTDetectorModel
+
+_ULTRALYTICS_DEFAULT_CONF = 0.25
+_DETR_HYBRID_MODES = {"yolo_detr", "hybrid", "yolo_plus_detr", "yolo_detr_vit", "yolo_all"}
+_VIT_HYBRID_MODES = {"yolo_vit", "hybrid", "yolo_plus_vit", "yolo_detr_vit", "yolo_all"}
 
 
 class ObjectDetector:
     """Detects objects using YOLO, optionally fused with DETR and ViT."""
     
-    def __init__(self, model_path=None, context: dict | None = None):
+    def __init__(
+        self,
+        model_path=None,
+        context: dict | None = None,
+        backend: str | None = None,
+        enable_vit: bool | None = None,
+    ):
         """
         Initialize YOLOv8x object detector
         
         Args:
             model_path: Path to YOLOv8x model weights
+            backend: YOLO runtime ("torch" or "onnx"); defaults to settings.YOLO_BACKEND
+            enable_vit: False forces the ViT detector off for this image (execution plan);
+                None keeps the settings/contextual-fallback behaviour
         """
         self.model_path = model_path or settings.YOLO_MODEL_PATH
+        self.backend = str(backend or getattr(settings, "YOLO_BACKEND", "torch")).strip().lower()
+        self.onnx_intra_op_threads = int(getattr(settings, "YOLO_ONNX_INTRA_OP_THREADS", 0))
         self.threshold = settings.OBJECT_DETECTION_THRESHOLD
         self.iou_threshold = float(getattr(settings, "YOLO_IOU_THRESHOLD", 0.45))
         self.image_size = int(getattr(settings, "YOLO_IMAGE_SIZE", 1280))
         self.max_det = int(getattr(settings, "YOLO_MAX_DET", 300))
+        self.tiling_enabled = bool(getattr(settings, "YOLO_TILING_ENABLED", False))
+        self.tiling_min_image_side = int(getattr(settings, "YOLO_TILING_MIN_IMAGE_SIDE", 3000))
+        self.tile_size = int(getattr(settings, "YOLO_TILE_SIZE", self.image_size))
+        self.tile_overlap = int(getattr(settings, "YOLO_TILE_OVERLAP", 256))
+        self.tile_batch_size = int(getattr(settings, "YOLO_TILE_BATCH_SIZE", 4))
+        self.tile_merge_iou = float(getattr(settings, "YOLO_TILE_MERGE_IOU", 0.5))
+        self.tile_global_pass = bool(getattr(settings, "YOLO_TILE_GLOBAL_PASS", True))
         self.supplemental_enabled = bool(getattr(settings, "YOLO_SUPPLEMENTAL_ENABLED", True))
         self.supplemental_min_threshold = float(
             getattr(settings, "YOLO_SUPPLEMENTAL_MIN_THRESHOLD", 0.2)
@@ -54,7 +90,8 @@ class ObjectDetector:
         self.detr_model_name = str(getattr(settings, "DETR_MODEL_NAME", "facebook/detr-resnet-50"))
         self.detr_threshold = float(getattr(settings, "DETR_CONFIDENCE_THRESHOLD", self.threshold))
         self._context = context or {}
-        self.enable_vit = bool(getattr(settings, "ENABLE_VIT_DETECTOR", False))
+        self._vit_configured = bool(getattr(settings, "ENABLE_VIT_DETECTOR", False))
+        self.enable_vit = self._vit_configured
         self.vit_contextual_fallback_enabled = bool(
             getattr(settings, "VIT_CONTEXTUAL_FALLBACK_ENABLED", True)
         )
@@ -69,7 +106,10 @@ class ObjectDetector:
         self.vit_threshold = float(getattr(settings, "VIT_CONFIDENCE_THRESHOLD", 0.3))
         self.open_vocab_cfg = getattr(settings, "OPEN_VOCABULARY_DETECTOR", {})
         self.vit_labels = self._build_open_vocabulary_prompts(self._context)
-        if (not self.enable_vit) and self._should_enable_contextual_vit():
+        self._vit_forced_off = enable_vit is False
+        if self._vit_forced_off:
+            self.enable_vit = False
+        elif (not self.enable_vit) and self._should_enable_contextual_vit():
             self.enable_vit = True
             logger.info(
                 "ViT detector auto-enabled via contextual fallback for image_type=%s",
@@ -77,6 +117,7 @@ class ObjectDetector:
             )
         self.hybrid_mode = str(getattr(settings, "DETECTOR_HYBRID_MODE", "yolo_only")).lower()
         self.model = None
+        self.onnx_session = None
         self.detr_model = None
         self.detr_processor = None
         self.detr_available = False
@@ -90,7 +131,13 @@ class ObjectDetector:
     def _load_model(self):
         """Load YOLO model and optional DETR/ViT models."""
         try:
+            # Not memory-mapped: ultralytics fuses conv+bn into new tensors at
+            # predict time, so mapped pages would not stay shared.
+            from ultralytics import YOLO
+
+            started = time.perf_counter()
             self.model = YOLO(str(self.model_path))
+            record_load(str(Path(self.model_path).name), time.perf_counter() - started, "checkpoint")
             self.available = True
             self.status_reason = "ready"
             logger.info("YOLOv8x model loaded from %s", self.model_path)
@@ -100,17 +147,58 @@ class ObjectDetector:
             logger.error("YOLO init failed [model_init_failed]: %s", e)
             logger.info("Download with: yolo download model=yolov8x.pt")
             raise
+        if self.backend == "onnx":
+            self._load_onnx_backend()
         self._load_detr_model()
         self._load_vit_model()
 
+    def _load_onnx_backend(self):
+        """Export YOLO to ONNX (cached by weights hash + imgsz) and open a CPU session."""
+        try:
+            export_path = onnx_export_path(
+                Path(self.model_path),
+                Path(settings.CACHE_DIR),
+                self.image_size,
+            )
+            if not export_path.exists():
+                export_path.parent.mkdir(parents=True, exist_ok=True)
+                exported = self.model.export(
+                    format="onnx",
+                    imgsz=self.image_size,
+                    dynamic=False,
+                    simplify=False,
+                    verbose=False,
+                )
+                shutil.move(str(exported), str(export_path))
+                logger.info("YOLO exported to ONNX: %s", export_path)
+            self.onnx_session = YoloOnnxSession(
+                export_path,
+                image_size=self.image_size,
+                intra_op_threads=self.onnx_intra_op_threads,
+            )
+        except Exception as e:
+            self.onnx_session = None
+            self.backend = "torch"
+            logger.warning("YOLO ONNX backend unavailable; falling back to torch: %s", e)
+
     def _load_detr_model(self):
         """Load DETR model when enabled."""
         if not self.enable_detr:
             logger.info("DETR disabled; running YOLO only")
             return
         try:
+            from transformers import AutoImageProcessor, DetrForObjectDetection
+
             self.detr_processor = AutoImageProcessor.from_pretrained(self.detr_model_name)
-            self.detr_model = DetrForObjectDetection.from_pretrained(self.detr_model_name)
+            self.detr_model = load_module_mmap(
+                self.detr_model_name,
+                lambda: DetrForObjectDetection.from_pretrained(self.detr_model_name),
+                # The skeleton must not fetch timm backbone weights; they come from the cache.
+                skeleton_fn=hf_skeleton(DetrForObjectDetection, self.detr_model_name, use_pretrained_backbone=False),
+                fingerprint=lambda: hf_fingerprint(self.detr_model_name),
+                cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                enabled=getattr(settings, "MMAP_WEIGHTS", None),
+            )
             self.detr_model.eval()
             self.detr_available = True
             logger.info("DETR model loaded: %s", self.detr_model_name)
@@ -123,12 +211,25 @@ class ObjectDetector:
         if not self.enable_vit:
             logger.info("ViT detector disabled; skipping ViT model load")
             return
+        if self.hybrid_mode not in _VIT_HYBRID_MODES:
+            logger.info("ViT detector not used by hybrid mode %s; skipping ViT model load", self.hybrid_mode)
+            return
         if not self.vit_labels:
             logger.warning("ViT detector enabled but no labels configured; skipping ViT model load")
             return
         try:
+            from transformers import AutoProcessor
+
+            ViTDetectorModel = _vit_detector_model_class()
             self.vit_processor = AutoProcessor.from_pretrained(self.vit_model_name)
-            self.vit_model = ViTDetectorModel.from_pretrained(self.vit_model_name)
+            self.vit_model = load_module_mmap(
+                self.vit_model_name,
+                lambda: ViTDetectorModel.from_pretrained(self.vit_model_name),
+                skeleton_fn=hf_skeleton(ViTDetectorModel, self.vit_model_name),
+                fingerprint=lambda: hf_fingerprint(self.vit_model_name),
+                cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                enabled=getattr(settings, "MMAP_WEIGHTS", None),
+            )
             self.vit_model.eval()
             self.vit_available = True
             logger.info("ViT detector model loaded: %s (prompts=%d)", self.vit_model_name, len(self.vit_labels))
@@ -156,6 +257,40 @@ class ObjectDetector:
                 'class_name': str
             }
         """
+        return self.detect_hybrid(image, self.detect_yolo(image))
+
+    def update_context(self, context: dict, enable_vit: bool | None = None) -> None:
+        """
+        Apply per-image context after construction.
+
+        Rebuilds the open-vocabulary prompts, re-evaluates the contextual ViT
+        fallback and loads the ViT detector if it is newly needed. Lets YOLO start
+        before the scene summary exists, and lets one detector instance be reused
+        across images in a long-lived process.
+
+        Args:
+            context: image_type / scene / extracted_text context
+            enable_vit: False forces ViT off for this call; True/None leave it to
+                the configuration and contextual fallback. Applied on every call so
+                a forced-off image does not carry over to the next one.
+        """
+        self._context = context or {}
+        self.vit_labels = self._build_open_vocabulary_prompts(self._context)
+        self._vit_forced_off = enable_vit is False
+        self.enable_vit = self._vit_configured and not self._vit_forced_off
+        if self._vit_forced_off:
+            return
+        if (not self.enable_vit) and self._should_enable_contextual_vit():
+            self.enable_vit = True
+            logger.info(
+                "ViT detector auto-enabled via contextual fallback for image_type=%s",
+                str((self._context.get("image_type") or {}).get("type", "unknown")),
+            )
+        if self.enable_vit and self.vit_model is None:
+            self._load_vit_model()
+
+    def detect_yolo(self, image: np.ndarray) -> list:
+        """Run the context-independent YOLO pass (plus supplemental low-threshold pass)."""
         if self.model is None:
             raise RuntimeError("YOLOv8x model not loaded [model_init_failed]")
 
@@ -178,6 +313,10 @@ class ObjectDetector:
                     fallback_threshold,
                 )
             yolo_detections = merged
+        return yolo_detections
+
+    def detect_hybrid(self, image: np.ndarray, yolo_detections: list) -> dict:
+        """Fuse YOLO detections with the context-dependent DETR/ViT passes."""
         debug_views = {
             "yolo": list(yolo_detections),
             "detr": [],
@@ -215,7 +354,10 @@ class ObjectDetector:
             return False
         try:
             tiny = np.zeros((32, 32, 3), dtype=np.uint8)
-            _ = self.model(tiny, verbose=False, imgsz=self.image_size)
+            if self.onnx_session is not None:
+                _ = self._run_onnx_inference(tiny, threshold=self.threshold)
+            else:
+                _ = self.model(tiny, verbose=False, imgsz=self.image_size)
             if self._should_run_detr_hybrid():
                 _ = self._run_detr_inference(tiny)
             if self._should_run_vit_hybrid():
@@ -228,18 +370,26 @@ class ObjectDetector:
             return False
 
     def _run_inference(self, image: np.ndarray, threshold: float) -> list:
-        """Run YOLO inference and return threshold-filtered detections."""
+        """Run YOLO inference (tiled on very large images) and return threshold-filtered detections."""
+        if should_tile(image.shape, self.tiling_enabled, self.tiling_min_image_side):
+            return self._run_tiled_inference(image, threshold)
+        return self._run_frame_inference([image], threshold)[0]
+
+    def _run_frame_inference(self, images: list, threshold: float) -> list:
+        """Run YOLO on a batch of frames; returns one detection list per frame."""
+        if self.onnx_session is not None:
+            return [self._run_onnx_inference(frame, threshold) for frame in images]
         results = self.model(
-            image,
+            list(images),
             verbose=False,
             imgsz=self.image_size,
             iou=self.iou_threshold,
             max_det=self.max_det,
         )
-        detections = []
+        batch_detections = []
         for r in results:
-            boxes = r.boxes
-            for box in boxes:
+            detections = []
+            for box in r.boxes:
                 confidence = float(box.conf[0])
                 if confidence < threshold:
                     continue
@@ -249,12 +399,66 @@ class ObjectDetector:
                     "class_id": int(box.cls[0]),
                     "class_name": self.model.names[int(box.cls[0])],
                 })
+            batch_detections.append(detections)
+        return batch_detections
+
+    def _run_tiled_inference(self, image: np.ndarray, threshold: float) -> list:
+        """
+        Detect on overlapping tiles (batched), map boxes back and merge seam duplicates.
+
+        A downscaled full-frame pass is merged in as well so objects larger than a
+        tile are still found whole.
+        """
+        h, w = image.shape[:2]
+        tiles = plan_tiles(h, w, self.tile_size, self.tile_overlap)
+        detections = []
+        for batch in iter_tile_batches(image, tiles, self.tile_batch_size):
+            batch_results = self._run_frame_inference([view for _, view in batch], threshold)
+            for (tile_box, _), tile_detections in zip(batch, batch_results):
+                detections.extend(tile_detections_to_image(tile_detections, tile_box, image.shape))
+        if self.tile_global_pass:
+            detections.extend(self._run_frame_inference([image], threshold)[0])
+        merged = merge_tiled_detections(detections, iou_threshold=self.tile_merge_iou)
+        merged.sort(key=lambda d: float(d.get("confidence", 0.0)), reverse=True)
+        merged = merged[: self.max_det]
+        logger.info(
+            "YOLO tiled inference: image=%dx%d tiles=%d raw=%d merged=%d",
+            w,
+            h,
+            len(tiles),
+            len(detections),
+            len(merged),
+        )
+        return merged
+
+    def _run_onnx_inference(self, image: np.ndarray, threshold: float) -> list:
+        """Run the ONNX Runtime YOLO graph and return detections in the torch-path format."""
+        # Pre-NMS confidence matches the ultralytics predictor default so both paths agree.
+        boxes, scores, class_ids = self.onnx_session.predict(
+            image,
+            conf_threshold=_ULTRALYTICS_DEFAULT_CONF,
+            iou_threshold=self.iou_threshold,
+            max_det=self.max_det,
+        )
+        detections = []
+        for bbox, score, class_id in zip(boxes, scores, class_ids):
+            confidence = float(score)
+            if confidence < threshold:
+                continue
+            detections.append({
+                "bbox": [float(v) for v in bbox],
+                "confidence": confidence,
+                "class_id": int(class_id),
+                "class_name": self.model.names[int(class_id)],
+            })
         return detections
 
     def _run_detr_inference(self, image: np.ndarray) -> list:
         """Run DETR inference and return threshold-filtered detections."""
         if self.detr_model is None or self.detr_processor is None:
             return []
+        import torch
+
         with torch.no_grad():
             inputs = self.detr_processor(images=image, return_tensors="pt")
             outputs = self.detr_model(**inputs)
@@ -291,6 +495,8 @@ class ObjectDetector:
         """Run ViT detector inference and return threshold-filtered detections."""
         if self.vit_model is None or self.vit_processor is None or not self.vit_labels:
             return []
+        import torch
+
         with torch.no_grad():
             inputs = self.vit_processor(
                 text=self.vit_labels,
@@ -501,12 +707,12 @@ class ObjectDetector:
     def _should_run_detr_hybrid(self) -> bool:
         if not self.enable_detr or not self.detr_available:
             return False
-        return self.hybrid_mode in {"yolo_detr", "hybrid", "yolo_plus_detr", "yolo_detr_vit", "yolo_all"}
+        return self.hybrid_mode in _DETR_HYBRID_MODES
 
     def _should_run_vit_hybrid(self) -> bool:
         if not self.enable_vit or not self.vit_available:
             return False
-        return self.hybrid_mode in {"yolo_vit", "hybrid", "yolo_plus_vit", "yolo_detr_vit", "yolo_all"}
+        return self.hybrid_mode in _VIT_HYBRID_MODES
 
     @staticmethod
     def _bbox_iou(box_a: list, box_b: list) -> float:
@@ -7,9 +7,15 @@ import logging
 
 import numpy as np
 import cv2
-from paddleocr import PaddleOCR
 
 from perception.config import settings
+from perception.utils.tiling import (
+    iter_tile_batches,
+    merge_tiled_detections,
+    plan_tiles,
+    should_tile,
+    tile_detections_to_image,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,23 +23,41 @@ logger = logging.getLogger(__name__)
 class TextDetector:
     """Detects text regions in images using PaddleOCR detection"""
     
-    def __init__(self):
-        """Initialize PaddleOCR text detector"""
+    def __init__(self, cpu_threads=None):
+        """
+        Initialize PaddleOCR text detector
+
+        Args:
+            cpu_threads: Paddle CPU threads (default: from config; 0 = Paddle default)
+        """
+        self.cpu_threads = int(cpu_threads if cpu_threads is not None else getattr(settings, "OCR_CPU_THREADS", 0))
         self.threshold = settings.TEXT_DETECTION_THRESHOLD
         self.retry_upscale_factor = float(getattr(settings, "TEXT_DETECT_RETRY_UPSCALE_FACTOR", 1.5))
         self.max_retries = int(getattr(settings, "TEXT_DETECT_MAX_RETRIES", 1))
+        self.tiling_enabled = bool(getattr(settings, "OCR_TILING_ENABLED", False))
+        self.tiling_min_image_side = int(getattr(settings, "OCR_TILING_MIN_IMAGE_SIDE", 3000))
+        self.tile_size = int(getattr(settings, "OCR_TILE_SIZE", 1600))
+        self.tile_overlap = int(getattr(settings, "OCR_TILE_OVERLAP", 200))
+        self.tile_batch_size = int(getattr(settings, "OCR_TILE_BATCH_SIZE", 4))
+        self.tile_merge_iou = float(getattr(settings, "OCR_TILE_MERGE_IOU", 0.3))
         self.ocr = None
         self._load_model()
     
     def _load_model(self):
         """Load PaddleOCR detection model"""
         try:
+            from paddleocr import PaddleOCR
+
+            ocr_kwargs = {}
+            if self.cpu_threads > 0:
+                ocr_kwargs["cpu_threads"] = self.cpu_threads
             # Keep angle classifier enabled to avoid orientation-warning noise.
             self.ocr = PaddleOCR(
                 lang="en",
                 use_gpu=bool(settings.OCR_GPU),
                 use_angle_cls=bool(getattr(settings, "OCR_USE_ANGLE_CLS", True)),
                 show_log=False,
+                **ocr_kwargs,
             )
             logger.info(
                 "PaddleOCR text detector loaded (gpu=%s, use_angle_cls=%s)",
@@ -61,6 +85,10 @@ class TextDetector:
         """
         if self.ocr is None:
             raise RuntimeError("PaddleOCR not loaded")
+
+        if should_tile(image.shape, self.tiling_enabled, self.tiling_min_image_side):
+            # Large images already give small text enough pixels; skip the upscale retry.
+            return self._detect_tiled(image)
         
         # Run detection only (parameters handled by PaddleOCR internally)
         text_regions = self._extract_regions_from_result(self.ocr.ocr(image))
@@ -87,6 +115,26 @@ class TextDetector:
 
         return []
 
+    def _detect_tiled(self, image: np.ndarray) -> list:
+        """Detect text on overlapping tiles and merge regions split across seams."""
+        h, w = image.shape[:2]
+        tiles = plan_tiles(h, w, self.tile_size, self.tile_overlap)
+        regions = []
+        for batch in iter_tile_batches(image, tiles, self.tile_batch_size):
+            for tile_box, view in batch:
+                tile_regions = self._extract_regions_from_result(self.ocr.ocr(view))
+                regions.extend(tile_detections_to_image(tile_regions, tile_box, image.shape))
+        merged = merge_tiled_detections(
+            regions,
+            iou_threshold=self.tile_merge_iou,
+            class_key=None,
+            prefer="area",
+            join_lines=True,
+            text_key=None,
+        )
+        logger.info("Text detection tiled: tiles=%d raw=%d merged=%d", len(tiles), len(regions), len(merged))
+        return merged
+
     @staticmethod
     def _rescale_region(region: dict, sx: float, sy: float) -> dict:
         scaled = dict(region)
@@ -4,6 +4,9 @@ Orchestrates the complete workflow from image loading to JSON output
 """
 
 import argparse
+import logging
+import threading
+from datetime import datetime
 from pathlib import Path
 
 from perception.config import settings
@@ -24,6 +27,19 @@ from perception.ocr.ocr_engine import OCREngine
 from perception.ocr.text_postprocess import TextPostProcessor
 from perception.builders.scene_json_builder import SceneJSONBuilder
 from perception.utils.infographic import calibrate_text_region_confidence, compute_infographic_analysis
+from perception.utils.execution_planner import build_execution_plan
+from perception.utils.task_graph import StageTask, run_task_graph
+from perception.utils.crop_groups import group_duplicate_crops
+from perception.utils.near_duplicate import NearDuplicateIndex, changed_regions, rescale_scene_geometry
+from perception.utils.tiling import offset_detection
+from perception.utils.model_workers import ModelWorkerPool
+from perception.utils.model_warmup import ensure_warm, forget, start_background_warmup as _start_warmup_thread, warm_state
+from src.utilities.fingerprint import config_fingerprint, source_fingerprint
+from src.utilities.model_manager import get_model_manager
+
+_MODEL_MANAGER_CONFIGURED = False
+_MODEL_MANAGER_LOCK = threading.Lock()
+_MODEL_WORKER_POOL = None
 
 
 def _bbox_iou(box_a: list, box_b: list) -> float:
@@ -77,6 +93,7 @@ def _build_quality_summary(
     extracted_text: list,
     object_text_links: list,
     sam_status: dict,
+    model_warm_state: dict = None,
 ) -> dict:
     """Build scene-level quality and readiness summary."""
     object_scores = [float(o.get("confidence", 0.0)) for o in (objects or [])]
@@ -101,26 +118,507 @@ def _build_quality_summary(
         "sam_available": bool((sam_status or {}).get("available", False)),
         "sam_reason": str((sam_status or {}).get("reason", "")),
         "sam_segmented_object_count": segmented_count,
+        "sam_model_type": str((sam_status or {}).get("model_type", "")),
+        "sam_timing": dict((sam_status or {}).get("timing") or {}),
+        "model_warm_state": dict(model_warm_state or {}),
+    }
+
+
+def _skipped_sam_status() -> dict:
+    """SAM status reported when the execution plan skips segmentation."""
+    return {
+        "enabled": False,
+        "available": False,
+        "reason": "skipped_by_plan",
+        "model_type": str(getattr(settings, "SAM_MODEL_TYPE", "")),
+        "checkpoint_path": str(getattr(settings, "SAM_CHECKPOINT_PATH", "")),
+        "timing": {},
     }
 
 
-def _run_model_warmup(
-    object_detector: ObjectDetector,
-    blip_manager: BLIPModelManager,
-    ocr_engine: OCREngine,
-    sam_segmenter: SAMSegmenter,
-    face_detector: FaceDetector = None,
-) -> None:
-    """Run small warmup passes to reduce first-inference latency spikes."""
-    object_detector.warmup()
-    blip_manager.warmup()
-    ocr_engine.warmup()
-    sam_segmenter.warmup()
-    if face_detector is not None:
-        face_detector.warmup()
+def _model_manager():
+    """Process-wide model manager, configured once from pipeline.model_memory."""
+    global _MODEL_MANAGER_CONFIGURED
+    manager = get_model_manager()
+    if not _MODEL_MANAGER_CONFIGURED:
+        with _MODEL_MANAGER_LOCK:
+            if not _MODEL_MANAGER_CONFIGURED:
+                manager.configure(
+                    budget_mb=getattr(settings, "MODEL_MEMORY_BUDGET_MB", 0),
+                    size_hints_mb=getattr(settings, "MODEL_SIZE_HINTS_MB", {}),
+                )
+                _MODEL_MANAGER_CONFIGURED = True
+    return manager
+
+
+def _release_component(key: str, component) -> None:
+    """Eviction hook: drop warm state and any singleton reference."""
+    forget(key)
+    release = getattr(component, "release", None)
+    if callable(release):
+        release()
+
+
+def _model_worker_pool():
+    """Process-wide worker pool, or None when pipeline.model_workers is disabled."""
+    global _MODEL_WORKER_POOL
+    cfg = getattr(settings, "MODEL_WORKERS", {}) or {}
+    if not cfg.get("enabled", False):
+        return None
+    with _MODEL_MANAGER_LOCK:
+        if _MODEL_WORKER_POOL is None:
+            _MODEL_WORKER_POOL = ModelWorkerPool(cfg)
+    return _MODEL_WORKER_POOL
+
+
+def _hosted_in_worker(key: str) -> bool:
+    pool = _model_worker_pool()
+    return pool is not None and pool.hosts(key)
+
+
+def _get_component(key: str, factory):
+    """
+    Return the process-wide instance for ``key``, creating it on first use.
+
+    Components live in the shared model manager, which may unload them under
+    its memory budget; an unloaded component is rebuilt here on next use.
+    Components hosted in a model worker are returned as proxies.
+    With pipeline.reuse_models disabled every call builds a fresh component.
+    """
+    if _hosted_in_worker(key):
+        pool = _model_worker_pool()
+        # Out-of-process models do not count against this process's budget.
+        return _model_manager().get(key, lambda: pool.proxy(key), size_mb=0)
+    if not getattr(settings, "REUSE_PERCEPTION_MODELS", True):
+        return factory()
+    return _model_manager().get(key, factory, on_evict=lambda component: _release_component(key, component))
+
+
+def _warmup(key: str, component) -> None:
+    """Warm a model once per process to reduce first-inference latency spikes."""
+    if component is not None and settings.ENABLE_MODEL_WARMUP:
+        ensure_warm(key, component)
+
+
+def _component_loaders() -> dict:
+    """Factories for the image-independent Stage-1 components, keyed like the warm state."""
+    loaders = {
+        "text_detector": lambda: _get_component("text_detector", TextDetector),
+        "image_classifier": lambda: _get_component("image_classifier", ImageTypeClassifier),
+        "ocr_engine": lambda: _get_component("ocr_engine", OCREngine),
+        "blip": lambda: _get_component("blip", BLIPModelManager),
+        "object_detector": lambda: _get_component("object_detector", ObjectDetector),
+        "sam_segmenter": lambda: _get_component("sam_segmenter", SAMSegmenter),
+    }
+    if settings.ENABLE_FACE_DETECTION:
+        loaders["face_detector"] = lambda: _get_component("face_detector", FaceDetector)
+    if _hosted_in_worker("scene_summarizer") and _hosted_in_worker("object_captioner"):
+        # BLIP lives in the worker; loading it here would only duplicate it.
+        loaders.pop("blip")
+    return loaders
+
+
+# PaddleOCR predictors hold native threads and handles that do not survive fork.
+FORK_UNSAFE_COMPONENTS = ("text_detector", "ocr_engine")
+_FORK_INHERITED = []
+
+
+def preload_models(warm: bool = True) -> list:
+    """
+    Load (and warm) every Stage-1 component in this process.
+
+    Used before forking batch workers so they share the weights copy-on-write.
+    Returns the keys that loaded.
+    """
+    log = logging.getLogger("stage1_perception")
+    loaders = _component_loaders()
+    loaders["icon_analyzer"] = lambda: _get_component(
+        "icon_analyzer",
+        lambda: IconSemanticAnalyzer(model_name=settings.CLIP_MODEL_NAME),
+    )
+    loaded = []
+    for key, loader in loaders.items():
+        try:
+            component = loader()
+        except Exception as e:
+            log.warning("Preload of %s failed: %s", key, e)
+            continue
+        if warm:
+            _warmup(key, component)
+        loaded.append(key)
+    log.info("Preloaded Stage-1 components: %s", loaded)
+    return loaded
+
+
+def reinit_after_fork(threads: int = 0) -> None:
+    """
+    Make inherited Stage-1 state safe in a forked worker.
+
+    Fork-unsafe components are dropped so they reload in the child, and torch /
+    OpenCV thread pools are re-created with ``threads`` threads per worker.
+    """
+    manager = _model_manager()
+    for key in FORK_UNSAFE_COMPONENTS:
+        if manager.contains(key):
+            # Keep the inherited object alive: running its native destructor in
+            # the child could wait on threads that only exist in the parent.
+            _FORK_INHERITED.append(manager.get(key, lambda: None))
+            manager.evict(key)
+    if threads > 0:
+        import cv2
+        import torch
+
+        torch.set_num_threads(threads)
+        cv2.setNumThreads(threads)
+
+
+def start_background_warmup():
+    """
+    Load and warm Stage-1 models in a background thread (service startup).
+
+    No-op unless pipeline.background_warmup is enabled; needs
+    pipeline.reuse_models so the warmed instances serve later images.
+    Returns the warmup thread, or None when not started.
+    """
+    if not getattr(settings, "ENABLE_BACKGROUND_WARMUP", False):
+        return None
+    if not (settings.ENABLE_MODEL_WARMUP and getattr(settings, "REUSE_PERCEPTION_MODELS", True)):
+        logging.getLogger("stage1_perception").info(
+            "Background warmup skipped: requires enable_model_warmup and reuse_models"
+        )
+        return None
+    return _start_warmup_thread(_component_loaders(), name="stage1-warmup")
+
+
+def _build_stage_one_tasks(image, logger: logging.Logger) -> list:
+    """
+    Stage-1 dependency graph.
+
+    Models load in their own tasks so loading overlaps with inference elsewhere.
+    YOLO only needs the image type; the scene summary and OCR text feed the
+    open-vocabulary prompts, which are applied just before the hybrid pass.
+    """
+    threads = getattr(settings, "STAGE_TASK_THREADS", {}) or {}
+
+    loaders = _component_loaders()
+
+    def text_detection(deps):
+        return loaders["text_detector"]().detect(image)
+
+    def classification(deps):
+        return loaders["image_classifier"]().classify(image)
+
+    def ocr_engine(deps):
+        engine = loaders["ocr_engine"]()
+        _warmup("ocr_engine", engine)
+        return engine
+
+    def scene_summarizer(deps):
+        if _hosted_in_worker("scene_summarizer"):
+            return _get_component("scene_summarizer", SceneSummarizer)
+        _warmup("blip", loaders["blip"]())
+        return SceneSummarizer()
+
+    def plan(deps):
+        execution_plan = build_execution_plan(
+            deps["classification"],
+            deps["text_detection"],
+            image.shape,
+            getattr(settings, "EXECUTION_PLANNER", {}),
+        )
+        logger.info(
+            "Execution plan: profile=%s text_density=%.3f steps=%s caption_top_k=%d",
+            execution_plan["profile"],
+            execution_plan["text_density"],
+            execution_plan["steps"],
+            execution_plan["caption_top_k"],
+        )
+        return execution_plan
+
+    def faces(deps):
+        if not (settings.ENABLE_FACE_DETECTION and deps["plan"]["steps"]["face_detection"]):
+            return []
+        face_detector = loaders["face_detector"]()
+        _warmup("face_detector", face_detector)
+        return face_detector.detect(image)
+
+    def ocr(deps):
+        logger.info("Step 2.5: Extracting text for OCR-first context...")
+        extracted_text = deps["ocr_engine"].extract(image, deps["text_detection"])
+        text_boxes = calibrate_text_region_confidence(deps["text_detection"], extracted_text)
+        return extracted_text, text_boxes
+
+    def typography(deps):
+        if not (settings.ENABLE_TYPOGRAPHY_SUMMARY and deps["plan"]["steps"]["typography"]):
+            return {}
+        return TextPostProcessor().summarize_styles(deps["ocr"][0])
+
+    def scene_summary(deps):
+        return deps["scene_summarizer"].summarize(
+            image,
+            image_type=deps["classification"],
+            extracted_text=deps["ocr"][0],
+        )
+
+    def object_detector(deps):
+        detector = loaders["object_detector"]()
+        detector.update_context(
+            {"image_type": deps["classification"]},
+            enable_vit=bool(deps["plan"]["steps"]["vit_detector"]),
+        )
+        _warmup("object_detector", detector)
+        return detector
+
+    def yolo(deps):
+        return deps["object_detector"].detect_yolo(image)
+
+    def detection(deps):
+        detector = deps["object_detector"]
+        detector.update_context(
+            {
+                "image_type": deps["classification"],
+                "scene": deps["scene_summary"],
+                "extracted_text": deps["ocr"][0],
+            },
+            enable_vit=bool(deps["plan"]["steps"]["vit_detector"]),
+        )
+        return detector.detect_hybrid(image, deps["yolo"])
+
+    def sam_prepare(deps):
+        if not deps["plan"]["steps"]["sam_segmentation"]:
+            return None
+        sam_segmenter = loaders["sam_segmenter"]()
+        _warmup("sam_segmenter", sam_segmenter)
+        return sam_segmenter
+
+    def segmentation(deps):
+        sam_segmenter = deps["sam_prepare"]
+        bounding_boxes = deps["detection"].get("final", [])
+        sam_status = sam_segmenter.get_status() if sam_segmenter is not None else _skipped_sam_status()
+        logger.info(
+            "SAM status: enabled=%s available=%s reason=%s model_type=%s checkpoint=%s",
+            sam_status.get("enabled"),
+            sam_status.get("available"),
+            sam_status.get("reason"),
+            sam_status.get("model_type"),
+            sam_status.get("checkpoint_path"),
+        )
+        if sam_segmenter is None:
+            return [SAMSegmenter._empty_result("skipped_by_plan") for _ in bounding_boxes], sam_status
+        segmentations = sam_segmenter.segment(image, bounding_boxes)
+        return segmentations, sam_segmenter.get_status()
+
+    graph = [
+        (text_detection, ()),
+        (classification, ()),
+        (ocr_engine, ()),
+        (scene_summarizer, ()),
+        (plan, ("text_detection", "classification")),
+        (faces, ("plan",)),
+        (ocr, ("text_detection", "ocr_engine")),
+        (typography, ("ocr", "plan")),
+        (scene_summary, ("scene_summarizer", "classification", "ocr")),
+        (object_detector, ("classification", "plan")),
+        (yolo, ("object_detector",)),
+        (detection, ("object_detector", "yolo", "classification", "scene_summary", "ocr")),
+        (sam_prepare, ("plan",)),
+        (segmentation, ("sam_prepare", "detection")),
+    ]
+    return [
+        StageTask(fn.__name__, fn, deps, threads=int(threads.get(fn.__name__, 0) or 0))
+        for fn, deps in graph
+    ]
+
+
+# Settings that do not change Stage-1 output (locations, logging, scheduling).
+_FINGERPRINT_EXCLUDED_SETTINGS = {
+    "BASE_DIR",
+    "PACKAGE_DIR",
+    "ENV",
+    "DEBUG",
+    "DATA_DIR",
+    "CACHE_DIR",
+    "OUTPUT_DIR",
+    "DEBUG_IMAGES_DIR",
+    "SAVE_DEBUG_IMAGES",
+    "LOG_LEVEL",
+    "LOG_FILE",
+    "BLIP_MODEL_API_KEY",
+    "WEIGHT_CACHE_DIR",
+    "MODEL_PRECISION_CACHE_DIR",
+    "SAM_EMBEDDING_CACHE_DISK",
+    "SAM_EMBEDDING_CACHE_ENTRIES",
+    "OCR_CPU_THREADS",
+    "NEAR_DUPLICATE",
+    "NEAR_DUPLICATE_INDEX_DIR",
+    "MODEL_WORKERS",
+    "MODEL_MEMORY_BUDGET_MB",
+    "MODEL_SIZE_HINTS_MB",
+    "REUSE_PERCEPTION_MODELS",
+    "ENABLE_MODEL_WARMUP",
+    "ENABLE_BACKGROUND_WARMUP",
+    "STAGE_EXECUTOR_MODE",
+    "STAGE_EXECUTOR_MAX_WORKERS",
+    "STAGE_TASK_THREADS",
+}
+
+
+def _perception_fingerprint() -> str:
+    """Settings, model names and Stage-1 source code that shape the scene JSON."""
+    config = {k: v for k, v in vars(settings).items() if k not in _FINGERPRINT_EXCLUDED_SETTINGS}
+    # src/utilities holds precision, weight-cache and sidecar code that Stage 1 output depends on.
+    perception_dir = Path(__file__).resolve().parent
+    code = source_fingerprint([perception_dir, perception_dir.parent / "utilities"])
+    return config_fingerprint({"settings": config, "code": code})
+
+
+def _near_duplicate_index():
+    """Process-wide near-duplicate index, or None when reuse is disabled."""
+    cfg = getattr(settings, "NEAR_DUPLICATE", {}) or {}
+    if not cfg.get("enabled", False):
+        return None
+    return _get_component(
+        "near_duplicate_index",
+        lambda: NearDuplicateIndex(
+            settings.NEAR_DUPLICATE_INDEX_DIR,
+            max_phash_distance=int(cfg.get("max_phash_distance", 4)),
+            max_dhash_distance=int(cfg.get("max_dhash_distance", 6)),
+            max_aspect_ratio_delta=float(cfg.get("max_aspect_ratio_delta", 0.02)),
+            fingerprint=_perception_fingerprint(),
+            max_entries=int(cfg.get("max_entries", 1000)),
+        ),
+    )
+
+
+def _boxes_overlap(a: list, b: list) -> bool:
+    return float(a[0]) < float(b[2]) and float(b[0]) < float(a[2]) and float(a[1]) < float(b[3]) and float(b[1]) < float(a[3])
+
+
+def _changes_touch_non_text(scene_json: dict, boxes: list) -> bool:
+    """True when a changed region overlaps an object or face, whose captions/attributes OCR cannot refresh."""
+    items = list(scene_json.get("objects") or []) + list(scene_json.get("faces") or [])
+    for item in items:
+        bbox = item.get("bbox") if isinstance(item, dict) else None
+        if isinstance(bbox, list) and len(bbox) >= 4 and any(_boxes_overlap(bbox, box) for box in boxes):
+            return True
+    return False
+
+
+def _box_center_inside(item: dict, boxes: list) -> bool:
+    bbox = item.get("bbox") or []
+    if len(bbox) < 4:
+        return False
+    cx, cy = (float(bbox[0]) + float(bbox[2])) / 2.0, (float(bbox[1]) + float(bbox[3])) / 2.0
+    return any(b[0] <= cx <= b[2] and b[1] <= cy <= b[3] for b in boxes)
+
+
+def _rerun_changed_text(scene_json: dict, image, boxes: list) -> None:
+    """Re-run OCR inside ``boxes`` and splice the lines into the reused scene JSON."""
+    ocr_engine = _component_loaders()["ocr_engine"]()
+    h, w = image.shape[:2]
+    margin = 8
+    new_lines = []
+    for x1, y1, x2, y2 in boxes:
+        x1, y1 = max(0, x1 - margin), max(0, y1 - margin)
+        x2, y2 = min(w, x2 + margin), min(h, y2 + margin)
+        for line in ocr_engine.extract(image[y1:y2, x1:x2]):
+            new_lines.append(offset_detection(line, x1, y1))
+    text = scene_json.get("text") or {}
+    extracted_text = [t for t in (text.get("extracted") or []) if not _box_center_inside(t, boxes)]
+    extracted_text = sorted(
+        extracted_text + new_lines,
+        key=lambda t: (float((t.get("bbox") or [0, 0])[1]), float((t.get("bbox") or [0, 0])[0])),
+    )
+    text_boxes = [r for r in (text.get("regions") or []) if not _box_center_inside(r, boxes)]
+    text_boxes.extend(
+        {"bbox": line["bbox"], "confidence": line.get("confidence", 0.0), "polygon": line.get("polygon", [])}
+        for line in new_lines
+    )
+    SceneJSONBuilder().rebuild_text(
+        scene_json,
+        extracted_text,
+        text_boxes,
+        _build_object_text_links(scene_json.get("objects") or [], extracted_text),
+    )
+
+
+def _reuse_near_duplicate(index: NearDuplicateIndex, image, image_path: str, logger: logging.Logger):
+    """
+    Scene JSON rebuilt from a cached near-duplicate of ``image``, or None.
+
+    Geometry is rescaled to the new size; with rerun_changed_regions, OCR is
+    re-run on the regions that differ from the cached image. Changes that touch
+    an object or face fall back to full perception, since only text is re-run.
+    """
+    cfg = getattr(settings, "NEAR_DUPLICATE", {}) or {}
+    match = index.lookup(image)
+    if match is None:
+        return None
+    entry = match["entry"]
+    cached = index.load_scene(entry)
+    if cached is None:
+        return None
+    h, w = image.shape[:2]
+    changed = []
+    if cfg.get("rerun_changed_regions", True):
+        cached_thumbnail = index.load_thumbnail(entry)
+        if cached_thumbnail is not None:
+            changed = changed_regions(
+                cached_thumbnail,
+                image,
+                block_size=int(cfg.get("diff_block_size", 8)),
+                threshold=float(cfg.get("diff_threshold", 24)),
+            )
+    changed_ratio = sum((b[2] - b[0]) * (b[3] - b[1]) for b in changed) / float(max(1, h * w))
+    if changed_ratio > float(cfg.get("max_changed_area_ratio", 0.25)):
+        logger.info(
+            "Near-duplicate %s differs in %.0f%% of the image; running full perception",
+            entry.get("image_path"),
+            changed_ratio * 100.0,
+        )
+        return None
+
+    scene_json = rescale_scene_geometry(cached, w / float(entry["width"]), h / float(entry["height"]))
+    if changed and _changes_touch_non_text(scene_json, changed):
+        logger.info(
+            "Near-duplicate %s differs inside detected objects; running full perception",
+            entry.get("image_path"),
+        )
+        return None
+    if changed:
+        try:
+            _rerun_changed_text(scene_json, image, changed)
+        except Exception as e:
+            logger.warning("Near-duplicate partial re-run failed; running full perception: %s", e)
+            return None
+    scene_json["metadata"] = {
+        **(cached.get("metadata") or {}),
+        "image_path": str(image_path),
+        "image_name": Path(image_path).name,
+        "timestamp": datetime.now().isoformat(),
+        "reuse": {
+            "reused": True,
+            "method": "perceptual_hash",
+            "source_image_path": str(entry.get("image_path", "")),
+            "source_timestamp": str((cached.get("metadata") or {}).get("timestamp", "")),
+            "phash_distance": int(match["phash_distance"]),
+            "dhash_distance": int(match["dhash_distance"]),
+            "scale": [round(w / float(entry["width"]), 4), round(h / float(entry["height"]), 4)],
+            "rerun_regions": changed,
+            "rerun_components": ["ocr"] if changed else [],
+        },
+    }
+    logger.info(
+        "Reusing Stage-1 result of near-duplicate %s (phash=%d dhash=%d, %d region(s) re-run)",
+        entry.get("image_path"),
+        match["phash_distance"],
+        match["dhash_distance"],
+        len(changed),
+    )
+    return scene_json
 
 
-def main(image_path: str, output_path: str = None):
+def main(image_path: str, output_path: str = None, use_cache: bool = True):
     """
     Run the complete Stage-1 Perception pipeline
 
@@ -130,6 +628,8 @@ def main(image_path: str, output_path: str = None):
     3. Understanding: captions, attributes, scene description
     4. OCR: text extraction
     5. Build final JSON output
+
+    use_cache=False skips near-duplicate reuse (the result is still indexed).
     """
     logger = setup_logger()
     logger.info(f"Starting Stage-1 Perception pipeline for: {image_path}")
@@ -138,65 +638,44 @@ def main(image_path: str, output_path: str = None):
     logger.info("Step 1: Loading image...")
     image = load_image(image_path)
 
-    # Step 2: Context-first analysis for model-driven detection
+    near_duplicate_index = _near_duplicate_index()
+    if near_duplicate_index is not None and use_cache:
+        scene_json = _reuse_near_duplicate(near_duplicate_index, image, image_path, logger)
+        if scene_json is not None:
+            if output_path:
+                scene_json = SceneJSONBuilder().save(scene_json, output_path)
+                logger.info(f"Pipeline complete (near-duplicate reuse)! Output saved to: {output_path}")
+            return scene_json
+
+    # Step 2: Context-first analysis for model-driven detection, run as a
+    # dependency graph so independent components overlap.
     logger.info("Step 2: Building image context...")
-    text_detector = TextDetector()
-    image_classifier = ImageTypeClassifier()
-    face_detector = FaceDetector() if settings.ENABLE_FACE_DETECTION else None
-    ocr_engine = OCREngine()
-    sam_segmenter = SAMSegmenter()
-    blip_manager = BLIPModelManager()
-    scene_summarizer = SceneSummarizer()
-
-    text_boxes = text_detector.detect(image)
-    image_type = image_classifier.classify(image)
-    faces = face_detector.detect(image) if face_detector is not None else []
-    logger.info("Step 2.5: Extracting text for OCR-first context...")
-    text_postprocessor = TextPostProcessor()
-    extracted_text = ocr_engine.extract(image, text_boxes)
-    text_boxes = calibrate_text_region_confidence(text_boxes, extracted_text)
-    typography = (
-        text_postprocessor.summarize_styles(extracted_text)
-        if settings.ENABLE_TYPOGRAPHY_SUMMARY
-        else {}
+    executor_mode = str(getattr(settings, "STAGE_EXECUTOR_MODE", "thread")).strip().lower()
+    if executor_mode == "process":
+        # Stage-1 tasks share in-process models, so they cannot be pickled to workers.
+        logger.warning("Stage executor mode 'process' is not supported for Stage-1; using thread")
+        executor_mode = "thread"
+    stage_results, stage_timing = run_task_graph(
+        _build_stage_one_tasks(image, logger),
+        max_workers=int(getattr(settings, "STAGE_EXECUTOR_MAX_WORKERS", 4)),
+        mode=executor_mode,
     )
-    scene_description = scene_summarizer.summarize(
-        image,
-        image_type=image_type,
-        extracted_text=extracted_text,
-    )
-
-    object_detector = ObjectDetector(
-        context={
-            "image_type": image_type,
-            "scene": scene_description,
-            "extracted_text": extracted_text,
-        }
+    logger.info(
+        "Stage-1 graph: wall=%.0fms critical_path=%.0fms mode=%s",
+        stage_timing["wall_ms"],
+        stage_timing["critical_path_ms"],
+        stage_timing["mode"],
     )
-
-    if settings.ENABLE_MODEL_WARMUP:
-        logger.info("Step 2.6: Running model warmup...")
-        _run_model_warmup(
-            object_detector=object_detector,
-            blip_manager=blip_manager,
-            ocr_engine=ocr_engine,
-            sam_segmenter=sam_segmenter,
-            face_detector=face_detector,
-        )
-
-    detector_bundle = object_detector.detect_with_debug(image)
+    image_type = stage_results["classification"]
+    execution_plan = dict(stage_results["plan"], stage_timing=stage_timing)
+    faces = stage_results["faces"]
+    extracted_text, text_boxes = stage_results["ocr"]
+    typography = stage_results["typography"]
+    scene_description = stage_results["scene_summary"]
+    detector_bundle = stage_results["detection"]
     bounding_boxes = detector_bundle.get("final", [])
     detector_views = detector_bundle.get("debug_views", {})
-    sam_status = sam_segmenter.get_status()
-    logger.info(
-        "SAM status: enabled=%s available=%s reason=%s model_type=%s checkpoint=%s",
-        sam_status.get("enabled"),
-        sam_status.get("available"),
-        sam_status.get("reason"),
-        sam_status.get("model_type"),
-        sam_status.get("checkpoint_path"),
-    )
-    segmentations = sam_segmenter.segment(image, bounding_boxes)
+    segmentations, sam_status = stage_results["segmentation"]
     for idx, segmentation in enumerate(segmentations):
         if 0 <= idx < len(bounding_boxes):
             bounding_boxes[idx]["segmentation"] = segmentation
@@ -208,13 +687,55 @@ def main(image_path: str, output_path: str = None):
 
     # Step 3: Region understanding
     logger.info("Step 3: Understanding scene...")
-    object_captioner = ObjectCaptioner()
+    if _hosted_in_worker("object_captioner"):
+        object_captioner = _get_component("object_captioner", ObjectCaptioner)
+    else:
+        # Route the shared BLIP instance through the model manager so it is
+        # tracked (or reloaded after eviction) before the captioner uses it.
+        _get_component("blip", BLIPModelManager)
+        object_captioner = ObjectCaptioner()
     attribute_extractor = AttributeExtractor()
-    icon_analyzer = IconSemanticAnalyzer(model_name=settings.CLIP_MODEL_NAME)
 
-    object_captions = object_captioner.caption(image, bounding_boxes)
-    object_attributes = attribute_extractor.extract(image, bounding_boxes, object_captions)
-    icon_semantics = icon_analyzer.analyze(image, bounding_boxes, image_type)
+    crop_dedup_cfg = getattr(settings, "CROP_DEDUP", {}) or {}
+    if crop_dedup_cfg.get("enabled", False):
+        crop_group_ids = group_duplicate_crops(
+            image,
+            bounding_boxes,
+            max_hash_distance=int(crop_dedup_cfg.get("max_hash_distance", 4)),
+            max_color_delta=float(crop_dedup_cfg.get("max_color_delta", 20)),
+            size_tolerance=float(crop_dedup_cfg.get("size_tolerance", 0.2)),
+        )
+    else:
+        crop_group_ids = [-1] * len(bounding_boxes)
+    for idx, group_id in enumerate(crop_group_ids):
+        bounding_boxes[idx]["crop_group_id"] = group_id
+    if any(group_id >= 0 for group_id in crop_group_ids):
+        logger.info(
+            "  - Grouped %d repeated crop(s) into %d group(s)",
+            sum(1 for group_id in crop_group_ids if group_id >= 0),
+            max(crop_group_ids) + 1,
+        )
+
+    object_captions = object_captioner.caption(
+        image,
+        bounding_boxes,
+        max_captions=execution_plan["caption_top_k"],
+        group_ids=crop_group_ids,
+    )
+    object_attributes = attribute_extractor.extract(
+        image,
+        bounding_boxes,
+        object_captions,
+        group_ids=crop_group_ids,
+    )
+    if execution_plan["steps"]["icon_semantics"]:
+        icon_analyzer = _get_component(
+            "icon_analyzer",
+            lambda: IconSemanticAnalyzer(model_name=settings.CLIP_MODEL_NAME),
+        )
+        icon_semantics = icon_analyzer.analyze(image, bounding_boxes, image_type, group_ids=crop_group_ids)
+    else:
+        icon_semantics = {"enabled": False, "objects": [], "cluster_count": 0}
     for entry in icon_semantics.get("objects", []):
         idx = entry.get("object_index")
         if isinstance(idx, int) and 0 <= idx < len(bounding_boxes):
@@ -230,6 +751,7 @@ def main(image_path: str, output_path: str = None):
         extracted_text=extracted_text,
         object_text_links=object_text_links,
         sam_status=sam_status,
+        model_warm_state=warm_state(),
     )
     infographic_analysis = compute_infographic_analysis(image_type, bounding_boxes, extracted_text)
     infographic_analysis["icon_cluster_count"] = max(
@@ -269,11 +791,18 @@ def main(image_path: str, output_path: str = None):
         quality_summary=quality_summary,
         infographic_analysis=infographic_analysis,
         image_shape=image.shape,
+        execution_plan=execution_plan,
     )
+    if near_duplicate_index is not None:
+        near_duplicate_index.add(image, scene_json, image_path)
+
+    worker_pool = _model_worker_pool()
+    if worker_pool is not None:
+        logger.info("Model workers: %s", worker_pool.stats())
 
     # Save output
     if output_path:
-        json_builder.save(scene_json, output_path)
+        scene_json = json_builder.save(scene_json, output_path)
         logger.info(f"Pipeline complete! Output saved to: {output_path}")
     else:
         logger.info("Pipeline complete! No output path specified - returning scene_json only")
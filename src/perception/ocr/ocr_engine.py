@@ -8,9 +8,15 @@ from pathlib import Path
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from paddleocr import PaddleOCR
 
 from perception.config import settings
+from perception.utils.tiling import (
+    iter_tile_batches,
+    merge_tiled_detections,
+    plan_tiles,
+    should_tile,
+    tile_detections_to_image,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -132,17 +138,25 @@ def _extract_region_style(image: np.ndarray, bbox: list, text: str) -> dict:
 class OCREngine:
     """Performs OCR using PaddleOCR (detection + recognition)"""
     
-    def __init__(self, languages=None, use_gpu=None):
+    def __init__(self, languages=None, use_gpu=None, cpu_threads=None):
         """
         Initialize PaddleOCR engine
         
         Args:
             languages: List of language codes (default: from config)
             use_gpu: Whether to use GPU (default: from config)
+            cpu_threads: Paddle CPU threads (default: from config; 0 = Paddle default)
         """
         self.languages = languages or settings.OCR_LANGUAGES
         self.use_gpu = use_gpu if use_gpu is not None else settings.OCR_GPU
         self.use_angle_cls = bool(getattr(settings, "OCR_USE_ANGLE_CLS", True))
+        self.cpu_threads = int(cpu_threads if cpu_threads is not None else getattr(settings, "OCR_CPU_THREADS", 0))
+        self.tiling_enabled = bool(getattr(settings, "OCR_TILING_ENABLED", False))
+        self.tiling_min_image_side = int(getattr(settings, "OCR_TILING_MIN_IMAGE_SIDE", 3000))
+        self.tile_size = int(getattr(settings, "OCR_TILE_SIZE", 1600))
+        self.tile_overlap = int(getattr(settings, "OCR_TILE_OVERLAP", 200))
+        self.tile_batch_size = int(getattr(settings, "OCR_TILE_BATCH_SIZE", 4))
+        self.tile_merge_iou = float(getattr(settings, "OCR_TILE_MERGE_IOU", 0.3))
         self.ocr = None
         self.available = False
         self.status_reason = "not_initialized"
@@ -151,13 +165,19 @@ class OCREngine:
     def _load_reader(self):
         """Load PaddleOCR reader (with detection + recognition)"""
         try:
+            from paddleocr import PaddleOCR
+
             lang = self.languages[0] if isinstance(self.languages, list) else self.languages
+            ocr_kwargs = {}
+            if self.cpu_threads > 0:
+                ocr_kwargs["cpu_threads"] = self.cpu_threads
             
             self.ocr = PaddleOCR(
                 lang=lang,
                 use_gpu=bool(self.use_gpu),
                 use_angle_cls=self.use_angle_cls,
                 show_log=False,
+                **ocr_kwargs,
             )
             self.available = True
             self.status_reason = "ready"
@@ -196,16 +216,27 @@ class OCREngine:
         if self.ocr is None:
             raise RuntimeError("PaddleOCR not loaded [model_init_failed]")
         
-        extracted_text = []
-        
         # Run full OCR pipeline (parameters handled internally)
         try:
-            result = self.ocr.ocr(image)
+            if should_tile(image.shape, self.tiling_enabled, self.tiling_min_image_side):
+                lines = self._ocr_tiled(image)
+            else:
+                lines = self._ocr_lines(image)
         except Exception as e:
             self.status_reason = "inference_failed"
             logger.warning("PaddleOCR inference failed [inference_failed]: %s", e)
             return []
-        
+
+        extracted_text = []
+        for line in lines:
+            line["style"] = _extract_region_style(image, line["bbox"], line["text"])
+            extracted_text.append(line)
+        return extracted_text
+
+    def _ocr_lines(self, image: np.ndarray) -> list:
+        """Run PaddleOCR on one frame and return text lines without style."""
+        result = self.ocr.ocr(image)
+        lines = []
         if result and result[0]:
             for line in result[0]:
                 # PaddleOCR returns: [polygon, (text, confidence)]
@@ -223,15 +254,33 @@ class OCREngine:
                     max(y_coords)
                 ]
                 
-                extracted_text.append({
+                lines.append({
                     'text': text,
                     'bbox': bbox,
                     'confidence': confidence,
                     'polygon': polygon,
-                    'style': _extract_region_style(image, bbox, text),
                 })
-        
-        return extracted_text
+        return lines
+
+    def _ocr_tiled(self, image: np.ndarray) -> list:
+        """OCR overlapping tiles, map lines back, keep uncut copies and join seam-split lines."""
+        h, w = image.shape[:2]
+        tiles = plan_tiles(h, w, self.tile_size, self.tile_overlap)
+        lines = []
+        for batch in iter_tile_batches(image, tiles, self.tile_batch_size):
+            for tile_box, view in batch:
+                lines.extend(tile_detections_to_image(self._ocr_lines(view), tile_box, image.shape))
+        merged = merge_tiled_detections(
+            lines,
+            iou_threshold=self.tile_merge_iou,
+            class_key=None,
+            prefer="area",
+            join_lines=True,
+        )
+        # Restore reading order (top-to-bottom, left-to-right) after merging.
+        merged.sort(key=lambda item: (round(float(item["bbox"][1]) / 10.0), float(item["bbox"][0])))
+        logger.info("PaddleOCR tiled extraction: tiles=%d raw=%d merged=%d", len(tiles), len(lines), len(merged))
+        return merged
 
     def warmup(self) -> bool:
         """Run tiny OCR pass to reduce first-request latency."""
@@ -3,14 +3,19 @@ SAM-based object segmentation.
 Uses detected object boxes as prompts and returns lightweight polygon masks.
 """
 
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import cv2
 import numpy as np
 
 from perception.config import settings
+from src.utilities.scene_sidecar import encode_mask_rle
+from src.utilities.weight_cache import file_fingerprint, load_module_mmap
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +27,22 @@ class SAMSegmenter:
         self.enabled = bool(getattr(settings, "ENABLE_SAM_SEGMENTATION", True))
         self.model_type = model_type or settings.SAM_MODEL_TYPE
         self.checkpoint_path = Path(checkpoint_path or settings.SAM_CHECKPOINT_PATH)
+        self.box_batch_size = max(1, int(getattr(settings, "SAM_BOX_BATCH_SIZE", 32)))
+        self.embedding_cache_entries = max(0, int(getattr(settings, "SAM_EMBEDDING_CACHE_ENTRIES", 4)))
+        self.box_batch_mask_budget_mb = max(0, int(getattr(settings, "SAM_BOX_BATCH_MASK_BUDGET_MB", 512)))
+        self.embedding_cache_disk = bool(getattr(settings, "SAM_EMBEDDING_CACHE_DISK", True))
+        self.embedding_cache_disk_max_mb = max(0, int(getattr(settings, "SAM_EMBEDDING_CACHE_DISK_MAX_MB", 1024)))
+        # Full masks are only worth keeping when they go to the binary sidecar.
+        self.keep_mask_rle = bool(getattr(settings, "COMPACT_OUTPUT", False)) and bool(
+            getattr(settings, "KEEP_SAM_MASKS", True)
+        )
+        self.embedding_cache_dir = Path(settings.CACHE_DIR) / "sam_embeddings"
+        self._embedding_cache: "OrderedDict[str, Dict]" = OrderedDict()
         self.predictor = None
+        self.device = None
         self.available = False
         self.status_reason = "not_initialized"
+        self.last_timing: Dict = {}
         self._load_model()
 
     def _load_model(self) -> None:
@@ -42,9 +60,18 @@ class SAMSegmenter:
             import torch
             from segment_anything import SamPredictor, sam_model_registry
 
-            model = sam_model_registry[self.model_type](checkpoint=str(self.checkpoint_path))
+            builder = sam_model_registry[self.model_type]
+            model = load_module_mmap(
+                f"sam_{self.model_type}_{self.checkpoint_path.stem}",
+                lambda: builder(checkpoint=str(self.checkpoint_path)),
+                skeleton_fn=lambda: builder(checkpoint=None),
+                fingerprint=file_fingerprint(self.checkpoint_path),
+                cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                enabled=getattr(settings, "MMAP_WEIGHTS", None),
+            )
             device = "cuda" if torch.cuda.is_available() else "cpu"
             model.to(device=device)
+            self.device = device
             self.predictor = SamPredictor(model)
             self.available = True
             self.status_reason = "ready"
@@ -63,12 +90,15 @@ class SAMSegmenter:
             "reason": self.status_reason,
             "model_type": self.model_type,
             "checkpoint_path": str(self.checkpoint_path),
+            "timing": dict(self.last_timing),
         }
 
     def segment(self, image: np.ndarray, objects: List[Dict]) -> List[Dict]:
         """
         Segment each detected object using its bounding box as SAM prompt.
 
+        All valid boxes go through SAM's batched box-prompt decoder; the image
+        embedding is reused from cache when the same image was encoded before.
         Returns one segmentation dict per input object.
         """
         if not objects:
@@ -78,54 +108,233 @@ class SAMSegmenter:
             reason = self.status_reason if self.status_reason != "not_initialized" else "model_init_failed"
             return [self._empty_result(reason) for _ in objects]
 
+        image = image.astype(np.uint8)
+        start = time.perf_counter()
         try:
-            self.predictor.set_image(image.astype(np.uint8))
+            cache_source = self._set_image_cached(image)
         except Exception as e:
             logger.warning("SAM failed to set image: %s", e)
             return [self._empty_result("inference_failed") for _ in objects]
+        encoder_ms = (time.perf_counter() - start) * 1000.0
 
         h, w = image.shape[:2]
-        results: List[Dict] = []
-        for obj in objects:
+        results: List[Optional[Dict]] = [None] * len(objects)
+        boxes: List[List[float]] = []
+        box_indices: List[int] = []
+        for idx, obj in enumerate(objects):
             bbox = obj.get("bbox", [])
             if len(bbox) < 4:
-                results.append(self._empty_result("invalid_bbox"))
+                results[idx] = self._empty_result("invalid_bbox")
                 continue
 
             x1, y1, x2, y2 = [float(v) for v in bbox[:4]]
             x1, y1 = max(0.0, x1), max(0.0, y1)
             x2, y2 = min(float(w - 1), x2), min(float(h - 1), y2)
             if x2 <= x1 or y2 <= y1:
-                results.append(self._empty_result("invalid_bbox"))
+                results[idx] = self._empty_result("invalid_bbox")
                 continue
+            boxes.append([x1, y1, x2, y2])
+            box_indices.append(idx)
 
-            box = np.array([x1, y1, x2, y2], dtype=np.float32)
+        start = time.perf_counter()
+        batch_count = 0
+        batch_size = self._boxes_per_batch(h, w)
+        for offset in range(0, len(boxes), batch_size):
+            batch = boxes[offset : offset + batch_size]
+            batch_indices = box_indices[offset : offset + batch_size]
+            batch_count += 1
             try:
-                masks, scores, _ = self.predictor.predict(box=box, multimask_output=False)
-                if masks is None or len(masks) == 0:
-                    results.append(self._empty_result("inference_failed"))
-                    continue
-
-                mask = masks[0].astype(np.uint8)
-                score = float(scores[0]) if scores is not None and len(scores) > 0 else 0.0
-                area_px = int(mask.sum())
-                area_ratio = float(area_px / max(1, h * w))
-                polygon = self._mask_to_polygon(mask)
-                results.append(
-                    {
-                        "enabled": True,
-                        "source": "sam",
-                        "score": score,
-                        "area_px": area_px,
-                        "area_ratio": area_ratio,
-                        "polygon": polygon,
-                    }
-                )
+                masks, scores = self._predict_boxes(np.asarray(batch, dtype=np.float32), (h, w))
             except Exception as e:
-                logger.warning("SAM segmentation failed for bbox %s: %s", bbox, e)
-                results.append(self._empty_result("inference_failed"))
+                logger.warning("SAM batched segmentation failed for %d box(es): %s", len(batch), e)
+                for idx in batch_indices:
+                    results[idx] = self._empty_result("inference_failed")
+                continue
+            for local_i, idx in enumerate(batch_indices):
+                results[idx] = self._mask_to_result(masks[local_i], float(scores[local_i]), h, w)
+        decoder_ms = (time.perf_counter() - start) * 1000.0
+
+        self.last_timing = {
+            "model_type": self.model_type,
+            "checkpoint": self.checkpoint_path.name,
+            "embedding_cache": cache_source,
+            "encoder_ms": round(encoder_ms, 2),
+            "decoder_ms": round(decoder_ms, 2),
+            "box_count": len(boxes),
+            "batch_size": batch_size,
+            "batch_count": batch_count,
+        }
+        logger.info(
+            "SAM %s: encoder=%.1fms (cache=%s) decoder=%.1fms boxes=%d batches=%d",
+            self.model_type,
+            encoder_ms,
+            cache_source,
+            decoder_ms,
+            len(boxes),
+            batch_count,
+        )
+        return [r if r is not None else self._empty_result("inference_failed") for r in results]
+
+    def _boxes_per_batch(self, h: int, w: int) -> int:
+        """
+        Boxes per decoder call: box_batch_size, lowered so the full-resolution
+        float32 mask logits of one batch (4 bytes per pixel per box) stay within
+        box_batch_mask_budget_mb.
+        """
+        if self.box_batch_mask_budget_mb <= 0:
+            return self.box_batch_size
+        per_box_bytes = max(1, h * w * 4)
+        fit = (self.box_batch_mask_budget_mb * 1024 * 1024) // per_box_bytes
+        return max(1, min(self.box_batch_size, int(fit)))
+
+    def _predict_boxes(self, boxes: np.ndarray, image_hw) -> tuple:
+        """Run one batched decoder call for ``boxes`` (N x 4, xyxy pixels)."""
+        import torch
+
+        box_tensor = torch.as_tensor(boxes, dtype=torch.float32, device=self.predictor.device)
+        box_tensor = self.predictor.transform.apply_boxes_torch(box_tensor, image_hw)
+        with torch.no_grad():
+            masks, scores, _ = self.predictor.predict_torch(
+                point_coords=None,
+                point_labels=None,
+                boxes=box_tensor,
+                multimask_output=False,
+            )
+        return masks[:, 0].cpu().numpy(), scores[:, 0].float().cpu().numpy()
+
+    def _mask_to_result(self, mask: np.ndarray, score: float, h: int, w: int) -> Dict:
+        mask = mask.astype(np.uint8)
+        area_px = int(mask.sum())
+        result = {
+            "enabled": True,
+            "source": "sam",
+            "score": score,
+            "area_px": area_px,
+            "area_ratio": float(area_px / max(1, h * w)),
+            "polygon": self._mask_to_polygon(mask),
+        }
+        if self.keep_mask_rle:
+            result["mask_rle"] = encode_mask_rle(mask)
+        return result
+
+    @staticmethod
+    def image_content_hash(image: np.ndarray) -> str:
+        """Content hash of the pixel buffer and shape (independent of file path)."""
+        digest = hashlib.sha256()
+        digest.update(str(image.shape).encode("ascii"))
+        digest.update(np.ascontiguousarray(image).tobytes())
+        return digest.hexdigest()[:24]
+
+    def _embedding_key(self, image: np.ndarray) -> str:
+        return f"{self.model_type}_{self.checkpoint_path.stem}_{self.image_content_hash(image)}"
+
+    def _set_image_cached(self, image: np.ndarray) -> str:
+        """
+        Load the image embedding into the predictor, encoding only on cache miss.
+
+        Returns the cache source: "memory", "disk" or "miss".
+        """
+        if self.embedding_cache_entries <= 0 and not self.embedding_cache_disk:
+            self.predictor.set_image(image)
+            return "disabled"
+        key = self._embedding_key(image)
+        entry = self._embedding_cache.get(key)
+        source = "memory"
+        if entry is not None:
+            self._embedding_cache.move_to_end(key)
+        else:
+            entry = self._load_embedding_from_disk(key)
+            source = "disk"
+        if entry is not None:
+            self._restore_embedding(entry)
+            self._remember_embedding(key, entry)
+            return source
+
+        self.predictor.set_image(image)
+        entry = {
+            "features": self.predictor.features,
+            "original_size": tuple(self.predictor.original_size),
+            "input_size": tuple(self.predictor.input_size),
+        }
+        self._remember_embedding(key, entry)
+        self._save_embedding_to_disk(key, entry)
+        return "miss"
+
+    def _restore_embedding(self, entry: Dict) -> None:
+        self.predictor.reset_image()
+        self.predictor.features = entry["features"].to(self.predictor.device)
+        self.predictor.original_size = tuple(entry["original_size"])
+        self.predictor.input_size = tuple(entry["input_size"])
+        self.predictor.is_image_set = True
+
+    def _remember_embedding(self, key: str, entry: Dict) -> None:
+        if self.embedding_cache_entries <= 0:
+            return
+        self._embedding_cache[key] = entry
+        self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.embedding_cache_entries:
+            self._embedding_cache.popitem(last=False)
+
+    def _load_embedding_from_disk(self, key: str) -> Optional[Dict]:
+        if not self.embedding_cache_disk:
+            return None
+        path = self.embedding_cache_dir / f"{key}.pt"
+        if not path.exists():
+            return None
+        try:
+            import torch
+
+            entry = torch.load(str(path), map_location="cpu")
+            # mtime doubles as last-access time for LRU eviction.
+            path.touch()
+            return entry
+        except Exception as e:
+            logger.warning("SAM embedding cache unreadable at %s: %s", path, e)
+            return None
+
+    def _save_embedding_to_disk(self, key: str, entry: Dict) -> None:
+        if not self.embedding_cache_disk:
+            return
+        try:
+            import torch
+
+            self.embedding_cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.embedding_cache_dir / f"{key}.pt"
+            tmp_path = path.with_suffix(".tmp")
+            torch.save(
+                {
+                    "features": entry["features"].detach().cpu(),
+                    "original_size": list(entry["original_size"]),
+                    "input_size": list(entry["input_size"]),
+                },
+                str(tmp_path),
+            )
+            tmp_path.replace(path)
+            self._evict_disk_embeddings()
+        except Exception as e:
+            logger.warning("Could not persist SAM embedding %s: %s", key, e)
 
-        return results
+    def _evict_disk_embeddings(self) -> None:
+        """Delete least-recently-used embedding files past embedding_cache_disk_max_mb."""
+        if self.embedding_cache_disk_max_mb <= 0:
+            return
+        files = []
+        for path in self.embedding_cache_dir.glob("*.pt"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        limit = self.embedding_cache_disk_max_mb * 1024 * 1024
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
 
     @staticmethod
     def _mask_to_polygon(mask: np.ndarray) -> List[List[float]]:
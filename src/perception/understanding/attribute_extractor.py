@@ -3,9 +3,13 @@ Attribute Extractor
 Extracts attributes like emotion, color, clothing, etc. from objects and captions
 """
 
-import numpy as np
+import copy
 import re
 
+import numpy as np
+
+from perception.utils.crop_groups import representative_indices
+
 
 class AttributeExtractor:
     """Extracts detailed attributes from detected objects and their captions"""
@@ -21,7 +25,13 @@ class AttributeExtractor:
         }
         self.clothing_keywords = ['shirt', 'pants', 'dress', 'jacket', 'hat', 'shoes', 'tie', 'suit', 'skirt']
     
-    def extract(self, image: np.ndarray, bounding_boxes: list, captions: list = None) -> list:
+    def extract(
+        self,
+        image: np.ndarray,
+        bounding_boxes: list,
+        captions: list = None,
+        group_ids: list = None,
+    ) -> list:
         """
         Extract attributes for each detected object
         
@@ -29,6 +39,8 @@ class AttributeExtractor:
             image: Input image as numpy array (RGB)
             bounding_boxes: List of detected objects with bboxes
             captions: Optional list of captions from object_captioner
+            group_ids: Optional duplicate-crop group id per box; members reuse
+                the attributes of their group's first box
             
         Returns:
             List of attributes for each object:
@@ -48,8 +60,16 @@ class AttributeExtractor:
             ]
         """
         attributes_list = []
+        representatives = representative_indices(group_ids, len(bounding_boxes))
         
         for i, bbox_info in enumerate(bounding_boxes):
+            if representatives[i] != i:
+                attributes_list.append({
+                    'bbox': bbox_info.get('bbox', []),
+                    'attributes': copy.deepcopy(attributes_list[representatives[i]]['attributes'])
+                })
+                continue
+            
             # Get caption if available
             caption = ''
             if captions and i < len(captions):
@@ -7,15 +7,21 @@ import logging
 from threading import Lock
 
 import numpy as np
-import torch
 from PIL import Image
-from transformers import BlipProcessor, BlipForConditionalGeneration
 
 from perception.config import settings
+from src.utilities.model_precision import inference_autocast, load_model_with_precision
+from src.utilities.weight_cache import hf_skeleton
 
 logger = logging.getLogger(__name__)
 
 
+def _default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
 class BLIPModelManager:
     """
     Singleton class to manage shared BLIP model and processor.
@@ -43,7 +49,8 @@ class BLIPModelManager:
         self.model_name = settings.BLIP2_MODEL_NAME
         self.model = None
         self.processor = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = _default_device()
+        self.precision = str(getattr(settings, "MODEL_PRECISION", "fp32"))
         self.available = False
         self.status_reason = "not_initialized"
         self._initialized = True
@@ -58,24 +65,48 @@ class BLIPModelManager:
             return  # Already loaded
         
         try:
+            import torch
+            from transformers import BlipForConditionalGeneration, BlipProcessor
+
             logger.info("Loading shared BLIP model: %s...", self.model_name)
             auth_token = settings.BLIP_MODEL_API_KEY or None
             model_kwargs = {"token": auth_token} if auth_token else {}
             self.processor = BlipProcessor.from_pretrained(self.model_name, **model_kwargs)
-            self.model = BlipForConditionalGeneration.from_pretrained(
-                self.model_name,
-                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
-                **model_kwargs,
-            ).to(self.device)
+            model, self.precision = load_model_with_precision(
+                lambda: BlipForConditionalGeneration.from_pretrained(
+                    self.model_name,
+                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+                    **model_kwargs,
+                ),
+                model_name=self.model_name,
+                mode=self.precision,
+                device=self.device,
+                cache_dir=getattr(settings, "MODEL_PRECISION_CACHE_DIR", None),
+                skeleton_fn=hf_skeleton(BlipForConditionalGeneration, self.model_name, **model_kwargs),
+                weight_cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                mmap_weights=getattr(settings, "MMAP_WEIGHTS", None),
+            )
+            self.model = model.to(self.device)
             self.available = True
             self.status_reason = "ready"
-            logger.info("Shared BLIP model loaded on %s", self.device)
+            logger.info("Shared BLIP model loaded on %s (precision=%s)", self.device, self.precision)
         except Exception as e:
             self.available = False
             self.status_reason = "model_init_failed"
             logger.error("BLIP init failed [model_init_failed]: %s", e)
             raise
     
+    def release(self):
+        """
+        Forget the singleton so the next BLIPModelManager() loads afresh.
+
+        Called when the model manager evicts BLIP; callers still holding this
+        instance keep working and the weights are freed once they let go.
+        """
+        with BLIPModelManager._lock:
+            if BLIPModelManager._instance is self:
+                BLIPModelManager._instance = None
+
     def get_model(self):
         """Get the shared BLIP model"""
         if self.model is None:
@@ -92,15 +123,21 @@ class BLIPModelManager:
         """Get the device (cuda/cpu) the model is running on"""
         return self.device
 
+    def inference_context(self):
+        """Autocast context for BLIP generate calls (no-op unless bf16_autocast)."""
+        return inference_autocast(self.precision, self.device)
+
     def warmup(self) -> bool:
         """Run a tiny BLIP generation pass to reduce first-request latency."""
         if self.model is None or self.processor is None:
             self.status_reason = "model_init_failed"
             return False
         try:
+            import torch
+
             tiny = Image.fromarray(np.zeros((32, 32, 3), dtype=np.uint8))
             inputs = self.processor(images=tiny, return_tensors="pt").to(self.device)
-            with torch.no_grad():
+            with torch.no_grad(), self.inference_context():
                 _ = self.model.generate(**inputs, max_new_tokens=4)
             logger.info("BLIP warmup complete")
             return True
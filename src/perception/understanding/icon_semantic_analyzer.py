@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Tuple
 import numpy as np
 
 from perception.config import settings
+from perception.utils.crop_groups import representative_indices
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,7 @@ class IconSemanticAnalyzer:
         self._model = None
         self._processor = None
         self._device = None
+        self._precision = str(getattr(settings, "MODEL_PRECISION", "fp32"))
         cfg = getattr(settings, "PERCEPTION_PROMPTS", {}).get("icon_semantic_analyzer", {})
         self._semantic_prompts = [str(item).strip() for item in cfg.get("prompts", []) if str(item).strip()]
         self._semantic_labels = [str(item).strip() for item in cfg.get("labels", []) if str(item).strip()]
@@ -73,10 +75,23 @@ class IconSemanticAnalyzer:
             import torch
             from transformers import CLIPModel, CLIPProcessor
 
+            from src.utilities.model_precision import load_model_with_precision
+            from src.utilities.weight_cache import hf_skeleton
+
             self._device = "cuda" if torch.cuda.is_available() else "cpu"
-            self._model = CLIPModel.from_pretrained(self.model_name).to(self._device)
+            model, self._precision = load_model_with_precision(
+                lambda: CLIPModel.from_pretrained(self.model_name),
+                model_name=self.model_name,
+                mode=self._precision,
+                device=self._device,
+                cache_dir=getattr(settings, "MODEL_PRECISION_CACHE_DIR", None),
+                skeleton_fn=hf_skeleton(CLIPModel, self.model_name),
+                weight_cache_dir=getattr(settings, "WEIGHT_CACHE_DIR", None),
+                mmap_weights=getattr(settings, "MMAP_WEIGHTS", None),
+            )
+            self._model = model.to(self._device)
             self._processor = CLIPProcessor.from_pretrained(self.model_name)
-            logger.info("IconSemanticAnalyzer CLIP loaded: %s", self.model_name)
+            logger.info("IconSemanticAnalyzer CLIP loaded: %s (precision=%s)", self.model_name, self._precision)
         except Exception as e:
             logger.warning("IconSemanticAnalyzer CLIP unavailable, using fallback semantics: %s", e)
             self._model = None
@@ -94,6 +109,8 @@ class IconSemanticAnalyzer:
             import torch
             from PIL import Image
 
+            from src.utilities.model_precision import inference_autocast
+
             image = Image.fromarray(crop.astype(np.uint8))
             inputs = self._processor(
                 text=self._semantic_prompts,
@@ -101,20 +118,29 @@ class IconSemanticAnalyzer:
                 return_tensors="pt",
                 padding=True,
             ).to(self._device)
-            with torch.no_grad():
+            with torch.no_grad(), inference_autocast(self._precision, self._device):
                 logits = self._model(**inputs).logits_per_image
-                probs = logits.softmax(dim=1).cpu().numpy()[0]
+                probs = logits.float().softmax(dim=1).cpu().numpy()[0]
             idx = int(np.argmax(probs))
             return self._semantic_labels[idx], float(probs[idx])
         except Exception:
             return "icon", 0.50
 
-    def analyze(self, image: np.ndarray, objects: List[Dict[str, Any]], image_type: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(
+        self,
+        image: np.ndarray,
+        objects: List[Dict[str, Any]],
+        image_type: Dict[str, Any],
+        group_ids: List[int] | None = None,
+    ) -> Dict[str, Any]:
+        """Type icon-like crops with CLIP; duplicate-crop groups are classified once."""
         if not _is_infographic_like(image_type):
             return {"enabled": False, "objects": [], "cluster_count": 0}
         icon_like_indices = []
         icon_like_bboxes = []
         object_semantics = []
+        representatives = representative_indices(group_ids, len(objects or []))
+        crop_semantics: Dict[int, Tuple[str, float]] = {}
         h, w = image.shape[:2]
         for idx, obj in enumerate(objects or []):
             bbox = obj.get("bbox") or []
@@ -125,8 +151,10 @@ class IconSemanticAnalyzer:
             y1, y2 = max(0, min(y1, y2)), min(h, max(y1, y2))
             if x2 <= x1 or y2 <= y1:
                 continue
-            crop = image[y1:y2, x1:x2]
-            semantic_type, score = self._classify_crop_semantics(crop)
+            rep = representatives[idx]
+            if rep not in crop_semantics:
+                crop_semantics[rep] = self._classify_crop_semantics(image[y1:y2, x1:x2])
+            semantic_type, score = crop_semantics[rep]
             is_icon_like = semantic_type in {"icon", "symbol", "chart_element"} and score >= 0.35
             if is_icon_like:
                 icon_like_indices.append(idx)
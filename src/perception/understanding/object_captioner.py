@@ -7,11 +7,12 @@ import logging
 import re
 
 import numpy as np
-import torch
 from PIL import Image
 
 from perception.config import settings
 from perception.understanding.blip_model_manager import BLIPModelManager
+from perception.utils.crop_groups import representative_indices
+from perception.utils.execution_planner import select_salient_indices
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +38,23 @@ class ObjectCaptioner:
         
         logger.info("ObjectCaptioner initialized with shared BLIP model")
     
-    def caption(self, image: np.ndarray, bounding_boxes: list) -> list:
+    def caption(
+        self,
+        image: np.ndarray,
+        bounding_boxes: list,
+        max_captions: int = 0,
+        group_ids: list = None,
+    ) -> list:
         """
         Generate captions for each detected object
         
         Args:
             image: Input image as numpy array (RGB)
             bounding_boxes: List of detected objects with bboxes
+            max_captions: Caption only the N most salient boxes (0 = all); the
+                rest get an empty caption with source 'skipped_by_plan'
+            group_ids: Optional duplicate-crop group id per box; each group is
+                captioned once and the caption is shared by all members
             
         Returns:
             List of captions for each object:
@@ -59,9 +70,26 @@ class ObjectCaptioner:
         if self.model is None or self.processor is None:
             raise RuntimeError("BLIP-2 model not loaded")
         
+        representatives = representative_indices(group_ids, len(bounding_boxes))
+        selected = {
+            representatives[idx]
+            for idx in select_salient_indices(bounding_boxes, image.shape, int(max_captions or 0))
+        }
         captions = []
-        for bbox_info in bounding_boxes:
+        for idx, bbox_info in enumerate(bounding_boxes):
             bbox = bbox_info.get('bbox', [])
+            rep = representatives[idx]
+            if rep not in selected:
+                captions.append({
+                    'bbox': bbox,
+                    'caption': '',
+                    'confidence': 0.0,
+                    'source': 'skipped_by_plan'
+                })
+                continue
+            if rep != idx:
+                captions.append({**captions[rep], 'bbox': bbox})
+                continue
             
             # Crop the object from the image
             x1, y1, x2, y2 = [int(coord) for coord in bbox]
@@ -109,6 +137,8 @@ class ObjectCaptioner:
     
     def _generate_caption(self, image_crop: np.ndarray, prompt: str = "") -> str:
         """Generate caption for a single image crop using BLIP-2"""
+        import torch
+
         # Convert numpy array to PIL Image
         pil_image = Image.fromarray(image_crop.astype('uint8'))
         
@@ -119,7 +149,7 @@ class ObjectCaptioner:
             inputs = self.processor(images=pil_image, return_tensors="pt").to(self.device)
         
         # Generate caption
-        with torch.no_grad():
+        with torch.no_grad(), self.model_manager.inference_context():
             generated_ids = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens)
         
         # Decode caption
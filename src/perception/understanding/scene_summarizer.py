@@ -7,7 +7,6 @@ import logging
 import re
 
 import numpy as np
-import torch
 from PIL import Image
 
 from perception.config import settings
@@ -206,15 +205,19 @@ class SceneSummarizer:
 
     def _generate_caption(self, pil_image: Image.Image, max_new_tokens: int) -> str:
         """Generate an unprompted caption from BLIP."""
+        import torch
+
         inputs = self.processor(images=pil_image, return_tensors="pt").to(self.device)
-        with torch.no_grad():
+        with torch.no_grad(), self.model_manager.inference_context():
             generated_ids = self.model.generate(**inputs, max_new_tokens=max_new_tokens)
         return self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0].strip()
 
     def _generate_with_prompt(self, pil_image: Image.Image, prompt: str, max_new_tokens: int) -> str:
         """Generate text from BLIP using an image-conditioned prompt."""
+        import torch
+
         inputs = self.processor(images=pil_image, text=prompt, return_tensors="pt").to(self.device)
-        with torch.no_grad():
+        with torch.no_grad(), self.model_manager.inference_context():
             generated_ids = self.model.generate(**inputs, max_new_tokens=max_new_tokens)
         decoded = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0].strip()
         return self._strip_prompt_echo(decoded, prompt)
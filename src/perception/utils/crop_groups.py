@@ -0,0 +1,102 @@
+"""
+Within-image grouping of repeated crops (icons, bullet markers, weekday rows).
+
+Crops that hash alike (pHash and dHash of the normalized grayscale crop), have
+similar box sizes, detector class and mean colour share a group id, so the
+captioner, attribute extractor and icon classifier can process one
+representative per group and fan the result out to every member.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from perception.utils.near_duplicate import dhash, hamming, phash
+
+
+def _crop(image: np.ndarray, bbox: list) -> np.ndarray | None:
+    if not isinstance(bbox, (list, tuple)) or len(bbox) < 4:
+        return None
+    h, w = image.shape[:2]
+    x1, y1, x2, y2 = [int(round(float(v))) for v in bbox[:4]]
+    x1, x2 = max(0, min(x1, x2)), min(w, max(x1, x2))
+    y1, y2 = max(0, min(y1, y2)), min(h, max(y1, y2))
+    if x2 - x1 < 4 or y2 - y1 < 4:
+        return None
+    return image[y1:y2, x1:x2]
+
+
+def group_duplicate_crops(
+    image: np.ndarray,
+    objects: List[Dict[str, Any]],
+    max_hash_distance: int = 4,
+    max_color_delta: float = 20.0,
+    size_tolerance: float = 0.2,
+) -> List[int]:
+    """
+    Group id per object (-1 for objects without a duplicate).
+
+    Ids are consecutive from 0 in order of each group's first member.
+    """
+    signatures = []
+    for obj in objects or []:
+        crop = _crop(image, (obj or {}).get("bbox"))
+        if crop is None:
+            signatures.append(None)
+            continue
+        signatures.append(
+            {
+                "phash": phash(crop),
+                "dhash": dhash(crop),
+                "color": crop.reshape(-1, crop.shape[2] if crop.ndim == 3 else 1).mean(axis=0),
+                "size": (crop.shape[1], crop.shape[0]),
+                "class": str((obj or {}).get("class_name", "")).lower(),
+            }
+        )
+
+    def similar(a: dict, b: dict) -> bool:
+        if a["class"] != b["class"]:
+            return False
+        (aw, ah), (bw, bh) = a["size"], b["size"]
+        if abs(aw - bw) > size_tolerance * max(aw, bw) or abs(ah - bh) > size_tolerance * max(ah, bh):
+            return False
+        if float(np.abs(a["color"] - b["color"]).max()) > max_color_delta:
+            return False
+        return (
+            hamming(a["phash"], b["phash"]) <= max_hash_distance
+            and hamming(a["dhash"], b["dhash"]) <= max_hash_distance
+        )
+
+    representatives: List[int] = []
+    members: Dict[int, List[int]] = {}
+    for idx, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for rep in representatives:
+            if similar(signatures[rep], signature):
+                members[rep].append(idx)
+                break
+        else:
+            representatives.append(idx)
+            members[idx] = [idx]
+
+    group_ids = [-1] * len(signatures)
+    next_id = 0
+    for rep in representatives:
+        if len(members[rep]) < 2:
+            continue
+        for idx in members[rep]:
+            group_ids[idx] = next_id
+        next_id += 1
+    return group_ids
+
+
+def representative_indices(group_ids: List[int] | None, count: int) -> List[int]:
+    """Map every object index to its group's first member (itself when ungrouped)."""
+    reps = list(range(count))
+    first: Dict[int, int] = {}
+    for idx, group_id in enumerate((group_ids or [])[:count]):
+        if group_id is None or int(group_id) < 0:
+            continue
+        reps[idx] = first.setdefault(int(group_id), idx)
+    return reps
@@ -0,0 +1,138 @@
+"""
+Per-image Stage-1 execution planner.
+
+Uses the early CLIP image type and text density to decide which optional
+components run for an image. Rules live in settings.yaml under
+``pipeline.execution_planner``: ``default`` step flags, per-image-type
+``profiles`` overrides and a ``dense_text`` override applied when text covers
+at least ``dense_text_ratio`` of the frame.
+"""
+
+import math
+from typing import Any, Dict, List
+
+PLAN_STEPS = ("face_detection", "sam_segmentation", "icon_semantics", "typography", "vit_detector")
+
+_DEFAULT_RULES = {
+    "face_detection": True,
+    "sam_segmentation": True,
+    "icon_semantics": True,
+    "typography": True,
+    "vit_detector": True,
+    "caption_top_k": 0,
+}
+
+
+def compute_text_density(text_regions: List[Dict[str, Any]], image_shape: tuple) -> float:
+    """Fraction of the image covered by text boxes (rasterized, so overlaps count once)."""
+    h, w = int(image_shape[0]), int(image_shape[1])
+    if h <= 0 or w <= 0 or not text_regions:
+        return 0.0
+    # Coarse occupancy grid keeps this O(regions) regardless of image resolution.
+    grid = 128
+    sx, sy = grid / float(w), grid / float(h)
+    covered = [[False] * grid for _ in range(grid)]
+    for region in text_regions:
+        bbox = (region or {}).get("bbox") or []
+        if len(bbox) < 4:
+            continue
+        x1 = max(0, min(grid, int(math.floor(float(bbox[0]) * sx))))
+        y1 = max(0, min(grid, int(math.floor(float(bbox[1]) * sy))))
+        x2 = max(0, min(grid, int(math.ceil(float(bbox[2]) * sx))))
+        y2 = max(0, min(grid, int(math.ceil(float(bbox[3]) * sy))))
+        for row in covered[y1:y2]:
+            row[x1:x2] = [True] * (x2 - x1)
+    return round(sum(sum(row) for row in covered) / float(grid * grid), 4)
+
+
+def _merge_caption_top_k(current: int, override: int) -> int:
+    """0 means "no cap"; otherwise the tighter cap wins."""
+    current, override = int(current or 0), int(override or 0)
+    if current <= 0:
+        return override
+    if override <= 0:
+        return current
+    return min(current, override)
+
+
+def build_execution_plan(
+    image_type: Dict[str, Any],
+    text_regions: List[Dict[str, Any]],
+    image_shape: tuple,
+    config: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    Build the execution plan recorded in the scene JSON.
+
+    Returns:
+        {
+            "enabled": bool, "profile": str, "image_type": str,
+            "text_density": float, "text_region_count": int, "dense_text": bool,
+            "steps": {step: bool}, "caption_top_k": int, "reasons": [str]
+        }
+    """
+    config = config or {}
+    label = str((image_type or {}).get("type", "") or "").strip().lower()
+    density = compute_text_density(text_regions or [], image_shape)
+    dense_ratio = float(config.get("dense_text_ratio", 0.2))
+    rules = dict(_DEFAULT_RULES)
+    rules.update({k: v for k, v in (config.get("default") or {}).items() if k in _DEFAULT_RULES})
+    reasons: List[str] = []
+    enabled = bool(config.get("enabled", False))
+    dense_text = density >= dense_ratio
+    profile = "default"
+
+    if enabled:
+        profiles = config.get("profiles") or {}
+        if label in profiles:
+            profile = label
+            reasons.append(f"profile:{label}")
+            for key, value in (profiles.get(label) or {}).items():
+                if key == "caption_top_k":
+                    rules[key] = _merge_caption_top_k(rules[key], value)
+                elif key in rules:
+                    rules[key] = value
+        if dense_text:
+            reasons.append(f"dense_text:{density:.2f}>={dense_ratio:.2f}")
+            for key, value in (config.get("dense_text") or {}).items():
+                if key == "caption_top_k":
+                    rules[key] = _merge_caption_top_k(rules[key], value)
+                elif key in rules:
+                    rules[key] = value
+
+    return {
+        "enabled": enabled,
+        "profile": profile,
+        "image_type": label,
+        "text_density": density,
+        "text_region_count": len(text_regions or []),
+        "dense_text": dense_text,
+        "steps": {step: bool(rules[step]) for step in PLAN_STEPS},
+        "caption_top_k": max(0, int(rules.get("caption_top_k") or 0)),
+        "reasons": reasons,
+    }
+
+
+def select_salient_indices(objects: List[Dict[str, Any]], image_shape: tuple, top_k: int) -> List[int]:
+    """
+    Indices of the ``top_k`` most salient objects (all indices when top_k <= 0).
+
+    Salience = detector confidence weighted by sqrt of the area fraction, so large
+    confident objects win over tiny or low-confidence boxes.
+    """
+    indices = list(range(len(objects or [])))
+    if top_k <= 0 or len(indices) <= top_k:
+        return indices
+    h, w = float(image_shape[0]), float(image_shape[1])
+    image_area = max(1.0, h * w)
+
+    def salience(idx: int) -> float:
+        obj = objects[idx] or {}
+        bbox = obj.get("bbox") or []
+        area = 0.0
+        if len(bbox) >= 4:
+            area = max(0.0, float(bbox[2]) - float(bbox[0])) * max(0.0, float(bbox[3]) - float(bbox[1]))
+        return float(obj.get("confidence", 0.0)) * math.sqrt(area / image_area)
+
+    ranked = sorted(indices, key=salience, reverse=True)[:top_k]
+    return sorted(ranked)
@@ -0,0 +1,111 @@
+"""
+Once-per-process model warmup.
+
+Warmup is tied to the model lifecycle rather than to each image: the first time
+a model key is seen its component's ``warmup()`` runs, and later images reuse
+the warm state. Warmup can also be started in a background thread at service
+startup. ``warm_state()`` exposes per-model status for metrics.
+"""
+
+import copy
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_STATE: Dict[str, Dict[str, Any]] = {}
+_KEY_LOCKS: Dict[str, threading.Lock] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _REGISTRY_LOCK:
+        lock = _KEY_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _KEY_LOCKS[key] = lock
+        return lock
+
+
+def ensure_warm(key: str, component: Any, source: str = "foreground") -> bool:
+    """
+    Warm ``component`` once per process for ``key``.
+
+    A failed warmup is recorded and not retried, so a broken model does not add
+    a warmup attempt to every image.
+
+    Returns:
+        True when the model is warm
+    """
+    if component is None or not hasattr(component, "warmup"):
+        return False
+    with _key_lock(key):
+        state = _STATE.get(key)
+        if state is not None:
+            return bool(state.get("warm"))
+        started = time.perf_counter()
+        try:
+            ok = component.warmup() is not False
+        except Exception as e:
+            ok = False
+            logger.warning("Warmup failed for %s: %s", key, e)
+        _STATE[key] = {
+            "warm": bool(ok),
+            "warmup_ms": round((time.perf_counter() - started) * 1000.0, 2),
+            "source": source,
+            "warmed_at": datetime.now().isoformat(),
+        }
+        logger.info("Model warmup %s for %s (%s, %.0fms)", "done" if ok else "failed", key, source, _STATE[key]["warmup_ms"])
+        return bool(ok)
+
+
+def is_warm(key: str) -> bool:
+    """True when ``key`` has been warmed successfully in this process."""
+    return bool((_STATE.get(key) or {}).get("warm"))
+
+
+def warm_state() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of per-model warm state for metrics."""
+    with _REGISTRY_LOCK:
+        return copy.deepcopy(_STATE)
+
+
+def reset_warm_state() -> None:
+    """Forget all warm state (tests, or after models are unloaded)."""
+    with _REGISTRY_LOCK:
+        _STATE.clear()
+
+
+def forget(key: str) -> None:
+    """Forget warm state for one model, e.g. after it is unloaded."""
+    with _REGISTRY_LOCK:
+        _STATE.pop(key, None)
+
+
+def start_background_warmup(
+    loaders: Dict[str, Callable[[], Any]],
+    name: str = "model-warmup",
+) -> threading.Thread:
+    """
+    Load and warm components in a daemon thread.
+
+    Args:
+        loaders: {model_key: callable returning the (cached) component}
+        name: Thread name
+
+    Returns:
+        The started thread; join it to wait for warmup to finish
+    """
+    def run():
+        for key, loader in loaders.items():
+            try:
+                ensure_warm(key, loader(), source="background")
+            except Exception as e:
+                logger.warning("Background warmup could not load %s: %s", key, e)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
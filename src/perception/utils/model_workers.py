@@ -0,0 +1,409 @@
+"""
+Out-of-process hosting for heavy Stage-1 components.
+
+PaddleOCR and the torch models share OpenMP/MKL pools when they run in one
+process, which oversubscribes cores and occasionally deadlocks. A
+``ModelWorkerPool`` starts one spawned process per configured worker group
+(e.g. ``ocr``: text_detector + ocr_engine, ``blip``: scene_summarizer +
+object_captioner), each with its own thread count and, optionally, its own CPU
+set. Components in a group share the worker's models (one BLIP per worker).
+
+Callers get a ``WorkerProxy`` that behaves like the component: method calls
+are forwarded, and attributes are read remotely. Image arguments are copied
+once into ``multiprocessing.shared_memory`` and viewed in the worker without
+another copy. Detection lists come back as packed arrays (``bbox`` as one
+N x 4 array) instead of per-box Python lists.
+"""
+
+import atexit
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPONENT_SPECS = {
+    "text_detector": "perception.detectors.text_detector:TextDetector",
+    "ocr_engine": "perception.ocr.ocr_engine:OCREngine",
+    "object_detector": "perception.detectors.object_detector:ObjectDetector",
+    "scene_summarizer": "perception.understanding.scene_summarizer:SceneSummarizer",
+    "object_captioner": "perception.understanding.object_captioner:ObjectCaptioner",
+}
+
+# Components whose constructor takes the worker's thread count (PaddleOCR reads
+# it when the predictor is built, not from the environment).
+THREADED_COMPONENTS = ("text_detector", "ocr_engine")
+
+_PACKED = "__packed_detections__"
+_SHARED = "__shared_image__"
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def _packable_bboxes(items: list) -> Optional[np.ndarray]:
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    bboxes = [item.get("bbox") for item in items]
+    if not all(isinstance(b, list) and len(b) == 4 for b in bboxes):
+        return None
+    values = [v for b in bboxes for v in b]
+    if all(type(v) is int for v in values):
+        return np.asarray(bboxes, dtype=np.int64)
+    if all(type(v) is float for v in values):
+        return np.asarray(bboxes, dtype=np.float64)
+    return None
+
+
+def pack_result(value: Any) -> Any:
+    """Replace lists of detection dicts with a packed ``bbox`` array plus the remaining fields."""
+    if isinstance(value, list):
+        bboxes = _packable_bboxes(value)
+        if bboxes is not None:
+            rest = [{k: pack_result(v) for k, v in item.items() if k != "bbox"} for item in value]
+            return {_PACKED: True, "bbox": bboxes, "rest": rest}
+        return [pack_result(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(pack_result(item) for item in value)
+    if isinstance(value, dict):
+        return {k: pack_result(v) for k, v in value.items()}
+    return value
+
+
+def unpack_result(value: Any) -> Any:
+    """Inverse of :func:`pack_result`."""
+    if isinstance(value, dict):
+        if value.get(_PACKED):
+            items = []
+            for bbox, rest in zip(value["bbox"].tolist(), value["rest"]):
+                item = {"bbox": bbox}
+                item.update({k: unpack_result(v) for k, v in rest.items()})
+                items.append(item)
+            return items
+        return {k: unpack_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [unpack_result(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(unpack_result(item) for item in value)
+    return value
+
+
+def _share_arrays(args: tuple, kwargs: dict):
+    """Move top-level image arguments into shared memory; returns (args, kwargs, segments)."""
+    segments = []
+
+    def share(value):
+        if not isinstance(value, np.ndarray) or value.ndim < 2:
+            return value
+        array = np.ascontiguousarray(value)
+        segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        segments.append(segment)
+        return {_SHARED: segment.name, "shape": array.shape, "dtype": array.dtype.str}
+
+    return (
+        tuple(share(v) for v in args),
+        {k: share(v) for k, v in kwargs.items()},
+        segments,
+    )
+
+
+def _import_spec(spec: str):
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _configure_worker_threads(threads: int, cpus: List[int]) -> None:
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except OSError as e:
+            logger.warning("Could not pin model worker to CPUs %s: %s", cpus, e)
+    if threads <= 0:
+        return
+    for name in _THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+
+def _apply_loaded_thread_limits(threads: int) -> None:
+    if threads <= 0:
+        return
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    cv2 = sys.modules.get("cv2")
+    if cv2 is not None:
+        cv2.setNumThreads(threads)
+
+
+def _worker_main(conn, specs: Dict[str, str], threads: int, cpus: List[int]) -> None:
+    """Worker loop: build components lazily and serve calls until ``close``."""
+    _configure_worker_threads(threads, cpus)
+    components: Dict[str, Any] = {}
+
+    def component(name):
+        if name not in components:
+            kwargs = {"cpu_threads": threads} if threads > 0 and name in THREADED_COMPONENTS else {}
+            components[name] = _import_spec(specs[name])(**kwargs)
+            _apply_loaded_thread_limits(threads)
+        return components[name]
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        op = message[0]
+        if op == "close":
+            conn.send(("ok", None))
+            break
+        attached = []
+        try:
+            if op == "describe":
+                target = component(message[1])
+                names = [n for n in dir(target) if not n.startswith("__")]
+                result = [n for n in names if callable(getattr(target, n, None))]
+            elif op == "getattr":
+                result = getattr(component(message[1]), message[2])
+            elif op == "call":
+                _, name, method, args, kwargs = message
+
+                def attach(value):
+                    if isinstance(value, dict) and _SHARED in value:
+                        segment = shared_memory.SharedMemory(name=value[_SHARED])
+                        attached.append(segment)
+                        return np.ndarray(tuple(value["shape"]), dtype=np.dtype(value["dtype"]), buffer=segment.buf)
+                    return value
+
+                args = tuple(attach(v) for v in args)
+                kwargs = {k: attach(v) for k, v in kwargs.items()}
+                result = pack_result(getattr(component(name), method)(*args, **kwargs))
+                del args, kwargs
+            else:
+                raise ValueError(f"Unknown worker operation: {op}")
+            reply = ("ok", result)
+        except BaseException as e:
+            reply = ("error", (e, traceback.format_exc()))
+        finally:
+            for segment in attached:
+                try:
+                    segment.close()
+                except BufferError:
+                    # A component kept a view of the image; the mapping is
+                    # released when that reference goes away.
+                    pass
+        try:
+            conn.send(reply)
+        except Exception as e:
+            status, payload = reply
+            conn.send(("error", (RuntimeError(f"Unpicklable worker reply ({status}): {e}"), "")))
+
+
+class ModelWorker:
+    """One spawned process hosting a group of components."""
+
+    def __init__(
+        self,
+        name: str,
+        specs: Dict[str, str],
+        threads: int = 0,
+        cpus: Optional[List[int]] = None,
+        start_method: str = "spawn",
+        timeout_s: float = 600.0,
+    ):
+        self.name = name
+        self.specs = dict(specs)
+        self.threads = int(threads)
+        self.cpus = list(cpus or [])
+        self.timeout_s = float(timeout_s)
+        self._context = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._methods: Dict[str, set] = {}
+        self.calls = 0
+        self.restarts = 0
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        if self._process is not None:
+            self.restarts += 1
+            self._methods.clear()
+            logger.warning("Model worker %s exited (code %s); restarting", self.name, self._process.exitcode)
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.specs, self.threads, self.cpus),
+            name=f"model-worker-{self.name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        logger.info(
+            "Started model worker %s (pid=%s threads=%s cpus=%s components=%s)",
+            self.name,
+            self._process.pid,
+            self.threads or "default",
+            self.cpus or "any",
+            sorted(self.specs),
+        )
+
+    def request(self, message: tuple) -> Any:
+        with self._lock:
+            self._ensure_started()
+            self._conn.send(message)
+            if not self._conn.poll(self.timeout_s):
+                self._process.kill()
+                self._process.join()
+                raise TimeoutError(f"Model worker {self.name} did not answer within {self.timeout_s:.0f}s")
+            try:
+                status, payload = self._conn.recv()
+            except EOFError:
+                raise RuntimeError(f"Model worker {self.name} died while handling {message[0]}") from None
+            self.calls += 1
+        if status == "error":
+            error, remote_traceback = payload
+            if remote_traceback:
+                logger.debug("Model worker %s traceback:\n%s", self.name, remote_traceback)
+            raise error
+        return payload
+
+    def call(self, component: str, method: str, *args, **kwargs) -> Any:
+        args, kwargs, segments = _share_arrays(args, kwargs)
+        try:
+            return unpack_result(self.request(("call", component, method, args, kwargs)))
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def methods(self, component: str) -> set:
+        if component not in self._methods:
+            self._methods[component] = set(self.request(("describe", component)))
+        return self._methods[component]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._process is None:
+                return
+            if self._process.is_alive():
+                try:
+                    self._conn.send(("close",))
+                    if self._conn.poll(5.0):
+                        self._conn.recv()
+                except (OSError, EOFError):
+                    pass
+                self._process.join(5.0)
+                if self._process.is_alive():
+                    self._process.kill()
+                    self._process.join()
+            self._conn.close()
+            self._process = None
+            self._conn = None
+
+
+class WorkerProxy:
+    """Stands in for a component hosted in a :class:`ModelWorker`."""
+
+    def __init__(self, worker: ModelWorker, component: str):
+        self._worker = worker
+        self._component = component
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name in self._worker.methods(self._component):
+            def remote(*args, **kwargs):
+                return self._worker.call(self._component, name, *args, **kwargs)
+
+            remote.__name__ = name
+            return remote
+        return self._worker.request(("getattr", self._component, name))
+
+    def release(self) -> None:
+        """Model-manager eviction hook; the worker keeps serving other components."""
+        return None
+
+    def __repr__(self) -> str:
+        return f"WorkerProxy({self._component!r} in worker {self._worker.name!r})"
+
+
+def _allocate_cpus(groups: Dict[str, Dict[str, Any]], pin: bool) -> Dict[str, List[int]]:
+    if not pin or not hasattr(os, "sched_getaffinity"):
+        return {}
+    available = sorted(os.sched_getaffinity(0))
+    allocation, offset = {}, 0
+    for name, cfg in groups.items():
+        count = int(cfg.get("threads", 0) or 0)
+        if count <= 0 or offset + count > len(available):
+            continue
+        allocation[name] = available[offset:offset + count]
+        offset += count
+    return allocation
+
+
+class ModelWorkerPool:
+    """Worker groups from ``pipeline.model_workers`` and proxies for their components."""
+
+    def __init__(self, config: Dict[str, Any]):
+        groups = {
+            str(name): dict(cfg or {})
+            for name, cfg in (config.get("workers", {}) or {}).items()
+        }
+        cpus = _allocate_cpus(groups, bool(config.get("pin_cpus", True)))
+        self._workers: Dict[str, ModelWorker] = {}
+        self._host: Dict[str, ModelWorker] = {}
+        for name, cfg in groups.items():
+            specs = {}
+            for component in cfg.get("components", []) or []:
+                if component not in COMPONENT_SPECS:
+                    logger.warning("Model worker %s: unknown component %s ignored", name, component)
+                    continue
+                if component in self._host:
+                    logger.warning("Component %s already hosted by worker %s", component, self._host[component].name)
+                    continue
+                specs[component] = COMPONENT_SPECS[component]
+            if not specs:
+                continue
+            worker = ModelWorker(
+                name,
+                specs,
+                threads=int(cfg.get("threads", 0) or 0),
+                cpus=cpus.get(name),
+                start_method=str(config.get("start_method", "spawn")),
+                timeout_s=float(config.get("call_timeout_s", 600)),
+            )
+            self._workers[name] = worker
+            for component in specs:
+                self._host[component] = worker
+        atexit.register(self.shutdown)
+
+    def hosts(self, component: str) -> bool:
+        return component in self._host
+
+    def proxy(self, component: str) -> WorkerProxy:
+        return WorkerProxy(self._host[component], component)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "components": sorted(worker.specs),
+                "threads": worker.threads,
+                "cpus": worker.cpus,
+                "calls": worker.calls,
+                "restarts": worker.restarts,
+            }
+            for name, worker in self._workers.items()
+        }
+
+    def shutdown(self) -> None:
+        for worker in self._workers.values():
+            worker.shutdown()
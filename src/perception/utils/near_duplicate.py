@@ -0,0 +1,370 @@
+"""
+Perceptual-hash near-duplicate index for reusing Stage-1 results.
+
+Previously perceived images are indexed by pHash (DCT) in a BK-tree, with dHash
+as a second check. A close match (resized variant, recompressed JPEG, same
+banner with a different CTA) reuses the cached scene JSON with geometry
+rescaled; ``changed_regions`` locates the parts that differ so only those are
+re-run.
+
+Every entry records the fingerprint of the settings, models and pipeline code
+that produced it; lookups only match entries with the current fingerprint. The
+index keeps at most ``max_entries`` images and evicts the oldest beyond that.
+
+Layout under ``index_dir``:
+    index.jsonl        one entry per indexed image
+    scenes/<key>.json  scene JSON copy
+    thumbs/<key>.png   grayscale thumbnail used for region diffs
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_MAX_SIDE = 256
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bool(bit))
+    return value
+
+
+def phash(image: np.ndarray, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """DCT perceptual hash: sign of low-frequency coefficients against their median."""
+    size = hash_size * highfreq_factor
+    small = cv2.resize(_to_gray(image), (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:hash_size, :hash_size]
+    median = float(np.median(low.flatten()[1:]))
+    return _bits_to_int(low > median)
+
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """Difference hash: horizontal gradient signs of a (hash_size+1) x hash_size thumbnail."""
+    small = cv2.resize(_to_gray(image), (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(int(a) ^ int(b)).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes under Hamming distance."""
+
+    def __init__(self, distance: Callable[[int, int], int] = hamming):
+        self._distance = distance
+        self._root = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, value: Any) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = (key, [value], {})
+            return
+        node = self._root
+        while True:
+            dist = self._distance(key, node[0])
+            if dist == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = (key, [value], {})
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """Return ``(distance, value)`` pairs within ``max_distance``, closest first."""
+        if self._root is None:
+            return []
+        matches = []
+        stack = [self._root]
+        while stack:
+            node_key, values, children = stack.pop()
+            dist = self._distance(key, node_key)
+            if dist <= max_distance:
+                matches.extend((dist, value) for value in values)
+            for child_dist, child in children.items():
+                if dist - max_distance <= child_dist <= dist + max_distance:
+                    stack.append(child)
+        return sorted(matches, key=lambda item: item[0])
+
+
+def thumbnail(image: np.ndarray, max_side: int = THUMBNAIL_MAX_SIDE) -> np.ndarray:
+    gray = _to_gray(image)
+    h, w = gray.shape[:2]
+    scale = min(1.0, float(max_side) / float(max(h, w)))
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def changed_regions(
+    cached_thumbnail: np.ndarray,
+    image: np.ndarray,
+    block_size: int = 8,
+    threshold: float = 24.0,
+) -> List[List[int]]:
+    """
+    Boxes (in ``image`` coordinates) where ``image`` differs from the cached thumbnail.
+
+    The current image is reduced to the thumbnail size and blurred so resize and
+    recompression noise stays under ``threshold`` (mean absolute gray difference
+    per ``block_size`` block); adjacent changed blocks are merged into one box.
+    """
+    th, tw = cached_thumbnail.shape[:2]
+    current = cv2.resize(_to_gray(image), (tw, th), interpolation=cv2.INTER_AREA)
+    diff = cv2.absdiff(
+        cv2.GaussianBlur(current, (3, 3), 0),
+        cv2.GaussianBlur(cached_thumbnail, (3, 3), 0),
+    ).astype(np.float32)
+    block = max(1, int(block_size))
+    rows, cols = (th + block - 1) // block, (tw + block - 1) // block
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    for r in range(rows):
+        for c in range(cols):
+            patch = diff[r * block:(r + 1) * block, c * block:(c + 1) * block]
+            if patch.size and float(patch.mean()) > threshold:
+                mask[r, c] = 1
+    if not mask.any():
+        return []
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    h, w = image.shape[:2]
+    sx, sy = w / float(tw), h / float(th)
+    boxes = []
+    for label in range(1, count):
+        x, y, bw, bh = stats[label][:4]
+        boxes.append(
+            [
+                int(max(0, np.floor(x * block * sx))),
+                int(max(0, np.floor(y * block * sy))),
+                int(min(w, np.ceil((x + bw) * block * sx))),
+                int(min(h, np.ceil((y + bh) * block * sy))),
+            ]
+        )
+    return boxes
+
+
+def _scale_point(point: list, sx: float, sy: float) -> list:
+    return [round(float(point[0]) * sx, 2), round(float(point[1]) * sy, 2)] + list(point[2:])
+
+
+def rescale_scene_geometry(scene_json: Dict[str, Any], sx: float, sy: float) -> Dict[str, Any]:
+    """
+    Deep-copy ``scene_json`` with geometry scaled to a resized image.
+
+    Scales ``bbox``, ``polygon``, ``area_px``, font sizes and ``image_shape``;
+    ``metadata`` is left untouched. Full-resolution ``mask_rle`` masks are
+    dropped when the scale changes.
+    """
+    rescaled = abs(sx - 1.0) > 1e-9 or abs(sy - 1.0) > 1e-9
+
+    def walk(node):
+        if isinstance(node, dict):
+            if rescaled:
+                node.pop("mask_rle", None)
+            for key, value in node.items():
+                if key == "metadata":
+                    continue
+                if key == "bbox" and isinstance(value, list) and len(value) >= 4:
+                    node[key] = [
+                        round(float(value[0]) * sx, 2),
+                        round(float(value[1]) * sy, 2),
+                        round(float(value[2]) * sx, 2),
+                        round(float(value[3]) * sy, 2),
+                    ] + list(value[4:])
+                elif key == "polygon" and isinstance(value, list):
+                    node[key] = [
+                        _scale_point(p, sx, sy)
+                        for p in value
+                        if isinstance(p, (list, tuple)) and len(p) >= 2
+                    ]
+                elif key == "area_px" and isinstance(value, (int, float)):
+                    node[key] = int(round(float(value) * sx * sy))
+                elif key in ("font_size", "avg_font_size") and isinstance(value, (int, float)):
+                    node[key] = round(float(value) * sy, 2)
+                elif key == "image_shape" and isinstance(value, list) and len(value) >= 2:
+                    node[key] = [int(round(value[0] * sy)), int(round(value[1] * sx))] + list(value[2:])
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    scaled = copy.deepcopy(scene_json)
+    walk(scaled)
+    return scaled
+
+
+class NearDuplicateIndex:
+    """Persistent pHash/dHash index over previously perceived images."""
+
+    def __init__(
+        self,
+        index_dir: Path,
+        max_phash_distance: int = 4,
+        max_dhash_distance: int = 6,
+        max_aspect_ratio_delta: float = 0.02,
+        fingerprint: str = "",
+        max_entries: int = 1000,
+    ):
+        self.index_dir = Path(index_dir)
+        self.max_phash_distance = int(max_phash_distance)
+        self.max_dhash_distance = int(max_dhash_distance)
+        self.max_aspect_ratio_delta = float(max_aspect_ratio_delta)
+        self.fingerprint = str(fingerprint or "")
+        self.max_entries = max(1, int(max_entries))
+        self._tree = BKTree()
+        self._keys = set()
+        self._entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.index_dir / "index.jsonl"
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def _load(self) -> None:
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._insert(entry)
+                except (ValueError, KeyError) as e:
+                    logger.warning("Skipping malformed near-duplicate index entry: %s", e)
+        if len(self._entries) > self.max_entries:
+            self._evict()
+        logger.info("Near-duplicate index loaded: %d image(s) from %s", len(self._tree), self.index_dir)
+
+    def _insert(self, entry: Dict[str, Any]) -> None:
+        if entry["key"] in self._keys:
+            return
+        phash_value = int(entry["phash"], 16)
+        self._keys.add(entry["key"])
+        self._entries.append(entry)
+        self._tree.add(phash_value, entry)
+
+    def _evict(self) -> None:
+        """Drop the oldest entries beyond ``max_entries`` and rewrite the index file."""
+        evicted = self._entries[: len(self._entries) - self.max_entries]
+        self._entries = self._entries[len(evicted):]
+        for entry in evicted:
+            for rel in (entry.get("scene"), entry.get("thumbnail")):
+                if rel:
+                    (self.index_dir / rel).unlink(missing_ok=True)
+        self._keys = {entry["key"] for entry in self._entries}
+        self._tree = BKTree()
+        for entry in self._entries:
+            self._tree.add(int(entry["phash"], 16), entry)
+        tmp_path = self._index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry) + "\n")
+        tmp_path.replace(self._index_path)
+        logger.info("Near-duplicate index evicted %d old image(s)", len(evicted))
+
+    def lookup(self, image: np.ndarray) -> Dict[str, Any] | None:
+        """
+        Closest indexed near-duplicate of ``image``.
+
+        Returns:
+            {"entry": dict, "phash_distance": int, "dhash_distance": int} or None
+        """
+        if not len(self._tree):
+            return None
+        h, w = image.shape[:2]
+        query_phash, query_dhash = phash(image), dhash(image)
+        best = None
+        for phash_distance, entry in self._tree.search(query_phash, self.max_phash_distance):
+            if entry.get("fingerprint", "") != self.fingerprint:
+                continue
+            dhash_distance = hamming(query_dhash, int(entry["dhash"], 16))
+            if dhash_distance > self.max_dhash_distance:
+                continue
+            aspect = (w / float(h)) / (float(entry["width"]) / float(entry["height"]))
+            if abs(aspect - 1.0) > self.max_aspect_ratio_delta:
+                continue
+            if not (self.index_dir / entry["scene"]).exists():
+                continue
+            score = phash_distance + dhash_distance
+            if best is None or score < best[0]:
+                best = (score, {"entry": entry, "phash_distance": phash_distance, "dhash_distance": dhash_distance})
+        return best[1] if best else None
+
+    def add(self, image: np.ndarray, scene_json: Dict[str, Any], image_path: str) -> Dict[str, Any] | None:
+        """Index ``image`` with its scene JSON; exact duplicates are indexed once per fingerprint."""
+        digest = hashlib.sha256(np.ascontiguousarray(image).tobytes())
+        digest.update(self.fingerprint.encode("utf-8"))
+        key = digest.hexdigest()[:16]
+        with self._lock:
+            if key in self._keys:
+                return None
+            scenes_dir, thumbs_dir = self.index_dir / "scenes", self.index_dir / "thumbs"
+            scenes_dir.mkdir(parents=True, exist_ok=True)
+            thumbs_dir.mkdir(parents=True, exist_ok=True)
+            h, w = image.shape[:2]
+            entry = {
+                "key": key,
+                "phash": format(phash(image), "016x"),
+                "dhash": format(dhash(image), "016x"),
+                "width": int(w),
+                "height": int(h),
+                "image_path": str(image_path),
+                "scene": f"scenes/{key}.json",
+                "thumbnail": f"thumbs/{key}.png",
+                "indexed_at": datetime.now().isoformat(),
+                "fingerprint": self.fingerprint,
+            }
+            with open(self.index_dir / entry["scene"], "w", encoding="utf-8") as f:
+                json.dump(scene_json, f, ensure_ascii=False)
+            cv2.imwrite(str(self.index_dir / entry["thumbnail"]), thumbnail(image))
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._insert(entry)
+            if len(self._entries) > self.max_entries:
+                self._evict()
+            return entry
+
+    def load_scene(self, entry: Dict[str, Any]) -> Dict[str, Any] | None:
+        try:
+            with open(self.index_dir / entry["scene"], "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Cached scene for near-duplicate %s unreadable: %s", entry.get("key"), e)
+            return None
+
+    def load_thumbnail(self, entry: Dict[str, Any]) -> np.ndarray | None:
+        path = self.index_dir / str(entry.get("thumbnail", ""))
+        if not path.is_file():
+            return None
+        return cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
@@ -0,0 +1,193 @@
+"""
+Small dependency-graph executor for Stage-1 perception tasks.
+
+Each task declares the tasks it depends on; a task starts as soon as its
+dependencies finish, so independent components (e.g. face detection and image
+classification, or YOLO and BLIP scene summarization) overlap and wall time
+approaches the critical path. Tasks may carry a torch intra-op thread limit so
+concurrent tasks do not oversubscribe the CPU. torch's thread count is
+process-wide, so the limit is exact only while one task runs at a time
+(sequential mode, or each worker in process mode); overlapping thread-mode tasks
+share whichever limit was set last. PaddleOCR threads are not managed here; they
+are fixed when the OCR engines are built (``cpu_threads``).
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process", "sequential")
+
+
+class StageTask:
+    """
+    One node of the Stage-1 graph.
+
+    ``fn`` is called with ``{dep_name: dep_result}`` and returns the task result.
+    In process mode ``fn`` and the dependency results must be picklable.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], deps=(), threads: int = 0):
+        self.name = str(name)
+        self.fn = fn
+        self.deps = tuple(deps or ())
+        self.threads = max(0, int(threads or 0))
+
+
+def topological_order(tasks: List[StageTask]) -> List[str]:
+    """Return task names in dependency order (stable w.r.t. declaration order)."""
+    by_name = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Duplicate task name: {task.name}")
+        by_name[task.name] = task
+    for task in tasks:
+        missing = [dep for dep in task.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Task '{task.name}' depends on unknown task(s): {missing}")
+    order: List[str] = []
+    done = set()
+    pending = [task.name for task in tasks]
+    while pending:
+        ready = [name for name in pending if all(dep in done for dep in by_name[name].deps)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among tasks: {pending}")
+        for name in ready:
+            order.append(name)
+            done.add(name)
+        pending = [name for name in pending if name not in done]
+    return order
+
+
+def _get_torch_threads() -> int:
+    try:
+        import torch
+
+        return int(torch.get_num_threads())
+    except Exception:
+        return 0
+
+
+def _set_torch_threads(threads: int) -> None:
+    if threads <= 0:
+        return
+    try:
+        import torch
+
+        # Sets the process-wide intra-op (OpenMP/MKL) thread count, not a
+        # per-thread limit: overlapping tasks see the most recent value.
+        torch.set_num_threads(int(threads))
+    except Exception as e:
+        logger.debug("Could not set torch thread limit %s: %s", threads, e)
+
+
+def _run_task(fn: Callable, deps: Dict[str, Any], threads: int, restore: bool = True) -> Tuple[Any, float]:
+    previous = _get_torch_threads() if threads > 0 and restore else 0
+    _set_torch_threads(threads)
+    started = time.perf_counter()
+    try:
+        return fn(deps), (time.perf_counter() - started) * 1000.0
+    finally:
+        _set_torch_threads(previous)
+
+
+def _critical_path_ms(tasks: List[StageTask], order: List[str], durations: Dict[str, float]) -> float:
+    by_name = {task.name: task for task in tasks}
+    finish: Dict[str, float] = {}
+    for name in order:
+        start = max((finish[dep] for dep in by_name[name].deps), default=0.0)
+        finish[name] = start + durations.get(name, 0.0)
+    return max(finish.values(), default=0.0)
+
+
+def run_task_graph(
+    tasks: List[StageTask],
+    max_workers: int = 4,
+    mode: str = "thread",
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run ``tasks`` respecting dependencies.
+
+    Args:
+        tasks: Graph nodes
+        max_workers: Pool size; <= 1 runs sequentially in dependency order
+        mode: "thread", "process" or "sequential"
+
+    Returns:
+        (results, timing) where results maps task name to its return value and
+        timing = {"mode", "max_workers", "wall_ms", "critical_path_ms",
+                  "tasks": {name: {"start_ms", "duration_ms", "threads"}}}
+
+    The first task exception cancels tasks that have not started and is re-raised.
+    """
+    mode = str(mode or "thread").strip().lower()
+    if mode not in EXECUTOR_MODES:
+        logger.warning("Unknown stage executor mode '%s'; using thread", mode)
+        mode = "thread"
+    max_workers = max(1, int(max_workers or 1))
+    if max_workers == 1:
+        mode = "sequential"
+    order = topological_order(tasks)
+    by_name = {task.name: task for task in tasks}
+    results: Dict[str, Any] = {}
+    task_timing: Dict[str, Dict[str, float]] = {}
+    graph_start = time.perf_counter()
+
+    def deps_of(name: str) -> Dict[str, Any]:
+        return {dep: results[dep] for dep in by_name[name].deps}
+
+    def record(name: str, started: float, duration_ms: float) -> None:
+        task_timing[name] = {
+            "start_ms": round((started - graph_start) * 1000.0, 2),
+            "duration_ms": round(duration_ms, 2),
+            "threads": by_name[name].threads,
+        }
+
+    if mode == "sequential":
+        for name in order:
+            started = time.perf_counter()
+            results[name], duration_ms = _run_task(by_name[name].fn, deps_of(name), by_name[name].threads)
+            record(name, started, duration_ms)
+    else:
+        pool_cls = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        # Overlapping pool threads would restore each other's limits out of order,
+        # so thread mode restores the caller's thread count once, after the graph.
+        per_task_restore = mode == "process"
+        baseline = 0 if per_task_restore else _get_torch_threads()
+        try:
+            with pool_cls(max_workers=max_workers) as pool:
+                running = {}
+                remaining = list(order)
+                while remaining or running:
+                    for name in [n for n in remaining if all(dep in results for dep in by_name[n].deps)]:
+                        remaining.remove(name)
+                        future = pool.submit(
+                            _run_task, by_name[name].fn, deps_of(name), by_name[name].threads, per_task_restore
+                        )
+                        running[future] = (name, time.perf_counter())
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name, started = running.pop(future)
+                        try:
+                            results[name], duration_ms = future.result()
+                        except Exception:
+                            for other in running:
+                                other.cancel()
+                            raise
+                        record(name, started, duration_ms)
+        finally:
+            if any(task.threads for task in tasks):
+                _set_torch_threads(baseline)
+
+    durations = {name: timing["duration_ms"] for name, timing in task_timing.items()}
+    timing = {
+        "mode": mode,
+        "max_workers": max_workers,
+        "wall_ms": round((time.perf_counter() - graph_start) * 1000.0, 2),
+        "critical_path_ms": round(_critical_path_ms(tasks, order, durations), 2),
+        "tasks": task_timing,
+    }
+    return results, timing
@@ -0,0 +1,252 @@
+"""
+Overlapping tile helpers for running detectors/OCR on very large images.
+
+Tiles are numpy views into the source image, so per-batch memory is bounded by
+``tile_size`` and ``batch_size`` rather than by the full poster resolution.
+"""
+
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+TileBox = Tuple[int, int, int, int]
+
+_SEAM_KEY = "_tile_seam_fragment"
+
+
+def should_tile(image_shape: tuple, enabled: bool, min_image_side: int) -> bool:
+    """True when tiling is enabled and the longer image side reaches ``min_image_side``."""
+    if not enabled:
+        return False
+    h, w = image_shape[:2]
+    return max(h, w) >= int(min_image_side)
+
+
+def _axis_starts(length: int, tile: int, stride: int) -> List[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, stride))
+    starts.append(length - tile)
+    return sorted(set(starts))
+
+
+def plan_tiles(height: int, width: int, tile_size: int, overlap: int) -> List[TileBox]:
+    """
+    Cover an image with ``tile_size`` squares overlapping by ``overlap`` pixels.
+
+    The last row/column is aligned to the image edge so every tile is full size
+    (except when the image itself is smaller than a tile).
+    """
+    tile = max(1, int(tile_size))
+    stride = max(1, tile - max(0, int(overlap)))
+    tiles = []
+    for y0 in _axis_starts(height, tile, stride):
+        for x0 in _axis_starts(width, tile, stride):
+            tiles.append((x0, y0, min(width, x0 + tile), min(height, y0 + tile)))
+    return tiles
+
+
+def iter_tile_batches(
+    image: np.ndarray, tiles: List[TileBox], batch_size: int
+) -> Iterator[List[Tuple[TileBox, np.ndarray]]]:
+    """Yield lists of ``(tile_box, tile_view)`` with at most ``batch_size`` tiles each."""
+    size = max(1, int(batch_size))
+    for start in range(0, len(tiles), size):
+        yield [
+            ((x0, y0, x1, y1), image[y0:y1, x0:x1])
+            for x0, y0, x1, y1 in tiles[start : start + size]
+        ]
+
+
+def offset_detection(detection: dict, dx: float, dy: float) -> dict:
+    """Shift a tile-local detection (bbox and optional polygon) into image coordinates."""
+    shifted = dict(detection)
+    bbox = shifted.get("bbox")
+    if isinstance(bbox, (list, tuple)) and len(bbox) >= 4:
+        shifted["bbox"] = [
+            float(bbox[0]) + dx,
+            float(bbox[1]) + dy,
+            float(bbox[2]) + dx,
+            float(bbox[3]) + dy,
+        ]
+    polygon = shifted.get("polygon")
+    if isinstance(polygon, (list, tuple)):
+        shifted["polygon"] = [
+            [float(p[0]) + dx, float(p[1]) + dy]
+            for p in polygon
+            if isinstance(p, (list, tuple)) and len(p) >= 2
+        ]
+    return shifted
+
+
+def tile_detections_to_image(
+    detections: List[dict], tile_box: TileBox, image_shape: tuple, edge_margin: float = 2.0
+) -> List[dict]:
+    """
+    Map tile-local detections back to image coordinates.
+
+    Detections touching an interior tile edge (one shared with a neighbouring tile,
+    not the image border) are flagged as seam fragments for ``merge_tiled_detections``.
+    """
+    x0, y0, x1, y1 = tile_box
+    h, w = image_shape[:2]
+    mapped = []
+    for det in detections or []:
+        shifted = offset_detection(det, x0, y0)
+        bbox = shifted.get("bbox") or []
+        if len(bbox) >= 4:
+            shifted[_SEAM_KEY] = bool(
+                (x0 > 0 and bbox[0] - x0 <= edge_margin)
+                or (y0 > 0 and bbox[1] - y0 <= edge_margin)
+                or (x1 < w and x1 - bbox[2] <= edge_margin)
+                or (y1 < h and y1 - bbox[3] <= edge_margin)
+            )
+        mapped.append(shifted)
+    return mapped
+
+
+def _area(box: list) -> float:
+    return max(0.0, float(box[2]) - float(box[0])) * max(0.0, float(box[3]) - float(box[1]))
+
+
+def _overlap_stats(box_a: list, box_b: list) -> Tuple[float, float]:
+    """Return (IoU, intersection over the smaller box)."""
+    ix1, iy1 = max(float(box_a[0]), float(box_b[0])), max(float(box_a[1]), float(box_b[1]))
+    ix2, iy2 = min(float(box_a[2]), float(box_b[2])), min(float(box_a[3]), float(box_b[3]))
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    if inter <= 0.0:
+        return 0.0, 0.0
+    area_a, area_b = _area(box_a), _area(box_b)
+    union = area_a + area_b - inter
+    smaller = min(area_a, area_b)
+    return (inter / union if union > 0 else 0.0), (inter / smaller if smaller > 0 else 0.0)
+
+
+def _overlap_text(left: str, right: str) -> str:
+    """Join two OCR fragments, dropping the longest suffix of ``left`` repeated at the start of ``right``."""
+    left, right = left.rstrip(), right.lstrip()
+    for k in range(min(len(left), len(right)), 0, -1):
+        if left.endswith(right[:k]):
+            return left + right[k:]
+    return f"{left} {right}".strip()
+
+
+def _same_line(a: dict, b: dict, min_vertical_overlap: float) -> bool:
+    """True when ``b`` continues ``a`` to the right on the same baseline and the boxes meet."""
+    ab, bb = a["bbox"], b["bbox"]
+    ha = float(ab[3]) - float(ab[1])
+    hb = float(bb[3]) - float(bb[1])
+    if ha <= 0 or hb <= 0 or min(ha, hb) / max(ha, hb) < min_vertical_overlap:
+        return False
+    v_overlap = min(float(ab[3]), float(bb[3])) - max(float(ab[1]), float(bb[1]))
+    if v_overlap / min(ha, hb) < min_vertical_overlap:
+        return False
+    # Neighbouring tiles overlap, so a seam-split line's fragments share pixels.
+    return float(ab[0]) < float(bb[0]) <= float(ab[2]) < float(bb[2])
+
+
+def join_seam_line_fragments(
+    lines: List[dict], text_key: str | None = "text", min_vertical_overlap: float = 0.6
+) -> List[dict]:
+    """
+    Join text lines cut by a vertical tile seam into one line.
+
+    Fragments sharing a baseline, overlapping horizontally and carrying the seam flag
+    are replaced by a single line whose bbox (and rectangular polygon) is the union,
+    whose text drops the characters both fragments read in the overlap, and whose
+    confidence is the lower of the two.
+    """
+    pending = sorted((dict(line) for line in lines), key=lambda d: float(d["bbox"][0]))
+    joined: List[dict] = []
+    for line in pending:
+        target = None
+        if line.get(_SEAM_KEY):
+            for existing in joined:
+                if existing.get(_SEAM_KEY) and _same_line(existing, line, min_vertical_overlap):
+                    target = existing
+                    break
+        if target is None:
+            joined.append(line)
+            continue
+        a, b = target["bbox"], line["bbox"]
+        x1, y1 = min(float(a[0]), float(b[0])), min(float(a[1]), float(b[1]))
+        x2, y2 = max(float(a[2]), float(b[2])), max(float(a[3]), float(b[3]))
+        target["bbox"] = [x1, y1, x2, y2]
+        if "polygon" in target or "polygon" in line:
+            target["polygon"] = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+        if text_key and (text_key in target or text_key in line):
+            target[text_key] = _overlap_text(str(target.get(text_key, "")), str(line.get(text_key, "")))
+        if "confidence" in target or "confidence" in line:
+            target["confidence"] = min(
+                float(target.get("confidence", 1.0)), float(line.get("confidence", 1.0))
+            )
+    return joined
+
+
+def merge_tiled_detections(
+    detections: List[dict],
+    iou_threshold: float = 0.5,
+    containment_threshold: float = 0.8,
+    class_key: str | None = "class_name",
+    prefer: str = "confidence",
+    join_lines: bool = False,
+    text_key: str | None = "text",
+) -> List[dict]:
+    """
+    Merge duplicates produced by overlapping tiles (and the optional global pass).
+
+    Two detections are duplicates when they share ``class_key`` (ignored when None)
+    and either their IoU reaches ``iou_threshold`` or the smaller one is a seam
+    fragment (see ``tile_detections_to_image``) mostly contained in the other.
+
+    prefer:
+        "confidence" - keep the most confident detection; when a seam fragment is
+                       involved its bbox grows to the union (object detections).
+        "area"       - keep the largest detection (OCR lines: the uncut line wins).
+
+    join_lines:
+        After de-duplication, join text lines that a seam cut into left/right
+        fragments (see ``join_seam_line_fragments``); ``text_key`` names the text field.
+    """
+    def rank(det: dict) -> tuple:
+        bbox = det.get("bbox") or [0, 0, 0, 0]
+        if prefer == "area":
+            return (_area(bbox), float(det.get("confidence", 0.0)))
+        return (float(det.get("confidence", 0.0)), _area(bbox))
+
+    ordered = sorted(
+        (d for d in detections if isinstance(d.get("bbox"), (list, tuple)) and len(d["bbox"]) >= 4),
+        key=rank,
+        reverse=True,
+    )
+    kept: List[dict] = []
+    for det in ordered:
+        det_cls = str(det.get(class_key, "")).lower() if class_key else ""
+        duplicate_of = None
+        for existing in kept:
+            if class_key and str(existing.get(class_key, "")).lower() != det_cls:
+                continue
+            iou, containment = _overlap_stats(existing["bbox"], det["bbox"])
+            smaller = det if _area(det["bbox"]) <= _area(existing["bbox"]) else existing
+            if iou >= iou_threshold or (
+                smaller.get(_SEAM_KEY) and containment >= containment_threshold
+            ):
+                duplicate_of = existing
+                break
+        if duplicate_of is None:
+            kept.append(dict(det))
+            continue
+        if prefer == "confidence" and (duplicate_of.get(_SEAM_KEY) or det.get(_SEAM_KEY)):
+            a, b = duplicate_of["bbox"], det["bbox"]
+            duplicate_of[_SEAM_KEY] = bool(duplicate_of.get(_SEAM_KEY) and det.get(_SEAM_KEY))
+            duplicate_of["bbox"] = [
+                min(float(a[0]), float(b[0])),
+                min(float(a[1]), float(b[1])),
+                max(float(a[2]), float(b[2])),
+                max(float(a[3]), float(b[3])),
+            ]
+    if join_lines:
+        kept = join_seam_line_fragments(kept, text_key=text_key)
+    for det in kept:
+        det.pop(_SEAM_KEY, None)
+    return kept
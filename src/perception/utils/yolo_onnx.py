@@ -0,0 +1,202 @@
+"""
+ONNX Runtime helpers for the YOLO object detector.
+
+The torch/ultralytics path stays the reference implementation; this module only
+provides the export cache layout and a CPU inference session whose output is
+decoded into the same boxes/scores/classes the ultralytics predictor returns.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LETTERBOX_PAD_VALUE = 114
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def weights_fingerprint(weights_path: Path) -> str:
+    """Return a short content hash of a weights file (stable across renames)."""
+    digest = hashlib.sha256()
+    with open(weights_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def onnx_export_path(weights_path: Path, cache_dir: Path, image_size: int) -> Path:
+    """
+    Location of the exported ONNX graph for a weights file and input size.
+
+    Keyed by weights hash and imgsz so a changed checkpoint or resolution never
+    reuses a stale export.
+    """
+    weights_path = Path(weights_path)
+    fingerprint = weights_fingerprint(weights_path)
+    return Path(cache_dir) / "onnx" / f"{weights_path.stem}_{fingerprint}_{int(image_size)}.onnx"
+
+
+def letterbox(image: np.ndarray, image_size: int) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """
+    Resize keeping aspect ratio and pad to a square ``image_size`` canvas.
+
+    Returns:
+        (padded image, scale ratio, (pad_x, pad_y))
+    """
+    h, w = image.shape[:2]
+    ratio = min(image_size / h, image_size / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_x = (image_size - new_w) / 2.0
+    pad_y = (image_size - new_h) / 2.0
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    padded = cv2.copyMakeBorder(
+        image,
+        top,
+        bottom,
+        left,
+        right,
+        cv2.BORDER_CONSTANT,
+        value=(_LETTERBOX_PAD_VALUE,) * 3,
+    )
+    return padded, ratio, (float(left), float(top))
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy NMS over xyxy boxes; returns kept indices sorted by score."""
+    order = scores.argsort()[::-1]
+    areas = np.maximum(0.0, boxes[:, 2] - boxes[:, 0]) * np.maximum(0.0, boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        if order.size == 1:
+            break
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+        union = areas[i] + areas[rest] - inter
+        iou = np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def decode_yolo_output(
+    output: np.ndarray,
+    ratio: float,
+    pad: Tuple[float, float],
+    orig_shape: Tuple[int, int],
+    conf_threshold: float,
+    iou_threshold: float,
+    max_det: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode a raw YOLOv8 head ``(1, 4 + num_classes, anchors)`` into detections.
+
+    Applies class-aware NMS (same as the ultralytics default) and maps boxes back
+    from letterboxed input space to original image pixels.
+
+    Returns:
+        (boxes xyxy float32 [N, 4], scores float32 [N], class ids int64 [N])
+    """
+    preds = np.asarray(output)
+    if preds.ndim == 3:
+        preds = preds[0]
+    preds = preds.T  # (anchors, 4 + num_classes)
+    empty = (
+        np.zeros((0, 4), dtype=np.float32),
+        np.zeros((0,), dtype=np.float32),
+        np.zeros((0,), dtype=np.int64),
+    )
+    if preds.size == 0:
+        return empty
+    class_scores = preds[:, 4:]
+    class_ids = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(class_scores.shape[0]), class_ids]
+    mask = scores >= conf_threshold
+    if not np.any(mask):
+        return empty
+    cxcywh = preds[mask, :4]
+    scores = scores[mask]
+    class_ids = class_ids[mask]
+
+    boxes = np.empty_like(cxcywh)
+    boxes[:, 0] = cxcywh[:, 0] - cxcywh[:, 2] / 2.0
+    boxes[:, 1] = cxcywh[:, 1] - cxcywh[:, 3] / 2.0
+    boxes[:, 2] = cxcywh[:, 0] + cxcywh[:, 2] / 2.0
+    boxes[:, 3] = cxcywh[:, 1] + cxcywh[:, 3] / 2.0
+
+    # Offset boxes per class so a single NMS pass never suppresses across classes.
+    offset = class_ids.astype(boxes.dtype)[:, None] * (float(boxes.max()) + 1.0)
+    keep = _nms(boxes + offset, scores, iou_threshold)[: max(0, int(max_det))]
+    boxes, scores, class_ids = boxes[keep], scores[keep], class_ids[keep]
+
+    pad_x, pad_y = pad
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_x) / ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_y) / ratio
+    h, w = orig_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+    return boxes.astype(np.float32), scores.astype(np.float32), class_ids.astype(np.int64)
+
+
+class YoloOnnxSession:
+    """CPU ONNX Runtime session for an exported YOLOv8 graph."""
+
+    def __init__(self, onnx_path: Path, image_size: int, intra_op_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if int(intra_op_threads) > 0:
+            options.intra_op_num_threads = int(intra_op_threads)
+        options.inter_op_num_threads = 1
+        self.onnx_path = Path(onnx_path)
+        self.image_size = int(image_size)
+        self.intra_op_threads = int(intra_op_threads)
+        self.session = ort.InferenceSession(
+            str(self.onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        logger.info(
+            "YOLO ONNX session ready: %s (imgsz=%d, intra_op_threads=%s)",
+            self.onnx_path.name,
+            self.image_size,
+            self.intra_op_threads or "default",
+        )
+
+    def predict(
+        self,
+        image: np.ndarray,
+        conf_threshold: float,
+        iou_threshold: float,
+        max_det: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run one image and return (boxes, scores, class ids) in original pixels."""
+        padded, ratio, pad = letterbox(image, self.image_size)
+        # Ultralytics treats numpy input as BGR and flips to RGB; mirror that for parity.
+        blob = padded[..., ::-1].transpose(2, 0, 1)
+        blob = np.ascontiguousarray(blob, dtype=np.float32)[None] / 255.0
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return decode_yolo_output(
+            output,
+            ratio=ratio,
+            pad=pad,
+            orig_shape=image.shape[:2],
+            conf_threshold=conf_threshold,
+            iou_threshold=iou_threshold,
+            max_det=max_det,
+        )
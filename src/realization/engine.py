@@ -790,17 +790,36 @@ class RealizationEngine:
         except Exception:
             return False
 
+    @staticmethod
+    def _load_clip_components(model_name: str):
+        import torch
+        from transformers import CLIPModel, CLIPProcessor
+
+        from src.utilities.weight_cache import hf_fingerprint, hf_skeleton, load_module_mmap
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model = load_module_mmap(
+            model_name,
+            lambda: CLIPModel.from_pretrained(model_name),
+            skeleton_fn=hf_skeleton(CLIPModel, model_name),
+            fingerprint=lambda: hf_fingerprint(model_name),
+        ).to(device)
+        processor = CLIPProcessor.from_pretrained(model_name)
+        return (model, processor, device)
+
     def _get_clip_components(self):
+        # None: not tried yet; (): unavailable. Loaded models live in the shared
+        # model manager so they count against its memory budget.
         if self._clip_components is not None:
             return self._clip_components
+        model_name = self._quality_gate_config.get("clip_model_name", "openai/clip-vit-base-patch32")
         try:
-            import torch
-            from transformers import CLIPModel, CLIPProcessor
-            model_name = self._quality_gate_config.get("clip_model_name", "openai/clip-vit-base-patch32")
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            model = CLIPModel.from_pretrained(model_name).to(device)
-            processor = CLIPProcessor.from_pretrained(model_name)
-            self._clip_components = (model, processor, device)
+            from src.utilities.model_manager import get_model_manager
+
+            return get_model_manager().get(
+                f"clip_quality_gate:{model_name}",
+                lambda: self._load_clip_components(model_name),
+            )
         except Exception:
             self._clip_components = ()
         return self._clip_components
@@ -4,26 +4,43 @@ from typing import List
 
 logger = logging.getLogger(__name__)
 
-_CLIP_COMPONENTS = None
+_CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+_CLIP_UNAVAILABLE = False
+
+
+def _load_clip_components():
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+
+    from src.realization.config_loader import load_realization_config
+    from src.utilities.model_precision import load_model_with_precision
+    from src.utilities.weight_cache import hf_skeleton
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, precision = load_model_with_precision(
+        lambda: CLIPModel.from_pretrained(_CLIP_MODEL_NAME),
+        model_name=_CLIP_MODEL_NAME,
+        mode=load_realization_config().get("model_precision", "fp32"),
+        device=device,
+        skeleton_fn=hf_skeleton(CLIPModel, _CLIP_MODEL_NAME),
+    )
+    model = model.to(device)
+    processor = CLIPProcessor.from_pretrained(_CLIP_MODEL_NAME)
+    return (model, processor, device, precision)
 
 
 def _get_clip_components():
-    global _CLIP_COMPONENTS
-    if _CLIP_COMPONENTS is not None:
-        return _CLIP_COMPONENTS
+    global _CLIP_UNAVAILABLE
+    if _CLIP_UNAVAILABLE:
+        return ()
     try:
-        import torch
-        from transformers import CLIPModel, CLIPProcessor
+        from src.utilities.model_manager import get_model_manager
 
-        model_name = "openai/clip-vit-base-patch32"
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = CLIPModel.from_pretrained(model_name).to(device)
-        processor = CLIPProcessor.from_pretrained(model_name)
-        _CLIP_COMPONENTS = (model, processor, device)
+        return get_model_manager().get(f"clip_metrics:{_CLIP_MODEL_NAME}", _load_clip_components)
     except Exception as exc:
         logger.debug("CLIP metrics unavailable: %s", exc)
-        _CLIP_COMPONENTS = ()
-    return _CLIP_COMPONENTS
+        _CLIP_UNAVAILABLE = True
+        return ()
 
 
 def _clip_image_text_similarity(image_path: str, text: str) -> float:
@@ -34,14 +51,18 @@ def _clip_image_text_similarity(image_path: str, text: str) -> float:
         import torch
         from PIL import Image
 
-        model, processor, device = comps
+        from src.utilities.model_precision import inference_autocast
+
+        model, processor, device, precision = comps
         image = Image.open(image_path).convert("RGB")
         inputs = processor(images=image, text=[text], return_tensors="pt", padding=True).to(device)
-        with torch.no_grad():
+        with torch.no_grad(), inference_autocast(precision, device):
             image_features = model.get_image_features(pixel_values=inputs["pixel_values"])
             text_features = model.get_text_features(
                 input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"]
             )
+            image_features = image_features.float()
+            text_features = text_features.float()
             image_features = image_features / image_features.norm(dim=-1, keepdim=True)
             text_features = text_features / text_features.norm(dim=-1, keepdim=True)
             sim = float((image_features * text_features).sum().item())
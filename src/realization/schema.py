@@ -1,5 +1,6 @@
 import json
 from src.realization.models import EditPlan
+from src.utilities.scene_sidecar import resolve_geometry
 
 
 def _norm_label(value: str) -> str:
@@ -111,10 +112,11 @@ def adapt_plan_to_edit_format(plan_data: dict) -> dict:
                 "constraints": {
                     "visual_attributes": visual_attributes,
                     "scene_adaptation": edit_plan.get("scene_adaptation"),
-                    "polygon": (
+                    "polygon": resolve_geometry(
                         (obj.get("segmentation") or {}).get("polygon")
                         if isinstance(obj.get("segmentation"), dict)
-                        else obj.get("polygon")
+                        else obj.get("polygon"),
+                        plan_data,
                     ),
                 },
             })
@@ -141,7 +143,7 @@ def adapt_plan_to_edit_format(plan_data: dict) -> dict:
                 "constraints": {
                     "visual_attributes": region.get("visual_attributes"),
                     "scene_adaptation": edit_plan.get("scene_adaptation"),
-                    "polygon": region.get("polygon"),
+                    "polygon": resolve_geometry(region.get("polygon"), plan_data),
                 },
             })
         return {
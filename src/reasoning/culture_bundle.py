@@ -0,0 +1,106 @@
+"""
+Per-target-culture data compiled once per engine.
+
+Style priors, sensitivity notes, scene candidates, the avoid list and the
+per-type KB candidate pools depend only on the target culture. Before this,
+``analyze_image`` fetched them again for every object.
+:class:`CultureBundle` fetches them once; per-object reasoning then only does
+lookups. :class:`AvoidMatcher` replaces the per-candidate double loop of
+``_filter_candidates_by_avoid`` with one lookahead regex plus a substring
+search.
+"""
+
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_AVOID_SEPARATOR = "\x00"
+_MAX_AVOID_MATCHERS = 32
+
+
+class AvoidMatcher:
+    """
+    Finds the first avoid entry (in list order) that contains a candidate or is
+    contained in it, case-insensitively, like the former nested loops.
+    """
+
+    def __init__(self, avoid_list: Sequence[str]):
+        self.avoid_list = [str(a) for a in avoid_list]
+        lowered = [a.lower() for a in self.avoid_list]
+        self._first_index: Dict[str, int] = {}
+        for i, text in enumerate(lowered):
+            self._first_index.setdefault(text, i)
+        # Entries found inside the candidate. The lookahead matches at every
+        # position, and the alternation order keeps the earliest entry there.
+        alternatives = "|".join(re.escape(text) for text in self._first_index)
+        self._contained = re.compile(f"(?=({alternatives}))") if lowered else None
+        # The candidate found inside an entry: one search over the joined entries.
+        self._joined = _AVOID_SEPARATOR.join(lowered)
+        self._starts: List[int] = []
+        offset = 0
+        for text in lowered:
+            self._starts.append(offset)
+            offset += len(text) + 1
+
+    def first_match(self, candidate: str) -> Optional[str]:
+        if self._contained is None:
+            return None
+        c_lower = candidate.lower()
+        best = len(self.avoid_list)
+        position = self._joined.find(c_lower)
+        if position >= 0:
+            best = bisect_right(self._starts, position) - 1
+        for match in self._contained.finditer(c_lower):
+            best = min(best, self._first_index[match.group(1)])
+            if best == 0:
+                break
+        return self.avoid_list[best] if best < len(self.avoid_list) else None
+
+    def filter(self, candidates: List[str]) -> Tuple[List[str], List[str]]:
+        """(kept candidates, adherence notes) in the format of ``_filter_candidates_by_avoid``."""
+        filtered: List[str] = []
+        adherence: List[str] = []
+        for c in candidates:
+            av = self.first_match(c)
+            if av is None:
+                filtered.append(c)
+            else:
+                adherence.append("Avoided '%s' per avoid list: '%s'" % (c, av[:60] + ("..." if len(av) > 60 else "")))
+        return filtered, adherence
+
+
+class CultureBundle:
+    """Culture-level KB data for one target culture, fetched from ``kg_loader`` once."""
+
+    def __init__(self, kg_loader: Any, culture: str):
+        self.kg_loader = kg_loader
+        self.culture = culture
+        self.scene_candidates = kg_loader.get_scene_candidates(culture)
+        self.avoid_list = list(kg_loader.get_avoid_list(culture) or [])
+        self.style_priors = kg_loader.get_style_priors(culture)
+        self.sensitivity_notes = kg_loader.get_sensitivity_notes(culture) or []
+        self._type_labels: Dict[str, List[str]] = {}
+        self._matchers: "OrderedDict[Tuple[str, ...], AvoidMatcher]" = OrderedDict()
+
+    def type_labels(self, node_type: str) -> List[str]:
+        """Labels of the culture's KB nodes of ``node_type`` (a fresh list)."""
+        labels = self._type_labels.get(node_type)
+        if labels is None:
+            nodes = self.kg_loader.get_nodes_by_type_and_culture(node_type, self.culture) or []
+            labels = [n.label for n in nodes]
+            self._type_labels[node_type] = labels
+        return list(labels)
+
+    def avoid_matcher(self, avoid_list: Sequence[str]) -> AvoidMatcher:
+        """Compiled matcher for ``avoid_list`` (the KB list plus request overrides)."""
+        key = tuple(str(a) for a in avoid_list)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = AvoidMatcher(key)
+            self._matchers[key] = matcher
+            while len(self._matchers) > _MAX_AVOID_MATCHERS:
+                self._matchers.popitem(last=False)
+        else:
+            self._matchers.move_to_end(key)
+        return matcher
@@ -1,4 +1,5 @@
 import copy
+import json
 import logging
 import os
 import re
@@ -7,7 +8,9 @@ from src.reasoning.schemas import (
     ReasoningInput, TranscreationPlan, Transformation, Preservation, CulturalNode,
     StylePriors,
 )
+from src.reasoning.culture_bundle import AvoidMatcher, CultureBundle
 from src.reasoning.knowledge_loader import KnowledgeLoader
+from src.reasoning.label_index import LabelTokenIndex, normalize_label_key, tokenize_label
 from src.reasoning.llm_client import LLMClient
 from src.reasoning.prompt_config import get_prompt, get_prompt_list
 from src.reasoning.policy_config import (
@@ -71,6 +74,19 @@ INFOGRAPHIC_CULTURAL_CUE_TOKENS = _env_set(
     "REASONING_INFOGRAPHIC_CULTURAL_CUE_TOKENS", _DEFAULT_INFOGRAPHIC_CULTURAL_CUE_TOKENS
 )
 ENABLE_LLM_PLACEHOLDER_CLASSIFIER = _env_bool("REASONING_ENABLE_LLM_PLACEHOLDER_CLASSIFIER", True)
+# One LLM request for all OCR regions of a document (rewrites + placeholder flags).
+ENABLE_BATCHED_TEXT_REWRITE = _env_bool("REASONING_BATCH_TEXT_REWRITE", False)
+BATCHED_TEXT_REWRITE_MAX_REGIONS = _env_int("REASONING_BATCH_TEXT_REWRITE_MAX_REGIONS", 24)
+# Completion tokens one batched request may ask for; batches are sized to fit.
+BATCH_OUTPUT_TOKEN_BUDGET = _env_int("REASONING_BATCH_OUTPUT_TOKEN_BUDGET", 4096)
+_BATCH_REPLY_OVERHEAD_TOKENS = 64
+# One object decision: id, action, target_object, a one-sentence rationale, confidence.
+_BATCH_DECISION_REPLY_CHARS = 360
+
+
+def _estimate_output_tokens(chars: int) -> int:
+    """Completion tokens for ``chars`` characters of reply (~3 chars per token, high for non-Latin text)."""
+    return max(1, (int(chars) + 2) // 3)
 
 
 def apply_plan_to_input(input_data: Dict[str, Any], plan: TranscreationPlan) -> Dict[str, Any]:
@@ -158,20 +174,7 @@ def _filter_candidates_by_avoid(candidates: List[str], avoid_list: List[str]) ->
     Filter out candidates that appear in the avoid list (e.g. stereotypical edits).
     Returns (filtered_candidates, adherence_notes).
     """
-    filtered = []
-    adherence = []
-    for c in candidates:
-        c_lower = c.lower()
-        excluded = False
-        for av in avoid_list:
-            av_lower = av.lower()
-            if c_lower in av_lower or av_lower in c_lower:
-                excluded = True
-                adherence.append("Avoided '%s' per avoid list: '%s'" % (c, av[:60] + ("..." if len(av) > 60 else "")))
-                break
-        if not excluded:
-            filtered.append(c)
-    return filtered, adherence
+    return AvoidMatcher(avoid_list).filter(candidates)
 
 
 def _build_text_edits_for_document(
@@ -192,36 +195,42 @@ def _build_text_edits_for_document(
     max_edits = 8
     scene_context = ((scene_graph.get("scene") or {}).get("description") or "").strip()
     full_text = (text.get("full_text") or "").strip()
-    for item in extracted:
-        if not isinstance(item, dict):
-            continue
-        original = item.get("text")
-        bbox = item.get("bbox")
-        if not isinstance(original, str) or not original.strip():
-            continue
-        original_clean = original.strip()
-        # Skip symbol-only/noise OCR tokens (e.g. "*") to avoid low-quality text edits.
-        if len(original_clean) <= 1:
-            continue
-        if not re.search(r"[A-Za-z0-9]", original_clean):
-            continue
-        if not isinstance(bbox, list) or len(bbox) < 4:
-            continue
+    image_type = ((scene_graph.get("image_type") or {}).get("type") or "")
+    regions = [r for r in (_text_edit_region(item) for item in extracted) if r is not None]
+    batched: Dict[str, Dict[str, Any]] = {}
+    if ENABLE_BATCHED_TEXT_REWRITE and llm_client is not None:
+        batched = _batch_rewrite_text_regions(
+            regions,
+            target_culture=target_culture,
+            image_type=image_type,
+            scene_context=scene_context,
+            full_text=full_text,
+            llm_client=llm_client,
+        )
+    for item, original, original_clean, bbox in regions:
         culture_title = _rewrite_culture_title_text(original_clean, target_culture, scene_context)
+        batch_entry = batched.get(_normalize_key(original_clean))
         if culture_title:
             translated = culture_title
             rewrite_cache[_normalize_key(original_clean)] = translated
-        elif _is_placeholder_text_dynamic(original_clean, llm_client=llm_client):
+        elif (
+            batch_entry["is_placeholder"]
+            if batch_entry is not None
+            else _is_placeholder_text_dynamic(original_clean, llm_client=llm_client)
+        ):
             logger.info("Skipping placeholder OCR text rewrite: '%s'", original_clean[:80])
             continue
         else:
             cache_key = _normalize_key(original_clean)
             translated = rewrite_cache.get(cache_key)
+            if translated is None and batch_entry is not None:
+                translated = batch_entry["rewrite"]
+                rewrite_cache[cache_key] = translated
             if translated is None:
                 translated = _rewrite_text_for_region(
                     original=original_clean,
                     target_culture=target_culture,
-                    image_type=((scene_graph.get("image_type") or {}).get("type") or ""),
+                    image_type=image_type,
                     scene_context=scene_context,
                     full_text=full_text,
                     bbox=bbox,
@@ -250,6 +259,122 @@ def _build_text_edits_for_document(
     return edits
 
 
+def _text_edit_region(item: Any) -> Optional[Tuple[Dict[str, Any], str, str, List[Any]]]:
+    """(item, original, stripped text, bbox) for an OCR entry worth rewriting, else None."""
+    if not isinstance(item, dict):
+        return None
+    original = item.get("text")
+    bbox = item.get("bbox")
+    if not isinstance(original, str) or not original.strip():
+        return None
+    original_clean = original.strip()
+    # Skip symbol-only/noise OCR tokens (e.g. "*") to avoid low-quality text edits.
+    if len(original_clean) <= 1:
+        return None
+    if not re.search(r"[A-Za-z0-9]", original_clean):
+        return None
+    if not isinstance(bbox, list) or len(bbox) < 4:
+        return None
+    return item, original, original_clean, bbox
+
+
+def _batch_rewrite_text_regions(
+    regions: List[Tuple[Dict[str, Any], str, str, List[Any]]],
+    target_culture: str,
+    image_type: str,
+    scene_context: str,
+    full_text: str,
+    llm_client: LLMClient,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Rewrite candidates and placeholder flags for all regions in one LLM request.
+
+    Returns normalized text -> {"is_placeholder", "rewrite"} for well-formed
+    entries; the best candidate is picked locally with _pick_best_rewrite_candidate.
+    Regions missing from the result use the per-region path.
+    """
+    pending: Dict[str, Tuple[str, List[Any], Optional[Dict[str, Any]]]] = {}
+    max_chars_by_key: Dict[str, int] = {}
+    # Regions past the output-token budget keep the per-region path, so the
+    # batched reply is never cut off by the completion limit.
+    reply_tokens = _BATCH_REPLY_OVERHEAD_TOKENS
+    for item, _original, original_clean, bbox in regions:
+        key = _normalize_key(original_clean)
+        if key in pending or len(pending) >= BATCHED_TEXT_REWRITE_MAX_REGIONS:
+            continue
+        if _rewrite_culture_title_text(original_clean, target_culture, scene_context):
+            continue
+        if _is_placeholder_text(original_clean):
+            continue
+        style = item.get("style") if isinstance(item.get("style"), dict) else None
+        max_chars = _estimate_max_chars_for_region(original_clean, bbox=bbox, style=style)
+        # Three candidates of up to max_chars plus the entry's JSON keys.
+        region_tokens = 3 * _estimate_output_tokens(max_chars) + 24
+        if pending and reply_tokens + region_tokens > BATCH_OUTPUT_TOKEN_BUDGET:
+            continue
+        reply_tokens += region_tokens
+        pending[key] = (original_clean, bbox, style)
+        max_chars_by_key[key] = max_chars
+    if len(pending) < 2:
+        return {}
+    keys = list(pending)
+    listed = [
+        {"id": i, "text": pending[key][0], "max_chars": max_chars_by_key[key]}
+        for i, key in enumerate(keys)
+    ]
+    template = get_prompt(
+        "rewrite_text_regions_batch.template",
+        (
+            "Rewrite OCR text regions for cultural transcreation.\n"
+            "Target culture: {target_culture}\n"
+            "Image type: {image_type}\n"
+            "Scene context: {scene_context}\n"
+            "Neighbor text context: {neighbor_text}\n"
+            "Regions:\n{regions_block}\n\n"
+            'Return exactly one JSON object: {{"regions":[{{"id":0,"is_placeholder":false,"candidates":["...","..."]}}]}}'
+        ),
+    )
+    prompt = template.format(
+        target_culture=target_culture,
+        image_type=image_type,
+        scene_context=scene_context,
+        neighbor_text=full_text[:500],
+        regions_block="\n".join(json.dumps(entry, ensure_ascii=False) for entry in listed),
+    )
+    try:
+        result = llm_client.generate_reasoning(prompt, max_tokens=reply_tokens)
+    except Exception as e:
+        logger.warning("Batched OCR rewrite failed; using per-region requests: %s", e)
+        return {}
+    entries = result.get("regions") if isinstance(result, dict) else result
+    out: Dict[str, Dict[str, Any]] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < len(keys) or keys[index] in out:
+            continue
+        original_clean, bbox, style = pending[keys[index]]
+        flag = entry.get("is_placeholder") is True
+        # Same gate as _is_placeholder_text_dynamic: the LLM flag only counts for ambiguous text.
+        is_placeholder = flag and ENABLE_LLM_PLACEHOLDER_CLASSIFIER and _needs_llm_placeholder_check(original_clean)
+        rewrite = None
+        candidates = entry.get("candidates")
+        if isinstance(candidates, list):
+            rewrite = _pick_best_rewrite_candidate(original_clean, candidates, bbox=bbox, style=style)
+        rewritten = entry.get("rewritten_text")
+        if not rewrite and isinstance(rewritten, str) and rewritten.strip():
+            rewrite = _validate_rewrite_constraints(original_clean, rewritten.strip(), bbox=bbox, style=style)
+        if not rewrite and not is_placeholder:
+            continue
+        out[keys[index]] = {"is_placeholder": is_placeholder, "rewrite": rewrite or original_clean}
+    logger.info("Batched OCR rewrite: regions=%d, usable=%d", len(keys), len(out))
+    return out
+
+
 def _rewrite_text_for_region(
     original: str,
     target_culture: str,
@@ -334,12 +459,8 @@ def _is_placeholder_text(text: str) -> bool:
     return placeholder_hits >= 2
 
 
-def _is_placeholder_text_dynamic(text: str, llm_client: Optional[LLMClient] = None) -> bool:
-    """Heuristic placeholder detection with optional LLM fallback."""
-    if _is_placeholder_text(text):
-        return True
-    if (not ENABLE_LLM_PLACEHOLDER_CLASSIFIER) or llm_client is None:
-        return False
+def _needs_llm_placeholder_check(text: str) -> bool:
+    """Repetitive text the heuristic cannot settle; only these go to the LLM classifier."""
     cleaned = (text or "").strip()
     if len(cleaned) < 8:
         return False
@@ -347,10 +468,17 @@ def _is_placeholder_text_dynamic(text: str, llm_client: Optional[LLMClient] = No
     if not words:
         return False
     unique_ratio = float(len(set(words))) / float(len(words))
-    likely_ambiguous = (len(words) >= 4 and unique_ratio <= 0.65) or (
-        len(words) >= 8 and unique_ratio <= 0.8
-    )
-    if not likely_ambiguous:
+    return (len(words) >= 4 and unique_ratio <= 0.65) or (len(words) >= 8 and unique_ratio <= 0.8)
+
+
+def _is_placeholder_text_dynamic(text: str, llm_client: Optional[LLMClient] = None) -> bool:
+    """Heuristic placeholder detection with optional LLM fallback."""
+    if _is_placeholder_text(text):
+        return True
+    if (not ENABLE_LLM_PLACEHOLDER_CLASSIFIER) or llm_client is None:
+        return False
+    cleaned = (text or "").strip()
+    if not _needs_llm_placeholder_check(cleaned):
         return False
     try:
         template = get_prompt(
@@ -425,11 +553,11 @@ def _normalize_text(value: Any) -> str:
 
 
 def _normalize_key(value: Any) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", _normalize_text(value).lower()).strip()
+    return normalize_label_key(value)
 
 
 def _tokenize_label(value: Any) -> List[str]:
-    return [t for t in _normalize_key(value).split() if t]
+    return tokenize_label(value)
 
 
 def _scope_excluded_types() -> Set[str]:
@@ -475,28 +603,19 @@ def _infer_type_from_label_cues(obj: Dict[str, Any], source_label: str = "") ->
     return best_type
 
 
+def _label_token_index(kg_loader: KnowledgeLoader) -> LabelTokenIndex:
+    """The loader's cached inverted label index (built per call for duck-typed loaders and mocks)."""
+    if getattr(type(kg_loader), "get_label_token_index", None) is not None:
+        return kg_loader.get_label_token_index()
+    return LabelTokenIndex.from_loader(kg_loader)
+
+
 def _build_type_token_index(kg_loader: KnowledgeLoader) -> Dict[str, Set[str]]:
     """
     Build a dynamic index of cultural-type -> tokens from KB node labels.
     Used to infer object types from captions/labels without hardcoded maps.
     """
-    index: Dict[str, Set[str]] = {}
-    excluded = _scope_excluded_types()
-    raw_labels = kg_loader.get_all_labels()
-    if not isinstance(raw_labels, list):
-        return index
-    for label in raw_labels:
-        if not isinstance(label, str) or not label.strip():
-            continue
-        node = kg_loader.find_node(label)
-        if not node:
-            continue
-        node_type = str(node.type or "").upper()
-        if not node_type or node_type in excluded:
-            continue
-        bucket = index.setdefault(node_type, set())
-        bucket.update(_tokenize_label(label))
-    return index
+    return _label_token_index(kg_loader).type_tokens(_scope_excluded_types())
 
 
 def _object_signal_text(obj: Dict[str, Any], label: str = "") -> str:
@@ -545,7 +664,8 @@ def _infer_cultural_type_from_kb_signals(
     for node_type, hint_tokens in type_token_index.items():
         if not hint_tokens:
             continue
-        score = len(tokens.intersection(_filter_type_tokens(hint_tokens)))
+        # ``tokens`` is already filtered, so the overlap equals the filtered-vs-filtered one.
+        score = len(tokens.intersection(hint_tokens))
         if score > best_score:
             best_score = score
             best_type = node_type
@@ -597,7 +717,7 @@ def _resolve_obj_type_for_localized_edit(
         obj_type = cued_type
     elif semantic_fallback and obj_type == "FOOD" and not cued_type:
         semantic_tokens = _filter_type_tokens(set(_tokenize_label(_object_signal_text(obj, source_label))))
-        food_tokens = _filter_type_tokens(type_token_index.get("FOOD") or set())
+        food_tokens = type_token_index.get("FOOD") or set()
         if len(semantic_tokens.intersection(food_tokens)) < get_policy_int("type_inference_min_token_overlap"):
             obj_type = semantic_fallback
     return obj_type, source_culture
@@ -611,13 +731,15 @@ def _filter_labels_for_grounding(
 ) -> List[str]:
     excluded = exclude_types or _scope_excluded_types()
     allowed = {str(t).upper() for t in (allowed_types or set()) if str(t).strip()}
+    index = _label_token_index(kg_loader)
     filtered: List[str] = []
     for label in known_labels:
-        node = kg_loader.find_node(label)
-        if not node:
-            continue
-        node_type = str(node.type or "").upper()
-        if node_type in excluded:
+        if index.has_label(label):
+            node_type = index.type_of(label)
+        else:
+            node = kg_loader.find_node(label)
+            node_type = str(node.type or "").upper() if node else None
+        if node_type is None or node_type in excluded:
             continue
         if allowed and node_type not in allowed:
             continue
@@ -701,42 +823,30 @@ def _recover_grounded_label(
     if not raw_candidates:
         return None
 
-    known_labels = kg_loader.get_all_labels()
-    if not known_labels:
+    index = _label_token_index(kg_loader)
+    if not index.labels:
         return None
+    # Same type filter as _filter_labels_for_grounding, applied through the index.
     excluded_types = _scope_excluded_types() if exclude_scope_types else None
-    searchable_labels = _filter_labels_for_grounding(
-        known_labels,
-        kg_loader,
-        exclude_types=excluded_types,
-        allowed_types=allowed_types,
-    )
-    if not searchable_labels:
+    excluded = excluded_types or _scope_excluded_types()
+    allowed = {str(t).upper() for t in (allowed_types or set()) if str(t).strip()}
+    if not index.has_eligible(excluded, allowed):
         return None
     source_tokens = _filter_type_tokens(set(_tokenize_label(" ".join(raw_candidates))))
-    known_map = {_normalize_key(label): label for label in searchable_labels if _normalize_key(label)}
 
     # Pass 1: exact normalized match
     for candidate in raw_candidates:
         key = _normalize_key(candidate)
-        if key in known_map:
-            return known_map[key]
+        match = index.exact_match(key, excluded, allowed) if key else None
+        if match:
+            return match
 
-    # Pass 2: token overlap (dynamic matching to KB labels)
+    # Pass 2: token overlap (dynamic matching to KB labels) via posting lists
     for candidate in raw_candidates:
         c_tokens = _filter_type_tokens(set(_tokenize_label(candidate)))
         if not c_tokens:
             continue
-        best_label = None
-        best_overlap = 0
-        for known in searchable_labels:
-            k_tokens = _filter_type_tokens(set(_tokenize_label(known)))
-            if not k_tokens:
-                continue
-            overlap = len(c_tokens.intersection(k_tokens))
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_label = known
+        best_label, best_overlap = index.best_overlap(c_tokens, excluded, allowed)
         min_overlap = get_policy_int("grounding_min_label_token_overlap")
         if best_label and best_overlap >= min_overlap:
             return best_label
@@ -745,6 +855,7 @@ def _recover_grounded_label(
         return None
 
     # Pass 3: embedding ranking only when token overlap confirms the match
+    searchable_labels = index.eligible_labels(excluded, allowed)
     ranked = kg_loader.rank_candidates_by_embedding(" ".join(raw_candidates[:4]), searchable_labels)
     min_emb_overlap = get_policy_int("grounding_min_embedding_token_overlap")
     for label in ranked[:8]:
@@ -758,11 +869,27 @@ def _recover_grounded_label(
 
 def _reasoning_strategy() -> str:
     value = str(get_policy("reasoning_strategy")).strip().lower()
-    if value in {"llm_first", "kg_first"}:
+    if value in {"llm_first", "kg_first", "llm_first_batch"}:
         return value
     return "llm_first"
 
 
+def _batched_decision_index(decision: Any, listed_ids: Set[int]) -> Optional[int]:
+    """Object index of a well-formed batched decision, else None."""
+    if not isinstance(decision, dict):
+        return None
+    try:
+        index = int(decision.get("id"))
+    except (TypeError, ValueError):
+        return None
+    action = _normalize_key(decision.get("action"))
+    if index not in listed_ids or action not in {"transform", "preserve"}:
+        return None
+    if action == "transform" and not _normalize_text(decision.get("target_object")):
+        return None
+    return index
+
+
 def _ground_llm_target_to_kb(
     raw_target: str,
     kg_loader: KnowledgeLoader,
@@ -1403,19 +1530,29 @@ class CulturalReasoningEngine:
         debug_plan: bool = False,
         debug_kg_selection: bool = False,
         strict_mode: bool = False,
+        llm_use_cache: Optional[bool] = None,
     ):
         self.kg_loader = KnowledgeLoader(knowledge_graph_path)
-        self.llm_client = LLMClient()
+        self.llm_client = LLMClient(use_cache=llm_use_cache)
         self.debug_plan = debug_plan
         self.debug_kg_selection = debug_kg_selection
         self.strict_mode = strict_mode
         self._type_token_index = _build_type_token_index(self.kg_loader)
+        self._culture_bundles: Dict[str, CultureBundle] = {}
         self._debug_trace: Dict[str, Any] = {
             "raw_plan": [],
             "normalized_plan": [],
             "kg_selections": [],
         }
 
+    def _culture_bundle(self, target_culture: str) -> CultureBundle:
+        """Culture-level KB data for ``target_culture``, compiled once per loader."""
+        bundle = self._culture_bundles.get(target_culture)
+        if bundle is None or bundle.kg_loader is not self.kg_loader:
+            bundle = CultureBundle(self.kg_loader, target_culture)
+            self._culture_bundles[target_culture] = bundle
+        return bundle
+
     def _collect_kb_candidate_pool(
         self,
         *,
@@ -1439,13 +1576,13 @@ class CulturalReasoningEngine:
             for label in hint_candidates:
                 if label not in candidate_labels:
                     candidate_labels.append(label)
+        bundle = self._culture_bundle(target_culture)
         if not candidate_labels:
-            nodes = self.kg_loader.get_nodes_by_type_and_culture(obj_type, target_culture)
-            candidate_labels = [c.label for c in nodes]
+            candidate_labels = bundle.type_labels(obj_type)
         preferred = self.kg_loader.get_preferred_substitution(obj_label, target_culture)
         if preferred and preferred in candidate_labels:
             candidate_labels = [preferred] + [c for c in candidate_labels if c != preferred]
-        candidate_labels, notes = _filter_candidates_by_avoid(candidate_labels, avoid_list)
+        candidate_labels, notes = bundle.avoid_matcher(avoid_list).filter(candidate_labels)
         if candidate_labels:
             rank_query = f"{_object_signal_text(obj, obj_label)} {obj_type} {scene_context}".strip()
             ranked = self.kg_loader.rank_candidates_by_embedding(rank_query, candidate_labels)
@@ -1569,38 +1706,51 @@ class CulturalReasoningEngine:
         context: str,
         style_priors: Optional[StylePriors],
         sensitivity_notes: List[str],
+        kb_pool: Optional[Tuple[List[str], List[str]]] = None,
+        raw_result: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
-        candidate_labels, notes = self._collect_kb_candidate_pool(
-            target_culture=target_culture,
-            source_obj_label=source_obj_label,
-            obj_type=obj_type,
-            obj_label=obj_label,
-            grounded_hint=grounded_hint,
-            avoid_list=avoid_list,
-            obj=obj,
-            scene_context=scene_context,
-            used_targets=used_targets,
-        )
+        """
+        kb_pool and raw_result come from the batched strategy: the candidate pool
+        (collected with no used targets) and this object's decision from the scene request.
+        """
+        if kb_pool is not None:
+            candidate_labels = _prioritize_unused_candidates(kb_pool[0], used_targets)
+            notes = list(kb_pool[1])
+        else:
+            candidate_labels, notes = self._collect_kb_candidate_pool(
+                target_culture=target_culture,
+                source_obj_label=source_obj_label,
+                obj_type=obj_type,
+                obj_label=obj_label,
+                grounded_hint=grounded_hint,
+                avoid_list=avoid_list,
+                obj=obj,
+                scene_context=scene_context,
+                used_targets=used_targets,
+            )
         if not candidate_labels and (STRICT_KB_GROUNDED_TRANSFORMS or not has_local_edit_region):
             logger.info(
                 "Reasoning preserve: %s (no KB pool for grounding, LLM-first policy)",
                 obj_label,
             )
             return None, [], notes
-        prompt = self._construct_prompt(
-            obj_label=obj_label,
-            obj_type=obj_type,
-            source_culture=source_culture,
-            target_culture=target_culture,
-            candidates=[],
-            context=context,
-            avoid_list=avoid_list,
-            style_priors=style_priors,
-            sensitivity_notes=sensitivity_notes or [],
-            used_targets=used_targets,
-            reasoning_strategy="llm_first",
-        )
-        raw_result = self.llm_client.generate_reasoning(prompt)
+        if raw_result is None:
+            prompt = self._construct_prompt(
+                obj_label=obj_label,
+                obj_type=obj_type,
+                source_culture=source_culture,
+                target_culture=target_culture,
+                candidates=[],
+                context=context,
+                avoid_list=avoid_list,
+                style_priors=style_priors,
+                sensitivity_notes=sensitivity_notes or [],
+                used_targets=used_targets,
+                reasoning_strategy="llm_first",
+            )
+            raw_result = self.llm_client.generate_reasoning(prompt)
+        else:
+            raw_result = dict(raw_result)
         if self.debug_plan:
             self._debug_trace["raw_plan"].append({"object": obj_label, "raw_result": raw_result})
         llm_target = _normalize_text(raw_result.get("target_object"))
@@ -1657,6 +1807,177 @@ class CulturalReasoningEngine:
             )
         return reasoning_result, candidate_labels, notes
 
+    def _run_batched_llm_first_decisions(
+        self,
+        *,
+        prepared: List[Dict[str, Any]],
+        target_culture: str,
+        avoid_list: List[str],
+        scene_context: str,
+        context: str,
+        style_priors: Optional[StylePriors],
+        sensitivity_notes: List[str],
+    ) -> Dict[int, Tuple[Tuple[List[str], List[str]], Optional[Dict[str, Any]]]]:
+        """
+        One LLM request for every object of the scene (``llm_first_batch``).
+
+        Returns index -> (KB pool, raw decision). The decision is None for objects
+        that get no LLM call or whose entry is malformed, so they fall back to a
+        per-object request.
+        """
+        out: Dict[int, Tuple[Tuple[List[str], List[str]], Optional[Dict[str, Any]]]] = {}
+        listed: List[Dict[str, Any]] = []
+        max_candidates = get_policy_int("batch_reasoning_max_candidates")
+        # Objects past the output-token budget keep their per-object request.
+        reply_tokens = _BATCH_REPLY_OVERHEAD_TOKENS
+        for index, item in enumerate(prepared):
+            if item["preserve_rationale"]:
+                continue
+            kb_pool = self._collect_kb_candidate_pool(
+                target_culture=target_culture,
+                source_obj_label=item["source_obj_label"],
+                obj_type=item["obj_type"],
+                obj_label=item["obj_label"],
+                grounded_hint=item["grounded_hint"],
+                avoid_list=avoid_list,
+                obj=item["obj"],
+                scene_context=scene_context,
+                used_targets=set(),
+            )
+            out[index] = (kb_pool, None)
+            if not kb_pool[0] and (STRICT_KB_GROUNDED_TRANSFORMS or not item["has_local_edit_region"]):
+                continue
+            decision_tokens = _estimate_output_tokens(_BATCH_DECISION_REPLY_CHARS)
+            if listed and reply_tokens + decision_tokens > BATCH_OUTPUT_TOKEN_BUDGET:
+                continue
+            reply_tokens += decision_tokens
+            listed.append({
+                "id": index,
+                "object": item["obj_label"],
+                "type": item["obj_type"],
+                "source_culture": item["source_culture"],
+                "kb_candidates": kb_pool[0][:max_candidates],
+            })
+        if not listed:
+            return out
+
+        style_block = ""
+        if style_priors:
+            style_block = (
+                "Style priors for %s: palette %s; motifs %s.\n"
+                % (target_culture, style_priors.palette, style_priors.motifs)
+            )
+        sensitivity_block = ""
+        if sensitivity_notes:
+            sensitivity_block = "Sensitivity notes (follow these): " + "; ".join(sensitivity_notes) + "\n"
+        template = get_prompt(
+            "object_reasoning_batch.template",
+            (
+                "You are a cultural adaptation expert for {target_culture}. Scene: {context}\n"
+                "{style_block}{sensitivity_block}"
+                "Avoid: {avoid_list}\n"
+                "Objects:\n{objects_block}\n"
+                'Return JSON: {{"decisions":[{{"id":0,"action":"transform|preserve","target_object":"...","rationale":"...","confidence":0.0-1.0}}]}}'
+            ),
+        )
+        prompt = template.format(
+            target_culture=target_culture,
+            context=context,
+            style_block=style_block,
+            sensitivity_block=sensitivity_block,
+            avoid_list=avoid_list,
+            objects_block="\n".join(json.dumps(entry, ensure_ascii=False) for entry in listed),
+        )
+        logger.info("LLM-first batch request: objects=%d, target_culture=%s", len(listed), target_culture)
+        response = self.llm_client.generate_reasoning(prompt, max_tokens=reply_tokens)
+        if self.debug_plan:
+            self._debug_trace["raw_plan"].append({"object": "<scene batch>", "raw_result": response})
+        listed_ids = {entry["id"] for entry in listed}
+        if isinstance(response, dict) and response.get("error"):
+            # The service is down; every object would get the same error per call.
+            for index in listed_ids:
+                out[index] = (out[index][0], dict(response))
+            return out
+        decisions = response.get("decisions") if isinstance(response, dict) else response
+        accepted = 0
+        for decision in decisions if isinstance(decisions, list) else []:
+            index = _batched_decision_index(decision, listed_ids)
+            if index is None or out[index][1] is not None:
+                continue
+            out[index] = (out[index][0], decision)
+            accepted += 1
+        if accepted < len(listed):
+            logger.info(
+                "LLM-first batch: %d of %d decisions malformed or missing; using per-object requests",
+                len(listed) - accepted,
+                len(listed),
+            )
+        return out
+
+    def _prepare_scene_object(
+        self,
+        obj: Dict[str, Any],
+        infographic_mode: bool,
+        scene_context: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Type, grounding hint and infographic policy for one scene object (no LLM calls)."""
+        source_obj_label = obj.get("label") or obj.get("class_name")
+        if not source_obj_label:
+            return None
+        obj_label = source_obj_label
+        source_has_kg_match = self.kg_loader.find_node(source_obj_label) is not None
+        needs_grounding = (not source_has_kg_match) and (
+            "detector_caption_mismatch" in (obj.get("quality_flags") or [])
+            or "uncertain_label" in (obj.get("quality_flags") or [])
+            or str(obj.get("semantic_type") or "").lower() in {"icon", "symbol", "logo"}
+        )
+        has_local_edit_region = isinstance(obj.get("bbox"), list) and len(obj.get("bbox") or []) >= 4
+        obj_type, source_culture = _resolve_obj_type_for_localized_edit(
+            obj=obj,
+            source_label=source_obj_label,
+            kg_loader=self.kg_loader,
+            type_token_index=self._type_token_index,
+        )
+        grounded_hint = None
+        if needs_grounding:
+            allowed_types = {obj_type} if obj_type and obj_type not in {"object", ""} else None
+            grounded_hint = _recover_grounded_label(
+                obj,
+                self.kg_loader,
+                exclude_scope_types=has_local_edit_region,
+                allowed_types=allowed_types,
+            )
+            if grounded_hint and _normalize_key(grounded_hint) != _normalize_key(source_obj_label):
+                logger.info(
+                    "Grounding hint for source=%s (type=%s): %s",
+                    source_obj_label,
+                    obj_type,
+                    grounded_hint,
+                )
+        logger.info(
+            "Reasoning object start: label=%s, type=%s, confidence=%s",
+            obj_label,
+            obj_type,
+            obj.get("confidence"),
+        )
+        preserve_rationale = None
+        if _is_ambiguous_person_in_infographic(infographic_mode, obj_label, obj, scene_context):
+            preserve_rationale = "Infographic safety policy: ambiguous person detection preserved."
+            logger.info("Reasoning preserve: %s (ambiguous infographic person policy)", obj_label)
+        elif _should_preserve_non_text_in_infographic(infographic_mode, obj_type, obj):
+            preserve_rationale = "Infographic mode: preserving COCO-style object to avoid semantic drift."
+            logger.info("Reasoning preserve: %s (infographic COCO-style policy)", obj_label)
+        return {
+            "obj": obj,
+            "source_obj_label": source_obj_label,
+            "obj_label": obj_label,
+            "obj_type": obj_type,
+            "source_culture": source_culture,
+            "grounded_hint": grounded_hint,
+            "has_local_edit_region": has_local_edit_region,
+            "preserve_rationale": preserve_rationale,
+        }
+
     def analyze_image(self, input_data: ReasoningInput) -> TranscreationPlan:
         logger.info("Starting analysis for target culture: %s", input_data.target_culture)
         self._debug_trace = {
@@ -1671,7 +1992,8 @@ class CulturalReasoningEngine:
         avoidance_adherence: List[str] = []
         infographic_mode = _is_infographic_mode(input_data.scene_graph)
         scene_context = input_data.scene_graph.get("scene", {}).get("description", "")
-        scene_candidates = self.kg_loader.get_scene_candidates(target_culture)
+        bundle = self._culture_bundle(target_culture)
+        scene_candidates = bundle.scene_candidates
         scene_adaptation = scene_candidates[0] if scene_candidates else {}
         if not scene_adaptation and self.strict_mode:
             raise ValueError("Missing scene")
@@ -1683,91 +2005,66 @@ class CulturalReasoningEngine:
         }
 
         # Resolve avoid list: KB avoid + CLI override
-        kb_avoid = self.kg_loader.get_avoid_list(target_culture)
+        kb_avoid = bundle.avoid_list
         avoid_list = list(kb_avoid) if kb_avoid else []
         for a in input_data.avoid_list:
             if a and a not in avoid_list:
                 avoid_list.append(a)
 
         used_targets: Set[str] = set()
-        for obj in scene_objects:
-            source_obj_label = obj.get("label") or obj.get("class_name")
-            if not source_obj_label:
-                continue
-            obj_label = source_obj_label
-            source_has_kg_match = self.kg_loader.find_node(source_obj_label) is not None
-            needs_grounding = (not source_has_kg_match) and (
-                "detector_caption_mismatch" in (obj.get("quality_flags") or [])
-                or "uncertain_label" in (obj.get("quality_flags") or [])
-                or str(obj.get("semantic_type") or "").lower() in {"icon", "symbol", "logo"}
-            )
-            has_local_edit_region = isinstance(obj.get("bbox"), list) and len(obj.get("bbox") or []) >= 4
-            obj_type, source_culture = _resolve_obj_type_for_localized_edit(
-                obj=obj,
-                source_label=source_obj_label,
-                kg_loader=self.kg_loader,
-                type_token_index=self._type_token_index,
-            )
-            grounded_hint = None
-            if needs_grounding:
-                allowed_types = {obj_type} if obj_type and obj_type not in {"object", ""} else None
-                grounded_hint = _recover_grounded_label(
-                    obj,
-                    self.kg_loader,
-                    exclude_scope_types=has_local_edit_region,
-                    allowed_types=allowed_types,
-                )
-                if grounded_hint and _normalize_key(grounded_hint) != _normalize_key(source_obj_label):
-                    logger.info(
-                        "Grounding hint for source=%s (type=%s): %s",
-                        source_obj_label,
-                        obj_type,
-                        grounded_hint,
-                    )
-            logger.info(
-                "Reasoning object start: label=%s, type=%s, confidence=%s",
-                obj_label,
-                obj_type,
-                obj.get("confidence"),
+        prepared = [
+            item
+            for item in (self._prepare_scene_object(obj, infographic_mode, scene_context) for obj in scene_objects)
+            if item is not None
+        ]
+        context = input_data.scene_graph.get("scene", {}).get("description", "")
+        style_priors = bundle.style_priors
+        sensitivity_notes = bundle.sensitivity_notes
+        strategy = _reasoning_strategy()
+        batched: Dict[int, Tuple[Tuple[List[str], List[str]], Optional[Dict[str, Any]]]] = {}
+        if strategy == "llm_first_batch":
+            batched = self._run_batched_llm_first_decisions(
+                prepared=prepared,
+                target_culture=target_culture,
+                avoid_list=avoid_list,
+                scene_context=scene_context,
+                context=context,
+                style_priors=style_priors,
+                sensitivity_notes=sensitivity_notes,
             )
-            if _is_ambiguous_person_in_infographic(infographic_mode, obj_label, obj, scene_context):
-                preservations.append(Preservation(
-                    original_object=obj_label,
-                    rationale="Infographic safety policy: ambiguous person detection preserved.",
-                ))
-                logger.info("Reasoning preserve: %s (ambiguous infographic person policy)", obj_label)
-                continue
 
-            if _should_preserve_non_text_in_infographic(infographic_mode, obj_type, obj):
+        for index, item in enumerate(prepared):
+            obj = item["obj"]
+            source_obj_label = item["source_obj_label"]
+            obj_label = item["obj_label"]
+            obj_type = item["obj_type"]
+            if item["preserve_rationale"]:
                 preservations.append(Preservation(
                     original_object=obj_label,
-                    rationale="Infographic mode: preserving COCO-style object to avoid semantic drift.",
+                    rationale=item["preserve_rationale"],
                 ))
-                logger.info("Reasoning preserve: %s (infographic COCO-style policy)", obj_label)
                 continue
-
-            context = input_data.scene_graph.get("scene", {}).get("description", "")
-            style_priors = self.kg_loader.get_style_priors(target_culture)
-            sensitivity_notes = self.kg_loader.get_sensitivity_notes(target_culture) or []
-            strategy = _reasoning_strategy()
             logger.info("Reasoning strategy: %s for label=%s", strategy, obj_label)
 
-            if strategy == "llm_first":
+            if strategy in {"llm_first", "llm_first_batch"}:
+                kb_pool, batched_result = batched.get(index, (None, None))
                 reasoning_result, candidate_labels, avoid_notes = self._run_llm_first_object_reasoning(
                     obj=obj,
                     obj_label=obj_label,
                     source_obj_label=source_obj_label,
                     obj_type=obj_type,
-                    source_culture=source_culture,
+                    source_culture=item["source_culture"],
                     target_culture=target_culture,
-                    grounded_hint=grounded_hint,
+                    grounded_hint=item["grounded_hint"],
                     avoid_list=avoid_list,
                     scene_context=scene_context,
                     used_targets=used_targets,
-                    has_local_edit_region=has_local_edit_region,
+                    has_local_edit_region=item["has_local_edit_region"],
                     context=context,
                     style_priors=style_priors,
                     sensitivity_notes=sensitivity_notes,
+                    kb_pool=kb_pool,
+                    raw_result=batched_result,
                 )
             else:
                 reasoning_result, candidate_labels, avoid_notes = self._run_kg_first_object_reasoning(
@@ -1775,13 +2072,13 @@ class CulturalReasoningEngine:
                     obj_label=obj_label,
                     source_obj_label=source_obj_label,
                     obj_type=obj_type,
-                    source_culture=source_culture,
+                    source_culture=item["source_culture"],
                     target_culture=target_culture,
-                    grounded_hint=grounded_hint,
+                    grounded_hint=item["grounded_hint"],
                     avoid_list=avoid_list,
                     scene_context=scene_context,
                     used_targets=used_targets,
-                    has_local_edit_region=has_local_edit_region,
+                    has_local_edit_region=item["has_local_edit_region"],
                     context=context,
                     style_priors=style_priors,
                     sensitivity_notes=sensitivity_notes,
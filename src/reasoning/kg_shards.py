@@ -0,0 +1,115 @@
+"""
+Per-culture shards of the knowledge graph.
+
+A reasoning call only needs the per-type candidate lists of its target
+culture, but a monolithic graph builds them for every country up front. The
+sharded layout splits a graph into:
+
+- ``index.json``: the global index. It holds the node table (id, label,
+  type), node -> country, the cultural types, the label mappings and the
+  shard file of each country.
+- ``<nnnn>_<country>.json``: one shard per country with its type -> nodes
+  buckets.
+
+Point ``KnowledgeLoader`` at ``index.json`` and it serves label and type lookups
+from the index and loads a country's shard on its first culture-scoped query.
+Loaded shards go through an LRU (``KG_SHARD_CACHE_SIZE``, default 8).
+
+Build shards with ``scripts/knowledge_graph/generator.py`` or:
+    python -m src.reasoning.kg_shards --kg data/knowledge_base/countries_graph.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARD_INDEX_FORMAT = "kg_shard_index"
+SHARD_INDEX_VERSION = 1
+SHARD_INDEX_FILENAME = "index.json"
+
+
+def is_shard_index(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("format") == SHARD_INDEX_FORMAT
+
+
+def shard_cache_size() -> int:
+    try:
+        return max(1, int(os.getenv("KG_SHARD_CACHE_SIZE", "8")))
+    except ValueError:
+        return 8
+
+
+def _shard_filename(position: int, country: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9]+", "_", country).strip("_") or "country"
+    return f"{position:04d}_{safe}.json"
+
+
+def build_shards(loader) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """(global index, file name -> shard) for a monolithic ``KnowledgeLoader``."""
+    index: Dict[str, Any] = {
+        "format": SHARD_INDEX_FORMAT,
+        "version": SHARD_INDEX_VERSION,
+        "source": os.path.basename(loader.graph_path),
+        "nodes": list(loader.nodes.values()),
+        "node_country": dict(loader._node_to_country),
+        "part_of": dict(loader._part_of),
+        "cultural_types": sorted(loader._cultural_types),
+        "label_to_type": dict(loader._label_to_type),
+        "preferred_substitutions": list(loader._preferred_substitutions),
+        "shards": {},
+    }
+    shards: Dict[str, Dict[str, Any]] = {}
+    for position, (country, buckets) in enumerate(loader._country_type_index.items()):
+        name = _shard_filename(position, country)
+        index["shards"][country] = name
+        shards[name] = {"country": country, "buckets": buckets}
+    return index, shards
+
+
+def write_shards(graph_path: str, out_dir: str) -> Path:
+    """Shard the graph at ``graph_path`` into ``out_dir``; returns the index path."""
+    from src.reasoning.knowledge_loader import KnowledgeLoader
+
+    loader = KnowledgeLoader(graph_path, snapshot=False)
+    index, shards = build_shards(loader)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    for stale in out.glob("[0-9][0-9][0-9][0-9]_*.json"):
+        if stale.name not in shards:
+            stale.unlink()
+    for name, shard in shards.items():
+        with open(out / name, "w", encoding="utf-8") as f:
+            json.dump(shard, f, ensure_ascii=False)
+    index_path = out / SHARD_INDEX_FILENAME
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    logger.info("Wrote %d culture shards and %s", len(shards), index_path)
+    return index_path
+
+
+def load_shard(shard_dir: str, filename: str) -> Dict[str, Any]:
+    with open(os.path.join(shard_dir, filename), "r", encoding="utf-8") as f:
+        shard = json.load(f)
+    return shard.get("buckets") or {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Split a knowledge graph JSON into per-culture shards")
+    parser.add_argument("--kg", default="data/knowledge_base/countries_graph.json", help="Monolithic graph JSON")
+    parser.add_argument("--out", default=None, help="Output directory (default: <kg dir>/shards)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    out_dir = args.out or os.path.join(os.path.dirname(args.kg), "shards")
+    print(write_shards(args.kg, out_dir))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
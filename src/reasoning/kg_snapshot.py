@@ -0,0 +1,130 @@
+"""
+Versioned binary snapshots of a loaded knowledge graph.
+
+Parsing ``countries_graph.json`` and rebuilding every lookup index happens on
+each start. After a JSON load, :class:`KnowledgeLoader` writes its state (nodes,
+per-country indexes, label indexes, token index and, when computed, the label
+embedding matrix) to ``$CACHE_DIR/kg_snapshots/<stem>-<path-hash>.kgsnap``.
+Later loads read that file instead.
+
+Layout: fixed header (magic, format version, SHA-256 of the source JSON files,
+SHA-256 of the indexing code, payload length, payload CRC32) followed by a
+pickled state dict. A snapshot is used only when version, source checksum and
+code fingerprint match and the payload is intact; anything else falls back to
+the JSON path, which rewrites the snapshot. The code fingerprint covers the
+modules that build the pickled state, so editing them invalidates old snapshots
+without a manual ``SNAPSHOT_VERSION`` bump.
+
+Disable with ``ENABLE_KG_SNAPSHOT=false``.
+"""
+
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.utilities.fingerprint import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+SNAPSHOT_VERSION = 2
+_MAGIC = b"LPKGSNAP"
+_HEADER = struct.Struct("<8sI32s32sQI")
+# Modules whose code shapes the snapshot state.
+_INDEXING_MODULES = ("knowledge_loader.py", "kg_snapshot.py", "kg_shards.py", "label_index.py", "schemas.py")
+
+
+def code_fingerprint() -> bytes:
+    """SHA-256 of the knowledge-graph indexing modules."""
+    here = Path(__file__).resolve().parent
+    return bytes.fromhex(source_fingerprint([here / name for name in _INDEXING_MODULES]))
+
+
+def snapshot_enabled() -> bool:
+    return str(os.getenv("ENABLE_KG_SNAPSHOT", "true")).lower() in ("true", "1", "yes")
+
+
+def default_snapshot_dir() -> Path:
+    """``$CACHE_DIR/kg_snapshots`` (project ``cache/`` when CACHE_DIR is unset)."""
+    return Path(os.getenv("CACHE_DIR", str(_PROJECT_ROOT / "cache"))) / "kg_snapshots"
+
+
+def snapshot_path(graph_path: str, snapshot_dir: Optional[Path] = None) -> Path:
+    source = Path(graph_path).resolve()
+    path_hash = hashlib.sha1(str(source).encode("utf-8")).hexdigest()[:10]
+    base = Path(snapshot_dir) if snapshot_dir else default_snapshot_dir()
+    return base / f"{source.stem}-{path_hash}.kgsnap"
+
+
+def source_checksum(paths: Iterable[str]) -> Optional[bytes]:
+    """SHA-256 over the existing ``paths`` (name and bytes); None when none exist."""
+    digest = hashlib.sha256()
+    found = False
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        found = True
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.digest() if found else None
+
+
+def write_snapshot(path: Path, checksum: bytes, state: Dict[str, Any]) -> None:
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    header = _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, checksum, code_fingerprint(), len(payload), zlib.crc32(payload))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: Path, checksum: bytes) -> Optional[Dict[str, Any]]:
+    """State dict from ``path``, or None when missing, stale, another version or corrupt."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, stored_checksum, stored_code, length, crc = _HEADER.unpack(header)
+            if magic != _MAGIC or version != SNAPSHOT_VERSION:
+                logger.info("KG snapshot %s has format %s; rebuilding", path, version)
+                return None
+            if stored_code != code_fingerprint():
+                logger.info("KG snapshot %s was built by other indexing code; rebuilding", path)
+                return None
+            if stored_checksum != checksum:
+                logger.info("KG snapshot %s is stale; rebuilding from JSON", path)
+                return None
+            payload = f.read(length)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("Could not read KG snapshot %s: %s", path, e)
+        return None
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        logger.warning("KG snapshot %s is corrupt; rebuilding from JSON", path)
+        return None
+    # Unpickling allocates millions of small containers and cyclic GC passes
+    # over them would dominate the load, so GC is paused while it runs.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        state = pickle.loads(payload)
+    except Exception as e:
+        logger.warning("Could not unpickle KG snapshot %s: %s", path, e)
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return state if isinstance(state, dict) else None
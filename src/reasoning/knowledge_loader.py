@@ -2,14 +2,41 @@ import json
 import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional, Union, Set, Any, Tuple
 from src.reasoning.schemas import CulturalNode, CulturalKBEntry, StylePriors, SubstitutionEntry
+from src.reasoning.label_index import LabelTokenIndex
+from src.reasoning import kg_shards, kg_snapshot
 
 logger = logging.getLogger(__name__)
 
 CULTURAL_MAPPINGS_FILENAME = "cultural_mappings.json"
 REL_PART_OF = "PART_OF"
 
+# Loader state persisted in a KG snapshot (see kg_snapshot).
+_SNAPSHOT_FIELDS = (
+    "nodes",
+    "_node_to_country",
+    "_country_type_index",
+    "_cultural_kb",
+    "_is_kb_format",
+    "_label_to_type",
+    "_preferred_substitutions",
+    "_cultural_types",
+    "_part_of",
+    "_label_index",
+    "_label_culture_index",
+    "_label_unscoped_index",
+    "_country_keys",
+    "_kb_culture_keys",
+    "_preferred_index",
+    "_all_labels",
+    "_label_token_index",
+    "_shard_dir",
+    "_shard_files",
+)
+
 
 def _is_cultural_kb_format(data: dict) -> bool:
     """Detect if the loaded JSON is a cultural KB (culture-keyed entries with substitutions/avoid)."""
@@ -28,7 +55,7 @@ class KnowledgeLoader:
     knowledge graph (nodes/edges). Provides a unified interface for the
     reasoning engine.
     """
-    def __init__(self, graph_path: str):
+    def __init__(self, graph_path: str, snapshot: Optional[bool] = None, snapshot_dir: Optional[str] = None):
         self.graph_path = graph_path
         self.nodes: Dict[str, Dict] = {}
         self._node_to_country: Dict[str, str] = {}
@@ -38,11 +65,84 @@ class KnowledgeLoader:
         self._label_to_type: Dict[str, str] = {}
         self._preferred_substitutions: List[Dict[str, str]] = []
         self._cultural_types: Set[str] = set()
-        self._embedding_components = None
         self._part_of: Dict[str, str] = {}
-
-        self._load(graph_path)
-        self._load_cultural_mappings(graph_path)
+        # Lookup indexes built once after loading (see _build_lookup_indexes).
+        self._label_index: Dict[str, List[str]] = {}
+        self._label_culture_index: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._label_unscoped_index: Dict[str, Tuple[int, str]] = {}
+        self._country_keys: Dict[str, str] = {}
+        self._kb_culture_keys: Dict[str, str] = {}
+        self._preferred_index: Dict[Tuple[str, str], Optional[str]] = {}
+        self._all_labels: List[str] = []
+        self._label_token_index: Optional[LabelTokenIndex] = None
+        self._label_embeddings: Optional[Any] = None
+        self._snapshot_embeddings: Optional[Dict[str, Any]] = None
+        self._encoder_unavailable = False
+        # Sharded graphs (see kg_shards): country -> shard file, loaded on demand.
+        self._shard_dir: Optional[str] = None
+        self._shard_files: Dict[str, str] = {}
+        self._shard_cache_size = kg_shards.shard_cache_size()
+        self._shard_lock = threading.Lock()
+        self.shard_stats = {"loads": 0, "hits": 0, "evictions": 0}
+        self.loaded_from_snapshot = False
+
+        use_snapshot = kg_snapshot.snapshot_enabled() if snapshot is None else bool(snapshot)
+        self._snapshot_path = kg_snapshot.snapshot_path(graph_path, snapshot_dir) if use_snapshot else None
+        self._source_checksum = (
+            kg_snapshot.source_checksum([graph_path, self._mappings_path(graph_path)]) if use_snapshot else None
+        )
+        if not self._restore_snapshot():
+            self._load(graph_path)
+            self._load_cultural_mappings(graph_path)
+            self._build_lookup_indexes()
+            if self._snapshot_path is not None and self._source_checksum is not None:
+                self.get_label_token_index()
+                self.save_snapshot()
+
+    @staticmethod
+    def _mappings_path(graph_path: str) -> str:
+        return os.path.join(os.path.dirname(graph_path), CULTURAL_MAPPINGS_FILENAME)
+
+    def _restore_snapshot(self) -> bool:
+        if self._snapshot_path is None or self._source_checksum is None:
+            return False
+        state = kg_snapshot.read_snapshot(self._snapshot_path, self._source_checksum)
+        if state is None or any(field not in state for field in _SNAPSHOT_FIELDS):
+            return False
+        for field in _SNAPSHOT_FIELDS:
+            setattr(self, field, state[field])
+        if self._shard_files:
+            self._country_type_index = OrderedDict()
+        self._snapshot_embeddings = state.get("label_embeddings")
+        self.loaded_from_snapshot = True
+        logger.info("Loaded Knowledge Graph snapshot %s: %d nodes.", self._snapshot_path, len(self.nodes))
+        return True
+
+    def save_snapshot(self) -> bool:
+        """Write the loaded state (plus the label embedding matrix, once computed) as a KG snapshot."""
+        if self._snapshot_path is None or self._source_checksum is None:
+            return False
+        state = {field: getattr(self, field) for field in _SNAPSHOT_FIELDS}
+        if self._shard_files:
+            # Shards stay on disk; only the global index goes in the snapshot.
+            state["_country_type_index"] = {}
+        embeddings = self._label_embeddings
+        if embeddings is not None and embeddings.has_matrix():
+            import numpy as np
+
+            state["label_embeddings"] = {
+                "model_name": embeddings.model_name,
+                "matrix": np.array(embeddings.matrix(None)),
+            }
+        elif self._snapshot_embeddings:
+            state["label_embeddings"] = self._snapshot_embeddings
+        try:
+            kg_snapshot.write_snapshot(self._snapshot_path, self._source_checksum, state)
+        except Exception as e:
+            logger.warning("Could not write KG snapshot %s: %s", self._snapshot_path, e)
+            return False
+        logger.info("Wrote Knowledge Graph snapshot %s", self._snapshot_path)
+        return True
 
     def _load(self, path: str) -> None:
         try:
@@ -55,7 +155,9 @@ class KnowledgeLoader:
             logger.error("Invalid JSON in knowledge file: %s", path)
             raise
 
-        if _is_cultural_kb_format(data):
+        if kg_shards.is_shard_index(data):
+            self._load_shard_index(path, data)
+        elif _is_cultural_kb_format(data):
             self._is_kb_format = True
             for culture_key, entry in data.items():
                 if isinstance(entry, dict):
@@ -79,12 +181,57 @@ class KnowledgeLoader:
         else:
             self._load_graph_data(data)
 
+    def _load_shard_index(self, path: str, data: dict) -> None:
+        """Global label/type index of a sharded graph; per-country buckets load lazily."""
+        self._shard_dir = os.path.dirname(os.path.abspath(path))
+        self._shard_files = dict(data.get("shards") or {})
+        self._country_type_index = OrderedDict()
+        for n in data.get("nodes") or []:
+            self.nodes[n["id"]] = n
+        self._node_to_country = dict(data.get("node_country") or {})
+        self._part_of = dict(data.get("part_of") or {})
+        self._cultural_types = set(data.get("cultural_types") or [])
+        if data.get("label_to_type"):
+            self._label_to_type = {k.lower(): v for k, v in data["label_to_type"].items()}
+        if data.get("preferred_substitutions"):
+            self._preferred_substitutions = data["preferred_substitutions"]
+        logger.info("Loaded Knowledge Graph shard index: %d nodes, %d culture shards.",
+                    len(self.nodes), len(self._shard_files))
+
+    def _country_types(self, country: str) -> Dict[str, List[Dict]]:
+        """type -> nodes for ``country``, loading its shard (LRU) when the graph is sharded."""
+        if not self._shard_files:
+            return self._country_type_index.get(country, {})
+        with self._shard_lock:
+            buckets = self._country_type_index.get(country)
+            if buckets is not None:
+                self._country_type_index.move_to_end(country)
+                self.shard_stats["hits"] += 1
+                return buckets
+        filename = self._shard_files.get(country)
+        if not filename:
+            return {}
+        try:
+            buckets = kg_shards.load_shard(self._shard_dir or "", filename)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Could not load KG shard %s for %s: %s", filename, country, e)
+            return {}
+        with self._shard_lock:
+            self._country_type_index[country] = buckets
+            self._country_type_index.move_to_end(country)
+            self.shard_stats["loads"] += 1
+            while len(self._country_type_index) > self._shard_cache_size:
+                evicted, _ = self._country_type_index.popitem(last=False)
+                self.shard_stats["evictions"] += 1
+                logger.debug("Evicted KG shard for %s", evicted)
+        return buckets
+
     def _load_cultural_mappings(self, graph_path: str) -> None:
         """Load label_to_type and preferred_substitutions from KB. Graph file is used first if it has them; else cultural_mappings.json in same dir."""
         if self._label_to_type or self._preferred_substitutions:
             logger.debug("Cultural mappings already loaded from graph file.")
             return
-        mappings_path = os.path.join(os.path.dirname(graph_path), CULTURAL_MAPPINGS_FILENAME)
+        mappings_path = self._mappings_path(graph_path)
         if not os.path.isfile(mappings_path):
             logger.debug("No cultural mappings file at %s; using empty mappings.", mappings_path)
             return
@@ -98,6 +245,56 @@ class KnowledgeLoader:
         except (json.JSONDecodeError, OSError) as e:
             logger.warning("Could not load cultural mappings from %s: %s", mappings_path, e)
 
+    def _build_lookup_indexes(self) -> None:
+        """
+        Case-insensitive hash indexes for the per-object lookups.
+
+        Each index keeps the first match in load order, so lookups return what
+        the former linear scans returned.
+        """
+        self._label_index = {}
+        self._label_culture_index = {}
+        self._label_unscoped_index = {}
+        labels: List[str] = []
+        for position, (node_id, node) in enumerate(self.nodes.items()):
+            label = str(node.get("label") or "").strip()
+            key = label.lower()
+            if not key:
+                continue
+            bucket = self._label_index.get(key)
+            if bucket is None:
+                self._label_index[key] = [node_id]
+                labels.append(label)
+            else:
+                bucket.append(node_id)
+            culture = self._node_to_country.get(str(node.get("id")))
+            if culture:
+                self._label_culture_index.setdefault((key, culture.lower()), (position, node_id))
+            else:
+                self._label_unscoped_index.setdefault(key, (position, node_id))
+
+        self._country_keys = {}
+        for key in self._shard_files or self._country_type_index:
+            self._country_keys.setdefault(key.lower(), key)
+        self._kb_culture_keys = {}
+        for key in self._cultural_kb:
+            self._kb_culture_keys.setdefault(key.lower(), key)
+
+        self._preferred_index = {}
+        for entry in self._preferred_substitutions:
+            pair = ((entry.get("object_label") or "").lower(), (entry.get("target_culture") or "").lower())
+            self._preferred_index.setdefault(pair, entry.get("target_object"))
+
+        seen = set(self._label_index)
+        for label in self._label_to_type.keys():
+            key = str(label or "").strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                labels.append(str(label).strip())
+        self._all_labels = labels
+        self._label_token_index = None
+        self._label_embeddings = None
+
     def get_cultural_types(self) -> Set[str]:
         """Return set of types in the KG that are culture-related (have per-country attributes). Excludes COUNTRY."""
         return set(self._cultural_types)
@@ -108,35 +305,17 @@ class KnowledgeLoader:
 
     def get_all_labels(self) -> List[str]:
         """Return all unique known labels from graph nodes and mapping keys."""
-        labels: List[str] = []
-        seen = set()
-        for node in self.nodes.values():
-            label = str(node.get("label") or "").strip()
-            if not label:
-                continue
-            key = label.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            labels.append(label)
-        for label in self._label_to_type.keys():
-            key = str(label or "").strip().lower()
-            if not key or key in seen:
-                continue
-            seen.add(key)
-            labels.append(str(label).strip())
-        return labels
+        return list(self._all_labels)
+
+    def get_label_token_index(self) -> LabelTokenIndex:
+        """Token -> label inverted index over get_all_labels(), built on first use."""
+        if self._label_token_index is None:
+            self._label_token_index = LabelTokenIndex.from_loader(self)
+        return self._label_token_index
 
     def get_preferred_substitution(self, object_label: str, target_culture: str) -> Optional[str]:
         """Return preferred target_object for (object_label, target_culture) from KB, or None."""
-        obj_lower = (object_label or "").lower()
-        culture_lower = (target_culture or "").lower()
-        for entry in self._preferred_substitutions:
-            if (entry.get("object_label") or "").lower() == obj_lower and (
-                entry.get("target_culture") or ""
-            ).lower() == culture_lower:
-                return entry.get("target_object")
-        return None
+        return self._preferred_index.get(((object_label or "").lower(), (target_culture or "").lower()))
 
     def _load_graph_data(self, data: dict) -> None:
         # 1. Load Nodes
@@ -147,6 +326,7 @@ class KnowledgeLoader:
         # 2. Load Edges and Build Indexes
         edges = data.get("edges") or data.get("links") or []
         country_nodes = {nid: n["label"] for nid, n in self.nodes.items() if n.get("type") == "COUNTRY"}
+        bucket_ids: Dict[Tuple[str, str], Set[str]] = {}
         self._part_of = {}
         for edge in edges:
             if (edge.get("relation") or "") == REL_PART_OF:
@@ -208,8 +388,10 @@ class KnowledgeLoader:
             if t_type not in self._country_type_index[country_label]:
                 self._country_type_index[country_label][t_type] = []
             bucket = self._country_type_index[country_label][t_type]
-            tid = target_node.get("id")
-            if not any(str(x.get("id")) == str(tid) for x in bucket):
+            seen_ids = bucket_ids.setdefault((country_label, t_type), {str(x.get("id")) for x in bucket})
+            tid = str(target_node.get("id"))
+            if tid not in seen_ids:
+                seen_ids.add(tid)
                 bucket.append(target_node)
             if t_type != "COUNTRY":
                 self._cultural_types.add(t_type)
@@ -225,7 +407,8 @@ class KnowledgeLoader:
     def find_node(self, label: str) -> Optional[CulturalNode]:
         """Find a node by label (case-insensitive)."""
         label_lower = label.lower()
-        for node in self.nodes.values():
+        for node_id in self._label_index.get(label_lower.strip(), ()):
+            node = self.nodes[node_id]
             if node.get("label", "").lower() == label_lower:
                 return CulturalNode(**node)
         return None
@@ -240,23 +423,16 @@ class KnowledgeLoader:
         """
         Returns all nodes of a specific type associated with a specific culture using pre-built index.
         """
-        culture_key = None
-        for k in self._country_type_index.keys():
-            if k.lower() == culture_name.lower():
-                culture_key = k
-                break
+        culture_key = self._country_keys.get(culture_name.lower())
         if not culture_key:
             return []
-        nodes = self._country_type_index[culture_key].get(node_type, [])
+        nodes = self._country_types(culture_key).get(node_type, [])
         return [CulturalNode(**n) for n in nodes]
 
     # --- Cultural KB API (for K(c) format) ---
 
     def _culture_key(self, culture_name: str) -> Optional[str]:
-        for k in self._cultural_kb.keys():
-            if k.lower() == culture_name.lower():
-                return k
-        return None
+        return self._kb_culture_keys.get(culture_name.lower())
 
     def get_kb_entry(self, culture_name: str) -> Optional[CulturalKBEntry]:
         """Return the full KB entry for a target culture, if using KB format."""
@@ -297,15 +473,16 @@ class KnowledgeLoader:
         key = (label or "").strip().lower()
         if not key:
             return None
-        for node in self.nodes.values():
-            node_label = str(node.get("label") or "").strip().lower()
-            if node_label != key:
-                continue
-            node_culture = self._node_to_country.get(str(node.get("id")))
-            if culture_name and node_culture and node_culture.lower() != culture_name.lower():
-                continue
-            return dict(node)
-        return None
+        if not culture_name:
+            node_ids = self._label_index.get(key)
+            return dict(self.nodes[node_ids[0]]) if node_ids else None
+        # First match in load order among nodes of that culture and unscoped nodes.
+        matches = [
+            hit
+            for hit in (self._label_culture_index.get((key, culture_name.lower())), self._label_unscoped_index.get(key))
+            if hit is not None
+        ]
+        return dict(self.nodes[min(matches)[1]]) if matches else None
 
     def get_visual_attributes(self, label: str, obj_type: str, culture_name: str = "") -> Dict[str, str]:
         item = self.get_item_by_label(label, culture_name=culture_name) or {}
@@ -390,23 +567,49 @@ class KnowledgeLoader:
             }
         ]
 
-    def rank_candidates_by_embedding(self, query: str, candidates: List[str]) -> List[str]:
-        if not query or not candidates:
-            return candidates
+    def get_label_embeddings(self):
+        """Embedding matrix over get_all_labels() (see label_embeddings), created on first use."""
+        if self._label_embeddings is None:
+            from src.reasoning.label_embeddings import EMBEDDING_MODEL_NAME, LabelEmbeddingIndex, file_digest
+
+            seeded = self._snapshot_embeddings or {}
+            matrix = seeded.get("matrix") if seeded.get("model_name") == EMBEDDING_MODEL_NAME else None
+            self._label_embeddings = LabelEmbeddingIndex(
+                self._all_labels,
+                model_name=EMBEDDING_MODEL_NAME,
+                kg_hash=file_digest(self.graph_path),
+                matrix=matrix,
+                on_matrix=self._on_label_matrix,
+            )
+        return self._label_embeddings
+
+    def _on_label_matrix(self) -> None:
+        """Re-save the snapshot so the next load starts with the label embedding matrix."""
+        if self._snapshot_path is not None and self._source_checksum is not None:
+            self.save_snapshot()
+
+    def _encode_texts(self, model_name: str, texts: List[str]):
+        """Encode with the shared SentenceTransformer, imported and loaded on the first cache miss."""
+        if self._encoder_unavailable:
+            raise ImportError("sentence_transformers is not available")
         try:
             from sentence_transformers import SentenceTransformer
-            from sklearn.metrics.pairwise import cosine_similarity
         except Exception:
+            self._encoder_unavailable = True
+            raise
+        from src.utilities.model_manager import get_model_manager
+
+        model = get_model_manager().get(
+            f"sentence_transformer:{model_name}",
+            lambda: SentenceTransformer(model_name),
+        )
+        return model.encode(texts)
+
+    def rank_candidates_by_embedding(self, query: str, candidates: List[str]) -> List[str]:
+        if not query or not candidates:
             return candidates
         try:
-            if self._embedding_components is None:
-                self._embedding_components = SentenceTransformer("all-MiniLM-L6-v2")
-            model = self._embedding_components
-            q_emb = model.encode([query])
-            c_emb = model.encode(candidates)
-            sims = cosine_similarity(q_emb, c_emb)[0]
-            pairs: List[Tuple[float, str]] = list(zip(sims.tolist(), candidates))
-            pairs.sort(key=lambda x: x[0], reverse=True)
-            return [p[1] for p in pairs]
+            index = self.get_label_embeddings()
+            return index.rank(query, candidates, lambda texts: self._encode_texts(index.model_name, texts))
         except Exception:
             return candidates
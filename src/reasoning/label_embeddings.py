@@ -0,0 +1,217 @@
+"""
+Precomputed sentence embeddings for knowledge-base labels.
+
+``rank_candidates_by_embedding`` used to encode the whole candidate list on
+every call. :class:`LabelEmbeddingIndex` encodes every KB label once, stores the
+L2-normalized matrix as ``$CACHE_DIR/embeddings/<model>_<kg-hash>.npy`` (loaded
+memory-mapped on later runs) and ranks with one matrix-vector product. Query
+embeddings and the occasional non-KB candidate go through small LRUs, so a
+repeated ranking needs no model forward pass at all.
+
+Cache size: ``KG_EMBEDDING_QUERY_CACHE_SIZE`` (default 512); disable the disk
+matrix with ``ENABLE_KG_EMBEDDING_CACHE=false``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+Encoder = Callable[[List[str]], "np.ndarray"]
+
+
+def embedding_cache_enabled() -> bool:
+    return str(os.getenv("ENABLE_KG_EMBEDDING_CACHE", "true")).lower() in ("true", "1", "yes")
+
+
+def query_cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("KG_EMBEDDING_QUERY_CACHE_SIZE", "512")))
+    except ValueError:
+        return 512
+
+
+def default_embedding_cache_dir() -> Path:
+    """``$CACHE_DIR/embeddings`` (project ``cache/`` when CACHE_DIR is unset)."""
+    return Path(os.getenv("CACHE_DIR", str(_PROJECT_ROOT / "cache"))) / "embeddings"
+
+
+def file_digest(path: str) -> str:
+    """Short SHA-256 of a file's bytes (empty string when unreadable)."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    return digest.hexdigest()[:16]
+
+
+def _normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LabelEmbeddingIndex:
+    """Normalized embedding matrix over a fixed label list, with query LRUs."""
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        model_name: str = EMBEDDING_MODEL_NAME,
+        kg_hash: str = "",
+        cache_dir: Optional[Path] = None,
+        cache_size: Optional[int] = None,
+        persist: Optional[bool] = None,
+        matrix: Optional["np.ndarray"] = None,
+        on_matrix: Optional[Callable[[], None]] = None,
+    ):
+        self.labels = list(labels)
+        self.model_name = model_name
+        self.kg_hash = kg_hash
+        self.cache_dir = Path(cache_dir) if cache_dir else default_embedding_cache_dir()
+        self.cache_size = query_cache_size() if cache_size is None else max(0, int(cache_size))
+        self.persist = embedding_cache_enabled() if persist is None else bool(persist)
+        self._rows: Dict[str, int] = {}
+        for row, label in enumerate(self.labels):
+            self._rows.setdefault(label, row)
+        # Called once the matrix is first encoded or read from the .npy cache.
+        self.on_matrix = on_matrix
+        self._matrix: Optional["np.ndarray"] = None
+        if matrix is not None and np.ndim(matrix) == 2 and len(matrix) == len(self.labels):
+            self._matrix = matrix
+        self._queries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._extra: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "query_hits": 0,
+            "query_misses": 0,
+            "extra_encoded": 0,
+            "matrix_source": "snapshot" if self._matrix is not None else "",
+        }
+
+    @property
+    def cache_path(self) -> Path:
+        safe_model = re.sub(r"[^A-Za-z0-9._-]+", "__", self.model_name).strip("_") or "model"
+        return self.cache_dir / f"{safe_model}_{self.kg_hash or 'nohash'}.npy"
+
+    def _load_cached(self) -> Optional["np.ndarray"]:
+        path = self.cache_path
+        labels_path = path.with_suffix(".labels.json")
+        if not path.exists() or not labels_path.exists():
+            return None
+        try:
+            with open(labels_path, "r", encoding="utf-8") as f:
+                if json.load(f) != self.labels:
+                    return None
+            matrix = np.load(str(path), mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning("Label embedding cache %s unusable: %s", path, e)
+            return None
+        if matrix.ndim != 2 or matrix.shape[0] != len(self.labels):
+            return None
+        return matrix
+
+    def _save(self, matrix: "np.ndarray") -> Optional["np.ndarray"]:
+        path = self.cache_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+            with open(path.with_suffix(".labels.json"), "w", encoding="utf-8") as f:
+                json.dump(self.labels, f, ensure_ascii=False)
+            return np.load(str(path), mmap_mode="r")
+        except OSError as e:
+            logger.warning("Could not cache label embeddings at %s: %s", path, e)
+            return None
+
+    def has_matrix(self) -> bool:
+        return self._matrix is not None
+
+    def matrix(self, encode: Encoder) -> "np.ndarray":
+        """(len(labels), dim) normalized embeddings; encodes and persists on first use."""
+        if self._matrix is not None:
+            return self._matrix
+        with self._lock:
+            if self._matrix is not None:
+                return self._matrix
+            cached = self._load_cached() if self.persist else None
+            if cached is not None:
+                self._matrix = cached
+                self.stats["matrix_source"] = "mmap"
+            else:
+                encoded = _normalize_rows(encode(self.labels)) if self.labels else np.zeros((0, 0), np.float32)
+                saved = self._save(encoded) if self.persist and self.labels else None
+                self._matrix = saved if saved is not None else encoded
+                self.stats["matrix_source"] = "encoded"
+                logger.info("Encoded %d KB labels with %s", len(self.labels), self.model_name)
+            matrix = self._matrix
+        if self.on_matrix is not None:
+            try:
+                self.on_matrix()
+            except Exception as e:
+                logger.warning("Label embedding matrix callback failed: %s", e)
+        return matrix
+
+    def _cached_vectors(self, cache: "OrderedDict[str, np.ndarray]", texts: List[str], encode: Encoder) -> List["np.ndarray"]:
+        with self._lock:
+            missing = [t for t in dict.fromkeys(texts) if t not in cache]
+        if missing:
+            vectors = _normalize_rows(encode(missing))
+            with self._lock:
+                for text, vector in zip(missing, vectors):
+                    cache[text] = vector
+        with self._lock:
+            out = [cache[t] for t in texts]
+            for text in texts:
+                cache.move_to_end(text)
+            while len(cache) > max(self.cache_size, len(texts)):
+                cache.popitem(last=False)
+        return out
+
+    def query_vector(self, query: str, encode: Encoder) -> "np.ndarray":
+        with self._lock:
+            hit = query in self._queries
+            self.stats["query_hits" if hit else "query_misses"] += 1
+        return self._cached_vectors(self._queries, [query], encode)[0]
+
+    def rank(self, query: str, candidates: List[str], encode: Encoder) -> List[str]:
+        """``candidates`` by cosine similarity to ``query``, best first (stable on ties)."""
+        if not query or not candidates:
+            return candidates
+        q = self.query_vector(query, encode)
+        scores = np.empty(len(candidates), dtype=np.float32)
+        rows = [self._rows.get(c, -1) if isinstance(c, str) else -1 for c in candidates]
+        known = [i for i, row in enumerate(rows) if row >= 0]
+        if known:
+            label_scores = np.asarray(self.matrix(encode) @ q)
+            scores[known] = label_scores[[rows[i] for i in known]]
+        unknown = [i for i, row in enumerate(rows) if row < 0]
+        if unknown:
+            texts = [str(candidates[i]) for i in unknown]
+            with self._lock:
+                self.stats["extra_encoded"] += sum(1 for t in texts if t not in self._extra)
+            vectors = self._cached_vectors(self._extra, texts, encode)
+            scores[unknown] = np.stack(vectors) @ q
+        order = np.argsort(-scores, kind="stable")
+        return [candidates[i] for i in order.tolist()]
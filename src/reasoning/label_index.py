@@ -0,0 +1,121 @@
+"""
+Inverted token index over knowledge-base labels.
+
+Grounding and type inference match object text against every KB label by token
+overlap. :class:`LabelTokenIndex` tokenizes each label once and keeps posting
+lists (token -> label positions), so an overlap query only touches labels that
+share a token with the query instead of re-tokenizing the whole vocabulary.
+
+Postings hold raw tokens; callers filter their *query* tokens (stopwords, short
+tokens). Because the filter is a per-token predicate, ``filtered(q) & raw(label)``
+equals ``filtered(q) & filtered(label)``, so results match the former loops and
+policy stopword changes need no rebuild.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize_label_key(value: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(value or "").strip().lower()).strip()
+
+
+def tokenize_label(value: Any) -> List[str]:
+    return [t for t in normalize_label_key(value).split() if t]
+
+
+class LabelTokenIndex:
+    """Token -> label postings plus each label's node type, in ``get_all_labels()`` order."""
+
+    def __init__(self, labels: List[str], label_types: List[Optional[str]]):
+        self.labels = list(labels)
+        self.label_types = list(label_types)
+        self._type_by_label: Dict[str, Optional[str]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._key_positions: Dict[str, List[int]] = {}
+        self._type_tokens: Dict[str, Set[str]] = {}
+        for position, (label, node_type) in enumerate(zip(self.labels, self.label_types)):
+            self._type_by_label.setdefault(label, node_type)
+            tokens = set(tokenize_label(label))
+            for token in tokens:
+                self._postings.setdefault(token, []).append(position)
+            key = normalize_label_key(label)
+            if key:
+                self._key_positions.setdefault(key, []).append(position)
+            if node_type:
+                self._type_tokens.setdefault(node_type, set()).update(tokens)
+
+    @classmethod
+    def from_loader(cls, kg_loader: Any) -> "LabelTokenIndex":
+        """Build from a loader's ``get_all_labels()`` and ``find_node()`` (one call per label)."""
+        raw_labels = kg_loader.get_all_labels()
+        labels: List[str] = []
+        label_types: List[Optional[str]] = []
+        for label in raw_labels if isinstance(raw_labels, list) else []:
+            if not isinstance(label, str):
+                continue
+            node = kg_loader.find_node(label) if label.strip() else None
+            labels.append(label)
+            label_types.append(str(node.type or "").upper() if node else None)
+        return cls(labels, label_types)
+
+    def type_of(self, label: str) -> Optional[str]:
+        """Upper-cased node type of an indexed label (None when it has no node)."""
+        return self._type_by_label.get(label)
+
+    def has_label(self, label: str) -> bool:
+        return label in self._type_by_label
+
+    @staticmethod
+    def _eligible(node_type: Optional[str], excluded: Set[str], allowed: Set[str]) -> bool:
+        if node_type is None or node_type in excluded:
+            return False
+        return not allowed or node_type in allowed
+
+    def has_eligible(self, excluded: Set[str], allowed: Set[str]) -> bool:
+        return any(self._eligible(t, excluded, allowed) for t in set(self.label_types))
+
+    def eligible_labels(self, excluded: Set[str], allowed: Set[str]) -> List[str]:
+        return [
+            label
+            for label, node_type in zip(self.labels, self.label_types)
+            if self._eligible(node_type, excluded, allowed)
+        ]
+
+    def type_tokens(self, excluded: Set[str]) -> Dict[str, Set[str]]:
+        """Cultural type -> raw label tokens (fresh sets), skipping ``excluded`` types."""
+        return {t: set(tokens) for t, tokens in self._type_tokens.items() if t not in excluded}
+
+    def exact_match(self, key: str, excluded: Set[str], allowed: Set[str]) -> Optional[str]:
+        """Last eligible label whose normalized key is ``key`` (a later label wins, as in a dict)."""
+        for position in reversed(self._key_positions.get(key, ())):
+            if self._eligible(self.label_types[position], excluded, allowed):
+                return self.labels[position]
+        return None
+
+    def best_overlap(
+        self,
+        tokens: Iterable[str],
+        excluded: Set[str],
+        allowed: Set[str],
+    ) -> Tuple[Optional[str], int]:
+        """
+        Eligible label sharing the most tokens with ``tokens`` and that overlap.
+
+        Ties go to the earliest label, like a first-wins linear scan.
+        """
+        counts: Dict[int, int] = {}
+        for token in set(tokens):
+            for position in self._postings.get(token, ()):
+                counts[position] = counts.get(position, 0) + 1
+        best_position = -1
+        best_overlap = 0
+        for position, overlap in counts.items():
+            if overlap < best_overlap or (overlap == best_overlap and position > best_position):
+                continue
+            if not self._eligible(self.label_types[position], excluded, allowed):
+                continue
+            best_position, best_overlap = position, overlap
+        if best_position < 0:
+            return None, 0
+        return self.labels[best_position], best_overlap
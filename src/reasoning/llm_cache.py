@@ -0,0 +1,228 @@
+"""
+Disk-backed cache for LLM JSON responses.
+
+Batch and multi-culture runs send many identical prompts (the same OCR line
+for the same culture, the same object/type/culture reasoning prompt, the same
+placeholder check). :class:`LLMResponseCache` stores parsed responses in SQLite
+at ``$CACHE_DIR/llm/responses.sqlite``. Entries are keyed by provider, model,
+system prompt and prompt, expire after ``LLM_CACHE_TTL_S`` (default 7 days) and
+are evicted least-recently-used beyond ``LLM_CACHE_MAX_ENTRIES`` (default
+20000). Concurrent identical requests are coalesced: one thread makes the HTTP
+call and the others wait for its result.
+
+Error and fallback responses are never stored. Bypass with
+``ENABLE_LLM_CACHE=false`` or ``generate_reasoning(prompt, use_cache=False)``.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_EVICT_EVERY_PUTS = 32
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0, "bypassed": 0}
+
+
+def llm_cache_enabled() -> bool:
+    return str(os.getenv("ENABLE_LLM_CACHE", "true")).lower() in ("true", "1", "yes")
+
+
+def llm_cache_ttl_s() -> float:
+    try:
+        return max(0.0, float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600))))
+    except ValueError:
+        return 7 * 24 * 3600.0
+
+
+def llm_cache_max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000")))
+    except ValueError:
+        return 20000
+
+
+def default_llm_cache_path() -> Path:
+    """``$CACHE_DIR/llm/responses.sqlite`` (project ``cache/`` when CACHE_DIR is unset)."""
+    return Path(os.getenv("CACHE_DIR", str(_PROJECT_ROOT / "cache"))) / "llm" / "responses.sqlite"
+
+
+def cache_key(provider: str, model: str, system_prompt: str, prompt: str) -> str:
+    payload = json.dumps([provider, model, system_prompt, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _STATS_LOCK:
+        _STATS[name] += n
+
+
+def llm_cache_stats() -> Dict[str, int]:
+    """Process-wide hit/miss counters (for run metrics)."""
+    with _STATS_LOCK:
+        return dict(_STATS)
+
+
+def record_bypass() -> None:
+    _count("bypassed")
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMResponseCache:
+    """SQLite store of JSON responses with TTL, LRU size eviction and request coalescing."""
+
+    def __init__(self, path: Optional[Path] = None, ttl_s: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = Path(path) if path else default_llm_cache_path()
+        self.ttl_s = llm_cache_ttl_s() if ttl_s is None else float(ttl_s)
+        self.max_entries = llm_cache_max_entries() if max_entries is None else max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._puts = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("LLM response cache %s unavailable: %s", self.path, e)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._conn is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if self.ttl_s and now - row[1] > self.ttl_s:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("LLM response cache read failed: %s", e)
+            return None
+
+    def put(self, key: str, response: Dict[str, Any], provider: str = "", model: str = "") -> None:
+        if self._conn is None:
+            return
+        now = time.time()
+        try:
+            text = json.dumps(response, ensure_ascii=False)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, model, response, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, text, now, now),
+                )
+                self._puts += 1
+                if self._puts % _EVICT_EVERY_PUTS == 1:
+                    self._evict(now)
+                self._conn.commit()
+            _count("stores")
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("LLM response cache write failed: %s", e)
+
+    def _evict(self, now: float) -> None:
+        removed = 0
+        if self.ttl_s:
+            removed += self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,)).rowcount
+        removed += self._conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if removed > 0:
+            _count("evictions", removed)
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, Any]],
+        cacheable: Callable[[Any], bool],
+        provider: str = "",
+        model: str = "",
+    ) -> Dict[str, Any]:
+        """Cached response for ``key``; otherwise ``compute()`` once across concurrent callers."""
+        cached = self.get(key)
+        if cached is not None:
+            _count("hits")
+            return cached
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._inflight[key] = flight
+        if not leader:
+            flight.done.wait()
+            _count("coalesced")
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            # Another caller may have stored it between the lookup and registration.
+            cached = self.get(key)
+            if cached is not None:
+                _count("hits")
+                flight.result = cached
+                return copy.deepcopy(cached)
+            _count("misses")
+            result = compute()
+            flight.result = result
+            if cacheable(result):
+                self.put(key, result, provider=provider, model=model)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+
+_CACHES: Dict[str, LLMResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Shared cache for the current ``CACHE_DIR`` (one SQLite connection per path)."""
+    path = default_llm_cache_path()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(str(path))
+        if cache is None:
+            cache = LLMResponseCache(path)
+            _CACHES[str(path)] = cache
+        return cache
@@ -1,12 +1,14 @@
 import os
 import json
 import re
+import threading
 import time
 import logging
 import requests
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
+from src.reasoning.llm_cache import cache_key, get_llm_cache, llm_cache_enabled, record_bypass
 from src.reasoning.prompt_config import get_prompt
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -50,6 +52,11 @@ def _parse_llm_json(content: Optional[str]) -> Dict[str, Any]:
     return _FALLBACK_RESPONSE
 
 
+def _is_cacheable_response(result: Any) -> bool:
+    """Only parsed answers are cached; errors and the invalid-JSON fallback are retried next time."""
+    return isinstance(result, dict) and bool(result) and "error" not in result and result != _FALLBACK_RESPONSE
+
+
 def _normalize_provider(value: str) -> str:
     """Normalize provider string (e.g. 'groq?', 'Groq ' -> 'groq')."""
     if not value:
@@ -87,7 +94,12 @@ def _extract_deployment_from_chat_url(chat_url: str) -> Optional[str]:
 
 
 class LLMClient:
-    def __init__(self):
+    def __init__(self, use_cache: Optional[bool] = None):
+        """
+        Args:
+            use_cache: False disables the response cache for this client
+                (e.g. --no-cache); None follows ENABLE_LLM_CACHE.
+        """
         raw = _env_str("LLM_PROVIDER", "openai")
         self.provider = _normalize_provider(raw)
         if self.provider == "azure":
@@ -125,8 +137,12 @@ class LLMClient:
                 logger.warning("LLM_API_KEY / GROQ_API_KEY not found in environment variables.")
         self._service_unavailable = False
         self._service_unavailable_reason = ""
+        self.use_cache = llm_cache_enabled() and (use_cache is None or bool(use_cache))
+        # Per-thread flag set when a fallback (another deployment or Groq)
+        # answered instead of the configured provider/model.
+        self._served = threading.local()
 
-    def _call_groq_fallback(self, prompt: str) -> Optional[Dict[str, Any]]:
+    def _call_groq_fallback(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Fallback for Azure misconfiguration: use Groq when key is available."""
         groq_key = _env_str("GROQ_API_KEY") or _env_str("LLM_API_KEY")
         if not groq_key:
@@ -144,6 +160,8 @@ class LLMClient:
             ],
             "temperature": 0.2,
         }
+        if max_tokens:
+            payload["max_tokens"] = int(max_tokens)
         try:
             response = requests.post(
                 "https://api.groq.com/openai/v1/chat/completions",
@@ -155,24 +173,55 @@ class LLMClient:
             result = response.json()
             content = (result.get("choices") or [{}])[0].get("message", {}).get("content")
             logger.warning("Azure Stage-2 call failed; used Groq fallback model=%s", groq_model)
+            self._served.fallback = True
             return _parse_llm_json(content)
         except Exception as e:
             logger.warning("Groq fallback after Azure failure did not succeed: %s", e)
             return None
 
-    def generate_reasoning(self, prompt: str) -> Dict[str, Any]:
+    def generate_reasoning(
+        self, prompt: str, use_cache: bool = True, max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Sends a prompt to the LLM and expects a JSON response.
+        Identical prompts are served from the response cache unless use_cache is False.
+        max_tokens raises the completion limit for long (batched) answers;
+        None keeps the provider default.
         """
         logger.info("LLM generate_reasoning: provider=%s model=%s", self.provider, self.model)
+        return self._cached_call(prompt, use_cache=use_cache, max_tokens=max_tokens)
+
+    def _call_provider(self, prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         if self.provider == "openai":
-            return self._call_openai(prompt)
+            return self._call_openai(prompt, max_tokens=max_tokens)
         if self.provider == "groq":
-            return self._call_groq(prompt)
+            return self._call_groq(prompt, max_tokens=max_tokens)
         if self.provider == "azure":
-            return self._call_azure(prompt)
+            return self._call_azure(prompt, max_tokens=max_tokens)
         raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
+    def _cached_call(self, prompt: str, use_cache: bool = True, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        if not (use_cache and self.use_cache):
+            record_bypass()
+            return self._call_provider(prompt, max_tokens=max_tokens)
+        system_prompt = _SYSTEM_PROMPT_STRICT if self.provider == "groq" else _SYSTEM_PROMPT
+
+        def compute() -> Dict[str, Any]:
+            self._served.fallback = False
+            return self._call_provider(prompt, max_tokens=max_tokens)
+
+        def cacheable(result: Any) -> bool:
+            # The key names the configured provider/model; a fallback answer is not stored under it.
+            return _is_cacheable_response(result) and not getattr(self._served, "fallback", False)
+
+        return get_llm_cache().get_or_compute(
+            cache_key(self.provider, self.model, system_prompt, prompt),
+            compute,
+            cacheable=cacheable,
+            provider=self.provider,
+            model=self.model,
+        )
+
     def generate_candidates(
         self,
         obj_label: str,
@@ -207,16 +256,9 @@ class LLMClient:
             avoid_list=avoid_list,
         )
 
-        if self.provider == "openai":
-            logger.info("LLM generate_candidates via openai: obj=%s type=%s", obj_label, obj_type)
-            result = self._call_openai(prompt)
-        elif self.provider == "groq":
-            logger.info("LLM generate_candidates via groq: obj=%s type=%s", obj_label, obj_type)
-            result = self._call_groq(prompt)
-        elif self.provider == "azure":
-            result = self._call_azure(prompt)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+        if self.provider in ("openai", "groq"):
+            logger.info("LLM generate_candidates via %s: obj=%s type=%s", self.provider, obj_label, obj_type)
+        result = self._cached_call(prompt)
 
         candidates = result.get("candidates", [])
         if not isinstance(candidates, list):
@@ -243,7 +285,7 @@ class LLMClient:
         )
         return normalized
 
-    def _call_openai(self, prompt: str, retries: int = 3) -> Dict[str, Any]:
+    def _call_openai(self, prompt: str, retries: int = 3, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
@@ -261,6 +303,8 @@ class LLMClient:
             "response_format": {"type": "json_object"},
             "temperature": 0.2
         }
+        if max_tokens:
+            payload["max_tokens"] = int(max_tokens)
 
         for attempt in range(retries):
             try:
@@ -289,7 +333,7 @@ class LLMClient:
                 logger.error(f"Unexpected error in LLM client: {e}")
                 return {"error": str(e)}
 
-    def _call_azure(self, prompt: str, retries: int = 3) -> Dict[str, Any]:
+    def _call_azure(self, prompt: str, retries: int = 3, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Azure OpenAI chat completions: api-key header, deployment in URL (no model in body)."""
         if self._service_unavailable:
             return {
@@ -320,7 +364,7 @@ class LLMClient:
                 {"role": "user", "content": prompt},
             ],
             # Keep aligned with scripts/test_api: simple chat payload with max_tokens.
-            "max_tokens": 512,
+            "max_tokens": int(max_tokens) if max_tokens else 512,
             "response_format": {"type": "json_object"},
             "temperature": 0.2,
         }
@@ -347,6 +391,8 @@ class LLMClient:
                     response.raise_for_status()
                     result = response.json()
                     content = (result.get("choices") or [{}])[0].get("message", {}).get("content")
+                    if url != base_url:
+                        self._served.fallback = True
                     return _parse_llm_json(content)
                 except requests.exceptions.RequestException as e:
                     attempted_urls.append(url)
@@ -384,7 +430,7 @@ class LLMClient:
                     return {"error": str(e)}
 
         attempted = ", ".join(dict.fromkeys(attempted_urls)) if attempted_urls else "none"
-        groq_fallback = self._call_groq_fallback(prompt)
+        groq_fallback = self._call_groq_fallback(prompt, max_tokens=max_tokens)
         if groq_fallback is not None:
             return groq_fallback
         self._service_unavailable = True
@@ -395,7 +441,7 @@ class LLMClient:
             "rationale": self._service_unavailable_reason,
         }
 
-    def _call_groq(self, prompt: str, retries: int = 3) -> Dict[str, Any]:
+    def _call_groq(self, prompt: str, retries: int = 3, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Call Groq API (OpenAI-compatible). Uses GROQ_API_KEY or LLM_API_KEY."""
         headers = {
             "Content-Type": "application/json",
@@ -412,6 +458,8 @@ class LLMClient:
             ],
             "temperature": 0.2,
         }
+        if max_tokens:
+            payload["max_tokens"] = int(max_tokens)
 
         for attempt in range(retries):
             try:
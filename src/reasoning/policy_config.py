@@ -1,14 +1,26 @@
 """
 Reasoning policy settings loaded from reasoning.yaml (and optional env overrides).
+
+The YAML is parsed once into a :class:`PolicySnapshot`; typed lookups are
+memoized on the snapshot, so policy reads in per-object and per-label loops cost
+a dict lookup. Long-running services pick up edits to reasoning.yaml (and
+changed ``REASONING_POLICY_*`` variables) through an mtime check made at most
+every ``REASONING_RELOAD_INTERVAL_S`` seconds (default 1; 0 checks on every
+read). :func:`reload_policy` forces a reload; :func:`policy_stats` counts YAML
+reads so benchmarks can assert none happen in the hot path.
 """
+import copy
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, List, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
 import yaml
 
 _CONFIG_FILE = Path(__file__).resolve().parent / "config" / "reasoning.yaml"
 _ENV_PREFIX = "REASONING_POLICY_"
+_MISSING = object()
 
 
 def _load_yaml(path: Path) -> dict:
@@ -16,24 +28,25 @@ def _load_yaml(path: Path) -> dict:
         return yaml.safe_load(handle) or {}
 
 
-def _policy_root() -> dict:
-    return _load_yaml(_CONFIG_FILE).get("policy") or {}
+def _reload_interval_s() -> float:
+    try:
+        return max(0.0, float(os.getenv("REASONING_RELOAD_INTERVAL_S", "1")))
+    except ValueError:
+        return 1.0
 
 
-def _walk(path: str) -> Any:
-    node: Any = _policy_root()
-    for key in (path or "").split("."):
-        if not isinstance(node, dict):
-            return None
-        node = node.get(key)
-    return node
+def _config_mtime() -> Optional[int]:
+    try:
+        return _CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
 
 
-def _env_override(path: str) -> Any:
-    env_name = _ENV_PREFIX + path.replace(".", "_").upper()
-    raw = os.getenv(env_name)
-    if raw is None:
-        return None
+def _policy_env() -> Dict[str, str]:
+    return {k: v for k, v in os.environ.items() if k.startswith(_ENV_PREFIX)}
+
+
+def _parse_env_value(raw: str) -> Any:
     text = raw.strip()
     if text.lower() in {"true", "false"}:
         return text.lower() == "true"
@@ -45,43 +58,138 @@ def _env_override(path: str) -> Any:
         return text
 
 
+class PolicySnapshot:
+    """One parse of reasoning.yaml plus the env overrides present at load time."""
+
+    def __init__(self, root: dict, mtime: Optional[int], env: Dict[str, str]):
+        self._root = root
+        self.mtime = mtime
+        self.env = dict(env)
+        self._overrides = {name: _parse_env_value(value) for name, value in self.env.items()}
+        self._typed: Dict[Any, Any] = {}
+
+    def _walk(self, path: str) -> Any:
+        node: Any = self._root
+        for key in (path or "").split("."):
+            if not isinstance(node, dict):
+                return None
+            node = node.get(key)
+        return node
+
+    def _env_override(self, path: str) -> Any:
+        return self._overrides.get(_ENV_PREFIX + path.replace(".", "_").upper())
+
+    def value(self, path: str) -> Any:
+        """Raw policy value (shared; callers copy before mutating)."""
+        cached = self._typed.get(("raw", path), _MISSING)
+        if cached is not _MISSING:
+            return cached
+        val = self._env_override(path)
+        if val is None:
+            val = self._walk(path)
+        if val is None:
+            raise KeyError(f"Missing reasoning policy key: policy.{path}")
+        self._typed[("raw", path)] = val
+        return val
+
+    def typed(self, kind: str, path: str, convert: Callable[[Any], Any]) -> Any:
+        key = (kind, path)
+        cached = self._typed.get(key, _MISSING)
+        if cached is _MISSING:
+            cached = convert(self.value(path))
+            self._typed[key] = cached
+        return cached
+
+
+_SNAPSHOT: Optional[PolicySnapshot] = None
+_SNAPSHOT_LOCK = threading.Lock()
+_NEXT_CHECK = 0.0
+_STATS = {"yaml_reads": 0, "reloads": 0}
+
+
+def _load_snapshot() -> PolicySnapshot:
+    root = _load_yaml(_CONFIG_FILE).get("policy") or {}
+    _STATS["yaml_reads"] += 1
+    return PolicySnapshot(root, _config_mtime(), _policy_env())
+
+
+def reload_policy() -> PolicySnapshot:
+    """Re-read reasoning.yaml and the env overrides now."""
+    global _SNAPSHOT, _NEXT_CHECK
+    with _SNAPSHOT_LOCK:
+        if _SNAPSHOT is not None:
+            _STATS["reloads"] += 1
+        _SNAPSHOT = _load_snapshot()
+        _NEXT_CHECK = time.monotonic() + _reload_interval_s()
+        return _SNAPSHOT
+
+
+def policy_snapshot() -> PolicySnapshot:
+    """Current snapshot; reloads when reasoning.yaml or REASONING_POLICY_* changed."""
+    global _NEXT_CHECK
+    snapshot = _SNAPSHOT
+    if snapshot is None:
+        return reload_policy()
+    now = time.monotonic()
+    if now < _NEXT_CHECK:
+        return snapshot
+    _NEXT_CHECK = now + _reload_interval_s()
+    if _config_mtime() != snapshot.mtime or _policy_env() != snapshot.env:
+        return reload_policy()
+    return snapshot
+
+
+def policy_stats() -> Dict[str, int]:
+    return dict(_STATS)
+
+
 def get_policy(path: str) -> Any:
-    env_val = _env_override(path)
-    if env_val is not None:
-        return env_val
-    val = _walk(path)
-    if val is None:
-        raise KeyError(f"Missing reasoning policy key: policy.{path}")
-    return val
+    val = policy_snapshot().value(path)
+    return copy.deepcopy(val) if isinstance(val, (list, dict)) else val
+
+
+def _as_list(path: str) -> Callable[[Any], tuple]:
+    def convert(val: Any) -> tuple:
+        if not isinstance(val, list):
+            raise TypeError(f"policy.{path} must be a list")
+        return tuple(str(item).strip() for item in val if str(item).strip())
+
+    return convert
 
 
 def get_policy_list(path: str) -> List[str]:
-    val = get_policy(path)
-    if not isinstance(val, list):
-        raise TypeError(f"policy.{path} must be a list")
-    return [str(item).strip() for item in val if str(item).strip()]
+    return list(policy_snapshot().typed("list", path, _as_list(path)))
 
 
 def get_policy_int(path: str) -> int:
-    return int(get_policy(path))
+    return policy_snapshot().typed("int", path, int)
 
 
 def get_policy_float(path: str) -> float:
-    return float(get_policy(path))
+    return policy_snapshot().typed("float", path, float)
 
 
 def get_policy_set(path: str) -> Set[str]:
-    return {str(item).strip().upper() for item in get_policy_list(path) if str(item).strip()}
+    def convert(val: Any) -> frozenset:
+        return frozenset(item.upper() for item in _as_list(path)(val))
+
+    return set(policy_snapshot().typed("set", path, convert))
+
+
+def _as_dict(path: str) -> Callable[[Any], dict]:
+    def convert(val: Any) -> dict:
+        if not isinstance(val, dict):
+            raise TypeError(f"policy.{path} must be a mapping")
+        parsed: dict = {}
+        for key, value in val.items():
+            key_text = str(key or "").strip().lower()
+            value_text = str(value or "").strip().upper()
+            if key_text and value_text:
+                parsed[key_text] = value_text
+        return parsed
+
+    return convert
 
 
 def get_policy_dict(path: str) -> dict:
-    val = get_policy(path)
-    if not isinstance(val, dict):
-        raise TypeError(f"policy.{path} must be a mapping")
-    parsed: dict = {}
-    for key, value in val.items():
-        key_text = str(key or "").strip().lower()
-        value_text = str(value or "").strip().upper()
-        if key_text and value_text:
-            parsed[key_text] = value_text
-    return parsed
+    return dict(policy_snapshot().typed("dict", path, _as_dict(path)))
@@ -0,0 +1,45 @@
+"""
+Fingerprints for invalidating on-disk caches when code or configuration changes.
+
+A cached artifact (scene JSON, pickled index) is only valid for the code and
+settings that produced it. ``source_fingerprint`` hashes the Python sources a
+cache depends on, ``config_fingerprint`` a JSON-able settings mapping; store
+them with the artifact and treat a mismatch as a miss.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+
+@lru_cache(maxsize=32)
+def _sources_digest(paths: tuple) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        p = Path(path)
+        digest.update(p.name.encode("utf-8") + b"\0")
+        try:
+            digest.update(p.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def source_fingerprint(paths: Iterable[Any]) -> str:
+    """SHA-256 over the given source files (or every ``*.py`` under given directories)."""
+    files = []
+    for path in paths:
+        p = Path(path)
+        if p.is_dir():
+            files.extend(sorted(str(f) for f in p.rglob("*.py") if "__pycache__" not in f.parts))
+        else:
+            files.append(str(p))
+    return _sources_digest(tuple(files))
+
+
+def config_fingerprint(config: Mapping[str, Any]) -> str:
+    """SHA-256 of a settings mapping (paths and other objects hashed via ``str``)."""
+    payload = json.dumps(config, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
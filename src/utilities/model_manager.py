@@ -0,0 +1,334 @@
+"""
+Process-wide model registry with a RAM budget and LRU eviction.
+
+Stage 1-3 models (YOLO/DETR/OWLv2, BLIP, CLIP copies, SAM, PaddleOCR, the
+SentenceTransformer) are loaded through :func:`get_model_manager`. Each entry's
+footprint comes from a configured size hint, else its torch parameters/buffers
+and numpy arrays, else the RSS growth during load (e.g. PaddleOCR). When the
+resident total exceeds the budget, least-recently-used models are dropped and
+reloaded lazily on next use.
+
+Memory shared between entries (the BLIP singleton held by both the "blip"
+entry and the captioner/summarizer) is charged once: tensors and arrays already
+counted for another resident entry are skipped when estimating a new one.
+
+Eviction only drops the registry's reference (plus the ``on_evict`` hook), so a
+model still in use by another thread finishes its current call and is freed
+when that caller lets go of it.
+
+Budget: ``MODEL_MEMORY_BUDGET_MB`` (0 = unlimited), or :meth:`ModelManager.configure`;
+entry points call :func:`configure_model_manager` with pipeline.model_memory at startup.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024.0 * 1024.0
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size in MB (Linux /proc; None elsewhere)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / _MB
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def estimate_footprint_mb(component: Any, max_depth: int = 3) -> float:
+    """
+    Approximate memory held by ``component``: torch module parameters and
+    buffers, tensors and numpy arrays reachable through attributes, tuples,
+    lists and dicts (each object counted once).
+    """
+    return _measure(component, max_depth)[0] / _MB
+
+
+def _measure(component: Any, max_depth: int = 3, exclude: Optional[set] = None) -> tuple:
+    """
+    (bytes, ids of the counted tensors/arrays, whether any were reached) for
+    ``component``. Objects whose id is in ``exclude`` are reached but not counted.
+    """
+    torch = sys.modules.get("torch")
+    np = sys.modules.get("numpy")
+    exclude = exclude or set()
+    seen = set()
+    counted = set()
+    total = 0
+    found = False
+
+    def count(obj, nbytes):
+        nonlocal total, found
+        found = True
+        if id(obj) in exclude:
+            return
+        counted.add(id(obj))
+        total += nbytes
+
+    def visit(obj, depth):
+        nonlocal found
+        if obj is None or id(obj) in seen or depth > max_depth:
+            return
+        seen.add(id(obj))
+        if depth > 0 and id(obj) in exclude:
+            found = True
+            return
+        if torch is not None and isinstance(obj, torch.nn.Module):
+            for tensor in list(obj.parameters()) + list(obj.buffers()):
+                if id(tensor) not in seen:
+                    seen.add(id(tensor))
+                    count(tensor, tensor.numel() * tensor.element_size())
+            return
+        if torch is not None and isinstance(obj, torch.Tensor):
+            count(obj, obj.numel() * obj.element_size())
+            return
+        if np is not None and isinstance(obj, np.ndarray):
+            count(obj, obj.nbytes)
+            return
+        if isinstance(obj, (str, bytes, int, float, bool)):
+            return
+        if isinstance(obj, dict):
+            children = list(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            children = list(obj)
+        else:
+            children = list(getattr(obj, "__dict__", {}).values())
+        for child in children:
+            visit(child, depth + 1)
+
+    visit(component, 0)
+    return total, counted, found
+
+
+class ModelManager:
+    """LRU model cache bounded by an approximate RAM budget."""
+
+    def __init__(self, budget_mb: float = 0.0, size_hints_mb: Optional[Dict[str, float]] = None):
+        self.budget_mb = max(0.0, float(budget_mb or 0.0))
+        self.size_hints_mb = dict(size_hints_mb or {})
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self._evicted_keys = set()
+        self._events = []
+        self._counters = {"loads": 0, "reloads": 0, "hits": 0, "evictions": 0, "load_failures": 0}
+        self._peak_resident_mb = 0.0
+
+    def configure(self, budget_mb: Optional[float] = None, size_hints_mb: Optional[Dict[str, float]] = None) -> None:
+        with self._lock:
+            if budget_mb is not None:
+                self.budget_mb = max(0.0, float(budget_mb))
+            if size_hints_mb:
+                self.size_hints_mb.update({str(k): float(v) for k, v in size_hints_mb.items()})
+            self._enforce_budget(keep=None)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        on_evict: Optional[Callable[[Any], None]] = None,
+        size_mb: Optional[float] = None,
+    ) -> Any:
+        """
+        Resident model for ``key``, loading it with ``loader`` on a miss.
+
+        Args:
+            key: Registry key, e.g. "blip" or "clip:openai/clip-vit-base-patch32"
+            loader: Zero-argument factory
+            on_evict: Called with the model when it is evicted
+            size_mb: Footprint override (skips estimation)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._touch(key, entry)
+                return entry["model"]
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._touch(key, entry)
+                    return entry["model"]
+            rss_before = _rss_mb()
+            started = time.perf_counter()
+            try:
+                model = loader()
+            except Exception:
+                with self._lock:
+                    self._counters["load_failures"] += 1
+                raise
+            load_ms = (time.perf_counter() - started) * 1000.0
+            footprint, owned = self._footprint(key, model, size_mb, rss_before)
+            with self._lock:
+                reload = key in self._evicted_keys
+                self._counters["loads"] += 1
+                self._counters["reloads"] += int(reload)
+                self._entries[key] = {
+                    "model": model,
+                    "size_mb": footprint,
+                    "on_evict": on_evict,
+                    "owned": owned,
+                    "load_ms": round(load_ms, 2),
+                    "loaded_at": time.time(),
+                    "last_used": time.time(),
+                    "hits": 0,
+                }
+                self._record("reload" if reload else "load", key, footprint)
+                logger.info(
+                    "Model %s %s: ~%.0fMB in %.0fms (resident %.0fMB / budget %s)",
+                    key,
+                    "reloaded" if reload else "loaded",
+                    footprint,
+                    load_ms,
+                    self.resident_mb(),
+                    f"{self.budget_mb:.0f}MB" if self.budget_mb else "unlimited",
+                )
+                self._enforce_budget(keep=key)
+            return model
+
+    def _touch(self, key: str, entry: Dict[str, Any]) -> None:
+        entry["last_used"] = time.time()
+        entry["hits"] += 1
+        self._counters["hits"] += 1
+        self._entries.move_to_end(key)
+
+    def _footprint(self, key: str, model: Any, size_mb: Optional[float], rss_before: Optional[float]) -> tuple:
+        """(size in MB, ids of tensors/arrays charged to this entry)."""
+        if size_mb is not None:
+            return float(size_mb), set()
+        if key in self.size_hints_mb:
+            return float(self.size_hints_mb[key]), set()
+        with self._lock:
+            exclude = set()
+            for other_key, entry in self._entries.items():
+                if other_key != key:
+                    exclude.add(id(entry["model"]))
+                    exclude.update(entry.get("owned") or ())
+        nbytes, owned, found = _measure(model, exclude=exclude)
+        if found:
+            return round(nbytes / _MB, 1), owned
+        rss_after = _rss_mb()
+        if rss_before is not None and rss_after is not None:
+            return round(max(0.0, rss_after - rss_before), 1), set()
+        return 0.0, set()
+
+    def _record(self, event: str, key: str, size_mb: float) -> None:
+        self._events.append({"event": event, "key": key, "size_mb": size_mb, "at": time.time()})
+        del self._events[:-200]
+        self._peak_resident_mb = max(self._peak_resident_mb, self.resident_mb())
+
+    def _enforce_budget(self, keep: Optional[str]) -> None:
+        if not self.budget_mb:
+            return
+        for key in list(self._entries.keys()):
+            if self.resident_mb() <= self.budget_mb:
+                break
+            if key == keep or self._entries[key]["size_mb"] <= 0:
+                continue
+            self._evict_locked(key, reason="budget")
+        if self.resident_mb() > self.budget_mb and keep in self._entries:
+            logger.warning(
+                "Model %s alone (~%.0fMB) exceeds the %.0fMB memory budget",
+                keep,
+                self._entries[keep]["size_mb"],
+                self.budget_mb,
+            )
+
+    def _evict_locked(self, key: str, reason: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._counters["evictions"] += 1
+        self._evicted_keys.add(key)
+        self._record("evict", key, entry["size_mb"])
+        logger.info("Evicting model %s (~%.0fMB, %s)", key, entry["size_mb"], reason)
+        hook = entry.get("on_evict")
+        if hook is not None:
+            try:
+                hook(entry["model"])
+            except Exception as e:
+                logger.warning("Eviction hook failed for %s: %s", key, e)
+        entry.clear()
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def evict(self, key: str) -> bool:
+        """Drop ``key`` from the registry; it is reloaded on next use."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._evict_locked(key, reason="explicit")
+            return True
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def resident_mb(self) -> float:
+        with self._lock:
+            return round(sum(entry["size_mb"] for entry in self._entries.values()), 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Loads, evictions and the resident set, for run metrics."""
+        with self._lock:
+            return {
+                "budget_mb": self.budget_mb,
+                "resident_mb": self.resident_mb(),
+                "peak_resident_mb": round(self._peak_resident_mb, 1),
+                **dict(self._counters),
+                "resident": {
+                    key: {"size_mb": entry["size_mb"], "load_ms": entry["load_ms"], "hits": entry["hits"]}
+                    for key, entry in self._entries.items()
+                },
+                "events": [dict(event) for event in self._events],
+            }
+
+    def reset(self) -> None:
+        """Drop every model and counter (tests, service shutdown)."""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._evict_locked(key, reason="reset")
+            self._evicted_keys.clear()
+            self._events.clear()
+            self._counters = {name: 0 for name in self._counters}
+            self._peak_resident_mb = 0.0
+
+
+_MANAGER: Optional[ModelManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def configure_model_manager(budget_mb: float = 0.0, size_hints_mb: Optional[Dict[str, float]] = None) -> ModelManager:
+    """Apply the configured budget and size hints to the process-wide manager."""
+    manager = get_model_manager()
+    manager.configure(budget_mb=budget_mb, size_hints_mb=size_hints_mb)
+    return manager
+
+
+def get_model_manager() -> ModelManager:
+    """Process-wide :class:`ModelManager` (budget from ``MODEL_MEMORY_BUDGET_MB``)."""
+    global _MANAGER
+    if _MANAGER is None:
+        with _MANAGER_LOCK:
+            if _MANAGER is None:
+                try:
+                    budget = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0") or 0)
+                except ValueError:
+                    budget = 0.0
+                _MANAGER = ModelManager(budget_mb=budget)
+    return _MANAGER
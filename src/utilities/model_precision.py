@@ -0,0 +1,170 @@
+"""
+Inference precision modes shared by the BLIP/CLIP model loaders.
+
+Modes:
+    fp32           - unchanged float32 weights (default).
+    dynamic_int8   - torch dynamic int8 quantization of nn.Linear layers (CPU only);
+                     the quantized module is cached on disk so later runs skip
+                     both the fp32 download/load and the quantization pass.
+                     The cache is a pickle loaded with ``weights_only=False``, so
+                     its directory must be trusted (writable only by the
+                     pipeline's own user); a JSON sidecar records the source
+                     weights it was quantized from.
+    bf16_autocast  - float32 weights, bfloat16 autocast around inference.
+
+fp32/bf16 weights are memory-mapped from the safetensors cache when the caller
+passes a ``skeleton_fn`` (see :mod:`src.utilities.weight_cache`).
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRECISION_MODES = ("fp32", "dynamic_int8", "bf16_autocast")
+
+_PRECISION_ALIASES = {
+    "": "fp32",
+    "float32": "fp32",
+    "int8": "dynamic_int8",
+    "dynamic-int8": "dynamic_int8",
+    "bf16": "bf16_autocast",
+    "bf16-autocast": "bf16_autocast",
+    "bfloat16": "bf16_autocast",
+}
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def normalize_precision_mode(value: Any) -> str:
+    """Map config spellings (``dynamic-int8``, ``bf16`` ...) to a canonical mode."""
+    text = str(value or "").strip().lower()
+    mode = _PRECISION_ALIASES.get(text, text)
+    if mode not in PRECISION_MODES:
+        logger.warning("Unknown model precision '%s'; using fp32", value)
+        return "fp32"
+    return mode
+
+
+def default_precision_cache_dir() -> Path:
+    """``$CACHE_DIR/quantized`` (project ``cache/`` when CACHE_DIR is unset)."""
+    return Path(os.getenv("CACHE_DIR", str(_PROJECT_ROOT / "cache"))) / "quantized"
+
+
+def quantized_cache_path(model_name: str, mode: str, cache_dir: Optional[Path] = None) -> Path:
+    """Cache file for a quantized model; includes the torch version (pickles are not portable)."""
+    import torch
+
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "__", str(model_name)).strip("_") or "model"
+    torch_tag = re.sub(r"[^A-Za-z0-9.]+", "_", str(torch.__version__))
+    base = Path(cache_dir) if cache_dir else default_precision_cache_dir()
+    return base / f"{safe_name}_{mode}_torch{torch_tag}.pt"
+
+
+def _read_quantized_fingerprint(path: Path) -> Optional[str]:
+    """Source fingerprint recorded next to a quantized cache file (None when missing)."""
+    try:
+        return str(json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))["fingerprint"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_model_with_precision(
+    load_fn: Callable[[], Any],
+    model_name: str,
+    mode: Any,
+    device: str,
+    cache_dir: Optional[Path] = None,
+    skeleton_fn: Optional[Callable[[], Any]] = None,
+    weight_cache_dir: Optional[Path] = None,
+    mmap_weights: Optional[bool] = None,
+    fingerprint: Optional[Callable[[], str]] = None,
+) -> Tuple[Any, str]:
+    """
+    Load a model through ``load_fn`` and apply the requested precision mode.
+
+    With ``skeleton_fn`` (weights-free constructor), unquantized weights come
+    from the memory-mapped safetensors cache after the first load. ``fingerprint``
+    identifies the source weights (default: :func:`hf_fingerprint` of ``model_name``);
+    a cache written for other weights is rebuilt.
+
+    Returns:
+        (model, effective_mode). dynamic_int8 degrades to fp32 off-CPU or when
+        quantization fails, so callers should record the effective mode.
+    """
+    mode = normalize_precision_mode(mode)
+    if mode == "dynamic_int8" and not str(device).startswith("cpu"):
+        logger.info("dynamic_int8 precision is CPU-only; using fp32 weights on %s", device)
+        mode = "fp32"
+    from src.utilities.weight_cache import hf_fingerprint
+
+    # Both caches are keyed by model name; the fingerprint ties them to the source weights.
+    if fingerprint is None:
+        fingerprint = partial(hf_fingerprint, model_name)
+    if mode != "dynamic_int8":
+        from src.utilities.weight_cache import load_module_mmap
+
+        device_type = str(device or "cpu").split(":", 1)[0]
+        weights_key = model_name if device_type == "cpu" else f"{model_name}@{device_type}"
+        model = load_module_mmap(
+            weights_key,
+            load_fn,
+            skeleton_fn=skeleton_fn,
+            fingerprint=fingerprint,
+            cache_dir=weight_cache_dir,
+            enabled=mmap_weights,
+        )
+        return model, mode
+
+    import torch
+
+    path = quantized_cache_path(model_name, mode, cache_dir)
+    source_fingerprint = fingerprint()
+    cached_fingerprint = _read_quantized_fingerprint(path) if path.exists() else None
+    if path.exists() and cached_fingerprint != source_fingerprint:
+        # Never unpickle a file without matching metadata: it was quantized from
+        # other weights (or not written by this loader at all).
+        logger.info("Cached int8 weights for %s are stale; re-quantizing", model_name)
+    elif path.exists():
+        try:
+            model = torch.load(str(path), map_location="cpu", weights_only=False)
+            model.eval()
+            logger.info("Loaded cached int8 weights for %s from %s", model_name, path)
+            return model, mode
+        except Exception as e:
+            logger.warning("Cached int8 weights unreadable (%s); re-quantizing %s", e, model_name)
+
+    model = load_fn()
+    model.eval()
+    try:
+        quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning("Dynamic int8 quantization failed for %s; using fp32: %s", model_name, e)
+        return model, "fp32"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        torch.save(quantized, str(tmp_path))
+        os.replace(tmp_path, path)
+        # Re-resolve: a first download only now has a snapshot to fingerprint.
+        path.with_suffix(".json").write_text(json.dumps({"fingerprint": fingerprint()}), encoding="utf-8")
+        logger.info("Cached int8 weights for %s at %s", model_name, path)
+    except Exception as e:
+        logger.warning("Could not cache int8 weights for %s: %s", model_name, e)
+    return quantized, mode
+
+
+def inference_autocast(mode: Any, device: str):
+    """Context manager for inference: bf16 autocast in bf16_autocast mode, otherwise a no-op."""
+    if normalize_precision_mode(mode) != "bf16_autocast":
+        return contextlib.nullcontext()
+    import torch
+
+    device_type = str(device or "cpu").split(":", 1)[0]
+    return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
@@ -0,0 +1,245 @@
+"""
+Compact Stage-1 output: semantic scene JSON plus a binary geometry sidecar.
+
+Polygons and SAM mask RLEs are moved out of the scene JSON into
+``<stem>.geometry.npz`` and replaced in place by ``{"$geom": "<key>"}``
+references. Identical geometry (the same OCR polygon repeated in
+``text.regions``, ``text.extracted`` and ``text_regions``) is stored once.
+The sidecar is opened on first access, so readers that only need semantic
+fields never touch it.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_FORMAT = "npz"
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".geometry.npz"
+GEOMETRY_KEYS = ("polygon", "mask_rle")
+REF_KEY = "$geom"
+
+
+def encode_mask_rle(mask: np.ndarray) -> Dict[str, Any]:
+    """
+    Uncompressed COCO-style RLE of a binary mask.
+
+    Runs are taken in column-major order and start with a (possibly empty)
+    run of zeros.
+    """
+    mask = np.asarray(mask)
+    h, w = mask.shape[:2]
+    flat = mask.astype(bool).flatten(order="F")
+    if not flat.size:
+        return {"size": [int(h), int(w)], "counts": []}
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    counts = np.diff(np.concatenate(([0], changes, [flat.size])))
+    if flat[0]:
+        counts = np.concatenate(([0], counts))
+    return {"size": [int(h), int(w)], "counts": [int(c) for c in counts]}
+
+
+def decode_mask_rle(rle: Dict[str, Any]) -> np.ndarray:
+    """Binary ``uint8`` mask from :func:`encode_mask_rle` output."""
+    h, w = [int(v) for v in rle["size"][:2]]
+    counts = np.asarray(rle.get("counts") or [], dtype=np.int64)
+    values = (np.arange(len(counts)) % 2).astype(np.uint8)
+    flat = np.repeat(values, counts)
+    return flat.reshape((h, w), order="F")
+
+
+def is_geometry_ref(value: Any) -> bool:
+    return isinstance(value, dict) and REF_KEY in value
+
+
+def _polygon_array(value: Any) -> Optional[np.ndarray]:
+    if not isinstance(value, list) or not value:
+        return None
+    try:
+        array = np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 2 or array.shape[1] < 2:
+        return None
+    return array
+
+
+def split_geometry(scene_json: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Deep-copy ``scene_json`` with geometry replaced by sidecar references.
+
+    Returns:
+        (compact scene JSON, {sidecar key: array})
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    keys_by_digest: Dict[str, str] = {}
+
+    def store(prefix: str, array: np.ndarray) -> str:
+        digest = hashlib.sha1(
+            prefix.encode("ascii") + str(array.shape).encode("ascii") + array.tobytes()
+        ).hexdigest()
+        key = keys_by_digest.get(digest)
+        if key is None:
+            key = f"{prefix}{len(arrays)}"
+            keys_by_digest[digest] = key
+            arrays[key] = array
+        return key
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "polygon":
+                    array = _polygon_array(value)
+                    if array is not None:
+                        node[key] = {REF_KEY: store("p", array)}
+                        continue
+                elif key == "mask_rle" and isinstance(value, dict) and "counts" in value:
+                    counts = np.asarray(value.get("counts") or [], dtype=np.uint32)
+                    node[key] = {REF_KEY: store("m", counts), "size": list(value.get("size") or [])}
+                    continue
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    compact = copy.deepcopy(scene_json)
+    compact.pop("geometry_sidecar", None)
+    walk(compact)
+    return compact, arrays
+
+
+class GeometrySidecar:
+    """Lazily opened ``.npz`` geometry sidecar."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._archive = None
+
+    def _arrays(self):
+        if self._archive is None:
+            self._archive = np.load(self.path, allow_pickle=False)
+        return self._archive
+
+    def resolve(self, value: Any) -> Any:
+        """Inline value for a sidecar reference; other values are returned unchanged."""
+        if not is_geometry_ref(value):
+            return value
+        key = str(value[REF_KEY])
+        try:
+            array = self._arrays()[key]
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Geometry %s missing from sidecar %s: %s", key, self.path, e)
+            return None
+        if key.startswith("m"):
+            return {"size": list(value.get("size") or []), "counts": array.astype(np.int64).tolist()}
+        return array.tolist()
+
+
+@functools.lru_cache(maxsize=16)
+def _open_sidecar(path: str, mtime_ns: int) -> GeometrySidecar:
+    return GeometrySidecar(Path(path))
+
+
+def sidecar_for(scene_json: Dict[str, Any], base_dir: Optional[Path] = None) -> Optional[GeometrySidecar]:
+    """Sidecar referenced by ``scene_json`` (None when the scene has inline geometry)."""
+    meta = scene_json.get("geometry_sidecar") if isinstance(scene_json, dict) else None
+    if not isinstance(meta, dict) or not meta.get("path"):
+        return None
+    path = Path(meta["path"])
+    if not path.is_absolute() and base_dir is not None:
+        path = Path(base_dir) / path
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        logger.warning("Geometry sidecar not found: %s", path)
+        return None
+    return _open_sidecar(str(path.resolve()), mtime_ns)
+
+
+def resolve_geometry(value: Any, scene_json: Dict[str, Any]) -> Any:
+    """Resolve one geometry value of ``scene_json``, reading the sidecar only for references."""
+    if not is_geometry_ref(value):
+        return value
+    sidecar = sidecar_for(scene_json)
+    return sidecar.resolve(value) if sidecar is not None else None
+
+
+def inline_geometry(scene_json: Dict[str, Any], base_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Deep copy of ``scene_json`` with every sidecar reference resolved."""
+    sidecar = sidecar_for(scene_json, base_dir)
+    full = copy.deepcopy(scene_json)
+    full.pop("geometry_sidecar", None)
+    if sidecar is None:
+        return full
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in GEOMETRY_KEYS and is_geometry_ref(value):
+                    node[key] = sidecar.resolve(value)
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(full)
+    return full
+
+
+def sidecar_path(json_path: Path) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + SIDECAR_SUFFIX)
+
+
+def save_compact_scene(scene_json: Dict[str, Any], json_path: Path) -> Dict[str, Any]:
+    """
+    Write compact scene JSON plus its geometry sidecar next to it.
+
+    The file stores the sidecar name relative to the JSON; the returned scene
+    carries the absolute path so it can be resolved from anywhere.
+    """
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    compact, arrays = split_geometry(scene_json)
+    npz_path = sidecar_path(json_path)
+    tmp_path = npz_path.with_name(npz_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    tmp_path.replace(npz_path)
+    compact["geometry_sidecar"] = {
+        "format": SIDECAR_FORMAT,
+        "version": SIDECAR_VERSION,
+        "path": npz_path.name,
+        "entries": len(arrays),
+    }
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(compact, f, ensure_ascii=False, separators=(",", ":"))
+    compact["geometry_sidecar"] = dict(compact["geometry_sidecar"], path=str(npz_path.resolve()))
+    return compact
+
+
+def load_scene_json(path: Path, resolve: bool = False) -> Dict[str, Any]:
+    """
+    Load a (compact or regular) scene JSON.
+
+    Sidecar references are kept and the sidecar path is made absolute so they
+    can be resolved lazily later; ``resolve=True`` inlines all geometry.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        scene_json = json.load(f)
+    meta = scene_json.get("geometry_sidecar") if isinstance(scene_json, dict) else None
+    if isinstance(meta, dict) and meta.get("path") and not Path(meta["path"]).is_absolute():
+        meta["path"] = str((path.parent / meta["path"]).resolve())
+    if resolve:
+        return inline_geometry(scene_json)
+    return scene_json
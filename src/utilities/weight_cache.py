@@ -0,0 +1,247 @@
+"""
+Memory-mapped model weights for faster cold start.
+
+The first load of a model goes through its normal loader (``from_pretrained``,
+a ``.pth`` checkpoint ...) and its parameters and buffers are written once to
+``$CACHE_DIR/safetensors/<model>.safetensors``. Later loads build the module
+skeleton on the meta device (no allocation, no init) and assign tensors that
+are memory-mapped from that file, so load time is mostly page-table setup and
+processes on the same node share the weights through the page cache.
+
+Every load is timed; :func:`load_timings` feeds ``--profile-startup``.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_FORMAT_VERSION = "1"
+
+_TIMINGS: List[Dict[str, Any]] = []
+_TIMINGS_LOCK = threading.Lock()
+
+
+def mmap_weights_enabled() -> bool:
+    return str(os.getenv("ENABLE_MMAP_WEIGHTS", "true")).lower() in ("true", "1", "yes")
+
+
+def default_weight_cache_dir() -> Path:
+    """``$CACHE_DIR/safetensors`` (project ``cache/`` when CACHE_DIR is unset)."""
+    return Path(os.getenv("CACHE_DIR", str(_PROJECT_ROOT / "cache"))) / "safetensors"
+
+
+def weight_cache_path(model_key: str, cache_dir: Optional[Path] = None) -> Path:
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "__", str(model_key)).strip("_") or "model"
+    base = Path(cache_dir) if cache_dir else default_weight_cache_dir()
+    return base / f"{safe_name}.safetensors"
+
+
+def file_fingerprint(path: Path) -> str:
+    """Cheap identity for a local checkpoint (size + mtime); a changed file reconverts."""
+    stat = Path(path).stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+_HF_WEIGHT_SUFFIXES = (".safetensors", ".bin", ".pt", ".pth")
+
+
+def hf_fingerprint(model_name: str) -> str:
+    """
+    Identity of the weights ``from_pretrained(model_name)`` resolves to.
+
+    A local directory is fingerprinted by its config and weight files (size +
+    mtime); a hub id by the snapshot commit in the local Hugging Face cache.
+    Returns "" when neither can be resolved (e.g. before the first download).
+    """
+    local = Path(model_name)
+    if local.is_dir():
+        files = sorted(
+            p for p in local.iterdir() if p.is_file() and (p.suffix in _HF_WEIGHT_SUFFIXES or p.name == "config.json")
+        )
+        return ";".join(f"{p.name}={file_fingerprint(p)}" for p in files)
+    try:
+        from huggingface_hub import try_to_load_from_cache
+
+        resolved = try_to_load_from_cache(str(model_name), "config.json")
+    except Exception:
+        return ""
+    # <cache>/models--org--name/snapshots/<commit>/config.json
+    return f"rev:{Path(resolved).parent.name}" if isinstance(resolved, str) else ""
+
+
+def _resolve_fingerprint(fingerprint: Union[str, Callable[[], str]]) -> str:
+    return str(fingerprint() if callable(fingerprint) else fingerprint or "")
+
+
+def record_load(model_key: str, seconds: float, source: str) -> None:
+    """Record one model load (source: mmap | convert | direct | checkpoint)."""
+    with _TIMINGS_LOCK:
+        _TIMINGS.append({"model": model_key, "source": source, "seconds": round(float(seconds), 3)})
+    logger.info("Model %s loaded in %.2fs (%s)", model_key, seconds, source)
+
+
+def load_timings() -> List[Dict[str, Any]]:
+    with _TIMINGS_LOCK:
+        return [dict(entry) for entry in _TIMINGS]
+
+
+def reset_load_timings() -> None:
+    with _TIMINGS_LOCK:
+        _TIMINGS.clear()
+
+
+def _module_tensors(module):
+    """(name -> tensor, alias -> canonical name) over parameters and all buffers."""
+    tensors: Dict[str, Any] = {}
+    aliases: Dict[str, str] = {}
+    seen: Dict[int, str] = {}
+    named = list(module.named_parameters(remove_duplicate=False)) + list(
+        module.named_buffers(remove_duplicate=False)
+    )
+    for name, tensor in named:
+        if tensor is None:
+            continue
+        canonical = seen.get(id(tensor))
+        if canonical is not None:
+            aliases[name] = canonical
+            continue
+        seen[id(tensor)] = name
+        tensors[name] = tensor.detach().cpu().contiguous()
+    return tensors, aliases
+
+
+def save_module_weights(module, path: Path, fingerprint: str = "") -> None:
+    """Write ``module``'s parameters and buffers (tied weights once) as safetensors."""
+    from safetensors.torch import save_file
+
+    tensors, aliases = _module_tensors(module)
+    # safetensors refuses tensors that share storage (views such as split qkv
+    # weights): identical views become aliases, partial views are copied.
+    by_view: Dict[Any, str] = {}
+    storage_users: Dict[int, int] = {}
+    for tensor in tensors.values():
+        ptr = tensor.untyped_storage().data_ptr()
+        storage_users[ptr] = storage_users.get(ptr, 0) + 1
+    for name, tensor in list(tensors.items()):
+        ptr = tensor.untyped_storage().data_ptr()
+        view = (ptr, tensor.storage_offset(), tuple(tensor.shape), tuple(tensor.stride()), tensor.dtype)
+        if tensor.numel() and view in by_view:
+            aliases[name] = by_view[view]
+            del tensors[name]
+            continue
+        by_view[view] = name
+        if tensor.numel() and storage_users[ptr] > 1:
+            tensors[name] = tensor.clone()
+    metadata = {"format_version": _FORMAT_VERSION, "fingerprint": fingerprint, "aliases": json.dumps(aliases)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    save_file(tensors, str(tmp_path), metadata=metadata)
+    os.replace(tmp_path, path)
+
+
+def _slot(module, name: str):
+    owner_name, _, attr = name.rpartition(".")
+    owner = module.get_submodule(owner_name) if owner_name else module
+    if attr in owner._parameters:
+        return owner._parameters, attr
+    if attr in owner._buffers:
+        return owner._buffers, attr
+    raise KeyError(name)
+
+
+def _assign_weights(module, path: Path, fingerprint: str) -> None:
+    import torch
+    from safetensors import safe_open
+
+    with safe_open(str(path), framework="pt", device="cpu") as f:
+        metadata = f.metadata() or {}
+        if metadata.get("format_version") != _FORMAT_VERSION or metadata.get("fingerprint", "") != fingerprint:
+            raise ValueError("stale weight cache")
+        aliases = json.loads(metadata.get("aliases") or "{}")
+        for name in f.keys():
+            slots, attr = _slot(module, name)
+            tensor = f.get_tensor(name)
+            if isinstance(slots[attr], torch.nn.Parameter):
+                tensor = torch.nn.Parameter(tensor, requires_grad=False)
+            slots[attr] = tensor
+    # Tied weights point at the same object again.
+    for alias, canonical in aliases.items():
+        slots, attr = _slot(module, alias)
+        canonical_slots, canonical_attr = _slot(module, canonical)
+        slots[attr] = canonical_slots[canonical_attr]
+    for name, tensor in list(module.named_parameters()) + list(module.named_buffers()):
+        if tensor is not None and tensor.is_meta:
+            raise ValueError(f"weight cache is missing {name}")
+
+
+def load_module_mmap(
+    model_key: str,
+    load_fn: Callable[[], Any],
+    skeleton_fn: Optional[Callable[[], Any]] = None,
+    fingerprint: Union[str, Callable[[], str]] = "",
+    cache_dir: Optional[Path] = None,
+    enabled: Optional[bool] = None,
+) -> Any:
+    """
+    Load a torch module, memory-mapping its weights from the safetensors cache.
+
+    Args:
+        model_key: Cache key, e.g. "openai/clip-vit-large-patch14"
+        load_fn: Regular loader, used on a cache miss (and to fill the cache)
+        skeleton_fn: Builds the module without weights; called on the meta device
+        fingerprint: Source identity stored with the cache (see :func:`file_fingerprint`,
+            :func:`hf_fingerprint`); a callable is re-evaluated after ``load_fn`` so a
+            first download is recorded under the revision it fetched
+        enabled: Override for ``ENABLE_MMAP_WEIGHTS``
+    """
+    if enabled is None:
+        enabled = mmap_weights_enabled()
+    if not enabled or skeleton_fn is None:
+        started = time.perf_counter()
+        module = load_fn()
+        record_load(model_key, time.perf_counter() - started, "direct")
+        return module
+
+    import torch
+
+    path = weight_cache_path(model_key, cache_dir)
+    if path.exists():
+        started = time.perf_counter()
+        try:
+            with torch.device("meta"):
+                module = skeleton_fn()
+            _assign_weights(module, path, _resolve_fingerprint(fingerprint))
+            module.eval()
+            record_load(model_key, time.perf_counter() - started, "mmap")
+            return module
+        except Exception as e:
+            logger.warning("Weight cache for %s unusable (%s); reloading from source", model_key, e)
+
+    started = time.perf_counter()
+    module = load_fn()
+    elapsed = time.perf_counter() - started
+    try:
+        save_module_weights(module, path, fingerprint=_resolve_fingerprint(fingerprint))
+        logger.info("Cached %s weights at %s", model_key, path)
+    except Exception as e:
+        logger.warning("Could not cache %s weights: %s", model_key, e)
+    record_load(model_key, elapsed, "convert")
+    return module
+
+
+def hf_skeleton(model_cls, model_name: str, **config_kwargs) -> Callable[[], Any]:
+    """Skeleton factory for a transformers model class (config only, no weights)."""
+
+    def build():
+        config = model_cls.config_class.from_pretrained(model_name, **config_kwargs)
+        return model_cls(config)
+
+    return build
@@ -6,6 +6,11 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep runtime caches (KG snapshots, label embeddings) out of the project tree."""
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
 @pytest.fixture
 def test_image_path():
     """Provide path to test image."""
@@ -0,0 +1,73 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import src.batch_runner as batch_runner
+
+
+def _fake_run_one(index, image_path, job):
+    return {"index": index, "image": str(image_path), "pid": os.getpid(), "status": "ok", "seconds": 0.0}
+
+
+def test_collect_images_filters_and_sorts(tmp_path):
+    for name in ("b.PNG", "a.jpg", "notes.txt", "c.webp"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "sub.jpg").mkdir()
+    assert [p.name for p in batch_runner.collect_images(tmp_path)] == ["a.jpg", "b.PNG", "c.webp"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork start method required")
+def test_prefork_pool_distributes_images_over_forked_workers(monkeypatch, tmp_path):
+    preloaded = []
+    monkeypatch.setattr(batch_runner, "preload_shared_state", lambda job: preloaded.append(job) or {"perception": []})
+    monkeypatch.setattr(batch_runner, "_reinit_worker", lambda threads: None)
+    monkeypatch.setattr(batch_runner, "_run_one", _fake_run_one)
+    monkeypatch.setattr(batch_runner, "_prefork_blockers", lambda: [])
+    images = [tmp_path / f"{i}.jpg" for i in range(7)]
+
+    summary = batch_runner.run_batch(images, {"run_output_dir": str(tmp_path)}, workers=3, threads_per_worker=1)
+
+    assert summary["mode"] == "prefork" and len(preloaded) == 1
+    assert [r["index"] for r in summary["records"]] == list(range(7))
+    assert summary["succeeded"] == 7 and summary["failed"] == 0
+    assert len(summary["worker_memory"]) == 3
+    assert os.getpid() not in {r["pid"] for r in summary["records"]}
+
+
+def test_blocked_prefork_runs_inline_and_scaling_report(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_runner, "_run_one", _fake_run_one)
+    monkeypatch.setattr(batch_runner, "_prefork_blockers", lambda: ["CUDA is initialized in the parent"])
+    images = [Path(f"{i}.jpg") for i in range(3)]
+
+    summary = batch_runner.run_batch(images, {"run_output_dir": str(tmp_path)}, workers=4)
+    assert summary["mode"] == "inline" and summary["workers"] == 1
+    assert {r["pid"] for r in summary["records"]} == {os.getpid()}
+
+    assert batch_runner._scaling_steps(6) == [1, 2, 4, 6]
+    report = batch_runner.scaling_report(images, {"run_output_dir": str(tmp_path)}, max_workers=2)
+    assert [run["workers"] for run in report["runs"]] == [1, 1]
+    assert report["runs"][0]["speedup"] == 1.0 and report["runs"][0]["efficiency"] == 1.0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork start method required")
+def test_dead_worker_images_are_reported_failed(monkeypatch, tmp_path):
+    def crash_on_two(index, image_path, job):
+        if index == 2:
+            time.sleep(0.3)  # let the queue feeder flush earlier results
+            os._exit(3)
+        return _fake_run_one(index, image_path, job)
+
+    monkeypatch.setattr(batch_runner, "RESULT_POLL_S", 0.2)
+    monkeypatch.setattr(batch_runner, "preload_shared_state", lambda job: {"perception": []})
+    monkeypatch.setattr(batch_runner, "_reinit_worker", lambda threads: None)
+    monkeypatch.setattr(batch_runner, "_run_one", crash_on_two)
+    monkeypatch.setattr(batch_runner, "_prefork_blockers", lambda: [])
+    images = [tmp_path / f"{i}.jpg" for i in range(5)]
+
+    summary = batch_runner.run_batch(images, {"run_output_dir": str(tmp_path)}, workers=2, threads_per_worker=1)
+
+    assert [r["index"] for r in summary["records"]] == list(range(5))
+    assert summary["failed"] == 1 and summary["succeeded"] == 4
+    assert "died (exit code 3)" in summary["records"][2]["error"]
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+from perception.utils.crop_groups import group_duplicate_crops, representative_indices
+
+
+def _icon_sheet() -> np.ndarray:
+    image = np.full((200, 400, 3), 255, dtype=np.uint8)
+    for x in (10, 110, 210):
+        cv2.circle(image, (x + 40, 50), 30, (30, 120, 220), -1)
+        cv2.line(image, (x + 20, 50), (x + 60, 50), (255, 255, 255), 4)
+    cv2.circle(image, (350, 50), 30, (220, 40, 40), -1)
+    cv2.line(image, (330, 50), (370, 50), (255, 255, 255), 4)
+    cv2.rectangle(image, (20, 120), (180, 190), (0, 0, 0), 3)
+    return image
+
+
+def _objects():
+    return [
+        {"bbox": [10, 10, 90, 90], "class_name": "icon"},
+        {"bbox": [110, 10, 190, 90], "class_name": "icon"},
+        {"bbox": [210, 10, 290, 90], "class_name": "icon"},
+        {"bbox": [310, 10, 390, 90], "class_name": "icon"},
+        {"bbox": [10, 110, 190, 199], "class_name": "icon"},
+        {"bbox": [5, 5, 6, 6], "class_name": "icon"},
+    ]
+
+
+def test_identical_icons_share_a_group():
+    group_ids = group_duplicate_crops(_icon_sheet(), _objects())
+    assert group_ids[:3] == [0, 0, 0]
+    assert group_ids[3:] == [-1, -1, -1]
+
+
+def test_class_and_color_keep_crops_apart():
+    objects = _objects()
+    objects[1]["class_name"] = "logo"
+    group_ids = group_duplicate_crops(_icon_sheet(), objects)
+    assert group_ids[0] == group_ids[2] == 0
+    assert group_ids[1] == -1
+    assert group_duplicate_crops(_icon_sheet(), objects, max_color_delta=1000.0)[3] == 0
+
+
+def test_representative_indices_maps_members_to_first():
+    assert representative_indices([0, -1, 0, 1, 1], 5) == [0, 1, 0, 3, 3]
+    assert representative_indices(None, 3) == [0, 1, 2]
+    assert representative_indices([0, 0], 3) == [0, 0, 2]
@@ -0,0 +1,57 @@
+from perception.utils.execution_planner import (
+    build_execution_plan,
+    compute_text_density,
+    select_salient_indices,
+)
+
+_CONFIG = {
+    "enabled": True,
+    "dense_text_ratio": 0.2,
+    "default": {"caption_top_k": 0},
+    "profiles": {
+        "infographic": {"face_detection": False, "sam_segmentation": False, "caption_top_k": 12},
+        "other": {"icon_semantics": False},
+    },
+    "dense_text": {"sam_segmentation": False, "caption_top_k": 8},
+}
+
+
+def test_text_density_counts_overlapping_boxes_once():
+    regions = [{"bbox": [0, 0, 50, 100]}, {"bbox": [25, 0, 50, 100]}, {"bbox": [1, 2]}]
+    assert compute_text_density(regions, (100, 100, 3)) == 0.5
+    assert compute_text_density([], (100, 100, 3)) == 0.0
+
+
+def test_infographic_profile_skips_faces_and_sam_and_tightens_caption_cap():
+    text = [{"bbox": [0, 0, 100, 40]}]
+    plan = build_execution_plan({"type": "infographic"}, text, (100, 100, 3), _CONFIG)
+    assert plan["profile"] == "infographic"
+    assert plan["dense_text"] is True
+    assert plan["steps"]["face_detection"] is False
+    assert plan["steps"]["sam_segmentation"] is False
+    assert plan["steps"]["icon_semantics"] is True
+    assert plan["caption_top_k"] == 8
+    assert plan["reasons"][0] == "profile:infographic"
+
+
+def test_photo_profile_skips_icons_only_and_disabled_planner_runs_everything():
+    plan = build_execution_plan({"type": "other"}, [], (100, 100, 3), _CONFIG)
+    assert plan["steps"]["icon_semantics"] is False
+    assert plan["steps"]["sam_segmentation"] is True
+    assert plan["caption_top_k"] == 0
+
+    off = build_execution_plan({"type": "infographic"}, [], (100, 100, 3), {**_CONFIG, "enabled": False})
+    assert off["enabled"] is False
+    assert all(off["steps"].values())
+    assert off["profile"] == "default"
+
+
+def test_select_salient_indices_keeps_large_confident_boxes_in_order():
+    objects = [
+        {"bbox": [0, 0, 10, 10], "confidence": 0.9},
+        {"bbox": [0, 0, 80, 80], "confidence": 0.6},
+        {"bbox": [0, 0, 50, 50], "confidence": 0.95},
+        {"bbox": [0, 0, 90, 90], "confidence": 0.05},
+    ]
+    assert select_salient_indices(objects, (100, 100, 3), 2) == [1, 2]
+    assert select_salient_indices(objects, (100, 100, 3), 0) == [0, 1, 2, 3]
@@ -0,0 +1,28 @@
+import pytest
+
+from scripts.benchmark_import_time import ENTRY_POINTS, measure_import, parse_importtime
+
+
+def test_parse_importtime_reads_self_and_cumulative():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   json.decoder",
+            "import time:       300 |        420 | json",
+            "unrelated warning",
+        ]
+    )
+    assert parse_importtime(stderr) == [("json.decoder", 120, 120), ("json", 300, 420)]
+
+
+def test_measure_import_reports_total_and_heavy_modules():
+    result = measure_import("json", top=2)
+    assert result["total_ms"] > 0 and result["heavy_imported"] == []
+    assert len(result["slowest_self_ms"]) <= 2
+
+
+@pytest.mark.parametrize("entry", sorted(ENTRY_POINTS))
+def test_entry_points_do_not_import_heavy_ml_libraries(entry):
+    result = measure_import(ENTRY_POINTS[entry])
+    assert "error" not in result, result.get("error")
+    assert result["heavy_imported"] == []
@@ -0,0 +1,70 @@
+import numpy as np
+import torch
+
+from src.utilities.model_manager import ModelManager, estimate_footprint_mb
+
+
+class _Component:
+    def __init__(self):
+        self.model = torch.nn.Linear(512, 512)
+        self.table = np.zeros((256, 1024), dtype=np.float32)
+
+
+def test_footprint_counts_tensors_and_arrays_once():
+    component = _Component()
+    component.alias = component.model
+    expected = (512 * 512 + 512) * 4 + 256 * 1024 * 4
+    assert abs(estimate_footprint_mb(component) - expected / (1024.0 * 1024.0)) < 1e-6
+
+
+def test_lru_eviction_under_budget_and_lazy_reload():
+    manager = ModelManager(budget_mb=250)
+    evicted = []
+    loads = []
+
+    def loader(name):
+        def load():
+            loads.append(name)
+            return {"name": name}
+        return load
+
+    for name in ("yolo", "blip", "clip"):
+        manager.get(name, loader(name), on_evict=lambda model: evicted.append(model["name"]), size_mb=100)
+        if name == "blip":
+            manager.get("yolo", loader("yolo"))
+    assert evicted == ["blip"]
+    assert manager.contains("yolo") and manager.contains("clip")
+    assert manager.resident_mb() == 200
+
+    assert manager.get("blip", loader("blip"), size_mb=100) == {"name": "blip"}
+    assert loads == ["yolo", "blip", "clip", "blip"]
+    metrics = manager.metrics()
+    assert metrics["loads"] == 4 and metrics["reloads"] == 1
+    assert metrics["evictions"] == 2 and metrics["hits"] == 1
+    assert set(metrics["resident"]) == {"clip", "blip"}
+    assert metrics["peak_resident_mb"] == 300
+
+
+def test_unlimited_budget_keeps_everything_and_hints_win():
+    manager = ModelManager(size_hints_mb={"ocr_engine": 350})
+    manager.get("ocr_engine", object)
+    manager.get("component", _Component)
+    assert manager.metrics()["resident"]["ocr_engine"]["size_mb"] == 350
+    assert manager.metrics()["resident"]["component"]["size_mb"] > 1.0
+    assert manager.evict("ocr_engine") and not manager.evict("ocr_engine")
+    manager.reset()
+    assert manager.metrics()["loads"] == 0 and manager.resident_mb() == 0
+
+
+def test_shared_model_is_charged_once():
+    class _User:
+        def __init__(self, shared):
+            self.shared = shared
+            self.head = np.zeros((1024, 256), dtype=np.float32)
+
+    manager = ModelManager()
+    shared = manager.get("blip", _Component)
+    manager.get("captioner", lambda: _User(shared))
+    resident = manager.metrics()["resident"]
+    assert abs(resident["captioner"]["size_mb"] - 1.0) < 0.05
+    assert resident["blip"]["size_mb"] > 1.0
@@ -0,0 +1,79 @@
+import torch
+
+from src.utilities.model_precision import (
+    inference_autocast,
+    load_model_with_precision,
+    normalize_precision_mode,
+    quantized_cache_path,
+)
+
+
+def _tiny_model():
+    return torch.nn.Sequential(torch.nn.Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 2))
+
+
+def test_normalize_precision_mode_accepts_config_spellings():
+    assert normalize_precision_mode("dynamic-int8") == "dynamic_int8"
+    assert normalize_precision_mode("bf16-autocast") == "bf16_autocast"
+    assert normalize_precision_mode(None) == "fp32"
+    assert normalize_precision_mode("fp8") == "fp32"
+
+
+def test_dynamic_int8_quantizes_and_reuses_disk_cache(tmp_path):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return _tiny_model()
+
+    model, mode = load_model_with_precision(load, "org/tiny-model", "dynamic-int8", "cpu", tmp_path)
+    assert mode == "dynamic_int8"
+    assert isinstance(model[0], torch.ao.nn.quantized.dynamic.Linear)
+    assert quantized_cache_path("org/tiny-model", mode, tmp_path).exists()
+
+    cached, cached_mode = load_model_with_precision(load, "org/tiny-model", "dynamic-int8", "cpu", tmp_path)
+    assert cached_mode == "dynamic_int8"
+    assert len(calls) == 1
+    x = torch.randn(3, 8)
+    assert torch.allclose(model(x), cached(x))
+
+
+def test_dynamic_int8_is_cpu_only(tmp_path):
+    model, mode = load_model_with_precision(_tiny_model, "org/tiny-model", "dynamic_int8", "cuda", tmp_path)
+    assert mode == "fp32"
+    assert isinstance(model[0], torch.nn.Linear)
+    assert not any(tmp_path.iterdir())
+
+
+def test_inference_autocast_only_in_bf16_mode():
+    model = _tiny_model()
+    x = torch.randn(2, 8)
+    with inference_autocast("fp32", "cpu"):
+        assert model(x).dtype == torch.float32
+    with inference_autocast("bf16_autocast", "cpu"):
+        assert model(x).dtype == torch.bfloat16
+
+
+def test_dynamic_int8_cache_is_requantized_when_source_weights_change(tmp_path):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return _tiny_model()
+
+    for fingerprint in ("rev:a", "rev:a", "rev:b"):
+        load_model_with_precision(
+            load, "org/tiny-model", "dynamic-int8", "cpu", tmp_path, fingerprint=lambda: fingerprint
+        )
+    assert len(calls) == 2
+
+
+def test_dynamic_int8_never_unpickles_cache_without_metadata(tmp_path, monkeypatch):
+    path = quantized_cache_path("org/tiny-model", "dynamic_int8", tmp_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(_tiny_model(), str(path))
+    monkeypatch.setattr(torch, "load", lambda *a, **k: (_ for _ in ()).throw(AssertionError("unpickled")))
+    _, mode = load_model_with_precision(
+        _tiny_model, "org/tiny-model", "dynamic_int8", "cpu", tmp_path, fingerprint=lambda: ""
+    )
+    assert mode == "dynamic_int8"
@@ -0,0 +1,58 @@
+import pytest
+
+from perception.utils import model_warmup
+
+
+class _Model:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.calls = 0
+
+    def warmup(self):
+        self.calls += 1
+        return self.ok
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    model_warmup.reset_warm_state()
+    yield
+    model_warmup.reset_warm_state()
+
+
+def test_warmup_runs_once_per_process_and_is_reported():
+    model = _Model()
+    assert model_warmup.ensure_warm("yolo", model)
+    assert model_warmup.ensure_warm("yolo", model)
+    assert model.calls == 1
+    state = model_warmup.warm_state()
+    assert state["yolo"]["warm"] is True
+    assert state["yolo"]["source"] == "foreground"
+    assert model_warmup.is_warm("yolo")
+
+
+def test_failed_warmup_is_recorded_and_not_retried():
+    model = _Model(ok=False)
+    assert not model_warmup.ensure_warm("sam", model)
+    assert not model_warmup.ensure_warm("sam", model)
+    assert model.calls == 1
+    assert model_warmup.warm_state()["sam"]["warm"] is False
+    assert not model_warmup.ensure_warm("none", None)
+    assert "none" not in model_warmup.warm_state()
+
+
+def test_background_warmup_loads_and_warms_once():
+    model = _Model()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return model
+
+    thread = model_warmup.start_background_warmup({"blip": loader, "broken": lambda: 1 / 0})
+    thread.join(timeout=5)
+    assert loads == [1] and model.calls == 1
+    assert model_warmup.warm_state()["blip"]["source"] == "background"
+    assert "broken" not in model_warmup.warm_state()
+    model_warmup.ensure_warm("blip", model)
+    assert model.calls == 1
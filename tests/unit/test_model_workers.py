@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from perception.utils.model_workers import ModelWorker, ModelWorkerPool, WorkerProxy, pack_result, unpack_result
+
+
+class _Probe:
+    def __init__(self):
+        self.calls = 0
+        self.pid = os.getpid()
+
+    def detect(self, image, offset=0):
+        self.calls += 1
+        return [
+            {"bbox": [0.0, 0.0, float(image.shape[1]), float(image.shape[0])], "score": float(image.sum() + offset)},
+            {"bbox": [1.0, 2.0, 3.0, 4.0], "score": 0.5},
+        ]
+
+    def fail(self):
+        raise ValueError("probe failure")
+
+
+class _ThreadProbe:
+    def __init__(self, cpu_threads=None):
+        self.cpu_threads = cpu_threads
+
+
+def test_pack_result_roundtrip_keeps_types():
+    value = {
+        "final": [{"bbox": [1, 2, 3, 4], "label": "cup"}, {"bbox": [5, 6, 7, 8], "label": "tea"}],
+        "mixed": [{"bbox": [1, 2.5, 3, 4]}],
+        "pair": ([{"bbox": [0.5, 1.0, 2.0, 3.0], "conf": 0.9}], "text"),
+    }
+    packed = pack_result(value)
+    assert isinstance(packed["final"]["bbox"], np.ndarray) and packed["final"]["bbox"].dtype == np.int64
+    assert packed["mixed"] == value["mixed"]
+    assert unpack_result(packed) == value
+
+
+def test_worker_serves_calls_through_shared_memory():
+    worker = ModelWorker("probe", {"probe": "tests.unit.test_model_workers:_Probe"}, threads=1)
+    try:
+        proxy = WorkerProxy(worker, "probe")
+        image = np.ones((20, 30, 3), dtype=np.uint8)
+        result = proxy.detect(image, offset=2)
+        assert result[0] == {"bbox": [0.0, 0.0, 30.0, 20.0], "score": 1802.0}
+        assert result[1]["bbox"] == [1.0, 2.0, 3.0, 4.0]
+        assert proxy.calls == 1
+        assert proxy.pid != os.getpid()
+        assert hasattr(proxy, "detect") and not hasattr(proxy, "missing")
+        with pytest.raises(ValueError, match="probe failure"):
+            proxy.fail()
+        assert proxy.detect(image)[0]["score"] == 1800.0
+    finally:
+        worker.shutdown()
+
+
+def test_worker_passes_thread_count_to_ocr_constructors():
+    worker = ModelWorker(
+        "ocr",
+        {"ocr_engine": "tests.unit.test_model_workers:_ThreadProbe", "other": "tests.unit.test_model_workers:_ThreadProbe"},
+        threads=3,
+    )
+    try:
+        assert WorkerProxy(worker, "ocr_engine").cpu_threads == 3
+        assert WorkerProxy(worker, "other").cpu_threads is None
+    finally:
+        worker.shutdown()
+
+
+def test_pool_maps_components_to_workers_without_starting_them():
+    pool = ModelWorkerPool(
+        {
+            "pin_cpus": False,
+            "workers": {
+                "ocr": {"threads": 2, "components": ["text_detector", "ocr_engine", "unknown"]},
+                "blip": {"threads": 4, "components": ["ocr_engine", "object_captioner"]},
+            },
+        }
+    )
+    assert pool.hosts("ocr_engine") and pool.hosts("object_captioner")
+    assert not pool.hosts("unknown") and not pool.hosts("sam_segmenter")
+    stats = pool.stats()
+    assert stats["ocr"]["components"] == ["ocr_engine", "text_detector"]
+    assert stats["blip"]["components"] == ["object_captioner"]
+    assert stats["ocr"]["calls"] == 0 and stats["ocr"]["cpus"] == []
+    assert isinstance(pool.proxy("ocr_engine"), WorkerProxy)
+    pool.shutdown()
@@ -0,0 +1,114 @@
+import random
+
+import cv2
+import numpy as np
+
+from perception.utils.near_duplicate import (
+    BKTree,
+    NearDuplicateIndex,
+    changed_regions,
+    dhash,
+    hamming,
+    phash,
+    rescale_scene_geometry,
+    thumbnail,
+)
+
+
+def _banner(cta_color=(255, 255, 255)) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    image = cv2.resize(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8), (800, 600), interpolation=cv2.INTER_CUBIC)
+    cv2.rectangle(image, (80, 60), (420, 300), (200, 40, 40), -1)
+    cv2.rectangle(image, (560, 480), (760, 560), cta_color, -1)
+    return image
+
+
+def _jpeg(image: np.ndarray, quality: int = 60) -> np.ndarray:
+    ok, buf = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(buf, cv2.IMREAD_UNCHANGED)
+
+
+def test_hashes_survive_resize_and_recompression():
+    image = _banner()
+    variant = _jpeg(cv2.resize(image, (400, 300), interpolation=cv2.INTER_AREA))
+    assert hamming(phash(image), phash(variant)) <= 4
+    assert hamming(dhash(image), dhash(variant)) <= 6
+    other = np.ascontiguousarray(image[:, ::-1])
+    assert hamming(phash(image), phash(other)) > 10
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(7)
+    keys = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for i, key in enumerate(keys):
+        tree.add(key, i)
+    query = keys[42] ^ 0b1011
+    expected = sorted(i for i, key in enumerate(keys) if hamming(query, key) <= 5)
+    found = tree.search(query, 5)
+    assert sorted(i for _, i in found) == expected
+    assert found[0] == (3, 42)
+
+
+def test_index_lookup_roundtrip_and_geometry_rescale(tmp_path):
+    image = _banner()
+    scene = {
+        "metadata": {"image_path": "a.jpg"},
+        "objects": [{"bbox": [80, 60, 420, 300], "segmentation": {"area_px": 1000, "polygon": [[80, 60], [420, 300]]}}],
+        "layout": {"image_shape": [600, 800, 3]},
+        "text": {"extracted": [{"bbox": [560, 480, 760, 560], "style": {"font_size": 40}}]},
+    }
+    index = NearDuplicateIndex(tmp_path, max_phash_distance=4, max_dhash_distance=6)
+    assert index.add(image, scene, "a.jpg")["width"] == 800
+    assert index.add(image.copy(), scene, "a.jpg") is None
+
+    reloaded = NearDuplicateIndex(tmp_path)
+    variant = _jpeg(cv2.resize(image, (400, 300), interpolation=cv2.INTER_AREA))
+    match = reloaded.lookup(variant)
+    assert match is not None and match["entry"]["image_path"] == "a.jpg"
+    assert reloaded.lookup(cv2.resize(image, (800, 300))) is None
+
+    scaled = rescale_scene_geometry(reloaded.load_scene(match["entry"]), 0.5, 0.5)
+    assert scaled["objects"][0]["bbox"] == [40.0, 30.0, 210.0, 150.0]
+    assert scaled["objects"][0]["segmentation"]["area_px"] == 250
+    assert scaled["objects"][0]["segmentation"]["polygon"][1] == [210.0, 150.0]
+    assert scaled["layout"]["image_shape"] == [300, 400, 3]
+    assert scaled["text"]["extracted"][0]["style"]["font_size"] == 20.0
+    assert scaled["metadata"] == {"image_path": "a.jpg"}
+
+
+def test_changed_regions_localizes_a_different_cta():
+    cached = thumbnail(_banner())
+    assert changed_regions(cached, _jpeg(_banner())) == []
+    boxes = changed_regions(cached, _banner(cta_color=(0, 0, 0)))
+    assert len(boxes) == 1
+    x1, y1, x2, y2 = boxes[0]
+    assert x1 <= 560 and y1 <= 480 and x2 >= 760 and y2 >= 560
+    assert (x2 - x1) * (y2 - y1) < 0.1 * 800 * 600
+
+
+def test_index_skips_other_fingerprints_and_caps_entries(tmp_path):
+    image = _banner()
+    scene = {"metadata": {}, "objects": [], "layout": {"image_shape": [600, 800, 3]}}
+    NearDuplicateIndex(tmp_path, fingerprint="v1").add(image, scene, "a.jpg")
+    assert NearDuplicateIndex(tmp_path, fingerprint="v1").lookup(image) is not None
+    assert NearDuplicateIndex(tmp_path, fingerprint="v2").lookup(image) is None
+
+    capped = NearDuplicateIndex(tmp_path / "capped", max_entries=2)
+    for i in range(4):
+        capped.add(np.ascontiguousarray(np.roll(image, 97 * i, axis=1)), scene, f"{i}.jpg")
+    reloaded = NearDuplicateIndex(tmp_path / "capped", max_entries=2)
+    assert reloaded.lookup(image) is None
+    assert reloaded.lookup(np.ascontiguousarray(np.roll(image, 97 * 3, axis=1)))["entry"]["image_path"] == "3.jpg"
+    assert len(list((tmp_path / "capped").glob("**/*.json"))) <= 2
+
+
+def test_perception_fingerprint_covers_shared_utilities(monkeypatch):
+    import perception.main as perception_main
+
+    hashed = []
+    monkeypatch.setattr(
+        perception_main, "source_fingerprint", lambda paths: hashed.extend(p.name for p in paths) or "code"
+    )
+    perception_main._perception_fingerprint()
+    assert {"perception", "utilities"} <= set(hashed)
@@ -0,0 +1,17 @@
+from perception.detectors.object_detector import ObjectDetector
+
+
+def test_update_context_does_not_carry_forced_off_vit_to_the_next_image(monkeypatch):
+    monkeypatch.setattr(ObjectDetector, "_load_model", lambda self: None)
+    loads = []
+    monkeypatch.setattr(ObjectDetector, "_load_vit_model", lambda self: loads.append(1))
+    detector = ObjectDetector()
+    detector._vit_configured = True
+
+    detector.update_context({"image_type": {"type": "document"}}, enable_vit=False)
+    assert detector.enable_vit is False
+    assert loads == []
+
+    detector.update_context({"image_type": {"type": "photo"}}, enable_vit=True)
+    assert detector.enable_vit is True
+    assert loads == [1]
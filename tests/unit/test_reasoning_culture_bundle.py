@@ -0,0 +1,46 @@
+"""Pytest for reasoning culture_bundle and its use in CulturalReasoningEngine."""
+from unittest.mock import MagicMock, patch
+
+from src.reasoning.culture_bundle import AvoidMatcher, CultureBundle
+from src.reasoning.engine import CulturalReasoningEngine
+from src.reasoning.schemas import CulturalNode
+
+
+def test_avoid_matcher_reports_first_matching_entry_in_list_order():
+    matcher = AvoidMatcher(["Tea ceremony clichés", "sushi", "Geisha (costume)"])
+    assert matcher.first_match("Green Tea") is None
+    assert matcher.first_match("tea") == "Tea ceremony clichés"
+    assert matcher.first_match("Salmon Sushi Roll") == "sushi"
+    assert matcher.first_match("geisha (costume) party") == "Geisha (costume)"
+    kept, notes = matcher.filter(["Ramen", "Sushi", "Onigiri"])
+    assert kept == ["Ramen", "Onigiri"]
+    assert notes == ["Avoided 'Sushi' per avoid list: 'sushi'"]
+    assert AvoidMatcher([]).filter(["Ramen"]) == (["Ramen"], [])
+
+
+def test_culture_bundle_fetches_culture_data_once():
+    loader = MagicMock()
+    loader.get_avoid_list.return_value = ["clock gifts"]
+    loader.get_sensitivity_notes.return_value = None
+    loader.get_nodes_by_type_and_culture.return_value = [
+        CulturalNode(id="F_SAMOSA", label="Samosa", type="FOOD"),
+    ]
+    bundle = CultureBundle(loader, "India")
+    assert bundle.avoid_list == ["clock gifts"]
+    assert bundle.sensitivity_notes == []
+    first = bundle.type_labels("FOOD")
+    first.append("mutated")
+    assert bundle.type_labels("FOOD") == ["Samosa"]
+    loader.get_nodes_by_type_and_culture.assert_called_once_with("FOOD", "India")
+    assert bundle.avoid_matcher(["a", "b"]) is bundle.avoid_matcher(["a", "b"])
+
+
+def test_engine_caches_bundle_per_culture_and_loader(tmp_path):
+    (tmp_path / "kg.json").write_text('{"nodes": [], "edges": []}')
+    with patch("src.reasoning.engine.LLMClient"):
+        engine = CulturalReasoningEngine(str(tmp_path / "kg.json"))
+    india = engine._culture_bundle("India")
+    assert engine._culture_bundle("India") is india
+    assert engine._culture_bundle("Japan") is not india
+    engine.kg_loader = MagicMock()
+    assert engine._culture_bundle("India").kg_loader is engine.kg_loader
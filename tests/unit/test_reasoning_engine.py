@@ -529,3 +529,63 @@ def test_dedupe_transformations_by_original():
     deduped = _dedupe_transformations_by_original(items)
     assert len(deduped) == 1
     assert deduped[0].target_object == "Peacock"
+
+
+def test_analyze_image_batch_strategy_makes_one_scene_request(engine_with_mocks, mock_loader, mock_llm, monkeypatch):
+    monkeypatch.setattr("src.reasoning.engine._reasoning_strategy", lambda: "llm_first_batch")
+    mock_loader.find_node.return_value = None
+    mock_loader.get_candidates_from_kb.return_value = ["Samosa", "Biryani", "Dosa"]
+    mock_loader.get_nodes_by_type_and_culture.return_value = []
+    mock_llm.generate_reasoning.side_effect = [
+        {
+            "decisions": [
+                {"id": 0, "action": "transform", "target_object": "Samosa", "confidence": 0.9},
+                {"id": 1, "action": "transform", "target_object": "Samosa", "confidence": 0.8},
+                {"id": 2, "action": "transform", "target_object": ""},
+            ]
+        },
+        {"action": "transform", "target_object": "Dosa", "confidence": 0.7},
+    ]
+    inp = ReasoningInput(
+        scene_graph={"objects": [{"label": "Burger"}, {"label": "Pizza"}, {"label": "Taco"}]},
+        target_culture="India",
+    )
+    plan = engine_with_mocks.analyze_image(inp)
+    assert mock_llm.generate_reasoning.call_count == 2
+    batch_prompt = mock_llm.generate_reasoning.call_args_list[0].args[0]
+    assert all(label in batch_prompt for label in ("Burger", "Pizza", "Taco"))
+    targets = [t.target_object for t in plan.transformations]
+    assert targets[0] == "Samosa"
+    assert len(set(targets)) == 3
+
+
+def test_batch_strategy_leaves_objects_past_the_token_budget_to_single_requests(
+    engine_with_mocks, mock_loader, mock_llm, monkeypatch
+):
+    from src.reasoning import engine as engine_module
+
+    monkeypatch.setattr("src.reasoning.engine._reasoning_strategy", lambda: "llm_first_batch")
+    per_decision = engine_module._estimate_output_tokens(engine_module._BATCH_DECISION_REPLY_CHARS)
+    budget = engine_module._BATCH_REPLY_OVERHEAD_TOKENS + 2 * per_decision
+    monkeypatch.setattr("src.reasoning.engine.BATCH_OUTPUT_TOKEN_BUDGET", budget)
+    mock_loader.find_node.return_value = None
+    mock_loader.get_candidates_from_kb.return_value = ["Samosa", "Biryani", "Dosa"]
+    mock_loader.get_nodes_by_type_and_culture.return_value = []
+    mock_llm.generate_reasoning.side_effect = [
+        {
+            "decisions": [
+                {"id": 0, "action": "transform", "target_object": "Samosa", "confidence": 0.9},
+                {"id": 1, "action": "transform", "target_object": "Biryani", "confidence": 0.8},
+            ]
+        },
+        {"action": "transform", "target_object": "Dosa", "confidence": 0.7},
+    ]
+    inp = ReasoningInput(
+        scene_graph={"objects": [{"label": "Burger"}, {"label": "Pizza"}, {"label": "Taco"}]},
+        target_culture="India",
+    )
+    engine_with_mocks.analyze_image(inp)
+    assert mock_llm.generate_reasoning.call_count == 2
+    batch_call = mock_llm.generate_reasoning.call_args_list[0]
+    assert "Pizza" in batch_call.args[0] and "Taco" not in batch_call.args[0]
+    assert batch_call.kwargs["max_tokens"] == budget
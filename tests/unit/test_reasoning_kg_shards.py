@@ -0,0 +1,85 @@
+"""Pytest for reasoning kg_shards and sharded KnowledgeLoader lookups."""
+import json
+
+from src.reasoning.kg_shards import write_shards
+from src.reasoning.knowledge_loader import KnowledgeLoader
+
+GRAPH = {
+    "nodes": [
+        {"id": "C_JPN", "label": "Japan", "type": "COUNTRY"},
+        {"id": "C_IND", "label": "India", "type": "COUNTRY"},
+        {"id": "C_ITA", "label": "Italy", "type": "COUNTRY"},
+        {"id": "CU_IND_ROOT", "label": "India (national)", "type": "CULTURE", "country_label": "India"},
+        {"id": "F_SUSHI", "label": "Sushi", "type": "FOOD"},
+        {"id": "F_RAMEN", "label": "Ramen", "type": "FOOD"},
+        {"id": "F_CHAI", "label": "Masala Chai", "type": "FOOD"},
+        {"id": "L_TAJ", "label": "Taj Mahal", "type": "LANDMARK"},
+        {"id": "F_PIZZA", "label": "Pizza", "type": "FOOD"},
+    ],
+    "edges": [
+        {"source": "C_JPN", "target": "F_SUSHI"},
+        {"source": "C_JPN", "target": "F_RAMEN"},
+        {"source": "CU_IND_ROOT", "target": "C_IND", "relation": "PART_OF"},
+        {"source": "CU_IND_ROOT", "target": "F_CHAI"},
+        {"source": "CU_IND_ROOT", "target": "L_TAJ"},
+        {"source": "C_ITA", "target": "F_PIZZA"},
+    ],
+    "preferred_substitutions": [
+        {"object_label": "Sushi", "target_culture": "India", "target_object": "Masala Chai"},
+    ],
+}
+
+
+def _sharded(tmp_path):
+    graph_path = tmp_path / "kg.json"
+    graph_path.write_text(json.dumps(GRAPH), encoding="utf-8")
+    index_path = write_shards(str(graph_path), str(tmp_path / "shards"))
+    return str(graph_path), str(index_path)
+
+
+def test_sharded_loader_answers_like_the_monolithic_graph(tmp_path):
+    graph_path, index_path = _sharded(tmp_path)
+    full = KnowledgeLoader(graph_path, snapshot=False)
+    sharded = KnowledgeLoader(index_path, snapshot=False)
+
+    assert len(list((tmp_path / "shards").glob("0*.json"))) == 3
+    assert sharded.get_all_labels() == full.get_all_labels()
+    assert sharded.get_cultural_types() == full.get_cultural_types()
+    assert sharded.find_node("taj mahal") == full.find_node("taj mahal")
+    assert sharded.get_culture_of_node("F_CHAI") == "India"
+    assert sharded.get_item_by_label("Ramen", culture_name="japan") == full.get_item_by_label("Ramen", "japan")
+    assert sharded.get_preferred_substitution("sushi", "india") == "Masala Chai"
+    for culture in ("japan", "India", "ITALY", "Mars"):
+        for node_type in ("FOOD", "LANDMARK"):
+            assert sharded.get_nodes_by_type_and_culture(node_type, culture) == full.get_nodes_by_type_and_culture(
+                node_type, culture
+            )
+
+
+def test_shards_load_on_demand_through_an_lru(tmp_path, monkeypatch):
+    monkeypatch.setenv("KG_SHARD_CACHE_SIZE", "2")
+    _, index_path = _sharded(tmp_path)
+    loader = KnowledgeLoader(index_path, snapshot=False)
+    assert len(loader._country_type_index) == 0
+
+    assert [n.id for n in loader.get_nodes_by_type_and_culture("FOOD", "Japan")] == ["F_SUSHI", "F_RAMEN"]
+    loader.get_nodes_by_type_and_culture("LANDMARK", "Japan")
+    loader.get_nodes_by_type_and_culture("FOOD", "India")
+    loader.get_nodes_by_type_and_culture("FOOD", "Italy")
+    assert list(loader._country_type_index) == ["India", "Italy"]
+    assert loader.shard_stats == {"loads": 3, "hits": 1, "evictions": 1}
+    assert [n.id for n in loader.get_nodes_by_type_and_culture("FOOD", "Japan")] == ["F_SUSHI", "F_RAMEN"]
+    assert loader.shard_stats["loads"] == 4
+
+
+def test_snapshot_of_shard_index_keeps_shards_lazy(tmp_path):
+    _, index_path = _sharded(tmp_path)
+    snap_dir = str(tmp_path / "snap")
+    first = KnowledgeLoader(index_path, snapshot=True, snapshot_dir=snap_dir)
+    first.get_nodes_by_type_and_culture("FOOD", "Japan")
+    first.save_snapshot()
+
+    restored = KnowledgeLoader(index_path, snapshot=True, snapshot_dir=snap_dir)
+    assert restored.loaded_from_snapshot
+    assert len(restored._country_type_index) == 0
+    assert [n.id for n in restored.get_nodes_by_type_and_culture("FOOD", "india")] == ["F_CHAI"]
@@ -0,0 +1,87 @@
+"""Pytest for reasoning kg_snapshot and KnowledgeLoader snapshot loading."""
+import json
+
+import numpy as np
+
+from src.reasoning import kg_snapshot
+from src.reasoning.knowledge_loader import KnowledgeLoader
+
+GRAPH = {
+    "nodes": [
+        {"id": "C_JPN", "label": "Japan", "type": "COUNTRY"},
+        {"id": "C_IND", "label": "India", "type": "COUNTRY"},
+        {"id": "F_SUSHI", "label": "Sushi", "type": "FOOD"},
+        {"id": "F_CHAI", "label": "Masala Chai", "type": "FOOD"},
+    ],
+    "edges": [
+        {"source": "C_JPN", "target": "F_SUSHI"},
+        {"source": "C_JPN", "target": "F_SUSHI"},
+        {"source": "C_IND", "target": "F_CHAI"},
+    ],
+    "preferred_substitutions": [
+        {"object_label": "Sushi", "target_culture": "India", "target_object": "Masala Chai"},
+    ],
+}
+
+
+def _write_graph(tmp_path, data=GRAPH):
+    path = tmp_path / "kg.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_second_load_comes_from_snapshot_with_same_state(tmp_path):
+    graph_path = _write_graph(tmp_path)
+    first = KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=str(tmp_path / "snap"))
+    assert not first.loaded_from_snapshot
+    assert [n["id"] for n in first._country_type_index["Japan"]["FOOD"]] == ["F_SUSHI"]
+
+    second = KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=str(tmp_path / "snap"))
+    assert second.loaded_from_snapshot
+    assert second.get_all_labels() == first.get_all_labels()
+    assert second.find_node("masala chai").id == "F_CHAI"
+    assert [n.id for n in second.get_nodes_by_type_and_culture("FOOD", "japan")] == ["F_SUSHI"]
+    assert second.get_preferred_substitution("sushi", "india") == "Masala Chai"
+    assert second.get_label_token_index().best_overlap({"chai"}, set(), set()) == ("Masala Chai", 1)
+
+
+def test_stale_or_corrupt_snapshot_falls_back_to_json(tmp_path):
+    graph_path = _write_graph(tmp_path)
+    snap_dir = str(tmp_path / "snap")
+    KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir)
+
+    changed = dict(GRAPH, nodes=GRAPH["nodes"] + [{"id": "F_RAMEN", "label": "Ramen", "type": "FOOD"}])
+    _write_graph(tmp_path, changed)
+    reloaded = KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir)
+    assert not reloaded.loaded_from_snapshot
+    assert reloaded.find_node("Ramen") is not None
+
+    path = kg_snapshot.snapshot_path(graph_path, snap_dir)
+    path.write_bytes(path.read_bytes()[:-10])
+    assert not KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).loaded_from_snapshot
+    assert KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).loaded_from_snapshot
+
+
+def test_snapshot_carries_label_embedding_matrix(tmp_path):
+    graph_path = _write_graph(tmp_path)
+    snap_dir = str(tmp_path / "snap")
+    loader = KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir)
+    labels = loader.get_all_labels()
+    embeddings = loader.get_label_embeddings()
+    # Computing the matrix re-saves the snapshot with it.
+    embeddings.matrix(lambda texts: np.eye(len(texts), 8, dtype=np.float32))
+
+    restored = KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).get_label_embeddings()
+    assert restored.stats["matrix_source"] == "snapshot"
+    assert np.allclose(restored.matrix(None), np.eye(len(labels), 8))
+
+
+def test_snapshot_from_other_indexing_code_is_rebuilt(tmp_path, monkeypatch):
+    graph_path = _write_graph(tmp_path)
+    snap_dir = str(tmp_path / "snap")
+    KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir)
+    assert KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).loaded_from_snapshot
+
+    monkeypatch.setattr(kg_snapshot, "code_fingerprint", lambda: b"\x01" * 32)
+    assert not KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).loaded_from_snapshot
+    assert KnowledgeLoader(graph_path, snapshot=True, snapshot_dir=snap_dir).loaded_from_snapshot
@@ -157,3 +157,68 @@ def test_knowledge_loader_hierarchy_aggregates_foods_by_country(temp_kg_hierarch
     nodes = loader.get_nodes_by_type_and_culture("FOOD", "India")
     labels = {n.label for n in nodes}
     assert labels == {"Biryani", "Dosa"}
+
+
+def test_knowledge_loader_get_item_by_label_prefers_first_match_in_culture(tmp_path):
+    data = {
+        "nodes": [
+            {"id": "C_JPN", "label": "Japan", "type": "COUNTRY"},
+            {"id": "C_IND", "label": "India", "type": "COUNTRY"},
+            {"id": "F_TEA_JP", "label": "Tea", "type": "FOOD"},
+            {"id": "F_TEA_ANY", "label": " tea ", "type": "FOOD"},
+            {"id": "F_TEA_IN", "label": "TEA", "type": "FOOD"},
+        ],
+        "edges": [
+            {"source": "C_JPN", "target": "F_TEA_JP"},
+            {"source": "C_IND", "target": "F_TEA_IN"},
+        ],
+        "preferred_substitutions": [
+            {"object_label": "Burger", "target_culture": "India", "target_object": "Vada Pav"},
+            {"object_label": "burger", "target_culture": "india", "target_object": "ignored duplicate"},
+        ],
+    }
+    path = tmp_path / "kg_dupes.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    loader = KnowledgeLoader(str(path))
+
+    assert loader.get_item_by_label("tea")["id"] == "F_TEA_JP"
+    assert loader.get_item_by_label("Tea", culture_name="japan")["id"] == "F_TEA_JP"
+    assert loader.get_item_by_label("Tea", culture_name="India")["id"] == "F_TEA_ANY"
+    assert loader.get_item_by_label("Tea", culture_name="Mars")["id"] == "F_TEA_ANY"
+    assert loader.find_node("TEA").id == "F_TEA_JP"
+    assert loader.find_node(" Tea ").id == "F_TEA_ANY"
+    assert loader.get_preferred_substitution("BURGER", "INDIA") == "Vada Pav"
+    assert loader.get_preferred_substitution("burger", "Japan") is None
+    assert loader.get_all_labels() == ["Japan", "India", "Tea"]
+
+
+def test_knowledge_loader_kb_format_culture_lookup_is_case_insensitive(tmp_path):
+    data = {
+        "Japan": {
+            "culture": "Japan",
+            "substitutions": {"FOOD": [{"source": "burger", "targets": ["onigiri"]}]},
+            "avoid": ["clock gifts"],
+        }
+    }
+    path = tmp_path / "kb.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    loader = KnowledgeLoader(str(path))
+    assert loader.get_candidates_from_kb("JAPAN", "Burger", "FOOD") == ["onigiri"]
+    assert loader.get_avoid_list("japan") == ["clock gifts"]
+    assert loader.get_kb_entry("Korea") is None
+
+
+def test_rank_candidates_by_embedding_encodes_only_on_cache_miss(temp_kg_path, monkeypatch):
+    loader = KnowledgeLoader(temp_kg_path, snapshot=False)
+    encoded = []
+
+    def fake_encode(model_name, texts):
+        encoded.append(list(texts))
+        return [[float(len(t)), float(sum(map(ord, t)) % 7), 1.0] for t in texts]
+
+    monkeypatch.setattr(loader, "_encode_texts", fake_encode)
+    first = loader.rank_candidates_by_embedding("Sushi", ["Burger", "Sushi", "Curry"])
+    calls = len(encoded)
+    assert calls > 0 and first[0] == "Sushi"
+    assert loader.rank_candidates_by_embedding("Sushi", ["Curry", "Sushi"])[0] == "Sushi"
+    assert len(encoded) == calls
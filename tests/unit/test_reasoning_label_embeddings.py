@@ -0,0 +1,73 @@
+"""Pytest for reasoning label_embeddings (fake encoder, no model download)."""
+import numpy as np
+
+from src.reasoning.label_embeddings import LabelEmbeddingIndex
+
+LABELS = ["Green Tea", "Sushi", "Taj Mahal", "Masala Chai"]
+
+
+class _Encoder:
+    """Character-histogram embeddings; records every batch it encodes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), 26), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for ch in text.lower():
+                if "a" <= ch <= "z":
+                    out[i, ord(ch) - 97] += 1.0
+        return out
+
+
+def _brute_force(query, candidates, encode):
+    q = encode([query])[0]
+    c = encode(candidates)
+    sims = c @ q / (np.linalg.norm(c, axis=1) * np.linalg.norm(q))
+    pairs = sorted(zip(sims.tolist(), candidates), key=lambda x: x[0], reverse=True)
+    return [p[1] for p in pairs]
+
+
+def test_rank_matches_brute_force_cosine_including_unknown_candidates(tmp_path):
+    encode = _Encoder()
+    index = LabelEmbeddingIndex(LABELS, kg_hash="abc", cache_dir=tmp_path)
+    candidates = ["Sushi", "Chai Latte", "Green Tea", "Taj Mahal", "Masala Chai"]
+    ranked = index.rank("masala tea", candidates, encode)
+    assert ranked == _brute_force("masala tea", candidates, _Encoder())
+    assert encode.calls[0] == ["masala tea"]
+    assert LABELS in encode.calls
+    assert ["Chai Latte"] in encode.calls
+    assert index.rank("", candidates, encode) == candidates
+
+
+def test_matrix_is_persisted_and_reloaded_memory_mapped(tmp_path):
+    first = LabelEmbeddingIndex(LABELS, kg_hash="abc", cache_dir=tmp_path)
+    first.rank("tea", LABELS, _Encoder())
+    assert first.cache_path.exists()
+
+    encode = _Encoder()
+    second = LabelEmbeddingIndex(LABELS, kg_hash="abc", cache_dir=tmp_path)
+    assert second.rank("tea", LABELS, encode) == first.rank("tea", LABELS, _Encoder())
+    assert isinstance(second.matrix(encode), np.memmap)
+    assert LABELS not in encode.calls
+    assert second.stats["matrix_source"] == "mmap"
+
+    changed = LabelEmbeddingIndex(LABELS + ["Ramen"], kg_hash="abc", cache_dir=tmp_path)
+    encode = _Encoder()
+    changed.rank("tea", LABELS, encode)
+    assert changed.stats["matrix_source"] == "encoded"
+
+
+def test_query_embeddings_are_lru_cached(tmp_path):
+    encode = _Encoder()
+    index = LabelEmbeddingIndex(LABELS, kg_hash="abc", cache_dir=tmp_path, cache_size=1, persist=False)
+    index.rank("tea", LABELS, encode)
+    index.rank("tea", LABELS, encode)
+    assert encode.calls.count(["tea"]) == 1
+    index.rank("sushi", LABELS, encode)
+    index.rank("tea", LABELS, encode)
+    assert encode.calls.count(["tea"]) == 2
+    assert index.stats["query_hits"] == 1
+    assert not index.cache_path.exists()
@@ -0,0 +1,62 @@
+"""Pytest for reasoning label_index and the engine lookups built on it."""
+import json
+
+from src.reasoning.engine import (
+    _build_type_token_index,
+    _filter_labels_for_grounding,
+    _recover_grounded_label,
+)
+from src.reasoning.knowledge_loader import KnowledgeLoader
+from src.reasoning.label_index import LabelTokenIndex
+
+
+def _index():
+    return LabelTokenIndex(
+        ["Green Tea", "Matcha Tea", "Tea House", "Japan", "Mystery"],
+        ["FOOD", "FOOD", "LANDMARK", "COUNTRY", None],
+    )
+
+
+def test_best_overlap_prefers_earliest_label_on_ties_and_filters_types():
+    index = _index()
+    assert index.best_overlap({"tea"}, set(), set()) == ("Green Tea", 1)
+    assert index.best_overlap({"matcha", "tea"}, set(), set()) == ("Matcha Tea", 2)
+    assert index.best_overlap({"tea"}, set(), {"LANDMARK"}) == ("Tea House", 1)
+    assert index.best_overlap({"tea"}, {"FOOD"}, set()) == ("Tea House", 1)
+    assert index.best_overlap({"mystery"}, set(), set()) == (None, 0)
+
+
+def test_exact_match_and_type_tokens_respect_exclusions():
+    index = _index()
+    assert index.exact_match("green tea", set(), set()) == "Green Tea"
+    assert index.exact_match("japan", {"COUNTRY"}, set()) is None
+    assert index.type_tokens({"COUNTRY"}) == {
+        "FOOD": {"green", "matcha", "tea"},
+        "LANDMARK": {"tea", "house"},
+    }
+
+
+def test_engine_grounding_uses_cached_loader_index(tmp_path):
+    data = {
+        "nodes": [
+            {"id": "C_JPN", "label": "Japan", "type": "COUNTRY"},
+            {"id": "F_SUSHI", "label": "Salmon Sushi", "type": "FOOD"},
+            {"id": "F_ROLL", "label": "Sushi Roll", "type": "FOOD"},
+            {"id": "L_FUJI", "label": "Mount Fuji", "type": "LANDMARK"},
+        ],
+        "edges": [{"source": "C_JPN", "target": "F_SUSHI"}],
+    }
+    path = tmp_path / "kg.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    loader = KnowledgeLoader(str(path))
+
+    index = loader.get_label_token_index()
+    assert loader.get_label_token_index() is index
+    assert _filter_labels_for_grounding(loader.get_all_labels(), loader, allowed_types={"FOOD"}) == [
+        "Salmon Sushi",
+        "Sushi Roll",
+    ]
+    assert "COUNTRY" not in _build_type_token_index(loader)
+    assert _recover_grounded_label({"label": "sushi_plate"}, loader, exclude_scope_types=True) == "Salmon Sushi"
+    assert _recover_grounded_label({"label": "mount_fuji"}, loader) == "Mount Fuji"
+    assert _recover_grounded_label({"label": "japan"}, loader, exclude_scope_types=True) is None
@@ -0,0 +1,97 @@
+"""Tests for the disk-backed LLM response cache."""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.reasoning.llm_cache import LLMResponseCache, cache_key, llm_cache_stats
+from src.reasoning.llm_client import LLMClient
+
+
+def _always(_result):
+    return True
+
+
+def test_llm_cache_persists_expires_and_evicts(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = LLMResponseCache(path, ttl_s=3600, max_entries=2)
+    key = cache_key("groq", "m", "sys", "prompt")
+    assert key != cache_key("groq", "m", "sys", "prompt2")
+    cache.put(key, {"action": "preserve"})
+    assert LLMResponseCache(path).get(key) == {"action": "preserve"}
+
+    for i in range(40):
+        cache.put(f"k{i}", {"i": i})
+    assert len(cache) <= 2 + 32
+
+    stale = LLMResponseCache(path, ttl_s=0.01)
+    stale.put("old", {"x": 1})
+    time.sleep(0.05)
+    assert stale.get("old") is None
+
+
+def test_llm_cache_coalesces_concurrent_identical_requests(tmp_path):
+    cache = LLMResponseCache(tmp_path / "responses.sqlite")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"action": "transform"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute, _always)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"action": "transform"}] * 5
+
+
+def test_llm_client_serves_repeated_prompt_from_cache(monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    with patch("src.reasoning.llm_client.requests.post") as mock_post:
+        mock_post.return_value.raise_for_status = MagicMock()
+        mock_post.return_value.json.return_value = {
+            "choices": [{"message": {"content": '{"action": "preserve", "rationale": "OK"}'}}]
+        }
+        client = LLMClient()
+        hits = llm_cache_stats()["hits"]
+        assert client.generate_reasoning("Same prompt") == client.generate_reasoning("Same prompt")
+        assert mock_post.call_count == 1
+        assert llm_cache_stats()["hits"] == hits + 1
+
+        client.generate_reasoning("Same prompt", use_cache=False)
+        assert mock_post.call_count == 2
+
+        mock_post.return_value.json.return_value = {"choices": [{"message": {"content": "not json"}}]}
+        client.generate_reasoning("Bad prompt")
+        client.generate_reasoning("Bad prompt")
+        assert mock_post.call_count == 4
+
+
+def test_llm_client_skips_cache_when_disabled_or_served_by_fallback(monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    calls = []
+
+    def fallback_answer(prompt, max_tokens=None):
+        calls.append(prompt)
+        client._served.fallback = True
+        return {"action": "preserve", "rationale": "from fallback"}
+
+    client = LLMClient()
+    monkeypatch.setattr(client, "_call_provider", fallback_answer)
+    client.generate_reasoning("Fallback prompt")
+    client.generate_reasoning("Fallback prompt")
+    assert len(calls) == 2
+
+    uncached = LLMClient(use_cache=False)
+    monkeypatch.setattr(uncached, "_call_provider", lambda prompt, max_tokens=None: calls.append(prompt) or {"action": "preserve"})
+    uncached.generate_reasoning("No cache prompt")
+    uncached.generate_reasoning("No cache prompt")
+    assert len(calls) == 4
@@ -1,3 +1,6 @@
+import os
+import time
+
 from src.reasoning.policy_config import get_policy_int, get_policy_set
 
 
@@ -13,3 +16,47 @@ def test_policy_type_inference_threshold():
 
 def test_policy_embedding_grounding_threshold():
     assert get_policy_int("grounding_min_embedding_token_overlap") >= 1
+
+
+def test_policy_snapshot_served_without_yaml_reads():
+    from src.reasoning.policy_config import get_policy_list, policy_stats, reload_policy
+
+    reload_policy()
+    reads = policy_stats()["yaml_reads"]
+    for _ in range(50):
+        get_policy_set("scope_excluded_types").add("MUTATED")
+        get_policy_int("type_inference_min_token_overlap")
+    assert "MUTATED" not in get_policy_set("scope_excluded_types")
+    assert isinstance(get_policy_list("scope_excluded_types"), list)
+    assert policy_stats()["yaml_reads"] == reads
+
+
+def test_policy_env_override_applied_on_reload(monkeypatch):
+    from src.reasoning import policy_config
+
+    monkeypatch.setenv("REASONING_POLICY_TYPE_INFERENCE_MIN_TOKEN_OVERLAP", "7")
+    policy_config.reload_policy()
+    try:
+        assert get_policy_int("type_inference_min_token_overlap") == 7
+    finally:
+        monkeypatch.delenv("REASONING_POLICY_TYPE_INFERENCE_MIN_TOKEN_OVERLAP")
+        policy_config.reload_policy()
+
+
+def test_policy_hot_reloads_when_yaml_changes(monkeypatch, tmp_path):
+    from src.reasoning import policy_config
+
+    config = tmp_path / "reasoning.yaml"
+    config.write_text("policy:\n  answer: 1\n", encoding="utf-8")
+    monkeypatch.setattr(policy_config, "_CONFIG_FILE", config)
+    monkeypatch.setenv("REASONING_RELOAD_INTERVAL_S", "0")
+    policy_config.reload_policy()
+    try:
+        assert policy_config.get_policy_int("answer") == 1
+        config.write_text("policy:\n  answer: 2\n", encoding="utf-8")
+        os.utime(config, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+        assert policy_config.get_policy_int("answer") == 2
+        assert policy_config.policy_stats()["reloads"] >= 1
+    finally:
+        monkeypatch.undo()
+        policy_config.reload_policy()
@@ -89,3 +89,71 @@ def test_repeated_text_rewrite_is_consistent():
 def test_country_title_is_rewritten_from_scene_context():
     assert _rewrite_culture_title_text("JAPAN", "India", "japan infographic elements") == "INDIA"
     assert _rewrite_culture_title_text("INFOGRAPHICS ELEMENTS", "India", "japan infographic elements") is None
+
+
+def test_batched_text_rewrite_uses_one_request(monkeypatch):
+    monkeypatch.setattr("src.reasoning.engine.ENABLE_BATCHED_TEXT_REWRITE", True)
+
+    class FakeLLM:
+        def __init__(self):
+            self.prompts = []
+
+        def generate_reasoning(self, prompt, max_tokens=None):
+            self.prompts.append(prompt)
+            if len(self.prompts) == 1:
+                assert max_tokens is not None
+                return {
+                    "regions": [
+                        {"id": 0, "is_placeholder": False, "candidates": ["Local guide", "x" * 300]},
+                        {"id": 1, "candidates": "not a list"},
+                    ]
+                }
+            return {"candidates": ["Local tips"]}
+
+    llm = FakeLLM()
+    scene_graph = {
+        "image_type": {"type": "infographic"},
+        "scene": {"description": "Travel infographic"},
+        "text": {
+            "full_text": "GLOBAL GUIDE TRAVEL TIPS",
+            "extracted": [
+                {"text": "GLOBAL GUIDE", "bbox": [0, 0, 200, 40], "style": {"font_size": 12}},
+                {"text": "TRAVEL TIPS", "bbox": [0, 50, 200, 90], "style": {"font_size": 12}},
+                {"text": "GLOBAL GUIDE", "bbox": [0, 100, 200, 140], "style": {"font_size": 12}},
+            ],
+        },
+    }
+
+    edits = _build_text_edits_for_document(scene_graph, "India", llm_client=llm)
+
+    assert "GLOBAL GUIDE" in llm.prompts[0] and "TRAVEL TIPS" in llm.prompts[0]
+    # The malformed entry for region 1 falls back to a per-region request.
+    assert len(llm.prompts) == 2
+    assert [e["translated"] for e in edits] == ["Local guide", "Local tips", "Local guide"]
+
+
+def test_batched_text_rewrite_fits_the_output_token_budget(monkeypatch):
+    from src.reasoning.engine import _batch_rewrite_text_regions, _text_edit_region
+
+    calls = []
+
+    class FakeLLM:
+        def generate_reasoning(self, prompt, max_tokens=None):
+            calls.append((prompt, max_tokens))
+            return {"regions": []}
+
+    items = [
+        {"text": text, "bbox": [0, 0, 400, 40], "style": {"font_size": 12}}
+        for text in ("FRESH MARKET", "DAILY OFFERS", "OPEN LATE")
+    ]
+    regions = [_text_edit_region(item) for item in items]
+    monkeypatch.setattr("src.reasoning.engine.BATCH_OUTPUT_TOKEN_BUDGET", 10**6)
+    _batch_rewrite_text_regions(regions, "India", "poster", "", "", llm_client=FakeLLM())
+    full_tokens = calls[-1][1]
+    assert "OPEN LATE" in calls[-1][0]
+
+    monkeypatch.setattr("src.reasoning.engine.BATCH_OUTPUT_TOKEN_BUDGET", full_tokens - 1)
+    _batch_rewrite_text_regions(regions, "India", "poster", "", "", llm_client=FakeLLM())
+    prompt, max_tokens = calls[-1]
+    assert "FRESH MARKET" in prompt and "DAILY OFFERS" in prompt and "OPEN LATE" not in prompt
+    assert max_tokens < full_tokens
@@ -0,0 +1,135 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from perception.segmentation.sam_segmenter import SAMSegmenter
+
+
+class _IdentityTransform:
+    def apply_boxes_torch(self, boxes, original_size):
+        return boxes
+
+
+class _FakePredictor:
+    """Mimics SamPredictor: fills each box region of the mask."""
+
+    def __init__(self):
+        self.device = torch.device("cpu")
+        self.transform = _IdentityTransform()
+        self.set_image_calls = 0
+        self.predict_calls = []
+        self.reset_image()
+
+    def reset_image(self):
+        self.features = None
+        self.original_size = None
+        self.input_size = None
+        self.is_image_set = False
+
+    def set_image(self, image):
+        self.set_image_calls += 1
+        self.features = torch.full((1, 2, 4, 4), float(image.mean()))
+        self.original_size = image.shape[:2]
+        self.input_size = image.shape[:2]
+        self.is_image_set = True
+
+    def predict_torch(self, point_coords, point_labels, boxes, multimask_output):
+        assert self.is_image_set
+        self.predict_calls.append(len(boxes))
+        h, w = self.original_size
+        masks = torch.zeros((len(boxes), 1, h, w), dtype=torch.bool)
+        for i, (x1, y1, x2, y2) in enumerate(boxes.int().tolist()):
+            masks[i, 0, y1:y2, x1:x2] = True
+        scores = torch.full((len(boxes), 1), 0.9)
+        return masks, scores, None
+
+
+def _segmenter(tmp_path: Path, predictor=None, batch_size=2, disk=True) -> SAMSegmenter:
+    seg = SAMSegmenter.__new__(SAMSegmenter)
+    seg.enabled = True
+    seg.model_type = "vit_b"
+    seg.checkpoint_path = tmp_path / "sam_vit_b_01ec64.pth"
+    seg.box_batch_size = batch_size
+    seg.box_batch_mask_budget_mb = 0
+    seg.embedding_cache_entries = 2
+    seg.embedding_cache_disk = disk
+    seg.embedding_cache_disk_max_mb = 0
+    seg.keep_mask_rle = False
+    seg.embedding_cache_dir = tmp_path / "sam_embeddings"
+    seg._embedding_cache = OrderedDict()
+    seg.predictor = predictor or _FakePredictor()
+    seg.device = "cpu"
+    seg.available = True
+    seg.status_reason = "ready"
+    seg.last_timing = {}
+    return seg
+
+
+def test_segment_batches_boxes_and_keeps_object_order(tmp_path):
+    seg = _segmenter(tmp_path, batch_size=2)
+    image = np.zeros((40, 60, 3), dtype=np.uint8)
+    objects = [
+        {"bbox": [0, 0, 10, 10]},
+        {"bbox": [1, 2]},
+        {"bbox": [20, 5, 40, 25]},
+        {"bbox": [5, 5, 15, 30]},
+    ]
+    results = seg.segment(image, objects)
+    assert seg.predictor.predict_calls == [2, 1]
+    assert [r["enabled"] for r in results] == [True, False, True, True]
+    assert results[1]["reason"] == "invalid_bbox"
+    assert results[0]["area_px"] == 100
+    assert results[2]["area_px"] == 400
+    timing = seg.get_status()["timing"]
+    assert timing["model_type"] == "vit_b"
+    assert timing["checkpoint"] == "sam_vit_b_01ec64.pth"
+    assert timing["box_count"] == 3 and timing["batch_count"] == 2
+    assert timing["embedding_cache"] == "miss"
+
+
+def test_segment_reuses_image_embedding_from_memory_and_disk(tmp_path):
+    image = np.full((32, 32, 3), 7, dtype=np.uint8)
+    objects = [{"bbox": [2, 2, 20, 20]}]
+    seg = _segmenter(tmp_path)
+    first = seg.segment(image, objects)
+    second = seg.segment(image.copy(), objects)
+    assert seg.predictor.set_image_calls == 1
+    assert seg.last_timing["embedding_cache"] == "memory"
+    assert first == second
+
+    fresh = _segmenter(tmp_path)
+    assert fresh.segment(image, objects) == first
+    assert fresh.predictor.set_image_calls == 0
+    assert fresh.last_timing["embedding_cache"] == "disk"
+
+    other = np.full((32, 32, 3), 9, dtype=np.uint8)
+    fresh.segment(other, objects)
+    assert fresh.predictor.set_image_calls == 1
+
+
+def test_box_batch_size_follows_mask_memory_budget(tmp_path):
+    seg = _segmenter(tmp_path, batch_size=32)
+    seg.box_batch_mask_budget_mb = 1
+    # 256x256 float32 logits are 256 KiB per box, so 4 boxes fit in 1 MiB.
+    assert seg._boxes_per_batch(256, 256) == 4
+    assert seg._boxes_per_batch(4096, 4096) == 1
+    assert seg._boxes_per_batch(16, 16) == 32
+    image = np.zeros((256, 256, 3), dtype=np.uint8)
+    seg.segment(image, [{"bbox": [i, i, i + 10, i + 10]} for i in range(6)])
+    assert seg.predictor.predict_calls == [4, 2]
+
+
+def test_disk_embedding_cache_evicts_least_recently_used(tmp_path):
+    seg = _segmenter(tmp_path)
+    seg.embedding_cache_dir.mkdir(parents=True)
+    for i, name in enumerate(["old", "used", "new"]):
+        path = seg.embedding_cache_dir / f"{name}.pt"
+        path.write_bytes(b"\0" * 400 * 1024)
+        os.utime(path, (1000 + i, 1000 + i))
+    os.utime(seg.embedding_cache_dir / "used.pt", (5000, 5000))
+    seg.embedding_cache_disk_max_mb = 1
+    seg._evict_disk_embeddings()
+    assert sorted(p.stem for p in seg.embedding_cache_dir.glob("*.pt")) == ["new", "used"]
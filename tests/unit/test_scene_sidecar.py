@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+
+from src.realization.schema import adapt_plan_to_edit_format
+from src.utilities.scene_sidecar import (
+    decode_mask_rle,
+    encode_mask_rle,
+    inline_geometry,
+    load_scene_json,
+    save_compact_scene,
+)
+
+
+def _scene():
+    mask = np.zeros((6, 5), dtype=np.uint8)
+    mask[0, 0] = 1
+    mask[2:5, 1:4] = 1
+    line = {"bbox": [1, 2, 30, 12], "polygon": [[1.0, 2.0], [30.0, 2.0], [30.0, 12.0], [1.0, 12.0]], "text": "Sale"}
+    return {
+        "metadata": {"image_path": "a.jpg"},
+        "objects": [
+            {
+                "id": 0,
+                "bbox": [1, 2, 4, 5],
+                "class_name": "cup",
+                "segmentation": {
+                    "enabled": True,
+                    "polygon": [[1.0, 2.0], [3.0, 2.0], [3.0, 4.0]],
+                    "mask_rle": encode_mask_rle(mask),
+                },
+            }
+        ],
+        "text": {"regions": [dict(line)], "extracted": [dict(line)]},
+        "text_regions": [{"id": 0, "text": "Sale", "polygon": []}],
+    }
+
+
+def test_mask_rle_roundtrip():
+    mask = np.zeros((6, 5), dtype=np.uint8)
+    mask[0, 0] = 1
+    mask[2:5, 1:4] = 1
+    rle = encode_mask_rle(mask)
+    assert rle["size"] == [6, 5] and rle["counts"][0] == 0
+    assert np.array_equal(decode_mask_rle(rle), mask)
+    empty = np.zeros((3, 4), dtype=np.uint8)
+    assert np.array_equal(decode_mask_rle(encode_mask_rle(empty)), empty)
+
+
+def test_compact_scene_roundtrip_and_dedup(tmp_path):
+    scene = _scene()
+    path = tmp_path / "a_stage1_perception.json"
+    returned = save_compact_scene(scene, path)
+    assert (tmp_path / "a_stage1_perception.geometry.npz").is_file()
+
+    on_disk = json.loads(path.read_text(encoding="utf-8"))
+    assert on_disk["geometry_sidecar"]["path"] == "a_stage1_perception.geometry.npz"
+    assert on_disk["geometry_sidecar"]["entries"] == 3
+    assert on_disk["text"]["regions"][0]["polygon"] == on_disk["text"]["extracted"][0]["polygon"]
+    assert on_disk["text_regions"][0]["polygon"] == []
+    assert on_disk["objects"][0]["class_name"] == "cup"
+
+    loaded = load_scene_json(path)
+    assert loaded["geometry_sidecar"]["path"] == returned["geometry_sidecar"]["path"]
+    assert inline_geometry(loaded) == scene
+    assert load_scene_json(path, resolve=True) == scene
+
+
+def test_adapt_plan_resolves_polygon_from_sidecar(tmp_path):
+    scene = _scene()
+    scene["objects"][0]["original_class_name"] = "cup"
+    scene["objects"][0]["class_name"] = "teacup"
+    scene["edit_plan"] = {"transformations": [{"original_object": "cup", "target_object": "teacup"}]}
+    path = tmp_path / "plan.json"
+    save_compact_scene(scene, path)
+    plan = adapt_plan_to_edit_format(load_scene_json(path))
+    assert plan["replace"][0]["constraints"]["polygon"] == [[1.0, 2.0], [3.0, 2.0], [3.0, 4.0]]
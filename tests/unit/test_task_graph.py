@@ -0,0 +1,65 @@
+import time
+
+import pytest
+import torch
+
+from perception.utils.task_graph import StageTask, run_task_graph, topological_order
+
+
+def _sleep_task(seconds, value):
+    def fn(deps):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_independent_tasks_overlap_and_results_match_sequential():
+    def combine(deps):
+        return deps["a"] + deps["b"]
+
+    tasks = [
+        StageTask("a", _sleep_task(0.2, 1)),
+        StageTask("b", _sleep_task(0.2, 2)),
+        StageTask("c", combine, deps=("a", "b")),
+    ]
+    threaded, timing = run_task_graph(tasks, max_workers=4, mode="thread")
+    sequential, seq_timing = run_task_graph(tasks, max_workers=4, mode="sequential")
+    assert threaded == sequential == {"a": 1, "b": 2, "c": 3}
+    assert timing["wall_ms"] < 350
+    assert seq_timing["wall_ms"] >= 400
+    assert 200 <= timing["critical_path_ms"] < 300
+    assert timing["tasks"]["c"]["start_ms"] >= timing["tasks"]["a"]["duration_ms"]
+
+
+def test_per_task_thread_limit_is_applied_and_restored():
+    def record(deps):
+        return torch.get_num_threads()
+
+    before = torch.get_num_threads()
+    results, _ = run_task_graph([StageTask("t", record, threads=3)], max_workers=1)
+    assert results["t"] == 3
+    assert torch.get_num_threads() == before
+
+
+def test_overlapping_thread_tasks_restore_the_callers_thread_count():
+    def sleepy(deps):
+        time.sleep(0.05)
+        return torch.get_num_threads()
+
+    before = torch.get_num_threads()
+    tasks = [StageTask("a", sleepy, threads=2), StageTask("b", sleepy, threads=3)]
+    run_task_graph(tasks, max_workers=2, mode="thread")
+    assert torch.get_num_threads() == before
+
+
+def test_graph_validation_and_error_propagation():
+    with pytest.raises(ValueError, match="unknown"):
+        topological_order([StageTask("a", _sleep_task(0, 1), deps=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order([StageTask("a", None, deps=("b",)), StageTask("b", None, deps=("a",))])
+
+    def boom(deps):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_task_graph([StageTask("a", boom), StageTask("b", _sleep_task(0, 1), deps=("a",))])
@@ -0,0 +1,123 @@
+import numpy as np
+
+from perception.utils.tiling import (
+    iter_tile_batches,
+    merge_tiled_detections,
+    plan_tiles,
+    should_tile,
+    tile_detections_to_image,
+)
+
+
+def test_plan_tiles_covers_image_with_full_size_overlapping_tiles():
+    tiles = plan_tiles(height=2500, width=6000, tile_size=1280, overlap=256)
+    assert all(x1 - x0 == 1280 and y1 - y0 == 1280 for x0, y0, x1, y1 in tiles)
+    covered = np.zeros((2500, 6000), dtype=bool)
+    for x0, y0, x1, y1 in tiles:
+        covered[y0:y1, x0:x1] = True
+    assert covered.all()
+    xs = sorted({t[0] for t in tiles})
+    assert all(b - a <= 1280 - 256 for a, b in zip(xs, xs[1:]))
+
+
+def test_plan_tiles_small_image_is_single_tile():
+    assert plan_tiles(400, 300, 1280, 256) == [(0, 0, 300, 400)]
+    assert not should_tile((400, 300, 3), enabled=True, min_image_side=3000)
+    assert not should_tile((8000, 6000, 3), enabled=False, min_image_side=3000)
+    assert should_tile((8000, 6000, 3), enabled=True, min_image_side=3000)
+
+
+def test_iter_tile_batches_yields_views_in_bounded_batches():
+    image = np.zeros((100, 250, 3), dtype=np.uint8)
+    tiles = plan_tiles(100, 250, 100, 20)
+    batches = list(iter_tile_batches(image, tiles, batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    (box, view) = batches[0][0]
+    assert view.base is image
+    assert view.shape[:2] == (box[3] - box[1], box[2] - box[0])
+
+
+def test_seam_fragment_merges_into_full_detection_from_neighbour_tile():
+    shape = (1000, 2000, 3)
+    left = tile_detections_to_image(
+        [{"bbox": [900, 100, 1000, 200], "confidence": 0.9, "class_name": "cup"}],
+        (0, 0, 1000, 1000),
+        shape,
+    )
+    right = tile_detections_to_image(
+        [{"bbox": [50, 100, 250, 200], "confidence": 0.8, "class_name": "cup"}],
+        (800, 0, 1800, 1000),
+        shape,
+    )
+    merged = merge_tiled_detections(left + right, iou_threshold=0.5)
+    assert len(merged) == 1
+    assert merged[0]["bbox"] == [850.0, 100.0, 1050.0, 200.0]
+    assert merged[0]["confidence"] == 0.9
+    assert "_tile_seam_fragment" not in merged[0]
+
+
+def test_merge_keeps_nested_objects_that_are_not_seam_fragments():
+    dets = [
+        {"bbox": [0, 0, 400, 400], "confidence": 0.9, "class_name": "person"},
+        {"bbox": [10, 10, 60, 60], "confidence": 0.8, "class_name": "person"},
+        {"bbox": [12, 12, 62, 62], "confidence": 0.7, "class_name": "cup"},
+    ]
+    assert len(merge_tiled_detections(dets)) == 3
+
+
+def test_ocr_merge_prefers_uncut_line_and_maps_polygons():
+    shape = (1000, 2000, 3)
+    cut = tile_detections_to_image(
+        [{"text": "HELLO WO", "bbox": [700, 10, 1000, 40], "confidence": 0.99,
+          "polygon": [[700, 10], [1000, 10], [1000, 40], [700, 40]]}],
+        (0, 0, 1000, 1000),
+        shape,
+    )
+    whole = tile_detections_to_image(
+        [{"text": "HELLO WORLD", "bbox": [0, 10, 400, 40], "confidence": 0.95,
+          "polygon": [[0, 10], [400, 10], [400, 40], [0, 40]]}],
+        (700, 0, 1700, 1000),
+        shape,
+    )
+    merged = merge_tiled_detections(cut + whole, iou_threshold=0.3, class_key=None, prefer="area")
+    assert [m["text"] for m in merged] == ["HELLO WORLD"]
+    assert merged[0]["polygon"][0] == [700.0, 10.0]
+
+
+def test_ocr_line_wider_than_overlap_is_joined_across_the_seam():
+    shape = (2000, 4000, 3)
+    tiles = plan_tiles(2000, 4000, 1600, 200)
+    assert (0, 0, 1600, 1600) in tiles and (1400, 0, 3000, 1600) in tiles
+    left = tile_detections_to_image(
+        [{"text": "SUMMER SALE NO", "bbox": [1000, 100, 1600, 180], "confidence": 0.97,
+          "polygon": [[1000, 100], [1600, 100], [1600, 180], [1000, 180]]}],
+        (0, 0, 1600, 1600),
+        shape,
+    )
+    right = tile_detections_to_image(
+        [{"text": "LE NOW ON", "bbox": [0, 102, 800, 180], "confidence": 0.93,
+          "polygon": [[0, 102], [800, 102], [800, 180], [0, 180]]}],
+        (1400, 0, 3000, 1600),
+        shape,
+    )
+    other = [{"text": "TODAY", "bbox": [1000, 400, 1300, 460], "confidence": 0.9}]
+    merged = merge_tiled_detections(
+        left + right + other, iou_threshold=0.3, class_key=None, prefer="area", join_lines=True
+    )
+    headline = [m for m in merged if m["text"] != "TODAY"]
+    assert len(merged) == 2 and len(headline) == 1
+    assert headline[0]["text"] == "SUMMER SALE NOW ON"
+    assert headline[0]["bbox"] == [1000.0, 100.0, 2200.0, 180.0]
+    assert headline[0]["polygon"][2] == [2200.0, 180.0]
+    assert headline[0]["confidence"] == 0.93
+    assert "_tile_seam_fragment" not in headline[0]
+
+
+def test_seam_join_leaves_uncut_neighbouring_lines_alone():
+    lines = [
+        {"text": "LEFT", "bbox": [0, 0, 100, 30], "_tile_seam_fragment": True},
+        {"text": "RIGHT", "bbox": [120, 0, 220, 30], "_tile_seam_fragment": True},
+        {"text": "BELOW", "bbox": [50, 60, 150, 90], "_tile_seam_fragment": True},
+    ]
+    merged = merge_tiled_detections(lines, class_key=None, prefer="area", join_lines=True)
+    assert sorted(m["text"] for m in merged) == ["BELOW", "LEFT", "RIGHT"]
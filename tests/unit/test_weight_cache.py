@@ -0,0 +1,108 @@
+import torch
+
+from src.utilities.weight_cache import (
+    hf_fingerprint,
+    load_module_mmap,
+    load_timings,
+    reset_load_timings,
+    weight_cache_path,
+)
+
+
+class _Tied(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embed = torch.nn.Embedding(10, 4)
+        self.head = torch.nn.Linear(4, 10, bias=False)
+        self.head.weight = self.embed.weight
+        self.norm = torch.nn.BatchNorm1d(4)
+        self.register_buffer("position_ids", torch.arange(6), persistent=False)
+
+    def forward(self, ids):
+        return self.head(self.norm(self.embed(ids).reshape(-1, 4)))
+
+
+def _trained():
+    torch.manual_seed(0)
+    model = _Tied()
+    model.norm.running_mean.fill_(0.5)
+    return model.eval()
+
+
+def test_second_load_maps_weights_from_cache(tmp_path):
+    reset_load_timings()
+    reference = _trained()
+    first = load_module_mmap("org/tied", lambda: reference, skeleton_fn=_Tied, cache_dir=tmp_path, enabled=True)
+    assert first is reference
+    assert weight_cache_path("org/tied", tmp_path).is_file()
+
+    mapped = load_module_mmap("org/tied", lambda: 1 / 0, skeleton_fn=_Tied, cache_dir=tmp_path, enabled=True)
+    assert mapped.head.weight is mapped.embed.weight
+    assert torch.equal(mapped.position_ids, torch.arange(6))
+    ids = torch.tensor([[1, 2, 3]])
+    with torch.no_grad():
+        assert torch.equal(mapped(ids), reference(ids))
+    assert [entry["source"] for entry in load_timings()] == ["convert", "mmap"]
+
+
+def test_changed_fingerprint_reconverts(tmp_path):
+    reset_load_timings()
+    load_module_mmap("ckpt", _trained, skeleton_fn=_Tied, fingerprint="1:1", cache_dir=tmp_path, enabled=True)
+    loads = []
+    load_module_mmap(
+        "ckpt",
+        lambda: loads.append(1) or _trained(),
+        skeleton_fn=_Tied,
+        fingerprint="2:2",
+        cache_dir=tmp_path,
+        enabled=True,
+    )
+    assert loads == [1]
+    assert [entry["source"] for entry in load_timings()] == ["convert", "convert"]
+
+
+def test_disabled_or_no_skeleton_loads_directly(tmp_path):
+    reset_load_timings()
+    load_module_mmap("plain", _trained, cache_dir=tmp_path, enabled=True)
+    load_module_mmap("plain", _trained, skeleton_fn=_Tied, cache_dir=tmp_path, enabled=False)
+    assert not weight_cache_path("plain", tmp_path).exists()
+    assert [entry["source"] for entry in load_timings()] == ["direct", "direct"]
+
+
+def test_retrained_local_hf_directory_reconverts(tmp_path):
+    model_dir = tmp_path / "finetuned"
+    model_dir.mkdir()
+    (model_dir / "config.json").write_text("{}")
+    weights = model_dir / "model.safetensors"
+    weights.write_bytes(b"v1")
+    cache_dir = tmp_path / "cache"
+    reset_load_timings()
+
+    def load():
+        return load_module_mmap(
+            str(model_dir),
+            _trained,
+            skeleton_fn=_Tied,
+            fingerprint=lambda: hf_fingerprint(str(model_dir)),
+            cache_dir=cache_dir,
+            enabled=True,
+        )
+
+    load()
+    load()
+    weights.write_bytes(b"retrained")
+    load()
+    assert [entry["source"] for entry in load_timings()] == ["convert", "mmap", "convert"]
+
+
+def test_hf_fingerprint_uses_cached_snapshot_commit(monkeypatch):
+    import huggingface_hub
+
+    monkeypatch.setattr(
+        huggingface_hub,
+        "try_to_load_from_cache",
+        lambda repo_id, filename: f"/hf/models--org--clip/snapshots/abc123/{filename}",
+    )
+    assert hf_fingerprint("org/clip") == "rev:abc123"
+    monkeypatch.setattr(huggingface_hub, "try_to_load_from_cache", lambda repo_id, filename: None)
+    assert hf_fingerprint("org/clip") == ""
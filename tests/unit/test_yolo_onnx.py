@@ -0,0 +1,64 @@
+import numpy as np
+
+from perception.utils.yolo_onnx import decode_yolo_output, letterbox, onnx_export_path
+
+
+def _raw_head(rows, num_classes=3):
+    """Build a (1, 4 + nc, anchors) tensor from (cx, cy, w, h, class_id, score) rows."""
+    out = np.zeros((1, 4 + num_classes, len(rows)), dtype=np.float32)
+    for i, (cx, cy, w, h, cls, score) in enumerate(rows):
+        out[0, :4, i] = [cx, cy, w, h]
+        out[0, 4 + cls, i] = score
+    return out
+
+
+def test_onnx_export_path_keyed_by_weights_hash_and_imgsz(tmp_path):
+    weights = tmp_path / "yolov8x.pt"
+    weights.write_bytes(b"weights-a")
+    first = onnx_export_path(weights, tmp_path / "cache", 1280)
+    assert first.parent == tmp_path / "cache" / "onnx"
+    assert first.name.startswith("yolov8x_") and first.name.endswith("_1280.onnx")
+    assert onnx_export_path(weights, tmp_path / "cache", 640) != first
+    weights.write_bytes(b"weights-b")
+    assert onnx_export_path(weights, tmp_path / "cache", 1280) != first
+
+
+def test_letterbox_pads_to_square_and_reports_offsets():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    padded, ratio, (pad_x, pad_y) = letterbox(image, 64)
+    assert padded.shape == (64, 64, 3)
+    assert ratio == 64 / 200
+    assert pad_x == 0.0
+    assert pad_y == 16.0
+    assert int(padded[0, 0, 0]) == 114
+
+
+def test_decode_applies_class_aware_nms_and_maps_back_to_original_pixels():
+    raw = _raw_head(
+        [
+            (32, 32, 20, 20, 0, 0.9),
+            (33, 32, 20, 20, 0, 0.8),  # same class, heavy overlap -> suppressed
+            (33, 32, 20, 20, 1, 0.7),  # other class, same place -> kept
+            (10, 10, 4, 4, 2, 0.1),  # below confidence
+        ]
+    )
+    boxes, scores, classes = decode_yolo_output(
+        raw,
+        ratio=0.5,
+        pad=(0.0, 16.0),
+        orig_shape=(64, 128),
+        conf_threshold=0.25,
+        iou_threshold=0.45,
+        max_det=300,
+    )
+    assert classes.tolist() == [0, 1]
+    assert np.allclose(scores, [0.9, 0.7])
+    assert np.allclose(boxes[0], [44.0, 12.0, 84.0, 52.0])
+
+
+def test_decode_respects_max_det_and_empty_input():
+    raw = _raw_head([(10 + 20 * i, 10, 8, 8, 0, 0.9 - 0.01 * i) for i in range(5)])
+    boxes, _, _ = decode_yolo_output(raw, 1.0, (0.0, 0.0), (64, 128), 0.25, 0.45, max_det=2)
+    assert boxes.shape == (2, 4)
+    empty = decode_yolo_output(_raw_head([]), 1.0, (0.0, 0.0), (64, 64), 0.25, 0.45, 10)
+    assert all(arr.shape[0] == 0 for arr in empty)